@@ -0,0 +1,227 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Recursive, parallel verification of bundle stores.
+
+Discovers every bundle (a directory containing the manifest) under a root
+and verifies them on a process pool. The public key is read once by the
+caller and loaded once per worker process. Results are yielded as each
+bundle completes so callers can stream them. With a verification cache,
+each worker reads a read-only copy and returns the digests it used; the
+parent merges them into one cache and saves it once.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from agent.evidence import verify_evidence_manifest
+from agent.verify_cache import DEFAULT_SAMPLE_RATE, VerificationCache
+
+DEFAULT_MANIFEST_REL = "artifacts/manifest.json"
+DEFAULT_PROCESSES = os.cpu_count() or 1
+
+# Per-process state set up by `_init_worker`.
+_worker_public_key: Any = None
+_worker_cache: VerificationCache | None = None
+
+
+def discover_bundles(
+    root: Path, manifest_rel: str = DEFAULT_MANIFEST_REL
+) -> List[Path]:
+    """Return sorted bundle directories under `root` containing `manifest_rel`.
+
+    The walk does not descend into a bundle once it is found.
+    """
+    bundles: List[Path] = []
+    for dirpath, dirnames, _filenames in os.walk(root):
+        current = Path(dirpath)
+        if (current / manifest_rel).is_file():
+            bundles.append(current)
+            dirnames[:] = []
+            continue
+        dirnames.sort()
+    return sorted(bundles)
+
+
+def load_public_key(public_key_pem: bytes | None) -> Any:
+    """Parse a PEM public key (None passes through).
+
+    Raises:
+        ValueError: The key cannot be parsed, or cryptography is missing
+    """
+    if public_key_pem is None:
+        return None
+    try:
+        from cryptography.hazmat.primitives import serialization
+    except ImportError as exc:
+        raise ValueError("Signature verification requires cryptography") from exc
+    try:
+        return serialization.load_pem_public_key(public_key_pem)
+    except Exception as exc:  # ValueError, UnsupportedAlgorithm
+        raise ValueError(f"Invalid PEM public key: {exc}") from exc
+
+
+def _init_worker(public_key_pem: bytes | None, cache_path: str | None = None) -> None:
+    global _worker_public_key, _worker_cache
+    _worker_public_key = load_public_key(public_key_pem)
+    _worker_cache = (
+        None
+        if cache_path is None
+        else VerificationCache(Path(cache_path), read_only=True)
+    )
+
+
+def _verify_bundle(
+    bundle_dir: str,
+    manifest_rel: str,
+    paranoid: bool = False,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        result = verify_evidence_manifest(
+            Path(bundle_dir),
+            manifest_rel,
+            # Parallelism comes from the process pool; keep hashing serial.
+            workers=1,
+            public_key=_worker_public_key,
+            cache=_worker_cache,
+            paranoid=paranoid,
+            sample_rate=sample_rate,
+        )
+    except Exception as exc:  # one malformed bundle must not stop the batch
+        result = {
+            "ok": False,
+            "error": f"{type(exc).__name__}: {exc}",
+            "checked": 0,
+            "mismatches": [],
+            "missing": [],
+            "exit_code": 2,
+            "exit_reason": "verification_error",
+        }
+    record = {
+        "type": "bundle",
+        "bundle": bundle_dir,
+        "elapsed_seconds": round(time.perf_counter() - started, 6),
+        **result,
+    }
+    if _worker_cache is not None:
+        record["cache_updates"] = _worker_cache.take_updates()
+    return record
+
+
+def verify_bundles(
+    bundles: Iterable[Path],
+    manifest_rel: str = DEFAULT_MANIFEST_REL,
+    public_key_pem: bytes | None = None,
+    processes: int | None = None,
+    cache: VerificationCache | None = None,
+    paranoid: bool = False,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+) -> Iterator[Dict[str, Any]]:
+    """Verify `bundles` concurrently, yielding one result per bundle as it completes.
+
+    Args:
+        bundles: Bundle directories
+        manifest_rel: Manifest path relative to each bundle
+        public_key_pem: Ed25519 public key (PEM) for signed manifests
+        processes: Worker processes (default: CPU count; 1 = in-process)
+        cache: Verification cache; workers read the saved file and their
+            digests are merged back into `cache`, which is saved once at
+            the end
+        paranoid: Rehash every file despite cache hits
+        sample_rate: Fraction of cache hits rehashed anyway
+
+    Raises:
+        ValueError: `public_key_pem` cannot be parsed (see `load_public_key`)
+    """
+    global _worker_public_key, _worker_cache
+    paths = [str(bundle) for bundle in bundles]
+    public_key = load_public_key(public_key_pem)  # fail before starting workers
+    processes = DEFAULT_PROCESSES if processes is None else max(1, processes)
+    cache_path = None if cache is None else str(cache.path)
+    options = (paranoid, sample_rate)
+
+    def _merged(result: Dict[str, Any]) -> Dict[str, Any]:
+        updates = result.pop("cache_updates", None)
+        if cache is not None and updates:
+            cache.merge(updates)
+        return result
+
+    try:
+        if processes == 1 or len(paths) <= 1:
+            previous = (_worker_public_key, _worker_cache)
+            _init_worker(None, cache_path)
+            _worker_public_key = public_key
+            try:
+                for path in paths:
+                    yield _merged(_verify_bundle(path, manifest_rel, *options))
+            finally:
+                _worker_public_key, _worker_cache = previous
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(paths)),
+            initializer=_init_worker,
+            initargs=(public_key_pem, cache_path),
+        ) as pool:
+            futures = [
+                pool.submit(_verify_bundle, path, manifest_rel, *options)
+                for path in paths
+            ]
+            for future in as_completed(futures):
+                yield _merged(future.result())
+    finally:
+        if cache is not None:
+            cache.save()
+
+
+class BulkSummary:
+    """Running totals over per-bundle results, so callers can stream them."""
+
+    def __init__(self) -> None:
+        self.bundles = 0
+        self.verified = 0
+        self.files_checked = 0
+        self.bytes_hashed = 0
+        self.exit_code = 0
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.bundles += 1
+        self.verified += 1 if result.get("ok") else 0
+        self.files_checked += int(result.get("checked", 0))
+        self.bytes_hashed += int(result.get("bytes_hashed", 0))
+        self.exit_code = max(self.exit_code, int(result.get("exit_code", 1)))
+
+    def to_dict(self, elapsed_seconds: float) -> Dict[str, Any]:
+        """Counts and throughput as a `"type": "summary"` record."""
+        mib = self.bytes_hashed / (1024 * 1024)
+        return {
+            "type": "summary",
+            "bundles": self.bundles,
+            "verified": self.verified,
+            "failed": self.bundles - self.verified,
+            "files_checked": self.files_checked,
+            "bytes_hashed": self.bytes_hashed,
+            "elapsed_seconds": round(elapsed_seconds, 6),
+            "bundles_per_sec": (
+                round(self.bundles / elapsed_seconds, 2) if elapsed_seconds else None
+            ),
+            "mib_per_sec": (
+                round(mib / elapsed_seconds, 2) if elapsed_seconds else None
+            ),
+            "exit_code": self.exit_code if self.bundles else 2,
+        }
+
+
+def summarize_bulk_results(
+    results: Iterable[Dict[str, Any]], elapsed_seconds: float
+) -> Dict[str, Any]:
+    """Aggregate per-bundle results into counts and throughput."""
+    summary = BulkSummary()
+    for result in results:
+        summary.add(result)
+    return summary.to_dict(elapsed_seconds)
@@ -0,0 +1,165 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Single-file `.inspecta` bundle archives.
+
+An archive is a zip file whose members are the bundle's files under their
+bundle-relative paths (report.json, report.*, artifacts/...). Members are
+stored uncompressed by default so reads are plain offset/length slices; the
+zip central directory at the end of the file is the index of member offsets
+and sizes, so any single artifact can be read without extracting the rest.
+Member order and timestamps are fixed so packing the same bundle twice
+yields identical bytes.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Dict, List
+
+ARCHIVE_SUFFIX = ".inspecta"
+ARCHIVE_FORMAT = b"inspecta-bundle/1"
+_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_COPY_BUFFER_BYTES = 1024 * 1024
+
+
+class BundleArchiveError(Exception):
+    """Raised when an archive cannot be created or read."""
+
+
+def is_bundle_archive(path: Path) -> bool:
+    """Return True if `path` is a file that looks like a `.inspecta` archive."""
+    return path.is_file() and path.suffix == ARCHIVE_SUFFIX and zipfile.is_zipfile(path)
+
+
+def _bundle_members(bundle_dir: Path) -> List[str]:
+    members = []
+    for dirpath, dirnames, filenames in os.walk(bundle_dir):
+        dirnames.sort()
+        for name in filenames:
+            full = Path(dirpath) / name
+            if full.is_file() and not full.is_symlink():
+                members.append(full.relative_to(bundle_dir).as_posix())
+    return sorted(members)
+
+
+def pack_bundle(
+    bundle_dir: Path, archive_path: Path | None = None, compress: bool = False
+) -> Path:
+    """Pack a bundle directory into a `.inspecta` archive.
+
+    Args:
+        bundle_dir: Bundle directory (report.json, artifacts/, ...)
+        archive_path: Destination (default: `<bundle_dir>.inspecta` beside it)
+        compress: Deflate members instead of storing them
+
+    Returns:
+        Path to the written archive
+
+    Raises:
+        BundleArchiveError: Bundle missing/empty or archive not writable
+    """
+    if not bundle_dir.is_dir():
+        raise BundleArchiveError(f"Bundle directory not found: {bundle_dir}")
+    members = _bundle_members(bundle_dir)
+    if not members:
+        raise BundleArchiveError(f"Bundle directory is empty: {bundle_dir}")
+
+    archive_path = archive_path or bundle_dir.with_name(
+        bundle_dir.name + ARCHIVE_SUFFIX
+    )
+    compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    tmp_path = archive_path.with_name(f".{archive_path.name}.{os.getpid()}.tmp")
+    try:
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(tmp_path, "w", allowZip64=True) as archive:
+            archive.comment = ARCHIVE_FORMAT
+            for rel in members:
+                source = bundle_dir / rel
+                info = zipfile.ZipInfo(rel, date_time=_FIXED_DATE_TIME)
+                info.compress_type = compress_type
+                info.external_attr = 0o644 << 16
+                info.file_size = source.stat().st_size
+                with (
+                    source.open("rb") as src,
+                    archive.open(info, "w", force_zip64=info.file_size >= 2**31) as dst,
+                ):
+                    shutil.copyfileobj(src, dst, _COPY_BUFFER_BYTES)
+        os.replace(tmp_path, archive_path)
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise BundleArchiveError(f"Cannot write archive {archive_path}: {exc}") from exc
+    return archive_path
+
+
+class BundleArchive:
+    """Random-access reader for a `.inspecta` archive.
+
+    Args:
+        path: Archive file
+
+    Raises:
+        BundleArchiveError: Not a zip file or not an inspecta bundle archive
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            self._zip = zipfile.ZipFile(path)
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise BundleArchiveError(f"Cannot open archive {path}: {exc}") from exc
+        if self._zip.comment != ARCHIVE_FORMAT:
+            self._zip.close()
+            raise BundleArchiveError(f"Not an inspecta bundle archive: {path}")
+
+    def __enter__(self) -> "BundleArchive":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def names(self) -> List[str]:
+        """Return member paths in archive order."""
+        return self._zip.namelist()
+
+    def exists(self, rel: str) -> bool:
+        try:
+            self._zip.getinfo(rel)
+        except KeyError:
+            return False
+        return True
+
+    def index(self) -> Dict[str, Dict[str, int]]:
+        """Return `{path: {offset, size, compressed_size}}` (central directory)."""
+        return {
+            info.filename: {
+                "offset": info.header_offset,
+                "size": info.file_size,
+                "compressed_size": info.compress_size,
+            }
+            for info in self._zip.infolist()
+        }
+
+    def size(self, rel: str) -> int:
+        try:
+            return self._zip.getinfo(rel).file_size
+        except KeyError as exc:
+            raise BundleArchiveError(f"No member {rel} in {self.path}") from exc
+
+    def open(self, rel: str) -> IO[bytes]:
+        """Open one member for streaming reads without extracting the archive."""
+        try:
+            return self._zip.open(rel)
+        except KeyError as exc:
+            raise BundleArchiveError(f"No member {rel} in {self.path}") from exc
+
+    def read_bytes(self, rel: str) -> bytes:
+        with self.open(rel) as fh:
+            return fh.read()
+
+    def read_text(self, rel: str, encoding: str = "utf-8") -> str:
+        return self.read_bytes(rel).decode(encoding)
@@ -3,46 +3,30 @@
 
 Provides a minimal Click-based CLI with `run --mode quick` to produce a
 report.json and placeholder artifacts. Designed for tests and developer runs.
+
+The desktop app shells out to this CLI many times per session, so startup
+is kept cheap: heavy modules are imported inside the commands that use
+them, and the fleet and upload commands live in modules that are imported
+only when one of them runs (see `LazyGroup`).
 """
 
 from __future__ import annotations
 
 import hashlib
+import importlib
 import json
 import logging
 import platform as os_platform
 import subprocess
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 
-from . import __version__, native_bridge
-from .capability_matrix import get_surface_capabilities, load_capability_matrix
-from .evidence import (
-    EvidenceError,
-    audit_evidence_bundle,
-    verify_evidence_manifest,
-    write_evidence_manifest,
-)
-from .logging_utils import setup_logging
-from .native_probe_runner import run_smart_contract_hot_path
-from .plugin_manifest import PluginManifestError, verify_plugin_manifest
-from .plugin_negotiation import PluginNegotiationError, negotiate_plugin_capabilities
-from .plugins import battery, cpu_bench, disk_perf, inventory, memtest, sensors, smart
-from .policy_pack import PolicyPackError, load_policy_pack
-from .profiles import get_profile, is_valid_profile
-from .redaction import apply_redaction, apply_retention_policy
-from .report import compose_report
-from .report_formatter import (
-    generate_html_report,
-    generate_pdf_report,
-    generate_txt_report,
-    open_file,
-)
-from .schema_compat import ensure_supported_report_version, migrate_legacy_report
-from .upload_client import UploadError, upload_report_bundle
+from . import __version__, jsonio
+from .verify_cache import DEFAULT_MAX_ENTRIES, DEFAULT_SAMPLE_RATE, VerificationCache
 
 # Simple console logger for CLI (detailed logging set up in run command)
 logger = logging.getLogger("inspecta")
@@ -52,7 +36,87 @@ logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
 
-@click.group()
+# Subcommands imported on first use: name -> ("module:attribute", short help).
+# The short help is shown by `inspecta --help` without importing the module.
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "export": (
+        "agent.cli_fleet:export_cmd",
+        "Export reports under ROOT as a flat table, one row per report.",
+    ),
+    "index": (
+        "agent.cli_fleet:index_cmd",
+        "Build or incrementally update the SQLite report index for ROOT.",
+    ),
+    "query": (
+        "agent.cli_fleet:query_cmd",
+        "Search or aggregate reports in the index built by `inspecta index`.",
+    ),
+    "rescore": (
+        "agent.cli_fleet:rescore_cmd",
+        "Recompute scores and policy results for stored reports under ROOT.",
+    ),
+    "upload": (
+        "agent.cli_upload:upload_group",
+        "Manage the offline report upload spool.",
+    ),
+    "validate": (
+        "agent.cli_fleet:validate_cmd",
+        "Validate JSON documents against a shipped schema in bulk.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group whose subcommands can be imported on first use.
+
+    Args:
+        lazy_commands: Mapping of command name to ("module:attribute", short
+            help), as in `LAZY_COMMANDS`
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*self.commands, *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name][0].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return self.commands.get(cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: Any) -> None:
+        # Lazy commands not loaded yet are listed from their registered help.
+        entries: List[Tuple[str, Any]] = []
+        for name in self.list_commands(ctx):
+            command = self.commands.get(name)
+            if command is None:
+                entries.append((name, self.lazy_commands[name][1]))
+            elif not command.hidden:
+                entries.append((name, command))
+        if not entries:
+            return
+        limit = formatter.width - 6 - max(len(name) for name, _ in entries)
+        rows = []
+        for name, item in entries:
+            if not isinstance(item, str):
+                item = item.get_short_help_str(limit)
+            elif len(item) > limit:
+                item = item[: limit - 2].rsplit(" ", 1)[0].rstrip(".,") + "..."
+            rows.append((name, item))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(version=__version__)
 def cli() -> None:
     """inspecta — local-first device inspection toolkit.
@@ -99,6 +163,8 @@ def inventory_cmd(use_sample: bool) -> None:
 
     Output: JSON with vendor, model, serial, BIOS, SKU, and other fields
     """
+    from .plugins import inventory
+
     try:
         device_info = inventory.get_inventory(use_sample=use_sample)
         print(json.dumps(device_info, indent=2))
@@ -171,6 +237,16 @@ def inventory_cmd(use_sample: bool) -> None:
         "'html' for browser-friendly HTML, 'both' for txt+pdf"
     ),
 )
+@click.option(
+    "--html-mode",
+    type=click.Choice(["auto", "single", "split"]),
+    default="auto",
+    help=(
+        "HTML layout: 'single' is one self-contained file (for archiving), "
+        "'split' keeps report.html small and loads data from report.data.js, "
+        "'auto' splits large reports"
+    ),
+)
 @click.option(
     "--with-stress",
     is_flag=True,
@@ -179,7 +255,11 @@ def inventory_cmd(use_sample: bool) -> None:
 @click.option(
     "--upload",
     default=None,
-    help=("Optional upload base URL (or /reports endpoint). Requires --token."),
+    help=(
+        "Optional upload base URL (or /reports endpoint). Requires --token. "
+        "The bundle is queued in the local upload spool and sent in the "
+        "background; the run does not wait for the network."
+    ),
 )
 @click.option(
     "--token",
@@ -217,6 +297,15 @@ def inventory_cmd(use_sample: bool) -> None:
     default=None,
     help=("Optional path to Ed25519 private key (PEM) for detached manifest signing."),
 )
+@click.option(
+    "--manifest-version",
+    type=click.Choice(["1", "2"]),
+    default="1",
+    help=(
+        "Evidence manifest format. '2' adds per-file Merkle roots and chunk "
+        "hashes for single-file and byte-range verification."
+    ),
+)
 @click.option(
     "--policy-pack",
     default=None,
@@ -273,6 +362,26 @@ def inventory_cmd(use_sample: bool) -> None:
         "stored in artifacts/full_mode_checkpoint.json (default: enabled)."
     ),
 )
+@click.option(
+    "--record",
+    "record_dir",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=None,
+    help=(
+        "Record every external command (argv, stdout, stderr, exit code, "
+        "duration) into DIR for later --replay."
+    ),
+)
+@click.option(
+    "--replay",
+    "replay_dir",
+    type=click.Path(path_type=Path, exists=True, file_okay=False),
+    default=None,
+    help=(
+        "Serve external commands from a --record capture in DIR instead of "
+        "executing them (no hardware access, no sampling delays)."
+    ),
+)
 def run(
     mode: str,
     output: Path,
@@ -284,6 +393,7 @@ def run(
     auto_open: bool,
     no_auto_open: bool,
     format: str,
+    html_mode: str,
     with_stress: bool,
     upload: str | None,
     token: str | None,
@@ -291,6 +401,7 @@ def run(
     timeout: int | None,
     dry_run: bool,
     sign_key: str | None,
+    manifest_version: str,
     policy_pack: Path | None,
     plugin_manifest: Path | None,
     plugin_keyring: Path | None,
@@ -298,6 +409,8 @@ def run(
     redaction_preset: str,
     retention_days: int | None,
     resume: bool,
+    record_dir: Path | None,
+    replay_dir: Path | None,
 ) -> None:
     """Run a complete device inspection and generate report.
 
@@ -320,6 +433,8 @@ def run(
       sudo inspecta run --mode quick --output ./out --profile gamer --verbose
       inspecta run --mode quick --output ./out --use-sample --format pdf
       inspecta run --mode quick --output ./out --use-sample --no-auto-open
+      sudo inspecta run --mode quick --output ./out --record ./capture
+      inspecta run --mode quick --output ./out --replay ./capture
 
     \b
     Requirements (for real hardware inspection):
@@ -355,7 +470,41 @@ def run(
     Note: 'full' mode currently runs an enhanced comprehensive pipeline
     that builds on quick mode with thermal stress enabled by default.
     """
+    from . import native_bridge
+    from .evidence import ArtifactIndex, EvidenceError, write_evidence_manifest
+    from .exec import command_metrics_summary, reset_command_metrics, run_command
+    from .logging_utils import setup_logging
+    from .native_probe_runner import run_smart_contract_hot_path
+    from .plugin_manifest import PluginManifestError, verify_plugin_manifest
+    from .plugin_negotiation import (
+        PluginNegotiationError,
+        negotiate_plugin_capabilities,
+    )
+    from .plugins import (
+        battery,
+        cpu_bench,
+        disk_perf,
+        inventory,
+        memtest,
+        sensors,
+        smart,
+    )
+    from .policy_pack import PolicyPackError, load_policy_pack
+    from .profiles import get_profile, is_valid_profile
+    from .redaction import apply_redaction, apply_retention_policy
+    from .replay import (
+        CommandRecorder,
+        CommandReplayer,
+        ReplayError,
+        start_recording,
+        start_replay,
+        stop_capture,
+    )
+    from .report import compose_report
+    from .report_formatter import open_file, start_report_rendering
+
     run_started_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    reset_command_metrics()
 
     if require_hardware and use_sample:
         message = (
@@ -366,6 +515,34 @@ def run(
         click.echo(message, err=True)
         raise SystemExit(20)
 
+    if record_dir is not None and replay_dir is not None:
+        logger.error("--record and --replay cannot be combined")
+        raise SystemExit(20)
+
+    if (record_dir is not None or replay_dir is not None) and use_sample:
+        logger.error("--record/--replay cannot be combined with --use-sample")
+        raise SystemExit(20)
+
+    if require_hardware and replay_dir is not None:
+        logger.error("--require-hardware cannot be combined with --replay")
+        raise SystemExit(20)
+
+    if record_dir is None and replay_dir is None:
+        # Overlap the native handshake with the validation below.
+        native_bridge.prewarm_native_capabilities()
+
+    command_capture: CommandRecorder | CommandReplayer | None = None
+    try:
+        if record_dir is not None:
+            command_capture = start_recording(record_dir)
+        elif replay_dir is not None:
+            command_capture = start_replay(replay_dir)
+    except ReplayError as exc:
+        logger.error("Command capture setup failed: %s", exc)
+        raise SystemExit(20)
+    if command_capture is not None:
+        click.get_current_context().call_on_close(stop_capture)
+
     out_dir = Path(output)
     out_dir.mkdir(parents=True, exist_ok=True)
     artifacts_dir = out_dir / "artifacts"
@@ -522,6 +699,9 @@ def run(
     out_dir.mkdir(parents=True, exist_ok=True)
     artifacts_dir = out_dir / "artifacts"
     artifacts_dir.mkdir(parents=True, exist_ok=True)
+    # Artifacts written through the index are hashed as they are written, so
+    # the evidence manifest step does not read them back.
+    artifact_index = ArtifactIndex(out_dir)
 
     checkpoint_path = artifacts_dir / "full_mode_checkpoint.json"
     checkpoint_enabled = mode == "full"
@@ -617,8 +797,8 @@ def run(
                 if result["status"] == "ok":
                     # Write raw JSON artifact
                     artifact_name = f"smart_{device_name}.json"
-                    (artifacts_dir / artifact_name).write_text(
-                        json.dumps(result["raw_json"], indent=2), encoding="utf-8"
+                    artifact_index.write_json(
+                        f"artifacts/{artifact_name}", result["raw_json"], indent=None
                     )
 
                     # Add to tests list
@@ -692,9 +872,8 @@ def run(
             smart_contract_inputs,
             prefer_native=True,
         )
-        (artifacts_dir / "native_probe_runner.json").write_text(
-            json.dumps(native_hot_path, indent=2),
-            encoding="utf-8",
+        artifact_index.write_json(
+            "artifacts/native_probe_runner.json", native_hot_path, indent=None
         )
         tests_list.append(
             {
@@ -743,10 +922,8 @@ def run(
                 use_sample=use_sample,
             )
 
-            timeline_artifact = artifacts_dir / "smart_timeline.json"
-            timeline_artifact.write_text(
-                json.dumps(timeline_result, indent=2),
-                encoding="utf-8",
+            artifact_index.write_json(
+                "artifacts/smart_timeline.json", timeline_result, indent=None
             )
             tests_list.append(
                 {
@@ -791,9 +968,8 @@ def run(
         inspector_logger.info("Step 3: Scanning battery health...")
         battery_result = battery.scan_battery(use_sample=use_sample)
         if battery_result["status"] == "ok":
-            battery_artifact = artifacts_dir / "battery.json"
-            battery_artifact.write_text(
-                json.dumps(battery_result["data"], indent=2), encoding="utf-8"
+            artifact_index.write_json(
+                "artifacts/battery.json", battery_result["data"], indent=None
             )
             tests_list.append(
                 {
@@ -850,9 +1026,8 @@ def run(
         inspector_logger.info("Step 4: Running disk performance benchmark...")
         disk_result = disk_perf.scan_disk_performance(use_sample=use_sample)
         if disk_result["status"] == "ok":
-            disk_artifact = artifacts_dir / "disk_perf.json"
-            disk_artifact.write_text(
-                json.dumps(disk_result["data"], indent=2), encoding="utf-8"
+            artifact_index.write_json(
+                "artifacts/disk_perf.json", disk_result["data"], indent=None
             )
             tests_list.append(
                 {
@@ -908,8 +1083,9 @@ def run(
                 use_sample=use_sample,
             )
 
-            io_artifact = artifacts_dir / "disk_stress.json"
-            io_artifact.write_text(json.dumps(io_stress, indent=2), encoding="utf-8")
+            artifact_index.write_json(
+                "artifacts/disk_stress.json", io_stress, indent=None
+            )
 
             tests_list.append(
                 {
@@ -949,9 +1125,8 @@ def run(
         inspector_logger.info("Step 5: Running CPU benchmark...")
         cpu_result = cpu_bench.scan_cpu_benchmark(use_sample=use_sample)
         if cpu_result["status"] == "ok":
-            cpu_artifact = artifacts_dir / "cpu_bench.json"
-            cpu_artifact.write_text(
-                json.dumps(cpu_result["data"], indent=2), encoding="utf-8"
+            artifact_index.write_json(
+                "artifacts/cpu_bench.json", cpu_result["data"], indent=None
             )
             tests_list.append(
                 {
@@ -1005,9 +1180,8 @@ def run(
         )
         if memtest_result["status"] == "ok":
             # Write memtest log artifact
-            memtest_artifact = artifacts_dir / "memtest.log"
             memtest_raw_text = memtest_result.get("raw_text", "OK\n")
-            memtest_artifact.write_text(memtest_raw_text, encoding="utf-8")
+            artifact_index.write_text("artifacts/memtest.log", memtest_raw_text)
 
             # Sprint 2: importer-based deep parsing (memtester source for now).
             imported_memtest = memtest.import_memtest_log(
@@ -1028,8 +1202,8 @@ def run(
             )
         elif memtest_result["status"] == "skip":
             # Write placeholder when memtester not available
-            (artifacts_dir / "memtest.log").write_text(
-                "Memtester not available\n", encoding="utf-8"
+            artifact_index.write_text(
+                "artifacts/memtest.log", "Memtester not available\n"
             )
             tests_list.append(
                 {
@@ -1042,9 +1216,9 @@ def run(
                 "Memory test skipped: %s", memtest_result.get("reason")
             )
         else:
-            (artifacts_dir / "memtest.log").write_text(
+            artifact_index.write_text(
+                "artifacts/memtest.log",
                 f"Error: {memtest_result.get('error', 'unknown')}\n",
-                encoding="utf-8",
             )
             tests_list.append(
                 {
@@ -1117,21 +1291,19 @@ def run(
         inspector_logger.info("Thermal sensors not available: %s", str(e))
 
     try:
-        # Write sensors CSV artifact
-        sensors_csv = artifacts_dir / "sensors.csv"
-        csv_lines = ["timestamp,sensor,temp_c"]
-
-        if use_sample or sensors_result.get("sensors"):
-            import time
-
-            timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-            for sensor in sensors_result.get("sensors", []):
-                for reading in sensor.get("readings", []):
-                    csv_lines.append(
-                        f"{timestamp},{reading['label']},{reading['temp']}"
-                    )
+        # Stream sensors CSV artifact (hashed while written)
+        with artifact_index.open("artifacts/sensors.csv") as sensors_csv:
+            sensors_csv.write("timestamp,sensor,temp_c\n")
+
+            if use_sample or sensors_result.get("sensors"):
+                import time
 
-        sensors_csv.write_text("\n".join(csv_lines) + "\n", encoding="utf-8")
+                timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                for sensor in sensors_result.get("sensors", []):
+                    for reading in sensor.get("readings", []):
+                        sensors_csv.write(
+                            f"{timestamp},{reading['label']},{reading['temp']}\n"
+                        )
 
         if sensors_result.get("max_temp"):
             tests_list.append(
@@ -1161,9 +1333,7 @@ def run(
             )
             inspector_logger.info("Thermal snapshot: No sensors available")
     except Exception as e:
-        (artifacts_dir / "sensors.csv").write_text(
-            "timestamp,sensor,temp_c\n", encoding="utf-8"
-        )
+        artifact_index.write_text("artifacts/sensors.csv", "timestamp,sensor,temp_c\n")
         tests_list.append(
             {
                 "name": "thermal_snapshot",
@@ -1231,11 +1401,10 @@ def run(
 
             # Write thermal stress CSV artifact
             if thermal_stress_result.get("samples"):
-                thermal_csv = artifacts_dir / "thermal_stress.csv"
                 csv_content = sensors.generate_thermal_stress_csv(
                     thermal_stress_result["samples"]
                 )
-                thermal_csv.write_text(csv_content, encoding="utf-8")
+                artifact_index.write_text("artifacts/thermal_stress.csv", csv_content)
 
             # Add test result
             tests_list.append(
@@ -1316,6 +1485,7 @@ def run(
         profile=profile,
         smart_status=smart_status,
         native=native_capabilities,
+        command_metrics=command_metrics_summary(),
         policy_pack_payload=loaded_policy_pack,
         plugin_manifest_verification=(
             {
@@ -1331,8 +1501,7 @@ def run(
     report = apply_redaction(report, redaction_preset)
 
     report_path = out_dir / "report.json"
-    with open(report_path, "w", encoding="utf-8") as fh:
-        json.dump(report, fh, indent=2)
+    artifact_index.write_json("report.json", report)
 
     logger.info("Report written to %s", report_path)
     inspector_logger.info("Report generated: %s", report_path)
@@ -1343,87 +1512,25 @@ def run(
         report["summary"]["grade"],
     )
 
-    # Generate human-readable report(s)
+    # Generate human-readable report(s) in the background (PDF in its own
+    # process) while the manifest inputs below are gathered.
     inspector_logger.info("Step 10: Generating human-readable report(s)...")
-    report_to_open = None
+    report_formats = [
+        fmt
+        for fmt, selected in (
+            ("txt", format in ("txt", "both")),
+            ("pdf", format in ("pdf", "both")),
+            ("html", format == "html"),
+        )
+        if selected
+    ]
+    rendering = start_report_rendering(
+        report, out_dir, report_formats, html_mode=html_mode
+    )
 
     # Determine if auto-open should be enabled
     should_auto_open = auto_open and not no_auto_open
 
-    if format in ["txt", "both"]:
-        try:
-            txt_report_path = generate_txt_report(report, out_dir)
-            logger.info("Text report written to %s", txt_report_path)
-            inspector_logger.info("Text report generated: %s", txt_report_path)
-            if report_to_open is None:
-                report_to_open = txt_report_path
-        except Exception as e:
-            logger.warning("Failed to generate text report: %s", e)
-            inspector_logger.warning("Text report generation failed: %s", e)
-
-    if format in ["pdf", "both"]:
-        try:
-            pdf_report_path = generate_pdf_report(report, out_dir)
-            if pdf_report_path:
-                logger.info("PDF report written to %s", pdf_report_path)
-                inspector_logger.info("PDF report generated: %s", pdf_report_path)
-                # Prefer PDF over TXT if both are generated
-                report_to_open = pdf_report_path
-            else:
-                logger.warning(
-                    "PDF generation skipped: reportlab not installed. "
-                    "Install with: pip install reportlab"
-                )
-                inspector_logger.warning(
-                    "PDF report generation skipped: reportlab not available"
-                )
-        except Exception as e:
-            logger.warning("Failed to generate PDF report: %s", e)
-            inspector_logger.warning("PDF report generation failed: %s", e)
-
-    if format == "html":
-        try:
-            html_report_path = generate_html_report(report, out_dir)
-            logger.info("HTML report written to %s", html_report_path)
-            inspector_logger.info("HTML report generated: %s", html_report_path)
-            report_to_open = html_report_path
-        except Exception as e:
-            logger.warning("Failed to generate HTML report: %s", e)
-            inspector_logger.warning("HTML report generation failed: %s", e)
-
-    # Auto-open the report if requested
-    if should_auto_open and report_to_open:
-        inspector_logger.info("Opening report: %s", report_to_open)
-        if open_file(report_to_open):
-            logger.info("Report opened successfully: %s", report_to_open)
-            inspector_logger.info("Report opened in default application")
-        else:
-            logger.warning(
-                "Failed to open report automatically. Please open manually: %s",
-                report_to_open,
-            )
-            inspector_logger.warning("Failed to auto-open report")
-
-    if upload and token:
-        inspector_logger.info("Step 11: Uploading report bundle (opt-in)...")
-        try:
-            upload_result = upload_report_bundle(
-                upload_url=upload,
-                token=token,
-                output_dir=out_dir,
-                metadata={
-                    "mode": mode,
-                    "profile": profile,
-                    "use_sample": use_sample,
-                    "agent_version": __version__,
-                },
-            )
-            inspector_logger.info("Upload successful: %s", upload_result)
-            logger.info("Upload successful (status=%s)", upload_result.get("status"))
-        except UploadError as e:
-            inspector_logger.warning("Upload failed: %s", str(e))
-            logger.warning("Upload failed: %s", str(e))
-
     inspector_logger.info("Step 12: Generating evidence manifest...")
     evidence_candidates: list[str] = []
     # Exclude agent.log since it's still being written to by the logger
@@ -1434,28 +1541,15 @@ def run(
             if not p.name.endswith(".log")
         ]
     )
-
-    txt_report = out_dir / "report.txt"
-    pdf_report = out_dir / "report.pdf"
-    html_report = out_dir / "report.html"
-    for extra in (txt_report, pdf_report, html_report):
-        if extra.exists() and extra.is_file():
-            evidence_candidates.append(str(extra.relative_to(out_dir)))
-
-    # Sprint 6 policy: always include report.json in manifest coverage.
-    evidence_candidates.append("report.json")
+    if manifest_version == "1":
+        # Artifacts are final by now: hash them while the renderers run.
+        artifact_index.index_files(evidence_candidates)
 
     # Immutable run metadata for forensic reproducibility.
     def _tool_version(tool: str, args: list[str] | None = None) -> str | None:
         command = [tool] + (args or ["--version"])
         try:
-            res = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=False,
-            )
+            res = run_command(command, timeout=5, text=True)
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
             return None
 
@@ -1494,6 +1588,38 @@ def run(
             "winsat": _tool_version("winsat", ["/?"]),
         },
     }
+    if command_capture is not None:
+        run_metadata["command_capture"] = command_capture.summary()
+
+    report_to_open = _collect_rendered_reports(
+        rendering, out_dir, artifact_index, inspector_logger
+    )
+
+    # Auto-open the report if requested
+    if should_auto_open and report_to_open:
+        inspector_logger.info("Opening report: %s", report_to_open)
+        if open_file(report_to_open):
+            logger.info("Report opened successfully: %s", report_to_open)
+            inspector_logger.info("Report opened in default application")
+        else:
+            logger.warning(
+                "Failed to open report automatically. Please open manually: %s",
+                report_to_open,
+            )
+            inspector_logger.warning("Failed to auto-open report")
+
+    txt_report = out_dir / "report.txt"
+    pdf_report = out_dir / "report.pdf"
+    html_report = out_dir / "report.html"
+    html_data = out_dir / "report.data.js"
+    for extra in (txt_report, pdf_report, html_report, html_data):
+        if extra.exists() and extra.is_file():
+            evidence_candidates.append(str(extra.relative_to(out_dir)))
+
+    # Sprint 6 policy: always include report.json in manifest coverage.
+    # All renderers have finished, so report.json is rewritten for the last
+    # time below, before the manifest hashes it.
+    evidence_candidates.append("report.json")
 
     sign_key_path = Path(sign_key) if sign_key else None
 
@@ -1507,8 +1633,7 @@ def run(
     report["evidence"]["signed"] = bool(sign_key_path)
     report["run_metadata"] = run_metadata
 
-    with open(report_path, "w", encoding="utf-8") as fh:
-        json.dump(report, fh, indent=2)
+    artifact_index.write_json("report.json", report)
 
     try:
         manifest_rel_path, manifest_sha256 = write_evidence_manifest(
@@ -1517,6 +1642,8 @@ def run(
             agent_version=__version__,
             run_metadata=run_metadata,
             sign_key_path=sign_key_path,
+            artifact_index=artifact_index,
+            manifest_version=int(manifest_version),
         )
     except EvidenceError as exc:
         inspector_logger.error("Evidence manifest signing failed: %s", exc)
@@ -1534,6 +1661,34 @@ def run(
         manifest_sha256,
     )
 
+    if upload and token:
+        # Enqueue only: the run never waits on the network. A detached
+        # `inspecta upload flush` drains the spool with retries.
+        from .upload_spool import SpoolError, UploadSpool, spawn_background_flush
+
+        inspector_logger.info("Step 13: Queueing report bundle for upload (opt-in)...")
+        try:
+            queued = UploadSpool().enqueue(
+                out_dir,
+                upload_url=upload,
+                manifest_sha256=manifest_sha256,
+                metadata={
+                    "mode": mode,
+                    "profile": profile,
+                    "use_sample": use_sample,
+                    "agent_version": __version__,
+                },
+            )
+            inspector_logger.info("Upload %s: %s", queued["status"], queued["job"])
+            logger.info("Upload %s (manifest %s)", queued["status"], manifest_sha256)
+            if queued["status"] == "queued" and not spawn_background_flush(token):
+                logger.warning(
+                    "Background upload did not start; run `inspecta upload flush`"
+                )
+        except SpoolError as e:
+            inspector_logger.warning("Upload enqueue failed: %s", str(e))
+            logger.warning("Upload enqueue failed: %s", str(e))
+
     inspector_logger.info("=" * 60)
     inspector_logger.info("Inspection complete. Log file: %s", log_file)
     inspector_logger.info("=" * 60)
@@ -1565,17 +1720,78 @@ def run(
     default="html",
     help="Format to generate from report.json.",
 )
-def report_cmd(report_file: Path, open_report: bool, report_format: str) -> None:
-    """Generate/open human-readable outputs from an existing report.json."""
-    if report_file.suffix.lower() != ".json":
-        raise click.BadParameter("report_file must be a JSON file")
+@click.option(
+    "--html-mode",
+    type=click.Choice(["auto", "single", "split"]),
+    default="auto",
+    help=(
+        "HTML layout: 'single' is one self-contained file (for archiving), "
+        "'split' keeps report.html small and loads data from report.data.js, "
+        "'auto' splits large reports"
+    ),
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_option",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=None,
+    help=(
+        "Directory for the generated files (default: beside report.json, or "
+        "<archive>.rendered/ for an archive). Must not be an evidence bundle."
+    ),
+)
+def report_cmd(
+    report_file: Path,
+    open_report: bool,
+    report_format: str,
+    html_mode: str,
+    output_option: Path | None,
+) -> None:
+    """Generate/open human-readable outputs from an existing report.json.
 
-    with open(report_file, encoding="utf-8") as fh:
-        report = migrate_legacy_report(json.load(fh))
+    REPORT_FILE may also be a `.inspecta` archive; its report.json is read
+    in place and outputs are written to `<archive>.rendered/`. A separate
+    output directory must not contain artifacts/manifest.json, so rendering
+    never overwrites manifest-covered files of another bundle.
+    """
+    from .bundle_archive import BundleArchive, BundleArchiveError, is_bundle_archive
+    from .report_formatter import (
+        generate_html_report,
+        generate_pdf_report,
+        generate_txt_report,
+        open_file,
+    )
+    from .schema_compat import ensure_supported_report_version, migrate_legacy_report
 
+    if is_bundle_archive(report_file):
+        try:
+            with BundleArchive(report_file) as archive:
+                raw_report = jsonio.loads(archive.read_text("report.json"))
+        except (BundleArchiveError, json.JSONDecodeError) as exc:
+            raise click.BadParameter(f"Cannot read report from archive: {exc}")
+        output_dir = output_option or report_file.with_suffix(".rendered")
+    elif report_file.suffix.lower() != ".json":
+        raise click.BadParameter("report_file must be a JSON file or .inspecta archive")
+    else:
+        raw_report = jsonio.loads(report_file.read_text(encoding="utf-8"))
+        output_dir = output_option or report_file.parent
+
+    # Only re-rendering a report.json in place may touch its own bundle.
+    if is_bundle_archive(report_file) or output_dir.resolve() != (
+        report_file.parent.resolve()
+    ):
+        if (output_dir / "artifacts" / "manifest.json").is_file():
+            raise click.BadParameter(
+                f"{output_dir} is an evidence bundle; rendering into it would "
+                "overwrite manifest-covered files",
+                param_hint="--output",
+            )
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    report = migrate_legacy_report(raw_report)
     ensure_supported_report_version(str(report.get("report_version", "0.0.0")))
 
-    output_dir = report_file.parent
     generated_path: Path | None = None
 
     if report_format == "txt":
@@ -1587,7 +1803,7 @@ def report_cmd(report_file: Path, open_report: bool, report_format: str) -> None
                 "PDF generation unavailable. Install optional deps: reportlab"
             )
     elif report_format == "html":
-        generated_path = generate_html_report(report, output_dir)
+        generated_path = generate_html_report(report, output_dir, mode=html_mode)
 
     click.echo(f"Generated: {generated_path}")
 
@@ -1599,6 +1815,37 @@ def report_cmd(report_file: Path, open_report: bool, report_format: str) -> None
         click.echo(f"Opened: {generated_path}")
 
 
+@cli.command("pack")
+@click.argument(
+    "bundle_dir", type=click.Path(path_type=Path, exists=True, file_okay=False)
+)
+@click.option(
+    "--output",
+    "-o",
+    "archive_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Archive path (default: BUNDLE_DIR.inspecta next to the bundle).",
+)
+@click.option(
+    "--compress",
+    is_flag=True,
+    help="Deflate members (smaller, but reads are no longer plain slices).",
+)
+def pack_cmd(bundle_dir: Path, archive_path: Path | None, compress: bool) -> None:
+    """Pack a bundle directory into a single-file `.inspecta` archive.
+
+    The archive can be passed directly to `verify`, `report` and upload.
+    """
+    from .bundle_archive import BundleArchiveError, pack_bundle
+
+    try:
+        written = pack_bundle(bundle_dir, archive_path, compress=compress)
+    except BundleArchiveError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(f"Packed: {written}")
+
+
 @cli.command("capabilities")
 @click.option(
     "--surface",
@@ -1614,6 +1861,8 @@ def report_cmd(report_file: Path, open_report: bool, report_format: str) -> None
 )
 def capabilities_cmd(surface: str, as_json: bool) -> None:
     """Show versioned capability matrix data for CLI/Desktop/Mobile surfaces."""
+    from .capability_matrix import get_surface_capabilities, load_capability_matrix
+
     matrix = load_capability_matrix()
     payload = get_surface_capabilities(surface)
 
@@ -1647,11 +1896,82 @@ def capabilities_cmd(surface: str, as_json: bool) -> None:
     default=None,
     help="Optional Ed25519 public key (PEM) for signed manifest verification.",
 )
+@click.option(
+    "--cache",
+    "use_cache",
+    is_flag=True,
+    help="Reuse digests of files unchanged since a previous verification.",
+)
+@click.option(
+    "--cache-file",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Verification cache location (implies --cache).",
+)
+@click.option(
+    "--cache-max-entries",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ENTRIES,
+    show_default=True,
+    help="Cache entries kept across runs; entries used by this run are always " "kept.",
+)
+@click.option(
+    "--paranoid",
+    is_flag=True,
+    help="Rehash every file even when the cache has a matching entry.",
+)
+@click.option(
+    "--sample-rate",
+    type=click.FloatRange(0.0, 1.0),
+    default=DEFAULT_SAMPLE_RATE,
+    show_default=True,
+    help="Fraction of cache hits rehashed anyway to detect silent corruption.",
+)
+@click.option(
+    "--recursive",
+    is_flag=True,
+    help="Treat BUNDLE_DIR as a store root and verify every bundle under it.",
+)
+@click.option(
+    "--file",
+    "file_rel",
+    default=None,
+    help="Verify only this bundle-relative file (manifest v2).",
+)
+@click.option(
+    "--range",
+    "byte_range",
+    default=None,
+    metavar="START:END",
+    help="With --file, verify only bytes START..END (end exclusive).",
+)
+@click.option(
+    "--root",
+    "expected_root",
+    default=None,
+    help="Trusted manifest Merkle root to check --file against.",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes for --recursive (default: CPU count).",
+)
 def verify_cmd(
     bundle_dir: Path,
     manifest: str,
     as_json: bool,
     public_key: str | None,
+    use_cache: bool,
+    cache_file: Path | None,
+    cache_max_entries: int,
+    paranoid: bool,
+    sample_rate: float,
+    recursive: bool,
+    processes: int | None,
+    file_rel: str | None,
+    byte_range: str | None,
+    expected_root: str | None,
 ) -> None:
     """Verify evidence integrity of a report bundle.
 
@@ -1663,19 +1983,68 @@ def verify_cmd(
       inspecta verify ./output
       inspecta verify ./output --manifest artifacts/manifest.json
       inspecta verify ./output --json
+      inspecta verify ./output --cache
+      inspecta verify ./output --cache --paranoid
+      inspecta verify --recursive ./archive --processes 8
+      inspecta verify --recursive ./archive --cache
+      inspecta verify ./output --file artifacts/disk.img --range 0:1048576
+      inspecta verify ./run-2026-01-01.inspecta
+
+    BUNDLE_DIR may also be a packed `.inspecta` archive; it is verified
+    straight from the archive without extracting.
+
+    With --recursive, one JSON line is streamed per bundle as it completes,
+    followed by an aggregate summary (a final JSON line with --json). The
+    exit code is the worst bundle's code.
 
     Exit codes:
       0 - All files intact, no tampering detected
       1 - Hash mismatch or integrity failure
       2 - Bundle or manifest not found
     """
-    if not bundle_dir.is_dir():
+    from .bundle_archive import is_bundle_archive
+    from .evidence import verify_evidence_manifest
+
+    if is_bundle_archive(bundle_dir):
+        if recursive or file_rel is not None or use_cache or cache_file is not None:
+            raise click.UsageError(
+                "--recursive, --file and --cache need a bundle directory, "
+                "not an archive."
+            )
+    elif not bundle_dir.is_dir():
         raise click.BadParameter(f"Bundle directory not found: {bundle_dir}")
 
+    if file_rel is None and (byte_range is not None or expected_root is not None):
+        raise click.UsageError("--range and --root require --file.")
+    if file_rel is not None:
+        _verify_single_file(
+            bundle_dir, manifest, file_rel, byte_range, expected_root, as_json
+        )
+
+    cache = (
+        VerificationCache(cache_file, max_entries=cache_max_entries)
+        if use_cache or cache_file is not None
+        else None
+    )
+    if recursive:
+        _verify_recursive(
+            bundle_dir,
+            manifest,
+            as_json,
+            Path(public_key) if public_key else None,
+            processes,
+            cache,
+            paranoid,
+            sample_rate,
+        )
+
     result = verify_evidence_manifest(
         bundle_dir,
         manifest,
         public_key_path=Path(public_key) if public_key else None,
+        cache=cache,
+        paranoid=paranoid,
+        sample_rate=sample_rate,
     )
 
     if as_json:
@@ -1684,6 +2053,15 @@ def verify_cmd(
         click.echo(f"Bundle:            {bundle_dir}")
         click.echo(f"Manifest:          {manifest}")
         click.echo(f"Files checked:     {result.get('checked', 0)}")
+        if "cache" in result:
+            cache_stats = result["cache"]
+            click.echo(
+                f"Cache:             {cache_stats['hits']} reused, "
+                f"{cache_stats['hashed']} hashed "
+                f"({cache_stats['sampled']} sampled)"
+            )
+            for path in cache_stats["corrupted"]:
+                click.echo(f"  ⚠ changed without stat change: {path}")
         click.echo(f"Integrity status:  {'✓ OK' if result.get('ok') else '✗ FAILED'}")
         click.echo(
             "Result code:       "
@@ -1709,6 +2087,116 @@ def verify_cmd(
     raise SystemExit(int(result.get("exit_code", 1)))
 
 
+def _parse_byte_range(value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    try:
+        start_text, end_text = value.split(":", 1)
+        return int(start_text), int(end_text)
+    except ValueError as exc:
+        raise click.BadParameter(
+            "Expected START:END byte offsets.", param_hint="--range"
+        ) from exc
+
+
+def _verify_single_file(
+    bundle_dir: Path,
+    manifest: str,
+    file_rel: str,
+    byte_range: str | None,
+    expected_root: str | None,
+    as_json: bool,
+) -> None:
+    """Verify one file (or range) against a v2 manifest root and exit."""
+    from .evidence import verify_manifest_file
+
+    result = verify_manifest_file(
+        bundle_dir,
+        manifest,
+        file_rel,
+        byte_range=_parse_byte_range(byte_range),
+        expected_root=expected_root,
+    )
+    if as_json:
+        click.echo(json.dumps(result, indent=2, default=str))
+    else:
+        click.echo(f"File:              {file_rel}")
+        if result.get("range"):
+            start, end = result["range"]
+            click.echo(f"Range:             {start}..{end}")
+        click.echo(f"Chunks checked:    {result.get('chunks_checked', 0)}")
+        click.echo(f"Integrity status:  {'✓ OK' if result.get('ok') else '✗ FAILED'}")
+        if result.get("bad_chunks"):
+            click.echo(f"Bad chunks:        {result['bad_chunks']}")
+        if result.get("error"):
+            click.echo(f"Error:             {result['error']}")
+        click.echo(
+            "Result code:       "
+            f"{result.get('exit_code')} ({result.get('exit_reason')})"
+        )
+    raise SystemExit(int(result.get("exit_code", 1)))
+
+
+def _verify_recursive(
+    root: Path,
+    manifest: str,
+    as_json: bool,
+    public_key_path: Path | None,
+    processes: int | None,
+    cache: VerificationCache | None = None,
+    paranoid: bool = False,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+) -> None:
+    """Stream per-bundle results for `verify --recursive` and exit."""
+    from .bulk_verify import (
+        BulkSummary,
+        discover_bundles,
+        load_public_key,
+        verify_bundles,
+    )
+
+    public_key_pem = None
+    if public_key_path is not None:
+        try:
+            public_key_pem = public_key_path.read_bytes()
+            load_public_key(public_key_pem)
+        except (OSError, ValueError) as exc:
+            raise click.BadParameter(
+                f"Cannot load public key: {exc}", param_hint="--public-key"
+            ) from exc
+
+    started = time.perf_counter()
+    totals = BulkSummary()
+    for result in verify_bundles(
+        discover_bundles(root, manifest),
+        manifest_rel=manifest,
+        public_key_pem=public_key_pem,
+        processes=processes,
+        cache=cache,
+        paranoid=paranoid,
+        sample_rate=sample_rate,
+    ):
+        totals.add(result)
+        click.echo(json.dumps(result, sort_keys=True, default=str))
+
+    summary = totals.to_dict(time.perf_counter() - started)
+    if as_json:
+        click.echo(json.dumps(summary, sort_keys=True))
+    else:
+        click.echo(
+            f"Bundles: {summary['bundles']} "
+            f"({summary['verified']} verified, {summary['failed']} failed)",
+            err=True,
+        )
+        click.echo(
+            f"Throughput: {summary['bundles_per_sec']} bundles/s, "
+            f"{summary['mib_per_sec']} MiB/s "
+            f"over {summary['elapsed_seconds']:.2f}s",
+            err=True,
+        )
+    raise SystemExit(int(summary["exit_code"]))
+
+
 @cli.command("audit")
 @click.argument("bundle_dir", type=click.Path(path_type=Path, exists=True))
 @click.option(
@@ -1737,12 +2225,15 @@ def audit_cmd(
 
     Combines integrity verification with deterministic-entry checks and
     re-index comparison to ensure a bundle can be reproduced consistently.
+    Each listed file is hashed once and shared by all checks.
 
     Exit codes:
       0 - Reproducible and integrity verified
       1 - Integrity or reproducibility checks failed
       2 - Bundle or manifest not found / invalid manifest JSON
     """
+    from .evidence import audit_evidence_bundle
+
     if not bundle_dir.is_dir():
         raise click.BadParameter(f"Bundle directory not found: {bundle_dir}")
 
@@ -1771,6 +2262,11 @@ def audit_cmd(
             "Re-indexed parity:       "
             f"{'✓ OK' if result.get('reindexed_entries_match') else '✗ FAILED'}"
         )
+        if "bytes_hashed" in result:
+            click.echo(
+                "Bytes hashed:            "
+                f"{result['bytes_hashed']} in {result['elapsed_seconds']:.3f}s"
+            )
         click.echo(
             "Result code:             "
             f"{result.get('exit_code')} ({result.get('exit_reason')})"
@@ -1795,6 +2291,8 @@ def audit_cmd(
 )
 def plugin_verify_cmd(manifest_file: Path, keyring: Path, as_json: bool) -> None:
     """Verify signed plugin manifest against schema + keyring."""
+    from .plugin_manifest import PluginManifestError, verify_plugin_manifest
+
     try:
         result = verify_plugin_manifest(
             manifest_path=manifest_file,
@@ -1846,6 +2344,11 @@ def plugin_negotiate_cmd(
     as_json: bool,
 ) -> None:
     """Negotiate plugin compatibility and capability policy for a surface."""
+    from .plugin_negotiation import (
+        PluginNegotiationError,
+        negotiate_plugin_capabilities,
+    )
+
     try:
         manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
@@ -1896,6 +2399,8 @@ def plugin_negotiate_cmd(
 )
 def policy_export_cmd(policy_file: Path, output: Path) -> None:
     """Validate and export normalized policy-pack JSON."""
+    from .policy_pack import PolicyPackError, load_policy_pack
+
     try:
         payload = load_policy_pack(policy_file)
     except PolicyPackError as exc:
@@ -1921,6 +2426,8 @@ def policy_export_cmd(policy_file: Path, output: Path) -> None:
 )
 def policy_import_cmd(policy_file: Path, output_dir: Path, force: bool) -> None:
     """Import a validated policy-pack into a target directory."""
+    from .policy_pack import PolicyPackError, load_policy_pack
+
     try:
         payload = load_policy_pack(policy_file)
     except PolicyPackError as exc:
@@ -2040,10 +2547,53 @@ def _generate_dry_run_plan(
     return "\n".join(lines)
 
 
+def _collect_rendered_reports(
+    rendering: dict[str, Any],
+    out_dir: Path,
+    artifact_index: Any,
+    inspector_logger: logging.Logger,
+) -> Path | None:
+    """Wait for the report renderers, logging and hashing each as it finishes.
+
+    Returns the report to auto-open: PDF, else HTML, else TXT.
+    """
+    from concurrent.futures import as_completed
+
+    names = {future: fmt for fmt, future in rendering.items()}
+    rendered: dict[str, Path] = {}
+    for future in as_completed(names):
+        fmt = names[future]
+        try:
+            path = future.result()
+        except Exception as e:
+            label = {"txt": "text", "pdf": "PDF", "html": "HTML"}[fmt]
+            logger.warning("Failed to generate %s report: %s", label, e)
+            inspector_logger.warning("%s report generation failed: %s", label, e)
+            continue
+        if path is None:
+            logger.warning(
+                "PDF generation skipped: reportlab not installed. "
+                "Install with: pip install reportlab"
+            )
+            inspector_logger.warning(
+                "PDF report generation skipped: reportlab not available"
+            )
+            continue
+        label = {"txt": "Text", "pdf": "PDF", "html": "HTML"}[fmt]
+        logger.info("%s report written to %s", label, path)
+        inspector_logger.info("%s report generated: %s", label, path)
+        rendered[fmt] = path
+        # Final once its renderer returns: hash it while the others finish.
+        artifact_index.index_files([str(Path(path).relative_to(out_dir))])
+    for fmt in ("pdf", "html", "txt"):
+        if fmt in rendered:
+            return rendered[fmt]
+    return None
+
+
 def _load_full_mode_checkpoint(checkpoint_path: Path) -> dict[str, Any] | None:
     try:
-        with open(checkpoint_path, encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = jsonio.loads(checkpoint_path.read_text(encoding="utf-8"))
         if not isinstance(data, dict):
             return None
         data.setdefault("completed_steps", [])
@@ -2070,8 +2620,8 @@ def _save_full_mode_checkpoint(
     state.update(state_updates)
 
     checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(checkpoint_path, "w", encoding="utf-8") as fh:
-        json.dump(checkpoint_data, fh, indent=2)
+    # Machine-only state: compact JSON.
+    checkpoint_path.write_bytes(jsonio.dump_bytes(checkpoint_data))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,375 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Fleet-level commands over stored reports.
+
+`rescore`, `index`, `query`, `export` and `validate` work on many
+report.json files at once without re-running probes.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+import click
+
+from .policy_pack import PolicyPackError, load_policy_pack
+from .profiles import is_valid_profile
+from .report_export import (
+    DEFAULT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    ReportExportError,
+    discover_export_sources,
+    export_reports,
+)
+from .report_index import GROUP_BY_FIELDS, ReportIndex, ReportIndexError
+from .rescore import discover_reports, rescore_reports, summarize_rescore
+from .schema_registry import SchemaRegistryError, validate_files
+
+
+@click.command("rescore")
+@click.argument("root", type=click.Path(path_type=Path, exists=True))
+@click.option(
+    "--policy-pack",
+    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+    default=None,
+    help="Policy pack to evaluate (stored policy results are not reused).",
+)
+@click.option(
+    "--profile",
+    default=None,
+    help="Scoring profile override (default: each report's own profile).",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes (default: CPU count).",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Write the JSONL delta here instead of stdout.",
+)
+@click.option(
+    "--write-summaries",
+    is_flag=True,
+    help="Also write rescore.json beside each report.json (never modifies it).",
+)
+@click.option(
+    "--changed-only",
+    is_flag=True,
+    help="Only emit records whose score, grade or policy status changed.",
+)
+def rescore_cmd(
+    root: Path,
+    policy_pack: Path | None,
+    profile: str | None,
+    processes: int | None,
+    output_path: Path | None,
+    write_summaries: bool,
+    changed_only: bool,
+) -> None:
+    """Recompute scores and policy results for stored reports under ROOT.
+
+    Re-runs scoring, policy, reliability and anomaly stages on each stored
+    report's `tests` without re-running probes, and emits one JSONL delta
+    record per report (before/after score, grade and policy status). A
+    summary goes to stderr. Exit codes: 0 ok, 20 some reports failed.
+    """
+    if profile is not None and not is_valid_profile(profile):
+        raise click.BadParameter(f"Unknown profile: {profile}", param_hint="--profile")
+    pack_payload = None
+    if policy_pack is not None:
+        try:
+            pack_payload = load_policy_pack(policy_pack)
+        except PolicyPackError as exc:
+            raise click.BadParameter(str(exc), param_hint="--policy-pack")
+
+    reports = discover_reports(root)
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        sink = (
+            stack.enter_context(output_path.open("w", encoding="utf-8"))
+            if output_path is not None
+            else None
+        )
+
+        outcomes = []
+        for result in rescore_reports(
+            reports,
+            policy_pack=pack_payload,
+            profile=profile,
+            processes=processes,
+            write_summaries=write_summaries,
+        ):
+            # Keep only the counters; the full records are streamed out.
+            outcomes.append({"ok": result.get("ok"), "changed": result.get("changed")})
+            if changed_only and result.get("ok") and not result.get("changed"):
+                continue
+            line = json.dumps(result, sort_keys=True, default=str)
+            if sink is not None:
+                sink.write(line + "\n")
+            else:
+                click.echo(line)
+
+    summary = summarize_rescore(outcomes, time.perf_counter() - started)
+    click.echo(
+        f"Reports: {summary['reports']} ({summary['changed']} changed, "
+        f"{summary['errors']} errors) in {summary['elapsed_seconds']:.2f}s",
+        err=True,
+    )
+    raise SystemExit(20 if summary["errors"] else 0)
+
+
+_index_db_option = click.option(
+    "--db",
+    "db_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Index database (default: per-user data directory).",
+)
+
+
+@click.command("index")
+@click.argument("root", type=click.Path(path_type=Path, exists=True))
+@_index_db_option
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON.")
+def index_cmd(root: Path, db_path: Path | None, as_json: bool) -> None:
+    """Build or incrementally update the SQLite report index for ROOT.
+
+    Indexes metadata, device identity, scores, per-test metrics and
+    anomalies of every report.json under ROOT. Unchanged files (same mtime
+    and size) are skipped and reports removed from ROOT are dropped.
+    Exit codes: 0 ok, 10 some reports could not be read, 30 index unusable.
+    """
+    try:
+        with ReportIndex(db_path) as index:
+            summary = index.update(root)
+            db_location = index.path
+    except (ReportIndexError, sqlite3.Error) as exc:
+        click.echo(f"Error: {exc}", err=True)
+        raise SystemExit(30)
+
+    if as_json:
+        click.echo(json.dumps({"db": str(db_location), **summary}, indent=2))
+    else:
+        click.echo(f"Index: {db_location}")
+        click.echo(
+            f"Scanned {summary['scanned']}: {summary['added']} added, "
+            f"{summary['updated']} updated, {summary['unchanged']} unchanged, "
+            f"{summary['removed']} removed, {summary['errors']} errors "
+            f"in {summary['elapsed_seconds']:.2f}s"
+        )
+        for message in summary["error_messages"]:
+            click.echo(f"  {message}", err=True)
+    raise SystemExit(10 if summary["errors"] else 0)
+
+
+@click.command("query")
+@_index_db_option
+@click.option("--grade", default=None, help="Only reports with this grade.")
+@click.option("--profile", default=None, help="Only reports scored for this profile.")
+@click.option("--min-score", type=int, default=None, help="Minimum overall score.")
+@click.option("--max-score", type=int, default=None, help="Maximum overall score.")
+@click.option(
+    "--since", default=None, help="Generated at or after (ISO date, e.g. 2026-10-01)."
+)
+@click.option("--until", default=None, help="Generated before (ISO date).")
+@click.option(
+    "--device", default=None, help="Substring of device vendor, model or serial."
+)
+@click.option(
+    "--metric",
+    "metrics",
+    multiple=True,
+    help="Per-test metric filter METRIC OP VALUE, e.g. nvme_percentage_used>=80 "
+    "(repeatable; all must match).",
+)
+@click.option(
+    "--test",
+    default=None,
+    help="Only match --metric in tests whose name matches this glob.",
+)
+@click.option(
+    "--anomaly-severity", default=None, help="Only reports with such an anomaly."
+)
+@click.option(
+    "--group-by",
+    type=click.Choice(sorted(GROUP_BY_FIELDS)),
+    default=None,
+    help="Aggregate matching reports per group instead of listing them.",
+)
+@click.option("--limit", type=click.IntRange(min=1), default=None)
+@click.option("--json", "as_json", is_flag=True, help="Print rows as JSON lines.")
+def query_cmd(
+    db_path: Path | None,
+    group_by: str | None,
+    limit: int | None,
+    as_json: bool,
+    **filters: Any,
+) -> None:
+    """Search or aggregate reports in the index built by `inspecta index`.
+
+    Example: reports with NVMe wear of at least 80% this month:
+
+      inspecta query --metric nvme_percentage_used>=80 --since 2026-10-01
+    """
+    filters["metrics"] = list(filters["metrics"])
+    try:
+        with ReportIndex(db_path) as index:
+            if group_by is not None:
+                rows = index.aggregate(group_by, **filters)
+            else:
+                rows = index.query(limit=limit, **filters)
+    except ReportIndexError as exc:
+        raise click.UsageError(str(exc))
+
+    if as_json:
+        for row in rows:
+            click.echo(json.dumps(row, sort_keys=True))
+        return
+    if group_by is not None:
+        for row in rows:
+            click.echo(
+                f"{row[group_by] or '-'}: {row['reports']} reports, "
+                f"avg {row['avg_score']}, min {row['min_score']}, "
+                f"max {row['max_score']}"
+            )
+        return
+    for row in rows:
+        device = " ".join(str(row[key]) for key in ("vendor", "model") if row[key])
+        # Indexed columns are NULL when a report lacks the value.
+        score, grade, generated_at = (
+            "-" if row[key] is None else row[key]
+            for key in ("overall_score", "grade", "generated_at")
+        )
+        click.echo(
+            f"{generated_at}  {score:>3} {grade:<9}  {device or '-'}  {row['path']}"
+        )
+    click.echo(f"{len(rows)} reports", err=True)
+
+
+@click.command("export")
+@click.argument("root", type=click.Path(path_type=Path, exists=True))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(EXPORT_FORMATS),
+    default="csv",
+    show_default=True,
+    help="Output format (parquet requires pyarrow).",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    required=True,
+    help="Destination file.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Rows buffered per write.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON.")
+def export_cmd(
+    root: Path, fmt: str, output_path: Path, batch_size: int, as_json: bool
+) -> None:
+    """Export reports under ROOT as a flat table, one row per report.
+
+    ROOT may be a report.json, a .inspecta archive or a directory of either.
+    Tests' data, scores and summary are flattened into stable columns
+    (`tests.<name>.status`, `tests.<name>.data.<field>`, `scores.<category>`,
+    `summary.<field>`).
+    Exit codes: 0 ok, 10 some reports could not be read, 30 export failed.
+    """
+    try:
+        summary = export_reports(
+            discover_export_sources(root), output_path, fmt=fmt, batch_size=batch_size
+        )
+    except ReportExportError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        raise SystemExit(30)
+
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+    else:
+        click.echo(
+            f"Exported {summary['rows']} reports x {summary['columns']} columns "
+            f"to {summary['output']} ({summary['errors']} errors) "
+            f"in {summary['elapsed_seconds']:.2f}s"
+        )
+        for message in summary["error_messages"]:
+            click.echo(f"  {message}", err=True)
+    raise SystemExit(10 if summary["errors"] else 0)
+
+
+@click.command("validate")
+@click.argument(
+    "paths", nargs=-1, required=True, type=click.Path(path_type=Path, exists=True)
+)
+@click.option(
+    "--schema",
+    "schema_name",
+    default="report",
+    show_default=True,
+    help="Schema name (report, policy-pack, plugin-manifest).",
+)
+@click.option(
+    "--schema-version",
+    default=None,
+    help="Schema version or major version (default: newest).",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes (default: CPU count).",
+)
+@click.option(
+    "--json", "as_json", is_flag=True, help="Emit one JSON line per document."
+)
+def validate_cmd(
+    paths: tuple[Path, ...],
+    schema_name: str,
+    schema_version: str | None,
+    processes: int | None,
+    as_json: bool,
+) -> None:
+    """Validate JSON documents against a shipped schema in bulk.
+
+    Directories are searched for report.json files. The schema validator is
+    built once per worker process. Exit codes: 0 all valid, 20 some invalid.
+    """
+    documents: list[Path] = []
+    for path in paths:
+        documents.extend(discover_reports(path) if path.is_dir() else [path])
+
+    total = invalid = 0
+    try:
+        for result in validate_files(
+            documents, schema_name, version=schema_version, processes=processes
+        ):
+            total += 1
+            invalid += not result["ok"]
+            if as_json:
+                click.echo(json.dumps(result, sort_keys=True))
+            elif not result["ok"]:
+                click.echo(f"INVALID {result['path']}")
+                for message in result["errors"]:
+                    click.echo(f"  {message}")
+    except SchemaRegistryError as exc:
+        raise click.BadParameter(str(exc), param_hint="--schema")
+
+    click.echo(f"Validated {total} documents: {invalid} invalid", err=True)
+    raise SystemExit(20 if invalid else 0)
@@ -0,0 +1,189 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""`inspecta upload` commands: manage the offline upload spool."""
+
+from __future__ import annotations
+
+import json
+from functools import partial
+from pathlib import Path
+
+import click
+
+from .upload_spool import (
+    DEFAULT_FLUSH_WORKERS,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_INFLIGHT_BYTES,
+    DEFAULT_MAX_WAIT_SECONDS,
+    TOKEN_ENV_VAR,
+    SpoolError,
+    UploadSpool,
+    drain_spool,
+    flush_spool,
+)
+
+
+@click.group("upload")
+def upload_group() -> None:
+    """Manage the offline report upload spool."""
+
+
+_spool_dir_option = click.option(
+    "--spool-dir",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=None,
+    help="Upload spool directory (default: per-user data directory).",
+)
+
+
+@upload_group.command("enqueue")
+@click.argument("bundle", type=click.Path(path_type=Path, exists=True))
+@click.option(
+    "--upload",
+    "upload_url",
+    required=True,
+    help="Upload base URL (or /reports endpoint).",
+)
+@_spool_dir_option
+def upload_enqueue_cmd(bundle: Path, upload_url: str, spool_dir: Path | None) -> None:
+    """Queue a finished bundle directory or `.inspecta` archive for upload."""
+    try:
+        queued = UploadSpool(spool_dir).enqueue(bundle, upload_url=upload_url)
+    except SpoolError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(f"{queued['status'].capitalize()}: {queued['manifest_sha256']}")
+
+
+@upload_group.command("flush")
+@click.option(
+    "--token",
+    envvar=TOKEN_ENV_VAR,
+    required=True,
+    help=f"Upload bearer token (or set {TOKEN_ENV_VAR}).",
+)
+@_spool_dir_option
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FLUSH_WORKERS,
+    show_default=True,
+    help="Concurrent uploads.",
+)
+@click.option(
+    "--max-inflight-mb",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_INFLIGHT_BYTES // (1024 * 1024),
+    show_default=True,
+    help="Cap on the combined size of bundles being sent at once.",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_ATTEMPTS,
+    show_default=True,
+    help="Failures after which a bundle is moved to failed/.",
+)
+@click.option("--gzip", "gzip_body", is_flag=True, help="Gzip request bodies.")
+@click.option(
+    "--dedup/--no-dedup",
+    default=True,
+    show_default=True,
+    help="Pre-flight manifest hashes and upload only content the server lacks.",
+)
+@click.option(
+    "--all",
+    "include_deferred",
+    is_flag=True,
+    help="Also send bundles still waiting out their retry backoff.",
+)
+@click.option(
+    "--wait",
+    is_flag=True,
+    help="Keep running, sleeping until the next retry is due, until no bundle "
+    "is pending (used by the background flusher a run starts).",
+)
+@click.option(
+    "--max-wait",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_WAIT_SECONDS,
+    show_default=True,
+    help="With --wait, give up after this many seconds.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print summary JSON.")
+def upload_flush_cmd(
+    token: str,
+    spool_dir: Path | None,
+    workers: int,
+    max_inflight_mb: int,
+    max_attempts: int,
+    gzip_body: bool,
+    dedup: bool,
+    include_deferred: bool,
+    wait: bool,
+    max_wait: int,
+    as_json: bool,
+) -> None:
+    """Upload queued bundles whose retry time has come.
+
+    With --wait, bundles that fail are retried as their backoff expires
+    until none is pending.
+
+    Exit codes: 0 all due bundles sent, 10 some will be retried, 20 some
+    failed permanently, 30 another flush is already running.
+    """
+    flush = partial(drain_spool, max_wait_seconds=max_wait) if wait else flush_spool
+    summary = flush(
+        UploadSpool(spool_dir),
+        token=token,
+        workers=workers,
+        max_inflight_bytes=max_inflight_mb * 1024 * 1024,
+        max_attempts=max_attempts,
+        gzip_body=gzip_body,
+        dedup=dedup,
+        include_deferred=include_deferred,
+    )
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+    elif summary["locked"]:
+        click.echo("Another upload flush is already running.")
+    else:
+        click.echo(
+            f"Sent: {summary['sent']}  Retrying: {summary['retrying']}  "
+            f"Failed: {summary['failed']}  Deferred: {summary['deferred']}  "
+            f"Deduplicated: {summary['bytes_deduped']} bytes"
+        )
+
+    if summary["locked"]:
+        raise SystemExit(30)
+    if summary["failed"]:
+        raise SystemExit(20)
+    if summary["retrying"]:
+        raise SystemExit(10)
+
+
+@upload_group.command("status")
+@_spool_dir_option
+@click.option("--json", "as_json", is_flag=True, help="Print spool jobs as JSON.")
+def upload_status_cmd(spool_dir: Path | None, as_json: bool) -> None:
+    """Show queued, sent and failed uploads."""
+    spool = UploadSpool(spool_dir)
+    if as_json:
+        payload = {
+            "spool": str(spool.path),
+            "counts": spool.counts(),
+            "pending": spool.jobs("pending"),
+            "failed": spool.jobs("failed"),
+        }
+        click.echo(json.dumps(payload, indent=2))
+        return
+    counts = spool.counts()
+    click.echo(f"Spool: {spool.path}")
+    click.echo(
+        f"Pending: {counts['pending']}  Sent: {counts['sent']}  "
+        f"Failed: {counts['failed']}"
+    )
+    for job in spool.jobs("pending") + spool.jobs("failed"):
+        error = job.get("last_error") or "-"
+        click.echo(
+            f"  {job['manifest_sha256'][:12]}  attempts={job.get('attempts', 0)}  "
+            f"{job['bundle']}  last_error={error}"
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -50,9 +51,15 @@ def detect_device_class(device: dict[str, Any]) -> str:
     return "laptop-desktop"
 
 
+@lru_cache(maxsize=1)
+def _cached_device_class_profiles() -> dict[str, dict[str, Any]]:
+    # Read once per process; every composed report needs the assessment.
+    return load_device_class_profiles()
+
+
 def get_device_class_assessment(device: dict[str, Any]) -> dict[str, Any]:
     class_id = detect_device_class(device)
-    profiles = load_device_class_profiles()
+    profiles = _cached_device_class_profiles()
     profile = profiles.get(class_id, {})
 
     return {
@@ -11,8 +11,38 @@ from __future__ import annotations
 import datetime
 import hashlib
 import json
+import mmap
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from agent import jsonio
+from agent.bundle_archive import BundleArchive, BundleArchiveError, is_bundle_archive
+from agent.merkle import (
+    DEFAULT_CHUNK_SIZE,
+    MERKLE_ALGORITHM,
+    file_record_leaf,
+    hash_file_chunks,
+    inclusion_proof,
+    leaf_hash,
+    merkle_root,
+    root_from_proof,
+)
+from agent.verify_cache import DEFAULT_SAMPLE_RATE, VerificationCache
+
+MANIFEST_VERSION_V1 = "1.0.0"
+MANIFEST_VERSION_V2 = "2.0.0"
+
+# Files at least this large are hashed through mmap (no userspace copies).
+MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+_READ_CHUNK_BYTES = 1024 * 1024
+# Slice size fed to hashlib from a mapping; hashlib releases the GIL per call.
+_MMAP_SLICE_BYTES = 64 * 1024 * 1024
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
 
 
 class EvidenceError(Exception):
@@ -33,20 +63,243 @@ def _normalize_manifest_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
-def _sha256_file(path: Path) -> str:
+def _sha256_file(path: Path, use_mmap: bool = True) -> str:
     digest = hashlib.sha256()
     with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(65536), b""):
+        size = os.fstat(fh.fileno()).st_size
+        if use_mmap and size >= MMAP_THRESHOLD_BYTES:
+            try:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, len(view), _MMAP_SLICE_BYTES):
+                            digest.update(view[offset : offset + _MMAP_SLICE_BYTES])
+                    finally:
+                        view.release()
+                return digest.hexdigest()
+            except (OSError, ValueError):
+                # Mapping can fail (special files, 32-bit address space);
+                # fall back to buffered reads from the start.
+                digest = hashlib.sha256()
+                fh.seek(0)
+        for chunk in iter(lambda: fh.read(_READ_CHUNK_BYTES), b""):
             digest.update(chunk)
     return digest.hexdigest()
 
 
+def _hash_one(path: Path) -> Optional[Tuple[int, str]]:
+    try:
+        size = path.stat().st_size
+        return size, _sha256_file(path)
+    except OSError:
+        return None
+
+
+def hash_files(
+    paths: Sequence[Path], workers: int | None = None
+) -> List[Optional[Tuple[int, str]]]:
+    """Hash files on a bounded thread pool.
+
+    Results are returned in input order as `(size, sha256)` tuples, or None
+    for files that could not be read, so callers stay deterministic no
+    matter which worker finishes first.
+
+    Args:
+        paths: Files to hash
+        workers: Thread count (default `DEFAULT_HASH_WORKERS`; 1 = serial)
+    """
+    workers = DEFAULT_HASH_WORKERS if workers is None else max(1, workers)
+    if workers == 1 or len(paths) <= 1:
+        return [_hash_one(path) for path in paths]
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(paths)), thread_name_prefix="inspecta-hash"
+    ) as pool:
+        return list(pool.map(_hash_one, paths))
+
+
+class ArtifactWriter:
+    """Stream an artifact to disk while hashing it.
+
+    Bytes go to a temporary file beside the target and are fed to a running
+    SHA-256 as they are written; `close()` fsyncs, atomically renames the
+    file into place and registers the digest in the owning `ArtifactIndex`.
+    Leaving the context manager with an exception discards the temp file.
+    """
+
+    def __init__(self, index: "ArtifactIndex", rel_path: str) -> None:
+        self.rel_path = Path(rel_path).as_posix()
+        self.path = index.base_dir / self.rel_path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._index = index
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._fh = self._tmp_path.open("wb")
+        self._digest = hashlib.sha256()
+        self.size = 0
+        self.sha256: Optional[str] = None
+        self._entry: Optional[Dict[str, Any]] = None
+
+    def write(self, data: bytes | str, encoding: str = "utf-8") -> int:
+        payload = data.encode(encoding) if isinstance(data, str) else data
+        self._fh.write(payload)
+        self._digest.update(payload)
+        self.size += len(payload)
+        return len(payload)
+
+    def close(self) -> Dict[str, Any]:
+        """Finalize the artifact and return its manifest entry."""
+        if self._entry is not None:
+            return self._entry
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        os.replace(self._tmp_path, self.path)
+        self.sha256 = self._digest.hexdigest()
+        self._entry = self._index.record(self.rel_path, self.size, self.sha256)
+        return self._entry
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if not self._fh.closed:
+            self._fh.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *_exc: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class ArtifactIndex:
+    """In-memory manifest index for artifacts written during a run.
+
+    Entries remember the size and mtime observed right after the atomic
+    rename; `entry()` only returns a digest while the file still matches
+    them, so anything rewritten outside the index is hashed afresh.
+    Text is encoded without newline translation, so bundle bytes are the
+    same on every platform.
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = Path(base_dir)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def open(self, rel_path: str) -> ArtifactWriter:
+        return ArtifactWriter(self, rel_path)
+
+    def write_bytes(self, rel_path: str, data: bytes) -> Dict[str, Any]:
+        writer = self.open(rel_path)
+        try:
+            writer.write(data)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.close()
+
+    def write_text(
+        self, rel_path: str, text: str, encoding: str = "utf-8"
+    ) -> Dict[str, Any]:
+        return self.write_bytes(rel_path, text.encode(encoding))
+
+    def write_json(
+        self, rel_path: str, payload: Any, indent: Optional[int] = 2
+    ) -> Dict[str, Any]:
+        """Write `payload` as JSON; `indent=None` writes compact JSON."""
+        return self.write_bytes(rel_path, jsonio.dump_bytes(payload, indent=indent))
+
+    def record(self, rel_path: str, size: int, sha256: str) -> Dict[str, Any]:
+        stat = (self.base_dir / rel_path).stat()
+        with self._lock:
+            self._entries[rel_path] = {
+                "size": size,
+                "sha256": sha256,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        return {"path": rel_path, "size": size, "sha256": sha256}
+
+    def index_files(
+        self, rel_paths: Iterable[str], workers: int | None = None
+    ) -> List[str]:
+        """Hash finished files that were not written through the index.
+
+        Lets manifest hashing start early for artifacts that are already
+        final. A file is only recorded if its size and mtime did not change
+        while it was hashed; anything still being written is skipped and
+        hashed again when the manifest is built.
+
+        Returns:
+            The paths that were recorded
+        """
+        before: Dict[str, os.stat_result] = {}
+        for rel in sorted({Path(rel).as_posix() for rel in rel_paths}):
+            path = self.base_dir / rel
+            if self.entry(rel) is not None or not path.is_file():
+                continue
+            try:
+                before[rel] = path.stat()
+            except OSError:
+                continue
+
+        pending = list(before)
+        digests = hash_files([self.base_dir / rel for rel in pending], workers=workers)
+        recorded = []
+        for rel, digest in zip(pending, digests):
+            try:
+                after = (self.base_dir / rel).stat()
+            except OSError:
+                continue
+            stat = before[rel]
+            if (
+                digest is None
+                or digest[0] != stat.st_size
+                or (after.st_size, after.st_mtime_ns)
+                != (stat.st_size, stat.st_mtime_ns)
+            ):
+                continue
+            with self._lock:
+                self._entries[rel] = {
+                    "size": stat.st_size,
+                    "sha256": digest[1],
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            recorded.append(rel)
+        return recorded
+
+    def entry(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        """Return the indexed manifest entry if the file is unchanged."""
+        rel_path = Path(rel_path).as_posix()
+        with self._lock:
+            cached = self._entries.get(rel_path)
+        if cached is None:
+            return None
+        try:
+            stat = (self.base_dir / rel_path).stat()
+        except OSError:
+            return None
+        if stat.st_size != cached["size"] or stat.st_mtime_ns != cached["mtime_ns"]:
+            return None
+        return {"path": rel_path, "size": cached["size"], "sha256": cached["sha256"]}
+
+    def __contains__(self, rel_path: object) -> bool:
+        with self._lock:
+            return rel_path in self._entries
+
+
 def _sha256_bytes(payload: bytes) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
 def _canonical_manifest_bytes(manifest: Dict[str, Any]) -> bytes:
-    return json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return jsonio.canonical_bytes(manifest)
+
+
+def manifest_sha256(manifest: Dict[str, Any]) -> str:
+    """SHA256 of the canonical manifest encoding (its identity in the spool)."""
+    return _sha256_bytes(_canonical_manifest_bytes(manifest))
 
 
 def _public_key_fingerprint(public_key_bytes: bytes) -> str:
@@ -122,29 +375,38 @@ def _sign_manifest_ed25519(
 def _verify_manifest_signature_ed25519(
     manifest: Dict[str, Any],
     signature_path: Path,
-    public_key_path: Path,
+    public_key_path: Path | None,
+    public_key: Any = None,
+    signature: bytes | None = None,
 ) -> Tuple[bool, str]:
-    """Verify detached Ed25519 manifest signature."""
+    """Verify detached Ed25519 manifest signature.
+
+    `public_key` is an already-loaded key; when given, `public_key_path` is
+    not read. Likewise `signature` bytes take precedence over
+    `signature_path` (used for signatures read from an archive).
+    """
     try:
         from cryptography.hazmat.primitives import serialization
         from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
     except Exception:
         return False, "signature_verification_dependency_missing"
 
-    if not public_key_path.exists():
+    if public_key is None and (public_key_path is None or not public_key_path.exists()):
         return False, f"public_key_missing:{public_key_path}"
-    if not signature_path.exists():
+    if signature is None and not signature_path.exists():
         return False, f"signature_missing:{signature_path}"
 
-    try:
-        public_key = serialization.load_pem_public_key(public_key_path.read_bytes())
-    except Exception as exc:
-        return False, f"public_key_load_failed:{exc}"
+    if public_key is None:
+        try:
+            public_key = serialization.load_pem_public_key(public_key_path.read_bytes())
+        except Exception as exc:
+            return False, f"public_key_load_failed:{exc}"
 
     if not isinstance(public_key, Ed25519PublicKey):
         return False, "public_key_not_ed25519"
 
-    signature = signature_path.read_bytes()
+    if signature is None:
+        signature = signature_path.read_bytes()
     payload = _canonical_manifest_bytes(manifest)
 
     try:
@@ -156,49 +418,142 @@ def _verify_manifest_signature_ed25519(
 
 
 def generate_manifest_entries(
-    base_dir: Path, relative_paths: Iterable[str]
+    base_dir: Path,
+    relative_paths: Iterable[str],
+    artifact_index: ArtifactIndex | None = None,
+    workers: int | None = None,
 ) -> List[Dict[str, Any]]:
     """Generate manifest entries for existing files.
 
     Missing paths are ignored intentionally to allow caller flexibility.
+    Files written through `artifact_index` reuse their precomputed digest
+    instead of being read again; the rest are hashed in parallel.
     """
-    entries: List[Dict[str, Any]] = []
+    entries: Dict[str, Dict[str, Any]] = {}
+    to_hash: List[str] = []
     for rel in sorted(set(relative_paths)):
+        if artifact_index is not None:
+            indexed = artifact_index.entry(rel)
+            if indexed is not None:
+                entries[rel] = {**indexed, "path": rel}
+                continue
+
         path = base_dir / rel
         if not path.exists() or not path.is_file():
             continue
+        to_hash.append(rel)
 
-        entries.append(
-            {
-                "path": rel,
-                "size": path.stat().st_size,
-                "sha256": _sha256_file(path),
-            }
-        )
+    digests = hash_files([base_dir / rel for rel in to_hash], workers=workers)
+    for rel, digest in zip(to_hash, digests):
+        if digest is None:
+            continue
+        size, sha = digest
+        entries[rel] = {"path": rel, "size": size, "sha256": sha}
 
+    return [entries[rel] for rel in sorted(entries)]
+
+
+def generate_merkle_entries(
+    base_dir: Path,
+    relative_paths: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Generate manifest v2 entries with per-file Merkle roots.
+
+    Each file is read once to produce its SHA256 and chunk leaves. Files
+    spanning more than one chunk list their chunk leaves under `chunks`.
+    """
+    present = [rel for rel in sorted(set(relative_paths)) if (base_dir / rel).is_file()]
+
+    def _hash(rel: str) -> Optional[Tuple[int, str, List[str]]]:
+        try:
+            return hash_file_chunks(base_dir / rel, chunk_size)
+        except OSError:
+            return None
+
+    workers = DEFAULT_HASH_WORKERS if workers is None else max(1, workers)
+    if workers == 1 or len(present) <= 1:
+        results = [_hash(rel) for rel in present]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(present)), thread_name_prefix="inspecta-hash"
+        ) as pool:
+            results = list(pool.map(_hash, present))
+
+    entries: List[Dict[str, Any]] = []
+    for rel, result in zip(present, results):
+        if result is None:
+            continue
+        size, sha, leaves = result
+        entry: Dict[str, Any] = {
+            "path": rel,
+            "size": size,
+            "sha256": sha,
+            "merkle_root": merkle_root(leaves),
+        }
+        if len(leaves) > 1:
+            entry["chunks"] = leaves
+        entries.append(entry)
     return entries
 
 
+def manifest_merkle_root(entries: Iterable[Dict[str, Any]]) -> str:
+    """Return the root over the file-record leaves of v2 `entries`."""
+    return merkle_root(
+        [
+            file_record_leaf(entry["path"], entry["size"], entry["merkle_root"])
+            for entry in entries
+        ]
+    )
+
+
 def build_evidence_manifest(
     base_dir: Path,
     relative_paths: Iterable[str],
     agent_version: str,
     run_metadata: Dict[str, Any] | None = None,
     generated_at: str | None = None,
+    artifact_index: ArtifactIndex | None = None,
+    workers: int | None = None,
+    manifest_version: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> Tuple[Dict[str, Any], str]:
-    """Build deterministic manifest and return (manifest_obj, manifest_sha256)."""
+    """Build deterministic manifest and return (manifest_obj, manifest_sha256).
+
+    `manifest_version=2` adds per-file Merkle roots, chunk leaves for files
+    larger than `chunk_size` and a `merkle` block with the root over all
+    files, enabling single-file and byte-range verification.
+    """
+    if manifest_version not in (1, 2):
+        raise EvidenceError(f"Unsupported manifest version: {manifest_version}")
     generated_at = generated_at or (
         datetime.datetime.now(datetime.UTC).replace(microsecond=0).isoformat()
     )
-    entries = generate_manifest_entries(base_dir, relative_paths)
+    if manifest_version == 2:
+        entries = generate_merkle_entries(
+            base_dir, relative_paths, chunk_size=chunk_size, workers=workers
+        )
+    else:
+        entries = generate_manifest_entries(
+            base_dir, relative_paths, artifact_index, workers=workers
+        )
 
     manifest: Dict[str, Any] = {
-        "manifest_version": "1.0.0",
+        "manifest_version": (
+            MANIFEST_VERSION_V2 if manifest_version == 2 else MANIFEST_VERSION_V1
+        ),
         "generated_at": generated_at,
         "agent_version": agent_version,
         "algorithm": "sha256",
         "entries": entries,
     }
+    if manifest_version == 2:
+        manifest["merkle"] = {
+            "algorithm": MERKLE_ALGORITHM,
+            "chunk_size": chunk_size,
+            "root": manifest_merkle_root(entries),
+        }
 
     if run_metadata:
         manifest["run_metadata"] = run_metadata
@@ -216,6 +571,10 @@ def write_evidence_manifest(
     sign_key_path: Path | None = None,
     signature_filename: str = "manifest.sig",
     generated_at: str | None = None,
+    artifact_index: ArtifactIndex | None = None,
+    workers: int | None = None,
+    manifest_version: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> Tuple[str, str]:
     """Write evidence manifest to artifacts and return (manifest_rel_path, sha256)."""
     manifest, manifest_sha = build_evidence_manifest(
@@ -224,6 +583,10 @@ def write_evidence_manifest(
         agent_version=agent_version,
         run_metadata=run_metadata,
         generated_at=generated_at,
+        artifact_index=artifact_index,
+        workers=workers,
+        manifest_version=manifest_version,
+        chunk_size=chunk_size,
     )
 
     artifacts_dir = output_dir / "artifacts"
@@ -255,17 +618,116 @@ def write_evidence_manifest(
         canonical = _canonical_manifest_bytes(manifest)
         manifest_sha = _sha256_bytes(canonical)
 
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    manifest_path.write_bytes(jsonio.dump_bytes(manifest, indent=2))
 
     return str(manifest_path.relative_to(output_dir)), manifest_sha
 
 
+def _scan_bundle_files(
+    output_dir: Path,
+    relative_paths: Iterable[str],
+    workers: int | None = None,
+    cache: VerificationCache | None = None,
+    paranoid: bool = False,
+    sample_rate: float = 0.0,
+    rng: random.Random | None = None,
+) -> Dict[str, Any]:
+    """Stat and hash each distinct bundle path exactly once.
+
+    Returns `files` (path -> `(size, sha256)` for readable regular files),
+    `bytes_hashed` and `elapsed_seconds`. Verify and audit both derive their
+    results from this single scan.
+
+    With a `cache`, files whose stat tuple is unchanged reuse their cached
+    digest unless `paranoid` is set; a `sample_rate` fraction of those hits
+    is rehashed anyway and reported under `cache.corrupted` when the bytes
+    no longer match the cached digest.
+    """
+    started = time.perf_counter()
+    rng = rng or random.Random()
+    present = [
+        rel for rel in sorted(set(relative_paths)) if (output_dir / rel).is_file()
+    ]
+
+    files: Dict[str, Tuple[int, str]] = {}
+    stats: Dict[str, os.stat_result] = {}
+    cached: Dict[str, str] = {}
+    to_hash: List[str] = []
+    for rel in present:
+        if cache is not None:
+            try:
+                stats[rel] = (output_dir / rel).stat()
+            except OSError:
+                continue
+            sha = None if paranoid else cache.lookup(output_dir / rel, stats[rel])
+            if sha is not None:
+                cached[rel] = sha
+                if not (sample_rate > 0 and rng.random() < sample_rate):
+                    files[rel] = (stats[rel].st_size, sha)
+                    continue
+        to_hash.append(rel)
+
+    digests = hash_files([output_dir / rel for rel in to_hash], workers=workers)
+    corrupted: List[str] = []
+    for rel, digest in zip(to_hash, digests):
+        if digest is None:
+            continue
+        files[rel] = digest
+        if rel in cached and cached[rel] != digest[1]:
+            corrupted.append(rel)
+        if cache is not None:
+            try:
+                after = (output_dir / rel).stat()
+            except OSError:
+                continue
+            # Only trust the digest if the file did not change while hashing.
+            if after.st_mtime_ns == stats[rel].st_mtime_ns:
+                cache.store(output_dir / rel, after, digest[1])
+
+    scan: Dict[str, Any] = {
+        "files": dict(sorted(files.items())),
+        "bytes_hashed": sum(digest[0] for digest in digests if digest),
+        "elapsed_seconds": round(time.perf_counter() - started, 6),
+    }
+    if cache is not None:
+        scan["cache"] = {
+            "hits": len(present) - len(to_hash),
+            "hashed": len(to_hash),
+            "sampled": sum(1 for rel in to_hash if rel in cached),
+            "corrupted": corrupted,
+        }
+    return scan
+
+
 def verify_evidence_manifest(
     output_dir: Path,
     manifest_rel_path: str,
     public_key_path: Path | None = None,
+    workers: int | None = None,
+    cache: VerificationCache | None = None,
+    paranoid: bool = False,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+    public_key: Any = None,
 ) -> Dict[str, Any]:
-    """Verify an existing evidence manifest file and return verification details."""
+    """Verify an existing evidence manifest file and return verification details.
+
+    File digests are computed on a bounded thread pool (`workers`); the
+    reported mismatches keep manifest entry order. With a `cache`, files
+    whose stat tuple is unchanged since a previous run are not rehashed
+    (except a random `sample_rate` fraction) unless `paranoid` is set.
+    `public_key` may carry an already-loaded Ed25519 key in place of
+    `public_key_path` (bulk verification loads it once per worker).
+    `output_dir` may also be a `.inspecta` archive, which is verified by
+    streaming members straight from the archive.
+    """
+    if is_bundle_archive(output_dir):
+        return verify_archive_manifest(
+            output_dir,
+            manifest_rel_path,
+            public_key_path=public_key_path,
+            public_key=public_key,
+        )
+
     manifest_path = output_dir / manifest_rel_path
     if not manifest_path.exists():
         return {
@@ -279,7 +741,7 @@ def verify_evidence_manifest(
         }
 
     try:
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = jsonio.loads(manifest_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         return {
             "ok": False,
@@ -297,6 +759,153 @@ def verify_evidence_manifest(
         for entry in raw_entries
         if isinstance(entry, dict)
     ]
+    scan = _scan_bundle_files(
+        output_dir,
+        [
+            entry["path"]
+            for entry in entries
+            if isinstance(entry.get("path"), str)
+            and entry["path"]
+            and entry.get("sha256")
+        ],
+        workers=workers,
+        cache=cache,
+        paranoid=paranoid,
+        sample_rate=sample_rate,
+    )
+    result = _check_manifest_integrity(
+        output_dir, manifest, entries, scan["files"], public_key_path, public_key
+    )
+    result["bytes_hashed"] = scan["bytes_hashed"]
+    if cache is not None:
+        cache.save()
+        result["cache"] = scan["cache"]
+    return result
+
+
+def _hash_archive_member(archive: BundleArchive, rel: str) -> Tuple[int, str]:
+    digest = hashlib.sha256()
+    size = 0
+    with archive.open(rel) as fh:
+        for chunk in iter(lambda: fh.read(_READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def verify_archive_manifest(
+    archive_path: Path,
+    manifest_rel_path: str = "artifacts/manifest.json",
+    public_key_path: Path | None = None,
+    public_key: Any = None,
+) -> Dict[str, Any]:
+    """Verify a `.inspecta` archive against its embedded manifest.
+
+    Members are hashed as streams from the archive; nothing is extracted.
+    Results use the same exit-code taxonomy as `verify_evidence_manifest`.
+    """
+    try:
+        archive = BundleArchive(archive_path)
+    except BundleArchiveError as exc:
+        return {
+            "ok": False,
+            "error": str(exc),
+            "checked": 0,
+            "mismatches": [],
+            "missing": [],
+            "exit_code": 2,
+            "exit_reason": "archive_invalid",
+        }
+
+    with archive:
+        if not archive.exists(manifest_rel_path):
+            return {
+                "ok": False,
+                "error": f"Manifest not found: {manifest_rel_path}",
+                "checked": 0,
+                "mismatches": [],
+                "missing": [],
+                "exit_code": 2,
+                "exit_reason": "manifest_not_found",
+            }
+        try:
+            manifest = jsonio.loads(archive.read_text(manifest_rel_path))
+            if not isinstance(manifest, dict):
+                raise ValueError("manifest is not a JSON object")
+        except ValueError as exc:
+            return {
+                "ok": False,
+                "error": f"Invalid manifest JSON: {exc}",
+                "checked": 0,
+                "mismatches": [],
+                "missing": [],
+                "exit_code": 2,
+                "exit_reason": "manifest_invalid_json",
+            }
+
+        entries = [
+            _normalize_manifest_entry(entry)
+            for entry in manifest.get("entries", [])
+            if isinstance(entry, dict)
+        ]
+        digests: Dict[str, Tuple[int, str]] = {}
+        for entry in entries:
+            rel = entry.get("path")
+            if isinstance(rel, str) and rel not in digests and archive.exists(rel):
+                digests[rel] = _hash_archive_member(archive, rel)
+
+        result = _check_manifest_integrity(
+            archive_path,
+            manifest,
+            entries,
+            digests,
+            public_key_path,
+            public_key,
+            archive=archive,
+        )
+    result["bytes_hashed"] = sum(size for size, _ in digests.values())
+    return result
+
+
+def _check_merkle_structure(
+    manifest: Dict[str, Any], entries: List[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """Check v2 chunk lists and the manifest root agree with the entries."""
+    mismatches: List[Dict[str, str]] = []
+    complete = True
+    for entry in entries:
+        file_root = entry.get("merkle_root")
+        if not isinstance(file_root, str) or not isinstance(entry.get("size"), int):
+            mismatches.append(
+                {"path": str(entry.get("path")), "reason": "missing merkle metadata"}
+            )
+            complete = False
+            continue
+        chunks = entry.get("chunks")
+        if chunks is not None and merkle_root(chunks) != file_root:
+            mismatches.append({"path": entry["path"], "reason": "merkle root mismatch"})
+
+    merkle = manifest.get("merkle")
+    declared_root = merkle.get("root") if isinstance(merkle, dict) else None
+    if complete and declared_root != manifest_merkle_root(entries):
+        mismatches.append({"path": "<manifest>", "reason": "merkle root mismatch"})
+    return mismatches
+
+
+def _check_manifest_integrity(
+    output_dir: Path,
+    manifest: Dict[str, Any],
+    entries: List[Dict[str, Any]],
+    digests: Dict[str, Tuple[int, str]],
+    public_key_path: Path | None,
+    public_key: Any = None,
+    archive: BundleArchive | None = None,
+) -> Dict[str, Any]:
+    """Compare manifest entries against scanned digests and check the signature.
+
+    With an `archive`, the detached signature is read from the archive
+    member instead of `output_dir`.
+    """
     mismatches: List[Dict[str, str]] = []
     missing: List[str] = []
 
@@ -307,13 +916,13 @@ def verify_evidence_manifest(
             mismatches.append({"path": str(rel), "reason": "missing metadata"})
             continue
 
-        full_path = output_dir / rel
-        if not full_path.exists() or not full_path.is_file():
+        digest = digests.get(rel)
+        if digest is None:
             mismatches.append({"path": rel, "reason": "missing file"})
             missing.append(rel)
             continue
 
-        actual = _sha256_file(full_path)
+        actual = digest[1]
         if actual != expected:
             mismatches.append(
                 {
@@ -324,6 +933,9 @@ def verify_evidence_manifest(
                 }
             )
 
+    if str(manifest.get("manifest_version", "")).startswith("2."):
+        mismatches.extend(_check_merkle_structure(manifest, entries))
+
     # Optional detached signature verification.
     signature = manifest.get("signature") if isinstance(manifest, dict) else None
     if isinstance(signature, dict):
@@ -339,7 +951,7 @@ def verify_evidence_manifest(
                 "exit_reason": "signature_metadata_invalid",
             }
 
-        if public_key_path is None:
+        if public_key_path is None and public_key is None:
             return {
                 "ok": False,
                 "checked": len(entries),
@@ -362,9 +974,20 @@ def verify_evidence_manifest(
             }
 
         sig_ok, sig_reason = _verify_manifest_signature_ed25519(
-            manifest={k: v for k, v in manifest.items() if k != "signature"},
+            # Both blocks are added after signing, so neither is covered.
+            manifest={
+                k: v
+                for k, v in manifest.items()
+                if k not in ("signature", "attestation")
+            },
             signature_path=output_dir / sig_rel,
             public_key_path=public_key_path,
+            public_key=public_key,
+            signature=(
+                archive.read_bytes(sig_rel)
+                if archive is not None and archive.exists(sig_rel)
+                else None
+            ),
         )
 
         if not sig_ok:
@@ -402,13 +1025,16 @@ def audit_evidence_bundle(
     output_dir: Path,
     manifest_rel_path: str,
     public_key_path: Path | None = None,
+    workers: int | None = None,
 ) -> Dict[str, Any]:
     """Audit bundle reproducibility and determinism characteristics.
 
     The audit validates integrity first, then verifies deterministic-entry
     guarantees (sorted, unique paths and complete metadata) and checks that
-    re-indexing live files yields the same entry metadata.
+    re-indexing live files yields the same entry metadata. All three checks
+    share one scan, so every listed file is read once.
     """
+    started = time.perf_counter()
     manifest_path = output_dir / manifest_rel_path
     if not manifest_path.exists():
         return {
@@ -423,7 +1049,7 @@ def audit_evidence_bundle(
         }
 
     try:
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = jsonio.loads(manifest_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         return {
             "ok": False,
@@ -436,12 +1062,6 @@ def audit_evidence_bundle(
             "error": f"Invalid manifest JSON: {exc}",
         }
 
-    integrity = verify_evidence_manifest(
-        output_dir=output_dir,
-        manifest_rel_path=manifest_rel_path,
-        public_key_path=public_key_path,
-    )
-
     entries = (
         [
             _normalize_manifest_entry(entry)
@@ -451,6 +1071,16 @@ def audit_evidence_bundle(
         if isinstance(manifest, dict)
         else []
     )
+    listed_paths = [e["path"] for e in entries if isinstance(e.get("path"), str)]
+    scan = _scan_bundle_files(output_dir, listed_paths, workers=workers)
+    integrity = _check_manifest_integrity(
+        output_dir,
+        manifest if isinstance(manifest, dict) else {},
+        entries,
+        scan["files"],
+        public_key_path,
+    )
+
     raw_paths = [e.get("path") for e in entries if isinstance(e, dict)]
     path_values = [p for p in raw_paths if isinstance(p, str)]
 
@@ -466,16 +1096,13 @@ def audit_evidence_bundle(
         for e in entries
     )
 
-    listed_paths = [e["path"] for e in entries if isinstance(e, dict) and "path" in e]
-    reindexed_entries = generate_manifest_entries(output_dir, listed_paths)
-
     declared_by_path = {
         e.get("path"): {"size": e.get("size"), "sha256": e.get("sha256")}
         for e in entries
         if isinstance(e, dict) and isinstance(e.get("path"), str)
     }
     reindexed_by_path = {
-        e["path"]: {"size": e["size"], "sha256": e["sha256"]} for e in reindexed_entries
+        rel: {"size": size, "sha256": sha} for rel, (size, sha) in scan["files"].items()
     }
     reindexed_entries_match = declared_by_path == reindexed_by_path
 
@@ -495,9 +1122,188 @@ def audit_evidence_bundle(
         "checked": int(integrity.get("checked", 0)),
         "mismatches": integrity.get("mismatches", []),
         "missing": integrity.get("missing", []),
+        "bytes_hashed": scan["bytes_hashed"],
+        "elapsed_seconds": round(time.perf_counter() - started, 6),
         "manifest_sha256": _sha256_bytes(
             _canonical_manifest_bytes(manifest) if isinstance(manifest, dict) else b"{}"
         ),
         "exit_code": 0 if ok else 1,
         "exit_reason": "reproducible" if ok else "reproducibility_check_failed",
     }
+
+
+def _load_manifest_file(
+    output_dir: Path, manifest_rel_path: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Return (manifest, None) or (None, taxonomy error result)."""
+    manifest_path = output_dir / manifest_rel_path
+    if not manifest_path.exists():
+        return None, {
+            "ok": False,
+            "error": f"Manifest not found: {manifest_rel_path}",
+            "exit_code": 2,
+            "exit_reason": "manifest_not_found",
+        }
+    try:
+        manifest = jsonio.loads(manifest_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        return None, {
+            "ok": False,
+            "error": f"Invalid manifest JSON: {exc}",
+            "exit_code": 2,
+            "exit_reason": "manifest_invalid_json",
+        }
+    if not isinstance(manifest, dict):
+        return None, {
+            "ok": False,
+            "error": "Manifest is not a JSON object",
+            "exit_code": 2,
+            "exit_reason": "manifest_invalid_json",
+        }
+    return manifest, None
+
+
+def merkle_file_proof(manifest: Dict[str, Any], rel_path: str) -> Dict[str, Any]:
+    """Return the file record and inclusion proof for `rel_path` in a v2 manifest.
+
+    The result is self-contained: a holder of the manifest root can check
+    the file record with `root_from_proof(leaf, proof)` without the rest of
+    the manifest.
+
+    Raises:
+        EvidenceError: Manifest is not v2 or has no entry for `rel_path`
+    """
+    if not str(manifest.get("manifest_version", "")).startswith("2."):
+        raise EvidenceError("Merkle proofs require manifest v2")
+    entries = [
+        _normalize_manifest_entry(entry)
+        for entry in manifest.get("entries", [])
+        if isinstance(entry, dict)
+    ]
+    try:
+        leaves = [
+            file_record_leaf(entry["path"], entry["size"], entry["merkle_root"])
+            for entry in entries
+        ]
+    except (KeyError, TypeError) as exc:
+        raise EvidenceError(f"Incomplete merkle metadata: {exc}") from exc
+    for index, entry in enumerate(entries):
+        if entry["path"] == rel_path:
+            return {
+                "path": rel_path,
+                "size": entry["size"],
+                "merkle_root": entry["merkle_root"],
+                "leaf": leaves[index],
+                "proof": inclusion_proof(leaves, index),
+            }
+    raise EvidenceError(f"No manifest entry for {rel_path}")
+
+
+def verify_manifest_file(
+    output_dir: Path,
+    manifest_rel_path: str,
+    rel_path: str,
+    byte_range: Tuple[int, int] | None = None,
+    expected_root: str | None = None,
+    workers: int | None = None,
+) -> Dict[str, Any]:
+    """Verify one file, or a byte range of it, against a v2 manifest root.
+
+    The file record is checked against the manifest root (or a trusted
+    `expected_root`, e.g. from a signed attestation) through its inclusion
+    proof; then only the chunks covering `byte_range` (end exclusive) are
+    read and hashed, in parallel. Without `byte_range` the file's size must
+    also match the manifest.
+    """
+    manifest, error = _load_manifest_file(output_dir, manifest_rel_path)
+    if manifest is None:
+        return {"path": rel_path, "chunks_checked": 0, "bad_chunks": [], **error}
+
+    def _result(
+        ok: bool,
+        reason: str,
+        exit_code: int,
+        chunks_checked: int = 0,
+        bad_chunks: List[int] | None = None,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        return {
+            "ok": ok,
+            "path": rel_path,
+            "range": list(byte_range) if byte_range else None,
+            "chunks_checked": chunks_checked,
+            "bad_chunks": bad_chunks or [],
+            "exit_code": exit_code,
+            "exit_reason": reason,
+            **extra,
+        }
+
+    try:
+        record = merkle_file_proof(manifest, rel_path)
+    except EvidenceError as exc:
+        return _result(False, "merkle_proof_unavailable", 2, error=str(exc))
+
+    merkle = manifest.get("merkle") if isinstance(manifest.get("merkle"), dict) else {}
+    root = expected_root or merkle.get("root")
+    proof_ok = root_from_proof(record["leaf"], record["proof"]) == root
+    entry = {
+        normalized.get("path"): normalized
+        for normalized in (
+            _normalize_manifest_entry(e)
+            for e in manifest.get("entries", [])
+            if isinstance(e, dict)
+        )
+    }[rel_path]
+    chunks = entry.get("chunks") or [entry["merkle_root"]]
+    chunk_size = merkle.get("chunk_size")
+    if not proof_ok or merkle_root(chunks) != entry["merkle_root"]:
+        return _result(False, "integrity_mismatch", 1, proof_ok=proof_ok)
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        return _result(False, "merkle_proof_unavailable", 2, error="bad chunk_size")
+
+    size = entry["size"]
+    start, end = byte_range if byte_range else (0, size)
+    if byte_range and not 0 <= start < end <= size:
+        return _result(False, "invalid_range", 2, error=f"range outside 0..{size}")
+    indices = list(range(start // chunk_size, max(end - 1, 0) // chunk_size + 1))
+
+    path = output_dir / rel_path
+
+    def _check_chunk(index: int) -> Optional[bool]:
+        try:
+            with path.open("rb") as fh:
+                fh.seek(index * chunk_size)
+                data = fh.read(chunk_size)
+        except OSError:
+            return None
+        return index < len(chunks) and leaf_hash(data) == chunks[index]
+
+    if not path.is_file():
+        return _result(False, "integrity_mismatch", 1, error="missing file")
+    # Chunks only cover the recorded size, so a whole-file check must also
+    # reject data appended (or truncated) past it.
+    actual_size = path.stat().st_size
+    if byte_range is None and actual_size != size:
+        return _result(
+            False,
+            "integrity_mismatch",
+            1,
+            error=f"size {actual_size} != manifest size {size}",
+        )
+    workers = DEFAULT_HASH_WORKERS if workers is None else max(1, workers)
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(indices)), thread_name_prefix="inspecta-hash"
+    ) as pool:
+        outcomes = list(pool.map(_check_chunk, indices))
+
+    bad = [index for index, good in zip(indices, outcomes) if not good]
+    if bad:
+        return _result(
+            False,
+            "integrity_mismatch",
+            1,
+            chunks_checked=len(indices),
+            bad_chunks=bad,
+            proof_ok=True,
+        )
+    return _result(True, "verified", 0, chunks_checked=len(indices), proof_ok=True)
@@ -0,0 +1,702 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Shared subprocess executor for probe plugins.
+
+Every external tool invocation (smartctl, fio, sysbench, PowerShell, ...)
+goes through this module so the agent gets uniform behaviour:
+
+- stdout/stderr are streamed into bounded buffers (no unbounded capture)
+- children run in their own session/process group and the whole group is
+  killed on timeout or teardown (stress-ng workers do not survive)
+- each invocation is timed, classified and, on POSIX, charged its child
+  rusage
+- aggregate per-tool metrics can be exported into report.json
+- an optional command hook (see `agent.replay`) can record every
+  invocation to disk or serve previously captured outputs instead; probe
+  reads of host state under /sys, /proc and /etc go through
+  `read_system_file` / `list_system_dir` so the hook covers them too
+
+`run_command` mirrors the parts of `subprocess.run` that plugins rely on:
+it returns a `CompletedProcess`-compatible result and raises
+`subprocess.TimeoutExpired` / `FileNotFoundError` like the stdlib call.
+"""
+
+from __future__ import annotations
+
+import locale
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Sequence
+
+DEFAULT_MAX_OUTPUT_BYTES = 8 * 1024 * 1024
+KILL_GRACE_SECONDS = 2.0
+_READ_CHUNK_BYTES = 64 * 1024
+
+OUTCOME_OK = "ok"
+OUTCOME_NONZERO = "nonzero_exit"
+OUTCOME_SIGNALED = "signaled"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_SPAWN_FAILED = "spawn_failed"
+OUTCOME_TERMINATED = "terminated"
+
+
+@dataclass(frozen=True)
+class ChildUsage:
+    """Resource usage charged to a single child process (POSIX only)."""
+
+    user_cpu_seconds: float
+    system_cpu_seconds: float
+    max_rss_kb: int
+
+
+@dataclass(frozen=True)
+class CommandRecord:
+    """Metrics captured for one external command invocation."""
+
+    tool: str
+    argv: tuple[str, ...]
+    outcome: str
+    returncode: int | None
+    duration_ms: float
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    truncated: bool = False
+    usage: ChildUsage | None = None
+
+
+class CommandResult(subprocess.CompletedProcess):
+    """`CompletedProcess` with executor metadata attached."""
+
+    def __init__(
+        self,
+        args: Sequence[str],
+        returncode: int,
+        stdout: Any,
+        stderr: Any,
+        *,
+        outcome: str,
+        duration_ms: float,
+        truncated: bool = False,
+        usage: ChildUsage | None = None,
+    ) -> None:
+        super().__init__(list(args), returncode, stdout, stderr)
+        self.outcome = outcome
+        self.duration_ms = duration_ms
+        self.truncated = truncated
+        self.usage = usage
+
+
+class _CommandMetrics:
+    """Thread-safe registry of command records for the current run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._records: list[CommandRecord] = []
+
+    def add(self, record: CommandRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def snapshot(self) -> list[CommandRecord]:
+        with self._lock:
+            return list(self._records)
+
+
+_metrics = _CommandMetrics()
+_command_hook: Any = None
+
+
+def reset_command_metrics() -> None:
+    """Drop all recorded command metrics (called at the start of a run)."""
+    _metrics.reset()
+
+
+def add_command_record(record: CommandRecord) -> None:
+    """Append an externally produced record (e.g. a replayed command)."""
+    _metrics.add(record)
+
+
+def set_command_hook(hook: Any) -> Any:
+    """Install (or clear with None) the process-wide command hook.
+
+    A hook exposes `run_command(argv, *, timeout, text, input, execute)`,
+    `spawn_command(argv, *, execute)`, `read_file(path, *, execute)` and
+    `list_dir(path, *, execute)`, where `execute` performs the live
+    operation, plus a boolean `skip_pauses` attribute.
+
+    Returns:
+        The previously installed hook (None if there was none).
+    """
+    global _command_hook
+    previous = _command_hook
+    _command_hook = hook
+    return previous
+
+
+def get_command_hook() -> Any:
+    """Return the installed command hook, or None."""
+    return _command_hook
+
+
+def pause(seconds: float) -> None:
+    """Sleep between probe samples; skipped when the hook disables pauses."""
+    hook = _command_hook
+    if hook is not None and getattr(hook, "skip_pauses", False):
+        return
+    time.sleep(seconds)
+
+
+def _read_live(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as fh:
+        return fh.read()
+
+
+def _list_live(path: str) -> list[str]:
+    return sorted(entry.name for entry in Path(path).iterdir())
+
+
+def read_system_file(path: str) -> str:
+    """Read a host state file (e.g. /proc/cpuinfo) as text via the hook.
+
+    Raises:
+        OSError: As `open()` would; FileNotFoundError when absent (or, in
+            replay, not captured)
+    """
+    hook = _command_hook
+    if hook is None:
+        return _read_live(path)
+    return hook.read_file(path, execute=lambda: _read_live(path))
+
+
+def list_system_dir(path: str) -> list[str]:
+    """Return the sorted entry names of a host directory (e.g. /sys/block).
+
+    Raises:
+        OSError: As `Path.iterdir()` would; FileNotFoundError when absent
+            (or, in replay, not captured)
+    """
+    hook = _command_hook
+    if hook is None:
+        return _list_live(path)
+    return hook.list_dir(path, execute=lambda: _list_live(path))
+
+
+def get_command_records() -> list[CommandRecord]:
+    """Return a copy of every command record captured so far."""
+    return _metrics.snapshot()
+
+
+def command_metrics_summary() -> dict[str, Any]:
+    """Aggregate recorded invocations per tool for report export.
+
+    Returns:
+        Dictionary with invocation totals, outcome counts and per-tool
+        timing/byte/CPU aggregates sorted by tool name.
+    """
+    records = _metrics.snapshot()
+    outcomes: dict[str, int] = {}
+    by_tool: dict[str, dict[str, Any]] = {}
+
+    for record in records:
+        outcomes[record.outcome] = outcomes.get(record.outcome, 0) + 1
+        tool = by_tool.setdefault(
+            record.tool,
+            {
+                "invocations": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "failures": 0,
+                "timeouts": 0,
+                "truncated": 0,
+                "stdout_bytes": 0,
+                "stderr_bytes": 0,
+                "user_cpu_seconds": 0.0,
+                "system_cpu_seconds": 0.0,
+            },
+        )
+        tool["invocations"] += 1
+        tool["total_ms"] += record.duration_ms
+        tool["max_ms"] = max(tool["max_ms"], record.duration_ms)
+        if record.outcome not in {OUTCOME_OK, OUTCOME_TERMINATED}:
+            tool["failures"] += 1
+        if record.outcome == OUTCOME_TIMEOUT:
+            tool["timeouts"] += 1
+        if record.truncated:
+            tool["truncated"] += 1
+        tool["stdout_bytes"] += record.stdout_bytes
+        tool["stderr_bytes"] += record.stderr_bytes
+        if record.usage is not None:
+            tool["user_cpu_seconds"] += record.usage.user_cpu_seconds
+            tool["system_cpu_seconds"] += record.usage.system_cpu_seconds
+
+    for tool in by_tool.values():
+        tool["total_ms"] = round(tool["total_ms"], 3)
+        tool["max_ms"] = round(tool["max_ms"], 3)
+        tool["user_cpu_seconds"] = round(tool["user_cpu_seconds"], 4)
+        tool["system_cpu_seconds"] = round(tool["system_cpu_seconds"], 4)
+
+    return {
+        "invocations": len(records),
+        "total_duration_ms": round(sum(r.duration_ms for r in records), 3),
+        "outcomes": dict(sorted(outcomes.items())),
+        "by_tool": dict(sorted(by_tool.items())),
+    }
+
+
+def _tool_name(argv: Sequence[str]) -> str:
+    if not argv:
+        return "unknown"
+    return os.path.basename(str(argv[0])) or str(argv[0])
+
+
+def session_kwargs() -> dict[str, Any]:
+    """Popen kwargs that place the child in its own process group."""
+    if os.name == "nt":
+        return {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+    return {"start_new_session": True}
+
+
+def _classify(returncode: int | None) -> str:
+    if returncode is None:
+        return OUTCOME_TERMINATED
+    if returncode == 0:
+        return OUTCOME_OK
+    if returncode < 0:
+        return OUTCOME_SIGNALED
+    return OUTCOME_NONZERO
+
+
+class _BoundedReader(threading.Thread):
+    """Drain a pipe into a bounded buffer, discarding bytes past the cap."""
+
+    def __init__(self, stream: IO[bytes], limit: int) -> None:
+        super().__init__(daemon=True)
+        self._stream = stream
+        self._limit = max(0, int(limit))
+        self.buffer = bytearray()
+        self.total_bytes = 0
+        self.truncated = False
+
+    def run(self) -> None:
+        try:
+            while True:
+                chunk = self._stream.read1(_READ_CHUNK_BYTES)  # type: ignore[attr-defined]
+                if not chunk:
+                    break
+                self.total_bytes += len(chunk)
+                room = self._limit - len(self.buffer)
+                if room > 0:
+                    self.buffer += chunk[:room]
+                if len(chunk) > room:
+                    self.truncated = True
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                self._stream.close()
+            except OSError:
+                pass
+
+
+def _signal_group(proc: subprocess.Popen, sig: int) -> None:
+    try:
+        if os.name == "nt":
+            if sig == signal.SIGTERM:
+                proc.terminate()
+            else:
+                proc.kill()
+        else:
+            os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _usage_from_rusage(usage: Any) -> ChildUsage:
+    return ChildUsage(
+        user_cpu_seconds=round(float(usage.ru_utime), 4),
+        system_cpu_seconds=round(float(usage.ru_stime), 4),
+        max_rss_kb=int(usage.ru_maxrss),
+    )
+
+
+class _Reaper(threading.Thread):
+    """Reap one child with `os.wait4` so its rusage is attributable."""
+
+    def __init__(self, proc: subprocess.Popen) -> None:
+        super().__init__(daemon=True)
+        self._proc = proc
+        self.usage: ChildUsage | None = None
+
+    def run(self) -> None:
+        try:
+            _, status, usage = os.wait4(self._proc.pid, 0)
+        except ChildProcessError:
+            self._proc.wait()
+            return
+        self.usage = _usage_from_rusage(usage)
+        self._proc.returncode = os.waitstatus_to_exitcode(status)
+
+
+# Reapers still blocked on a child that outlived its wait budget, by pid.
+_pending_reapers: dict[int, _Reaper] = {}
+
+
+def _wait(
+    proc: subprocess.Popen, timeout: float | None
+) -> tuple[bool, ChildUsage | None]:
+    """Wait for `proc`; return (exited, usage).
+
+    On POSIX the child is reaped with `os.wait4` so its rusage can be
+    attributed to this invocation rather than to all children.
+    """
+    if proc.returncode is not None:
+        return True, None
+
+    if not hasattr(os, "wait4"):
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False, None
+        return True, None
+
+    reaper = _pending_reapers.pop(proc.pid, None)
+    if reaper is None:
+        reaper = _Reaper(proc)
+        reaper.start()
+    reaper.join(timeout)
+    if reaper.is_alive():
+        _pending_reapers[proc.pid] = reaper
+        return False, None
+    return True, reaper.usage
+
+
+def _kill_group(proc: subprocess.Popen, grace_seconds: float) -> ChildUsage | None:
+    """SIGTERM the process group, escalate to SIGKILL, then reap the leader."""
+    _signal_group(proc, signal.SIGTERM)
+    exited, usage = _wait(proc, grace_seconds)
+    # Escalate unconditionally: group members may outlive the leader.
+    _signal_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+    if not exited:
+        exited, usage = _wait(proc, None)
+    return usage
+
+
+def decode_output(payload: bytes, text: bool) -> Any:
+    """Return captured bytes as-is, or decoded the way `text=True` promises."""
+    if not text:
+        return bytes(payload)
+    decoded = payload.decode(locale.getpreferredencoding(False), errors="replace")
+    return decoded.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _record(
+    argv: Sequence[str],
+    outcome: str,
+    returncode: int | None,
+    started: float,
+    stdout_reader: _BoundedReader | None = None,
+    stderr_reader: _BoundedReader | None = None,
+    usage: ChildUsage | None = None,
+) -> CommandRecord:
+    record = CommandRecord(
+        tool=_tool_name(argv),
+        argv=tuple(str(a) for a in argv),
+        outcome=outcome,
+        returncode=returncode,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        stdout_bytes=stdout_reader.total_bytes if stdout_reader else 0,
+        stderr_bytes=stderr_reader.total_bytes if stderr_reader else 0,
+        truncated=bool(
+            (stdout_reader and stdout_reader.truncated)
+            or (stderr_reader and stderr_reader.truncated)
+        ),
+        usage=usage,
+    )
+    _metrics.add(record)
+    return record
+
+
+def run_command(
+    argv: Sequence[str],
+    *,
+    timeout: float | None,
+    text: bool = False,
+    input: str | bytes | None = None,
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+) -> CommandResult:
+    """Run an external command with bounded capture and group teardown.
+
+    Args:
+        argv: Command and arguments (no shell)
+        timeout: Seconds before the whole process group is killed
+        text: Decode stdout/stderr to str (locale encoding, newlines
+            normalized) instead of returning bytes
+        input: Optional data written to the child's stdin
+        max_output_bytes: Per-stream capture cap; excess output is drained
+            and discarded and the result is marked `truncated`
+        env: Optional environment override
+        cwd: Optional working directory
+
+    Returns:
+        CommandResult (a `subprocess.CompletedProcess`). Non-zero exit codes
+        never raise; callers inspect `returncode` / `outcome`.
+
+    Raises:
+        FileNotFoundError: The executable does not exist
+        OSError: The process could not be spawned
+        subprocess.TimeoutExpired: The command exceeded `timeout`
+    """
+    argv = [str(a) for a in argv]
+    hook = _command_hook
+    if hook is None:
+        return _run_live(argv, timeout, text, input, max_output_bytes, env, cwd)
+
+    def execute() -> CommandResult:
+        # Hooks always see raw bytes so captures are encoding-independent.
+        return _run_live(argv, timeout, False, input, max_output_bytes, env, cwd)
+
+    return hook.run_command(
+        argv, timeout=timeout, text=text, input=input, execute=execute
+    )
+
+
+def _run_live(
+    argv: list[str],
+    timeout: float | None,
+    text: bool,
+    input: str | bytes | None,
+    max_output_bytes: int,
+    env: dict[str, str] | None,
+    cwd: str | None,
+) -> CommandResult:
+    started = time.perf_counter()
+
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=cwd,
+            **session_kwargs(),
+        )
+    except FileNotFoundError:
+        _record(argv, OUTCOME_NOT_FOUND, None, started)
+        raise
+    except OSError:
+        _record(argv, OUTCOME_SPAWN_FAILED, None, started)
+        raise
+
+    stdout_reader = _BoundedReader(proc.stdout, max_output_bytes)  # type: ignore[arg-type]
+    stderr_reader = _BoundedReader(proc.stderr, max_output_bytes)  # type: ignore[arg-type]
+    stdout_reader.start()
+    stderr_reader.start()
+
+    if input is not None and proc.stdin is not None:
+        payload = input.encode("utf-8") if isinstance(input, str) else input
+        try:
+            proc.stdin.write(payload)
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    exited, usage = _wait(proc, timeout)
+    if not exited:
+        usage = _kill_group(proc, KILL_GRACE_SECONDS)
+        stdout_reader.join()
+        stderr_reader.join()
+        _record(
+            argv,
+            OUTCOME_TIMEOUT,
+            proc.returncode,
+            started,
+            stdout_reader,
+            stderr_reader,
+            usage,
+        )
+        raise subprocess.TimeoutExpired(
+            argv,
+            timeout or 0,
+            output=decode_output(stdout_reader.buffer, text),
+            stderr=decode_output(stderr_reader.buffer, text),
+        )
+
+    # Grandchildren that inherited our pipes can keep them open after the
+    # leader exits; bound the drain by the remaining timeout budget.
+    remaining = None
+    if timeout is not None:
+        remaining = max(0.0, timeout - (time.perf_counter() - started))
+    stdout_reader.join(remaining)
+    stderr_reader.join(remaining)
+    if stdout_reader.is_alive() or stderr_reader.is_alive():
+        _signal_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+        stdout_reader.join()
+        stderr_reader.join()
+
+    record = _record(
+        argv,
+        _classify(proc.returncode),
+        proc.returncode,
+        started,
+        stdout_reader,
+        stderr_reader,
+        usage,
+    )
+    return CommandResult(
+        argv,
+        int(proc.returncode or 0),
+        decode_output(stdout_reader.buffer, text),
+        decode_output(stderr_reader.buffer, text),
+        outcome=record.outcome,
+        duration_ms=record.duration_ms,
+        truncated=record.truncated,
+        usage=usage,
+    )
+
+
+class ManagedProcess:
+    """Background process running in its own process group.
+
+    Used for long-running load generators (stress-ng, sysbench) that the
+    caller samples around and then tears down with `terminate()`.
+    """
+
+    def __init__(self, argv: Sequence[str], proc: subprocess.Popen, started: float):
+        self.argv = [str(a) for a in argv]
+        self._proc = proc
+        self._started = started
+        self._usage: ChildUsage | None = None
+        self._recorded = False
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    @property
+    def returncode(self) -> int | None:
+        return self._proc.returncode
+
+    @property
+    def stdin(self) -> IO[bytes] | None:
+        """Writable pipe to the child (only with `spawn_command(pipes=True)`)."""
+        return self._proc.stdin
+
+    @property
+    def stdout(self) -> IO[bytes] | None:
+        """Readable pipe from the child (only with `spawn_command(pipes=True)`)."""
+        return self._proc.stdout
+
+    def poll(self) -> int | None:
+        """Return the exit code if the process has finished, else None."""
+        exited, usage = _wait(self._proc, 0)
+        if exited:
+            self._usage = self._usage or usage
+            self._finish(_classify(self._proc.returncode))
+        return self._proc.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for exit; raises `subprocess.TimeoutExpired` on timeout."""
+        exited, usage = _wait(self._proc, timeout)
+        if not exited:
+            raise subprocess.TimeoutExpired(self.argv, timeout or 0)
+        self._usage = self._usage or usage
+        self._finish(_classify(self._proc.returncode))
+        return int(self._proc.returncode or 0)
+
+    def terminate(self, grace_seconds: float = KILL_GRACE_SECONDS) -> None:
+        """Stop the whole process group (SIGTERM, then SIGKILL)."""
+        if self._proc.returncode is None:
+            self._usage = _kill_group(self._proc, grace_seconds)
+            self._finish(OUTCOME_TERMINATED)
+        else:
+            # Leader already exited; sweep any surviving group members.
+            _signal_group(self._proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+            self._finish(_classify(self._proc.returncode))
+        # stdout is left to the owner: a reader thread may still be draining it.
+        if self._proc.stdin is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+
+    def _finish(self, outcome: str) -> None:
+        if self._recorded:
+            return
+        self._recorded = True
+        _record(
+            self.argv,
+            outcome,
+            self._proc.returncode,
+            self._started,
+            usage=self._usage,
+        )
+
+    def __enter__(self) -> "ManagedProcess":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.terminate()
+
+
+def spawn_command(
+    argv: Sequence[str],
+    *,
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+    pipes: bool = False,
+) -> ManagedProcess:
+    """Start a background command in a new process group.
+
+    Output is discarded unless `pipes` is set, in which case stdin/stdout
+    are exposed as binary pipes for request/response helpers (stderr is
+    still discarded). Use `run_command` for one-shot commands.
+
+    Raises:
+        FileNotFoundError: The executable does not exist
+        OSError: The process could not be spawned
+    """
+    argv = [str(a) for a in argv]
+    hook = _command_hook
+    if hook is None:
+        return _spawn_live(argv, env, cwd, pipes)
+    return hook.spawn_command(argv, execute=lambda: _spawn_live(argv, env, cwd, pipes))
+
+
+def _spawn_live(
+    argv: list[str], env: dict[str, str] | None, cwd: str | None, pipes: bool
+) -> ManagedProcess:
+    started = time.perf_counter()
+    stream = subprocess.PIPE if pipes else subprocess.DEVNULL
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdin=stream,
+            stdout=stream,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            cwd=cwd,
+            **session_kwargs(),
+        )
+    except FileNotFoundError:
+        _record(argv, OUTCOME_NOT_FOUND, None, started)
+        raise
+    except OSError:
+        _record(argv, OUTCOME_SPAWN_FAILED, None, started)
+        raise
+    return ManagedProcess(argv, proc, started)
@@ -0,0 +1,530 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Batch scoring of many reports at once.
+
+`build_probe_table` flattens the `tests` of N reports into a column-oriented
+`ProbeTable` (one list per probe metric), and `score_fleet` derives every
+category score, plus the overall score and grade for every profile, in a
+single pass over those columns. Results are identical to running
+`compose_report` and `compute_overall_score` per report; the scalar functions
+in `agent.scoring` remain the reference.
+
+NumPy is used when installed and falls back to plain Python otherwise.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from agent import jsonio
+from agent.scoring import (
+    PROFILE_WEIGHTS,
+    grade_from_score,
+    score_gpu,
+    score_network,
+    score_security,
+)
+
+BACKENDS = ("auto", "numpy", "python")
+CATEGORIES = (
+    "storage",
+    "battery",
+    "memory",
+    "cpu_thermal",
+    "gpu",
+    "network",
+    "security",
+)
+
+_NAN = float("nan")
+_BATTERY_DEFAULT, _BATTERY_OK, _BATTERY_MISSING = 0, 1, 2
+_SEVERITY_CODES = {"moderate": 1, "high": 2, "critical": 3}
+_SEVERITY_PENALTIES = (0, 5, 10, 15)
+
+
+class FleetScoringError(ValueError):
+    """Raised for an unknown or unavailable scoring backend."""
+
+
+@dataclass
+class ProbeTable:
+    """Column-oriented probe metrics for N reports.
+
+    Per-report columns hold one entry per report. SMART results are a
+    separate set of rows (one per ok `smartctl*` test) keyed back to their
+    report by `smart_report`. Missing or unparseable numbers are NaN.
+    """
+
+    report_ids: List[str] = field(default_factory=list)
+    # SMART rows
+    smart_report: List[int] = field(default_factory=list)
+    smart_has_attrs: List[bool] = field(default_factory=list)
+    smart_has_nvme: List[bool] = field(default_factory=list)
+    smart_pending: List[int] = field(default_factory=list)
+    smart_reallocated: List[int] = field(default_factory=list)
+    smart_nvme_pct: List[float] = field(default_factory=list)
+    # Per-report columns
+    disk_present: List[bool] = field(default_factory=list)
+    disk_avg_mbps: List[float] = field(default_factory=list)
+    battery_state: List[int] = field(default_factory=list)
+    battery_health_pct: List[float] = field(default_factory=list)
+    memory_empty: List[bool] = field(default_factory=list)
+    memory_status_error: List[bool] = field(default_factory=list)
+    memory_error_count: List[int] = field(default_factory=list)
+    memory_pass_count: List[int] = field(default_factory=list)
+    memory_legacy_errors: List[bool] = field(default_factory=list)
+    cpu_events_per_second: List[float] = field(default_factory=list)
+    thermal_present: List[bool] = field(default_factory=list)
+    thermal_peak_temp: List[float] = field(default_factory=list)
+    thermal_throttled: List[bool] = field(default_factory=list)
+    thermal_severity: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.report_ids)
+
+
+def _first(tests: List[Dict[str, Any]], name: str) -> Optional[Dict[str, Any]]:
+    for test in tests:
+        if test.get("name") == name:
+            return test
+    return None
+
+
+def _as_int(value: Any) -> float:
+    try:
+        return int(value)
+    except Exception:
+        return _NAN
+
+
+def _as_float(value: Any) -> float:
+    try:
+        number = float(value)
+    except Exception:
+        return _NAN
+    # A real NaN fails every threshold (lowest band); keep NaN for "no value".
+    return -math.inf if math.isnan(number) else number
+
+
+def _append_smart(table: ProbeTable, index: int, data: Dict[str, Any]) -> None:
+    attrs = data.get("attributes", {}) if data else {}
+    try:
+        pending = int(attrs.get("Current_Pending_Sector", 0) or 0)
+        reallocated = int(attrs.get("Reallocated_Sector_Ct", 0) or 0)
+    except Exception:
+        pending = reallocated = 0
+    nvme_pct = (data or {}).get("nvme_percentage_used")
+    table.smart_report.append(index)
+    table.smart_has_attrs.append(bool(attrs))
+    table.smart_has_nvme.append(nvme_pct is not None)
+    table.smart_pending.append(pending)
+    table.smart_reallocated.append(reallocated)
+    table.smart_nvme_pct.append(_NAN if nvme_pct is None else _as_int(nvme_pct))
+
+
+def _disk_avg(data: Dict[str, Any]) -> float:
+    read_mbps = data.get("read_mbps") if data else None
+    write_mbps = data.get("write_mbps") if data else None
+    if read_mbps is None and write_mbps is None:
+        return _NAN
+    try:
+        return _as_float((float(read_mbps or 0) + float(write_mbps or 0)) / 2)
+    except Exception:
+        return _NAN
+
+
+def _append_report(table: ProbeTable, report_id: str, tests: List[Any]) -> None:
+    index = len(table.report_ids)
+    table.report_ids.append(report_id)
+    tests = [test for test in tests if isinstance(test, dict)]
+
+    for test in tests:
+        if str(test.get("name", "")).startswith("smartctl") and (
+            test.get("status") == "ok"
+        ):
+            _append_smart(table, index, test.get("data", {}))
+
+    disk = _first(tests, "disk_performance")
+    disk_ok = disk is not None and disk.get("status") == "ok"
+    table.disk_present.append(disk_ok)
+    table.disk_avg_mbps.append(_disk_avg(disk.get("data", {})) if disk_ok else _NAN)
+
+    battery = _first(tests, "battery_health")
+    state, health_pct = _BATTERY_DEFAULT, _NAN
+    if battery is not None and battery.get("status") == "ok":
+        data = battery.get("data", {})
+        state = _BATTERY_OK
+        pct = data.get("health_pct") if data else None
+        health_pct = _NAN if pct is None else _as_int(pct)
+    elif battery is not None and battery.get("status") == "missing":
+        state = _BATTERY_MISSING
+    table.battery_state.append(state)
+    table.battery_health_pct.append(health_pct)
+
+    memory = _first(tests, "memory_test")
+    mem_info: Dict[str, Any] = {}
+    if memory is not None and memory.get("status") in {"ok", "error"}:
+        mem_info = memory.get("data", {}) or {}
+    try:
+        error_count = int(mem_info.get("error_count", 0) or 0)
+        pass_count = int(mem_info.get("pass_count", 0) or 0)
+    except Exception:
+        error_count = pass_count = 0
+    table.memory_empty.append(not mem_info)
+    table.memory_status_error.append(mem_info.get("status") == "error")
+    table.memory_error_count.append(error_count)
+    table.memory_pass_count.append(pass_count)
+    table.memory_legacy_errors.append(bool(mem_info.get("errors")))
+
+    cpu_thermal: Dict[str, Any] = {}
+    cpu = _first(tests, "cpu_benchmark")
+    if cpu is not None and cpu.get("status") == "ok":
+        cpu_thermal = dict(cpu.get("data", {}) or {})
+    stress = _first(tests, "thermal_stress")
+    if stress is not None and stress.get("status") == "ok":
+        stress_data = stress.get("data", {})
+        cpu_thermal.update(
+            {
+                "peak_temp": stress_data.get("peak_temp"),
+                "throttled": stress_data.get("throttled"),
+                "thermal_severity": stress_data.get("thermal_severity"),
+            }
+        )
+    eps = cpu_thermal.get("events_per_second")
+    peak_temp = cpu_thermal.get("peak_temp")
+    throttled = cpu_thermal.get("throttled")
+    table.cpu_events_per_second.append(_NAN if eps is None else _as_float(eps))
+    table.thermal_present.append(peak_temp is not None or throttled is not None)
+    table.thermal_peak_temp.append(_as_float(peak_temp) if peak_temp else 0.0)
+    table.thermal_throttled.append(bool(throttled))
+    table.thermal_severity.append(
+        _SEVERITY_CODES.get(cpu_thermal.get("thermal_severity"), 0)
+    )
+
+
+def build_probe_table(
+    reports: Iterable[Dict[str, Any]], report_ids: Optional[Sequence[str]] = None
+) -> ProbeTable:
+    """Flatten the `tests` of each report into a `ProbeTable`.
+
+    Args:
+        reports: Parsed report.json payloads
+        report_ids: Optional identifiers (default: the report's position)
+
+    Returns:
+        ProbeTable with one per-report row for each report, in input order
+    """
+    table = ProbeTable()
+    for index, report in enumerate(reports):
+        report_id = report_ids[index] if report_ids is not None else str(index)
+        _append_report(table, report_id, report.get("tests") or [])
+    return table
+
+
+def load_probe_table(report_paths: Iterable[Path]) -> ProbeTable:
+    """Build a `ProbeTable` from report.json files, keyed by path.
+
+    Raises:
+        OSError: A report could not be read
+        ValueError: A report is not valid JSON
+    """
+    table = ProbeTable()
+    for path in report_paths:
+        report = jsonio.loads(Path(path).read_text(encoding="utf-8"))
+        _append_report(table, str(path), (report or {}).get("tests") or [])
+    return table
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise FleetScoringError(f"Unknown scoring backend: {backend}")
+    if backend == "auto":
+        return "numpy" if _numpy() is not None else "python"
+    if backend == "numpy" and _numpy() is None:
+        raise FleetScoringError("The numpy backend requires numpy to be installed")
+    return backend
+
+
+def _category_scores_numpy(table: ProbeTable) -> Dict[str, Any]:
+    np = _numpy()
+    count = len(table)
+
+    smart_report = np.asarray(table.smart_report, dtype=np.int64)
+    nvme_pct = np.asarray(table.smart_nvme_pct, dtype=np.float64)
+    smart_scores = np.select(
+        [
+            ~np.asarray(table.smart_has_attrs, dtype=bool)
+            & ~np.asarray(table.smart_has_nvme, dtype=bool),
+            (np.asarray(table.smart_pending, dtype=np.int64) > 0)
+            | (np.asarray(table.smart_reallocated, dtype=np.int64) > 0),
+            nvme_pct >= 70,
+        ],
+        [50, 30, 40],
+        90,
+    )
+    # Storage is the worst SMART result per report; 50 when there is none.
+    storage = np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(storage, smart_report, smart_scores)
+    storage[storage == np.iinfo(np.int64).max] = 50
+
+    disk_avg = np.asarray(table.disk_avg_mbps, dtype=np.float64)
+    disk = np.select(
+        [np.isnan(disk_avg), disk_avg >= 400, disk_avg >= 250, disk_avg >= 120],
+        [70, 95, 85, 70],
+        45,
+    )
+    blended = np.round(storage * 0.7 + disk * 0.3).astype(np.int64)
+    storage = np.where(np.asarray(table.disk_present, dtype=bool), blended, storage)
+
+    state = np.asarray(table.battery_state, dtype=np.int64)
+    health = np.asarray(table.battery_health_pct, dtype=np.float64)
+    battery = np.select(
+        [
+            state == _BATTERY_MISSING,
+            state == _BATTERY_DEFAULT,
+            np.isnan(health),
+            health >= 90,
+            health >= 70,
+            health >= 50,
+        ],
+        [100, 80, 80, 95, 80, 60],
+        30,
+    )
+
+    pass_count = np.asarray(table.memory_pass_count, dtype=np.int64)
+    memory = np.select(
+        [
+            np.asarray(table.memory_empty, dtype=bool),
+            np.asarray(table.memory_status_error, dtype=bool),
+            np.asarray(table.memory_error_count, dtype=np.int64) > 0,
+            pass_count >= 2,
+            pass_count == 1,
+            np.asarray(table.memory_legacy_errors, dtype=bool),
+        ],
+        [90, 20, 25, 95, 90, 20],
+        85,
+    )
+
+    eps = np.asarray(table.cpu_events_per_second, dtype=np.float64)
+    base = np.select(
+        [np.isnan(eps), eps >= 2000, eps >= 1200, eps >= 700], [85, 95, 85, 70], 50
+    )
+    peak = np.asarray(table.thermal_peak_temp, dtype=np.float64)
+    penalties = (
+        np.select([peak >= 95, peak >= 85, peak >= 75], [30, 15, 5], 0)
+        + np.asarray(table.thermal_throttled, dtype=np.int64) * 20
+        + np.asarray(_SEVERITY_PENALTIES, dtype=np.int64)[
+            np.asarray(table.thermal_severity, dtype=np.int64)
+        ]
+    )
+    cpu_thermal = np.where(
+        np.asarray(table.thermal_present, dtype=bool),
+        np.maximum(0, base - penalties),
+        base,
+    )
+
+    return {
+        "storage": storage,
+        "battery": battery,
+        "memory": memory,
+        "cpu_thermal": cpu_thermal,
+        "gpu": np.full(count, score_gpu({}), dtype=np.int64),
+        "network": np.full(count, score_network({}), dtype=np.int64),
+        "security": np.full(count, score_security({}), dtype=np.int64),
+    }
+
+
+def _band(value: float, bands: Sequence[tuple], default: int) -> int:
+    for threshold, score in bands:
+        if value >= threshold:
+            return score
+    return default
+
+
+def _category_scores_python(table: ProbeTable) -> Dict[str, List[int]]:
+    count = len(table)
+
+    worst: List[Optional[int]] = [None] * count
+    for row, index in enumerate(table.smart_report):
+        if not table.smart_has_attrs[row] and not table.smart_has_nvme[row]:
+            score = 50
+        elif table.smart_pending[row] > 0 or table.smart_reallocated[row] > 0:
+            score = 30
+        elif table.smart_nvme_pct[row] >= 70:
+            score = 40
+        else:
+            score = 90
+        if worst[index] is None or score < worst[index]:
+            worst[index] = score
+
+    storage: List[int] = []
+    for index in range(count):
+        score = 50 if worst[index] is None else worst[index]
+        if table.disk_present[index]:
+            avg = table.disk_avg_mbps[index]
+            disk = (
+                70
+                if math.isnan(avg)
+                else _band(avg, ((400, 95), (250, 85), (120, 70)), 45)
+            )
+            score = int(round(score * 0.7 + disk * 0.3))
+        storage.append(score)
+
+    battery: List[int] = []
+    for state, health in zip(table.battery_state, table.battery_health_pct):
+        if state == _BATTERY_MISSING:
+            battery.append(100)
+        elif state == _BATTERY_DEFAULT or math.isnan(health):
+            battery.append(80)
+        else:
+            battery.append(_band(health, ((90, 95), (70, 80), (50, 60)), 30))
+
+    memory: List[int] = []
+    for index in range(count):
+        pass_count = table.memory_pass_count[index]
+        if table.memory_empty[index]:
+            memory.append(90)
+        elif table.memory_status_error[index]:
+            memory.append(20)
+        elif table.memory_error_count[index] > 0:
+            memory.append(25)
+        elif pass_count >= 2:
+            memory.append(95)
+        elif pass_count == 1:
+            memory.append(90)
+        elif table.memory_legacy_errors[index]:
+            memory.append(20)
+        else:
+            memory.append(85)
+
+    cpu_thermal: List[int] = []
+    for index in range(count):
+        eps = table.cpu_events_per_second[index]
+        base = (
+            85
+            if math.isnan(eps)
+            else _band(eps, ((2000, 95), (1200, 85), (700, 70)), 50)
+        )
+        if table.thermal_present[index]:
+            penalties = (
+                _band(table.thermal_peak_temp[index], ((95, 30), (85, 15), (75, 5)), 0)
+                + 20 * table.thermal_throttled[index]
+                + _SEVERITY_PENALTIES[table.thermal_severity[index]]
+            )
+            base = max(0, base - penalties)
+        cpu_thermal.append(base)
+
+    return {
+        "storage": storage,
+        "battery": battery,
+        "memory": memory,
+        "cpu_thermal": cpu_thermal,
+        "gpu": [score_gpu({})] * count,
+        "network": [score_network({})] * count,
+        "security": [score_security({})] * count,
+    }
+
+
+def _overall_numpy(scores: Dict[str, Any], weights: Dict[str, float]) -> Any:
+    np = _numpy()
+    total_weighted = np.zeros(len(scores["storage"]), dtype=np.float64)
+    total_weight = 0
+    # Same accumulation order as `compute_overall_score`, so float results match.
+    for category, weight in weights.items():
+        if category in scores:
+            total_weighted = total_weighted + scores[category] * weight
+            total_weight += weight
+    if total_weight <= 0:
+        return np.full(len(total_weighted), 50, dtype=np.int64)
+    return np.trunc(total_weighted / total_weight).astype(np.int64)
+
+
+def _overall_python(
+    scores: Dict[str, List[int]], weights: Dict[str, float]
+) -> List[int]:
+    totals = [0.0] * len(scores["storage"])
+    total_weight = 0
+    for category, weight in weights.items():
+        if category in scores:
+            column = scores[category]
+            totals = [total + column[i] * weight for i, total in enumerate(totals)]
+            total_weight += weight
+    if total_weight <= 0:
+        return [50] * len(totals)
+    return [int(total / total_weight) for total in totals]
+
+
+def score_fleet(
+    table: ProbeTable,
+    profiles: Optional[Iterable[str]] = None,
+    backend: str = "auto",
+) -> Dict[str, Any]:
+    """Score every report in `table` for every profile in one pass.
+
+    Args:
+        table: Probe metrics from `build_probe_table` / `load_probe_table`
+        profiles: Profiles to compute overall scores for (default: all of
+            `PROFILE_WEIGHTS`); unknown names use the default weights
+        backend: "numpy", "python" or "auto" (numpy when installed)
+
+    Returns:
+        Dict with `report_ids`, `backend`, per-category `scores`, and per-profile
+        `overall` scores and `grades`, each a list aligned with `report_ids`
+
+    Raises:
+        FleetScoringError: Unknown backend, or numpy requested but missing
+    """
+    resolved = _resolve_backend(backend)
+    profiles = list(PROFILE_WEIGHTS) if profiles is None else list(profiles)
+
+    if resolved == "numpy":
+        np = _numpy()
+        columns = _category_scores_numpy(table)
+        overall = {
+            profile: _overall_numpy(
+                columns, PROFILE_WEIGHTS.get(profile, PROFILE_WEIGHTS["default"])
+            )
+            for profile in profiles
+        }
+        grades = {
+            profile: np.select(
+                [values >= 90, values >= 75, values >= 50],
+                ["Excellent", "Good", "Fair"],
+                "Poor",
+            ).tolist()
+            for profile, values in overall.items()
+        }
+        scores = {category: columns[category].tolist() for category in CATEGORIES}
+        overall = {profile: values.tolist() for profile, values in overall.items()}
+    else:
+        scores = _category_scores_python(table)
+        overall = {
+            profile: _overall_python(
+                scores, PROFILE_WEIGHTS.get(profile, PROFILE_WEIGHTS["default"])
+            )
+            for profile in profiles
+        }
+        grades = {
+            profile: [grade_from_score(value) for value in values]
+            for profile, values in overall.items()
+        }
+
+    return {
+        "report_ids": list(table.report_ids),
+        "backend": resolved,
+        "scores": scores,
+        "overall": overall,
+        "grades": grades,
+    }
@@ -0,0 +1,128 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""JSON encoding/decoding with an optional fast backend.
+
+`loads` and `dumps` use orjson when it is installed and the standard library
+otherwise. Inputs orjson rejects but the standard library accepts (NaN
+literals, integers beyond 64 bits, non-string keys) fall back to the
+standard library, so results never depend on which backend is present.
+Both backends encode NaN and +/-Infinity as `null`, which is what orjson
+does; the standard library's `NaN` / `Infinity` tokens are not valid JSON.
+
+`canonical_bytes` is the encoding that manifest hashes and signatures are
+computed over. It always uses the standard library encoder (sorted keys,
+no whitespace, ASCII escapes): orjson formats float exponents, control
+characters and non-ASCII text differently, and any difference would change
+existing manifest hashes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+BACKENDS = ("orjson", "json")
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+@lru_cache(maxsize=1)
+def _orjson() -> Any:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def backend() -> str:
+    """Return the active backend name ("orjson" or "json")."""
+    return "orjson" if _orjson() is not None else "json"
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON text or UTF-8 bytes.
+
+    Raises:
+        json.JSONDecodeError: Invalid JSON (orjson's error is a subclass)
+    """
+    orjson = _orjson()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # re-parse below for stdlib-compatible acceptance and errors
+    return json.loads(data)
+
+
+def dump_bytes(
+    obj: Any,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Encode `obj` as UTF-8 JSON.
+
+    Args:
+        obj: Value to encode
+        indent: 2 for human-readable output, None for compact output
+            (no whitespace) for machine-only files
+        sort_keys: Sort object keys
+        default: Called for otherwise unserializable objects
+
+    Raises:
+        TypeError: `obj` is not serializable
+    """
+    orjson = _orjson()
+    if orjson is not None and indent in (None, 2):
+        option = 0
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # non-str keys, >64-bit ints: use the stdlib encoder
+    separators = None if indent is not None else _COMPACT_SEPARATORS
+    options = {"indent": indent, "sort_keys": sort_keys, "separators": separators}
+    try:
+        text = json.dumps(obj, default=default, allow_nan=False, **options)
+    except ValueError:
+        # Rare: a non-finite float. Re-encode with it as null, as orjson does.
+        finite_default = None
+        if default is not None:
+            finite_default = lambda value: _finite(default(value))  # noqa: E731
+        text = json.dumps(_finite(obj), default=finite_default, **options)
+    return text.encode("utf-8")
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of `obj` with NaN and +/-Infinity floats replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def dumps(
+    obj: Any,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Encode `obj` as a JSON string (see `dump_bytes`)."""
+    return dump_bytes(obj, indent=indent, sort_keys=sort_keys, default=default).decode(
+        "utf-8"
+    )
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """Return the canonical encoding used for manifest hashing and signing."""
+    return json.dumps(obj, sort_keys=True, separators=_COMPACT_SEPARATORS).encode(
+        "utf-8"
+    )
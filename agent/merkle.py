@@ -0,0 +1,106 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Merkle-tree helpers for evidence manifest v2.
+
+Files are split into fixed-size chunks. Chunk leaves and interior nodes use
+RFC 6962 style domain separation (`0x00` leaf prefix, `0x01` node prefix) so
+a leaf can never be confused with a node. An odd node at any level is
+promoted unchanged. Each file gets a Merkle root over its chunks, and the
+manifest gets a root over per-file leaves, so a single file or byte range
+can be verified against the manifest root with an inclusion proof.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MERKLE_ALGORITHM = "sha256-rfc6962"
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(data: bytes) -> str:
+    """Hash one leaf (a file chunk or a file record)."""
+    return hashlib.sha256(_LEAF_PREFIX + data).hexdigest()
+
+
+def _node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(
+        _NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)
+    ).hexdigest()
+
+
+def _next_level(level: Sequence[str]) -> List[str]:
+    paired = [
+        _node_hash(level[index], level[index + 1])
+        for index in range(0, len(level) - 1, 2)
+    ]
+    if len(level) % 2:
+        paired.append(level[-1])
+    return paired
+
+
+def merkle_root(leaves: Sequence[str]) -> str:
+    """Return the root over hex `leaves` (the empty tree hashes b"")."""
+    if not leaves:
+        return hashlib.sha256(b"").hexdigest()
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def inclusion_proof(leaves: Sequence[str], index: int) -> List[Dict[str, str]]:
+    """Return the audit path for `leaves[index]`.
+
+    Each step is `{"side": "left" | "right", "hash": <sibling>}`; promoted
+    odd nodes contribute no step.
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"leaf index {index} out of range")
+    proof: List[Dict[str, str]] = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            side = "left" if sibling < index else "right"
+            proof.append({"side": side, "hash": level[sibling]})
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def root_from_proof(leaf: str, proof: Sequence[Dict[str, str]]) -> str:
+    """Fold `proof` over `leaf` and return the implied root."""
+    current = leaf
+    for step in proof:
+        if step.get("side") == "left":
+            current = _node_hash(step["hash"], current)
+        else:
+            current = _node_hash(current, step["hash"])
+    return current
+
+
+def file_record_leaf(path: str, size: int, file_root: str) -> str:
+    """Leaf for a file in the manifest-level tree."""
+    return leaf_hash(f"{path}\0{size}\0{file_root}".encode("utf-8"))
+
+
+def hash_file_chunks(
+    path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[int, str, List[str]]:
+    """Read `path` once, returning `(size, sha256, chunk_leaves)`."""
+    digest = hashlib.sha256()
+    leaves: List[str] = []
+    size = 0
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+            leaves.append(leaf_hash(chunk))
+            size += len(chunk)
+    if not leaves:
+        leaves.append(leaf_hash(b""))
+    return size, digest.hexdigest(), leaves
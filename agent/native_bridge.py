@@ -4,43 +4,437 @@
 Detects the optional `inspecta-native` Rust helper and returns a structured
 capability payload so the Python agent can use native code when available
 while remaining fully functional without it.
+
+Hot-path calls go through a long-lived `inspecta-native --session` process
+(`NativeSession`) when the helper supports it, and fall back to one process
+per call otherwise.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import os
 import shutil
 import subprocess
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
+from . import __version__, jsonio
+from .exec import (
+    KILL_GRACE_SECONDS,
+    ManagedProcess,
+    get_command_hook,
+    run_command,
+    spawn_command,
+)
+from .paths import user_cache_dir
 
-def detect_native_capabilities(
-    binary: str = "inspecta-native", timeout: int = 5
-) -> Dict[str, Any]:
-    """Probe the optional native helper.
+logger = logging.getLogger("inspecta.native")
 
-    Returns a small dictionary describing whether the helper exists,
-    where it lives, and the parsed handshake payload (if available).
-    The agent remains functional even when the helper is missing.
+SESSION_REQUEST_TIMEOUT = 15.0
+SESSION_HEALTH_TIMEOUT = 5.0
+SESSION_MAX_RESTARTS = 3
+SESSION_CHUNK_SIZE = 512
+HANDSHAKE_CACHE_FILE = "native-handshake.json"
+
+
+class NativeSessionError(RuntimeError):
+    """Raised when the persistent native helper session fails."""
+
+
+class _ConnectionLost(NativeSessionError):
+    """The helper process exited or its pipes broke mid-request."""
+
+
+class _Connection:
+    """One helper process plus the requests currently in flight on it."""
+
+    def __init__(self, proc: ManagedProcess) -> None:
+        self.proc = proc
+        self.pending: dict[int, Future] = {}
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.closed = False
+        self.reader = threading.Thread(
+            target=self._read_loop, name="inspecta-native-session", daemon=True
+        )
+        self.reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self.closed and self.proc.poll() is None
+
+    def _read_loop(self) -> None:
+        stdout = self.proc.stdout
+        try:
+            for raw in stdout:  # type: ignore[union-attr]
+                try:
+                    message = jsonio.loads(raw)
+                except json.JSONDecodeError:
+                    logger.debug("Ignoring malformed native session line: %r", raw)
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                with self.lock:
+                    future = self.pending.pop(message.get("id"), None)
+                if future is None:
+                    continue
+                if message.get("ok"):
+                    future.set_result(message.get("result"))
+                else:
+                    future.set_exception(
+                        NativeSessionError(
+                            str(message.get("error") or "native request failed")
+                        )
+                    )
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._fail_pending(_ConnectionLost("native session closed"))
+
+    def _fail_pending(self, exc: NativeSessionError) -> None:
+        with self.lock:
+            self.closed = True
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    def send(self, request_id: int, method: str, params: Any) -> Future:
+        future: Future = Future()
+        line = jsonio.dumps({"id": request_id, "method": method, "params": params})
+        with self.lock:
+            if self.closed:
+                raise _ConnectionLost("native session closed")
+            self.pending[request_id] = future
+        # Writes use their own lock so the reader can keep routing responses
+        # while a large request is blocked on a full pipe.
+        try:
+            with self.write_lock:
+                self.proc.stdin.write(line.encode("utf-8") + b"\n")  # type: ignore
+                self.proc.stdin.flush()  # type: ignore[union-attr]
+        except (OSError, ValueError) as exc:
+            with self.lock:
+                self.pending.pop(request_id, None)
+            raise _ConnectionLost(f"native session write failed: {exc}") from exc
+        return future
+
+    def close(self) -> None:
+        self.proc.terminate(grace_seconds=1.0)
+        self.reader.join(timeout=SESSION_HEALTH_TIMEOUT)
+        self._fail_pending(_ConnectionLost("native session closed"))
+        if self.proc.stdout is not None and not self.reader.is_alive():
+            self.proc.stdout.close()
+
+
+class NativeSession:
+    """Persistent `inspecta-native --session` helper speaking NDJSON.
+
+    Each request line carries an id so several requests can be in flight at
+    once (pipelining); a reader thread routes responses back to waiting
+    futures. The helper is health-checked with `ping` on start and restarted
+    on the next request after a crash or hang, up to `max_restarts` times.
+    """
+
+    def __init__(
+        self,
+        binary_path: str,
+        *,
+        request_timeout: float = SESSION_REQUEST_TIMEOUT,
+        max_restarts: int = SESSION_MAX_RESTARTS,
+    ) -> None:
+        self.binary_path = binary_path
+        self.request_timeout = request_timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.requests = 0
+        self._conn: _Connection | None = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._started = False
+
+    @property
+    def alive(self) -> bool:
+        conn = self._conn
+        return conn is not None and conn.alive
+
+    def _connect(self) -> _Connection:
+        """Return a live connection, (re)starting the helper if needed."""
+        with self._lock:
+            conn = self._conn
+            if conn is not None and conn.alive:
+                return conn
+            if conn is not None:
+                conn.close()
+                self._conn = None
+            if self._started:
+                if self.restarts >= self.max_restarts:
+                    raise NativeSessionError("native session restart limit reached")
+                self.restarts += 1
+                logger.warning(
+                    "Restarting native helper session (%d/%d)",
+                    self.restarts,
+                    self.max_restarts,
+                )
+            self._started = True
+            try:
+                proc = spawn_command([self.binary_path, "--session"], pipes=True)
+            except OSError as exc:
+                raise NativeSessionError(f"native session spawn failed: {exc}") from exc
+            conn = _Connection(proc)
+            self._conn = conn
+
+        try:
+            self._await(
+                conn, self._submit_on(conn, "ping", None), SESSION_HEALTH_TIMEOUT
+            )
+        except NativeSessionError as exc:
+            self._discard(conn)
+            raise NativeSessionError(f"native session health check failed: {exc}")
+        return conn
+
+    def _submit_on(self, conn: _Connection, method: str, params: Any) -> Future:
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self.requests += 1
+        return conn.send(request_id, method, params)
+
+    def _await(self, conn: _Connection, future: Future, timeout: float) -> Any:
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # A hung helper cannot be trusted with later requests either.
+            self._discard(conn)
+            raise _ConnectionLost(f"native session request timed out after {timeout}s")
+
+    def _discard(self, conn: _Connection) -> None:
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+        conn.close()
+
+    def start(self) -> "NativeSession":
+        """Start the helper (if needed) and verify it answers `ping`."""
+        self._connect()
+        return self
+
+    def request_many(
+        self,
+        calls: list[tuple[str, Any]],
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Pipeline several requests and return results in call order.
+
+        If the helper dies mid-batch it is restarted and the batch is retried
+        once; helper-reported errors are raised without retry.
+        """
+        budget = self.request_timeout if timeout is None else timeout
+        for attempt in (0, 1):
+            conn = self._connect()
+            deadline = time.monotonic() + budget
+            try:
+                futures = [
+                    self._submit_on(conn, method, params) for method, params in calls
+                ]
+                return [
+                    self._await(conn, future, max(0.0, deadline - time.monotonic()))
+                    for future in futures
+                ]
+            except _ConnectionLost:
+                self._discard(conn)
+                if attempt:
+                    raise
+        raise NativeSessionError("unreachable")  # pragma: no cover
+
+    def request(
+        self, method: str, params: Any = None, timeout: float | None = None
+    ) -> Any:
+        """Send one request and return its result."""
+        return self.request_many([(method, params)], timeout=timeout)[0]
+
+    def health_check(self) -> bool:
+        """Return True if the helper answers `ping` (restarting if needed)."""
+        try:
+            result = self.request("ping", timeout=SESSION_HEALTH_TIMEOUT)
+        except NativeSessionError:
+            return False
+        return isinstance(result, dict) and result.get("status") == "ok"
+
+    def smart_batch_contract(
+        self,
+        contracts: list[dict[str, Any]],
+        timeout: float | None = None,
+        chunk_size: int = SESSION_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """Run the SMART contract batch, pipelining chunks of `chunk_size`."""
+        size = max(1, chunk_size)
+        chunks = [contracts[i : i + size] for i in range(0, len(contracts), size)]
+        results = self.request_many(
+            [
+                ("smart_batch_contract", {"contracts": chunk})
+                for chunk in chunks or [[]]
+            ],
+            timeout=timeout,
+        )
+        for result in results:
+            if not isinstance(result, dict):
+                raise NativeSessionError("native batch returned invalid payload shape")
+        return _merge_batch_outputs(results)
+
+    def close(self) -> None:
+        """Stop the helper process."""
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+
+def _merge_batch_outputs(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine per-chunk batch outputs: integer counters add, `max_*` keys max."""
+    if len(results) == 1:
+        return results[0]
+
+    merged: dict[str, Any] = dict(results[0])
+    for key in merged:
+        values = [r.get(key) for r in results]
+        numeric = [v for v in values if isinstance(v, int) and not isinstance(v, bool)]
+        if key.startswith("max_"):
+            merged[key] = max(numeric) if numeric else merged[key]
+        elif numeric and len(numeric) == len(values):
+            merged[key] = sum(numeric)
+    statuses = {r.get("status") for r in results}
+    if statuses != {"ok"}:
+        merged["status"] = next(
+            (r.get("status") for r in results if r.get("status") != "ok"), "unknown"
+        )
+    merged["chunks"] = len(results)
+    return merged
+
+
+_sessions: dict[str, NativeSession] = {}
+_unsupported_session_binaries: set[str] = set()
+_sessions_lock = threading.Lock()
+
+
+def get_native_session(binary: str = "inspecta-native") -> NativeSession | None:
+    """Return the shared, started session for `binary`, or None.
+
+    None means the helper is missing, does not speak `--session`, or a
+    command record/replay hook is active (those modes must see every call as
+    a discrete command).
     """
+    if get_command_hook() is not None:
+        return None
     binary_path = shutil.which(binary)
     if not binary_path:
-        return {"available": False, "binary": None, "reason": "not_found"}
+        return None
+
+    with _sessions_lock:
+        if binary_path in _unsupported_session_binaries:
+            return None
+        session = _sessions.get(binary_path)
+        if session is None:
+            session = NativeSession(binary_path)
+            try:
+                session.start()
+            except NativeSessionError as exc:
+                logger.debug("Native session unavailable for %s: %s", binary_path, exc)
+                session.close()
+                _unsupported_session_binaries.add(binary_path)
+                return None
+            _sessions[binary_path] = session
+    return session
+
+
+def close_native_sessions() -> None:
+    """Stop all shared helper sessions and forget unsupported binaries."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _unsupported_session_binaries.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_native_sessions)
 
+
+def _binary_fingerprint(binary_path: str) -> Optional[Dict[str, Any]]:
     try:
-        result = subprocess.run(
-            [binary_path, "--handshake"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
+        stat = os.stat(binary_path)
+    except OSError:
+        return None
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "agent_version": __version__,
+    }
+
+
+def _handshake_cache_path() -> Path:
+    return user_cache_dir() / HANDSHAKE_CACHE_FILE
+
+
+def _load_handshake_cache() -> Dict[str, Any]:
+    try:
+        data = json.loads(_handshake_cache_path().read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def _cached_handshake(
+    binary_path: str, fingerprint: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    entry = _load_handshake_cache().get(binary_path)
+    if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+        return None
+    result = entry.get("result")
+    return result if isinstance(result, dict) else None
+
+
+def _store_handshake(
+    binary_path: str, fingerprint: Dict[str, Any], result: Dict[str, Any]
+) -> None:
+    path = _handshake_cache_path()
+    entries = _load_handshake_cache()
+    entries[binary_path] = {"fingerprint": fingerprint, "result": result}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"version": 1, "entries": entries}, indent=2),
+            encoding="utf-8",
         )
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.debug("Could not write native handshake cache %s: %s", path, exc)
+
+
+def _run_handshake(binary_path: str, timeout: int) -> Dict[str, Any]:
+    try:
+        result = run_command([binary_path, "--handshake"], timeout=timeout, text=True)
     except (OSError, subprocess.SubprocessError) as exc:
         return {"available": False, "binary": binary_path, "reason": str(exc)}
 
+    if result.returncode != 0:
+        return {
+            "available": False,
+            "binary": binary_path,
+            "reason": f"handshake exited with status {result.returncode}",
+        }
+
     payload: Optional[Dict[str, Any]] = None
     try:
-        payload = json.loads(result.stdout)
+        payload = jsonio.loads(result.stdout)
     except json.JSONDecodeError as exc:
         return {
             "available": False,
@@ -58,38 +452,122 @@ def detect_native_capabilities(
     }
 
 
+def _detect(binary: str, timeout: int, use_cache: bool) -> Dict[str, Any]:
+    binary_path = shutil.which(binary)
+    if not binary_path:
+        return {"available": False, "binary": None, "reason": "not_found"}
+
+    fingerprint = _binary_fingerprint(binary_path) if use_cache else None
+    if fingerprint is not None:
+        cached = _cached_handshake(binary_path, fingerprint)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    result = _run_handshake(binary_path, timeout)
+    # Only successful handshakes are cached; failures may be transient.
+    if fingerprint is not None and result.get("available"):
+        _store_handshake(binary_path, fingerprint, result)
+    return result
+
+
+_prewarm_futures: Dict[Tuple[str, int], Future] = {}
+_prewarm_lock = threading.Lock()
+
+
+def prewarm_native_capabilities(
+    binary: str = "inspecta-native", timeout: int = 5
+) -> Future:
+    """Start capability detection in the background.
+
+    The next `detect_native_capabilities` call with the same arguments
+    consumes the result instead of probing again, so the handshake overlaps
+    with CLI argument validation.
+    """
+    future: Future = Future()
+
+    def worker() -> None:
+        try:
+            future.set_result(_detect(binary, timeout, use_cache=True))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    with _prewarm_lock:
+        _prewarm_futures[(binary, timeout)] = future
+    threading.Thread(target=worker, name="inspecta-native-prewarm", daemon=True).start()
+    return future
+
+
+def detect_native_capabilities(
+    binary: str = "inspecta-native", timeout: int = 5, use_cache: bool = True
+) -> Dict[str, Any]:
+    """Probe the optional native helper.
+
+    Returns a small dictionary describing whether the helper exists,
+    where it lives, and the parsed handshake payload (if available).
+    The agent remains functional even when the helper is missing.
+
+    Successful handshakes are cached on disk keyed by binary path, size,
+    mtime and agent version (`cached: True` marks a cache hit). The cache
+    and any pre-warmed result are bypassed while a command record/replay
+    hook is active so the handshake goes through that hook.
+    """
+    hooked = get_command_hook() is not None
+    with _prewarm_lock:
+        future = _prewarm_futures.pop((binary, timeout), None)
+    if future is not None and not hooked:
+        try:
+            return future.result(timeout=timeout + KILL_GRACE_SECONDS + 1)
+        except Exception as exc:
+            logger.debug("Native capability pre-warm failed: %s", exc)
+
+    return _detect(binary, timeout, use_cache=use_cache and not hooked)
+
+
 def run_native_smart_contract_batch(
     contracts: list[dict[str, Any]],
     binary: str = "inspecta-native",
     timeout: int = 15,
+    use_session: bool = True,
 ) -> dict[str, Any]:
     """Execute optional native SMART contract hot-path runner.
 
-    Expected protocol:
+    Uses the shared `NativeSession` when available; otherwise (or if the
+    session fails) falls back to the one-shot protocol:
     - Command: `inspecta-native --smart-batch-contract`
     - stdin: JSON object containing `contracts`
     - stdout: JSON object with native execution metadata
     """
+    session = get_native_session(binary) if use_session else None
+    if session is not None:
+        try:
+            return session.smart_batch_contract(contracts, timeout=timeout)
+        except NativeSessionError as exc:
+            logger.warning("Native session batch failed, using one-shot: %s", exc)
+
     binary_path = shutil.which(binary)
     if not binary_path:
         raise RuntimeError("native helper not found")
 
-    payload = json.dumps({"contracts": contracts}, separators=(",", ":"))
+    payload = jsonio.dumps({"contracts": contracts})
 
     try:
-        result = subprocess.run(
+        result = run_command(
             [binary_path, "--smart-batch-contract"],
-            check=True,
-            capture_output=True,
-            text=True,
             timeout=timeout,
+            text=True,
             input=payload,
         )
     except (OSError, subprocess.SubprocessError) as exc:
         raise RuntimeError(f"native batch execution failed: {exc}") from exc
 
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"native batch execution failed with status {result.returncode}: "
+            f"{result.stderr.strip()}"
+        )
+
     try:
-        native_output = json.loads(result.stdout)
+        native_output = jsonio.loads(result.stdout)
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"native batch returned invalid json: {exc}") from exc
 
@@ -0,0 +1,40 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Per-user state locations for the agent.
+
+`INSPECTA_CACHE_DIR` and `INSPECTA_DATA_DIR` override the platform defaults
+(useful for stations with read-only home directories and for tests).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+
+def user_cache_dir() -> Path:
+    """Return the directory for disposable caches (not created here)."""
+    override = os.environ.get("INSPECTA_CACHE_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "inspecta" / "cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "inspecta"
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "inspecta"
+
+
+def user_data_dir() -> Path:
+    """Return the directory for durable per-user state (not created here)."""
+    override = os.environ.get("INSPECTA_DATA_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "inspecta" / "data"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "inspecta"
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return Path(base) / "inspecta"
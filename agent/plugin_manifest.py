@@ -13,21 +13,14 @@ import json
 from pathlib import Path
 from typing import Any
 
-import jsonschema
+from agent import jsonio
+from agent.schema_registry import best_error
 
 
 class PluginManifestError(Exception):
     """Raised when plugin manifest validation or verification fails."""
 
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
-
-
-def _schema_path() -> Path:
-    return _project_root() / "schemas" / "plugin-manifest-schema-1.0.0.json"
-
-
 def load_plugin_manifest(manifest_path: Path) -> dict[str, Any]:
     """Load and JSON-schema validate a plugin manifest."""
     if not manifest_path.exists() or not manifest_path.is_file():
@@ -38,13 +31,9 @@ def load_plugin_manifest(manifest_path: Path) -> dict[str, Any]:
     except json.JSONDecodeError as exc:
         raise PluginManifestError(f"Invalid plugin manifest JSON: {exc}") from exc
 
-    schema = json.loads(_schema_path().read_text(encoding="utf-8"))
-    try:
-        jsonschema.validate(manifest, schema)
-    except jsonschema.ValidationError as exc:
-        raise PluginManifestError(
-            f"Plugin manifest schema validation failed: {exc.message}"
-        )
+    error = best_error(manifest, "plugin-manifest")
+    if error is not None:
+        raise PluginManifestError(f"Plugin manifest schema validation failed: {error}")
 
     return manifest
 
@@ -150,9 +139,7 @@ def verify_plugin_manifest_signature(
         raise PluginManifestError("Plugin signature is not valid base64") from exc
 
     payload = {k: v for k, v in manifest.items() if k != "signing"}
-    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode(
-        "utf-8"
-    )
+    canonical = jsonio.canonical_bytes(payload)
 
     try:
         public_key.verify(signature_bytes, canonical)
@@ -17,6 +17,7 @@ import tempfile
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, Optional
 
+from ..exec import read_system_file, run_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.battery")
@@ -103,13 +104,7 @@ def execute_macos_battery(use_sample: bool = False) -> Dict[str, Any]:
         return {"status": "ok", "data": parsed, "raw_text": "sample-macos"}
 
     try:
-        pmset_result = subprocess.run(
-            ["pmset", "-g", "batt"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        pmset_result = run_command(["pmset", "-g", "batt"], timeout=10, text=True)
     except FileNotFoundError as exc:
         raise BatteryError("pmset not found on macOS") from exc
     except subprocess.TimeoutExpired as exc:
@@ -123,12 +118,8 @@ def execute_macos_battery(use_sample: bool = False) -> Dict[str, Any]:
 
     profiler_data: Dict[str, Any] = {}
     try:
-        profiler_result = subprocess.run(
-            ["system_profiler", "SPPowerDataType", "-json"],
-            capture_output=True,
-            text=True,
-            timeout=20,
-            check=False,
+        profiler_result = run_command(
+            ["system_profiler", "SPPowerDataType", "-json"], timeout=20, text=True
         )
         if profiler_result.returncode == 0 and profiler_result.stdout.strip():
             profiler_data = parse_macos_power_json(profiler_result.stdout)
@@ -312,13 +303,7 @@ def parse_powercfg_report(xml_text: str) -> Dict[str, Any]:
 def _detect_battery_path() -> str:
     """Detect the first battery device path using `upower -e`."""
     try:
-        result = subprocess.run(
-            ["upower", "-e"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        result = run_command(["upower", "-e"], timeout=10, text=True)
     except FileNotFoundError as exc:
         raise BatteryError(
             f"upower not found. {linux_env.tool_install_hint('upower')}"
@@ -347,13 +332,7 @@ def execute_upower(use_sample: bool = False) -> Dict[str, Any]:
     device_path = _detect_battery_path()
 
     try:
-        result = subprocess.run(
-            ["upower", "-i", device_path],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        result = run_command(["upower", "-i", device_path], timeout=10, text=True)
     except subprocess.TimeoutExpired as exc:
         raise BatteryError("upower -i timed out after 10 seconds") from exc
 
@@ -388,22 +367,18 @@ def execute_powercfg(use_sample: bool = False) -> Dict[str, Any]:
 
     try:
         # Preferred invocation on Windows PowerCfg.
-        result = subprocess.run(
+        result = run_command(
             ["powercfg", "/batteryreport", "/output", report_path],
-            capture_output=True,
-            text=True,
             timeout=15,
-            check=False,
+            text=True,
         )
 
         # Fallback for environments that require the legacy colon syntax.
         if result.returncode != 0:
-            result = subprocess.run(
+            result = run_command(
                 ["powercfg", "/batteryreport", f"/output:{report_path}"],
-                capture_output=True,
-                text=True,
                 timeout=15,
-                check=False,
+                text=True,
             )
 
         if result.returncode != 0:
@@ -412,8 +387,7 @@ def execute_powercfg(use_sample: bool = False) -> Dict[str, Any]:
                 raise BatteryError(f"No battery detected: {stderr}")
             raise BatteryError(f"powercfg failed: {stderr}")
 
-        with open(report_path, "r", encoding="utf-8") as f:
-            xml_text = f.read()
+        xml_text = read_system_file(report_path)
 
         parsed = parse_powercfg_report(xml_text)
         parsed["device"] = "battery_ACPI"
@@ -12,6 +12,7 @@ import re
 import subprocess
 from typing import Any, Dict, Optional
 
+from ..exec import run_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.cpu_bench")
@@ -75,13 +76,7 @@ def execute_sysbench(use_sample: bool = False) -> Dict[str, Any]:
     cmd = ["sysbench", "cpu", "--threads=2", "--time=10", "run"]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=20,
-            check=False,
-        )
+        result = run_command(cmd, timeout=20, text=True)
     except FileNotFoundError as exc:
         raise CpuBenchError(
             f"sysbench not found. {linux_env.tool_install_hint('sysbench')}"
@@ -117,12 +112,8 @@ def execute_windows_cpu_probe() -> Dict[str, Any]:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=12,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=12, text=True
         )
     except FileNotFoundError as exc:
         raise CpuBenchError("PowerShell not found on Windows") from exc
@@ -148,13 +139,7 @@ def execute_macos_cpu_probe() -> Dict[str, Any]:
     cmd = ["sysctl", "-n", "hw.ncpu", "hw.cpufrequency"]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        result = run_command(cmd, timeout=10, text=True)
     except FileNotFoundError as exc:
         raise CpuBenchError("sysctl not found on macOS") from exc
     except subprocess.TimeoutExpired as exc:
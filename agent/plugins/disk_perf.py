@@ -13,6 +13,7 @@ import re
 import subprocess
 from typing import Any, Dict
 
+from ..exec import run_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.disk_perf")
@@ -79,13 +80,7 @@ def execute_fio(use_sample: bool = False) -> Dict[str, Any]:
     ]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-        )
+        result = run_command(cmd, timeout=30, text=True)
     except FileNotFoundError as exc:
         raise DiskPerfError(
             f"fio not found. {linux_env.tool_install_hint('fio')}"
@@ -112,20 +107,8 @@ def execute_windows_winsat() -> Dict[str, Any]:
     write_cmd = ["winsat", "disk", "-seq", "-write", "-drive", "c"]
 
     try:
-        read_result = subprocess.run(
-            read_cmd,
-            capture_output=True,
-            text=True,
-            timeout=45,
-            check=False,
-        )
-        write_result = subprocess.run(
-            write_cmd,
-            capture_output=True,
-            text=True,
-            timeout=45,
-            check=False,
-        )
+        read_result = run_command(read_cmd, timeout=45, text=True)
+        write_result = run_command(write_cmd, timeout=45, text=True)
     except FileNotFoundError as exc:
         raise DiskPerfError("winsat not found on Windows") from exc
     except PermissionError as exc:
@@ -14,6 +14,7 @@ import re
 import subprocess
 from typing import Any
 
+from ..exec import run_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.inventory")
@@ -26,12 +27,8 @@ class InventoryError(Exception):
 def execute_macos_inventory() -> str:
     """Execute macOS system_profiler query and return JSON payload."""
     try:
-        result = subprocess.run(
-            ["system_profiler", "SPHardwareDataType", "-json"],
-            capture_output=True,
-            text=True,
-            timeout=20,
-            check=False,
+        result = run_command(
+            ["system_profiler", "SPHardwareDataType", "-json"], timeout=20, text=True
         )
     except FileNotFoundError as exc:
         raise InventoryError("system_profiler not found on macOS") from exc
@@ -100,12 +97,8 @@ def execute_windows_inventory_registry() -> str:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=12,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=12, text=True
         )
     except FileNotFoundError as exc:
         raise InventoryError("PowerShell not found on Windows") from exc
@@ -144,12 +137,8 @@ def execute_windows_inventory() -> str:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=12,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=12, text=True
         )
     except FileNotFoundError as exc:
         raise InventoryError("PowerShell not found on Windows") from exc
@@ -208,12 +197,10 @@ def execute_dmidecode() -> str:
         InventoryError: If dmidecode is not found or requires elevated permissions.
     """
     try:
-        result = subprocess.run(
+        result = run_command(
             ["dmidecode", "-t", "system", "-t", "bios", "-t", "chassis"],
-            capture_output=True,
-            text=True,
             timeout=10,
-            check=False,
+            text=True,
         )
 
         if result.returncode != 0:
@@ -13,6 +13,8 @@ import os
 import platform
 from typing import Dict, Optional
 
+from ..exec import read_system_file
+
 _PKG_MANAGER_INSTALL_CMD = {
     "apt": "sudo apt install",
     "dnf": "sudo dnf install",
@@ -138,8 +140,7 @@ def detect_linux_capabilities(os_release_text: Optional[str] = None) -> Dict[str
 
     if os_release_text is None:
         try:
-            with open("/etc/os-release", "r", encoding="utf-8") as fh:
-                os_release_text = fh.read()
+            os_release_text = read_system_file("/etc/os-release")
         except OSError:
             os_release_text = ""
 
@@ -12,6 +12,7 @@ import re
 import subprocess
 from typing import Any, Dict
 
+from ..exec import run_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.memtest")
@@ -161,12 +162,10 @@ def execute_memtest(
     try:
         # Run memtester for ~512MB (adjust based on available RAM)
         # Use -q flag for quiet mode to reduce output verbosity
-        result = subprocess.run(
+        result = run_command(
             ["memtester", "512M", "1", "-q"],
-            capture_output=True,
-            text=True,
             timeout=duration_seconds + 10,  # Add buffer for startup/shutdown
-            check=False,
+            text=True,
         )
 
         if result.returncode != 0 and "memtester: not found" not in result.stderr:
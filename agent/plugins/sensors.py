@@ -14,6 +14,7 @@ import subprocess
 import time
 from typing import Any, Dict, Optional
 
+from ..exec import pause, read_system_file, run_command, spawn_command
 from . import linux_env
 
 logger = logging.getLogger("inspecta.sensors")
@@ -34,12 +35,8 @@ def _get_windows_openhardwaremonitor_snapshot() -> Optional[Dict[str, Any]]:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=10, text=True
         )
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return None
@@ -152,13 +149,7 @@ def get_sensors_snapshot_macos() -> Dict[str, Any]:
 
     for cmd in probes:
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=12,
-                check=False,
-            )
+            result = run_command(cmd, timeout=12, text=True)
         except FileNotFoundError:
             continue
         except subprocess.TimeoutExpired:
@@ -204,13 +195,7 @@ def _get_macos_cpu_freq_mhz() -> Optional[float]:
     keys = ["hw.cpufrequency", "hw.cpufrequency_max"]
     for key in keys:
         try:
-            result = subprocess.run(
-                ["sysctl", "-n", key],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=False,
-            )
+            result = run_command(["sysctl", "-n", key], timeout=5, text=True)
         except (FileNotFoundError, subprocess.TimeoutExpired):
             continue
 
@@ -230,12 +215,8 @@ def _get_macos_cpu_freq_mhz() -> Optional[float]:
 def _get_macos_thermal_level() -> Optional[int]:
     """Read macOS thermal level if available (0 is best)."""
     try:
-        result = subprocess.run(
-            ["sysctl", "-n", "machdep.xcpm.cpu_thermal_level"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False,
+        result = run_command(
+            ["sysctl", "-n", "machdep.xcpm.cpu_thermal_level"], timeout=5, text=True
         )
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return None
@@ -252,12 +233,7 @@ def _get_macos_thermal_level() -> Optional[int]:
 def has_lm_sensors() -> bool:
     """Check if lm-sensors is available on Linux."""
     try:
-        result = subprocess.run(
-            ["sensors", "-v"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
+        result = run_command(["sensors", "-v"], timeout=5, text=True)
         return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
@@ -412,12 +388,7 @@ def get_sensors_snapshot_linux() -> Dict[str, Any]:
         )
 
     try:
-        result = subprocess.run(
-            ["sensors"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+        result = run_command(["sensors"], timeout=10, text=True)
 
         if result.returncode != 0:
             raise SensorError(f"sensors command failed: {result.stderr}")
@@ -449,11 +420,10 @@ def get_sensors_snapshot_windows() -> Dict[str, Any]:
 
     try:
         # Try using WMIC to get thermal zone temperatures
-        result = subprocess.run(
+        result = run_command(
             ["wmic", "path", "Win32_TemperatureProbe", "get", "CurrentReading,Name"],
-            capture_output=True,
-            text=True,
             timeout=10,
+            text=True,
         )
 
         sensors = []
@@ -543,20 +513,18 @@ def get_cpu_frequency_linux() -> Optional[float]:
     try:
         # Try reading from cpufreq first (more accurate)
         freq_path = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"
-        with open(freq_path, "r") as f:
-            # cpufreq returns kHz, convert to MHz
-            return float(f.read().strip()) / 1000.0
+        # cpufreq returns kHz, convert to MHz
+        return float(read_system_file(freq_path).strip()) / 1000.0
     except (FileNotFoundError, PermissionError, ValueError):
         pass
 
     try:
         # Fallback to parsing /proc/cpuinfo
-        with open("/proc/cpuinfo", "r") as f:
-            for line in f:
-                if line.startswith("cpu MHz"):
-                    # Format: "cpu MHz		: 2400.000"
-                    freq_str = line.split(":")[1].strip()
-                    return float(freq_str)
+        for line in read_system_file("/proc/cpuinfo").splitlines():
+            if line.startswith("cpu MHz"):
+                # Format: "cpu MHz		: 2400.000"
+                freq_str = line.split(":")[1].strip()
+                return float(freq_str)
     except (FileNotFoundError, PermissionError, ValueError, IndexError):
         pass
 
@@ -584,12 +552,12 @@ def detect_cpu_throttling_linux(
 
     # Check if stress-ng is available
     try:
-        subprocess.run(["stress-ng", "--version"], capture_output=True, timeout=5)
+        run_command(["stress-ng", "--version"], timeout=5)
         stress_cmd = ["stress-ng", "--cpu", "0", "--timeout", f"{duration_seconds}s"]
     except (FileNotFoundError, subprocess.TimeoutExpired):
         # Fallback to using sysbench if available
         try:
-            subprocess.run(["sysbench", "--version"], capture_output=True, timeout=5)
+            run_command(["sysbench", "--version"], timeout=5)
             stress_cmd = ["sysbench", "cpu", f"--time={duration_seconds}", "run"]
         except (FileNotFoundError, subprocess.TimeoutExpired):
             raise SensorError(
@@ -600,11 +568,7 @@ def detect_cpu_throttling_linux(
     logger.info(
         f"Starting {duration_seconds}s CPU stress test for throttle detection..."
     )
-    stress_proc = subprocess.Popen(
-        stress_cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    stress_proc = spawn_command(stress_cmd)
 
     # Sample temperatures and frequencies during stress
     samples = []
@@ -618,7 +582,7 @@ def detect_cpu_throttling_linux(
 
     try:
         for i in range(num_samples):
-            time.sleep(sample_interval)
+            pause(sample_interval)
             try:
                 snapshot = get_sensors_snapshot_linux()
                 freq = get_cpu_frequency_linux()
@@ -648,12 +612,8 @@ def detect_cpu_throttling_linux(
             except SensorError:
                 pass
     finally:
-        # Ensure stress process is terminated
+        # Ensure the stress process group (including workers) is torn down
         stress_proc.terminate()
-        try:
-            stress_proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            stress_proc.kill()
 
     # Analyze results
     if not temp_samples:
@@ -826,12 +786,8 @@ def _collect_windows_perf_sample() -> Dict[str, Any]:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=10, text=True
         )
     except FileNotFoundError as exc:
         raise SensorError("PowerShell not found for Windows thermal probe") from exc
@@ -866,7 +822,7 @@ def detect_cpu_throttling_windows(duration_seconds: int = 30) -> Dict[str, Any]:
     freqs = []
 
     for _ in range(sample_count):
-        time.sleep(sample_interval)
+        pause(sample_interval)
         sample = _collect_windows_perf_sample()
         freq = sample.get("freq_mhz")
         temp = sample.get("temp_c")
@@ -941,7 +897,7 @@ def detect_cpu_throttling_macos(duration_seconds: int = 30) -> Dict[str, Any]:
     thermal_levels = []
 
     for _ in range(sample_count):
-        time.sleep(sample_interval)
+        pause(sample_interval)
 
         freq = _get_macos_cpu_freq_mhz()
         thermal_level = _get_macos_thermal_level()
@@ -17,6 +17,7 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List
 
+from ..exec import list_system_dir, pause, run_command
 from ..native_contract import build_rust_smart_contract
 from . import linux_env
 
@@ -30,12 +31,7 @@ class SmartError(Exception):
 def execute_macos_storage_health() -> List[Dict[str, Any]]:
     """Collect macOS storage health using diskutil plist outputs."""
     try:
-        list_result = subprocess.run(
-            ["diskutil", "list", "-plist"],
-            capture_output=True,
-            timeout=15,
-            check=False,
-        )
+        list_result = run_command(["diskutil", "list", "-plist"], timeout=15)
     except FileNotFoundError as exc:
         raise SmartError("diskutil not found on macOS") from exc
     except subprocess.TimeoutExpired as exc:
@@ -62,11 +58,8 @@ def execute_macos_storage_health() -> List[Dict[str, Any]]:
     normalized: List[Dict[str, Any]] = []
     for device_id in device_ids:
         try:
-            info_result = subprocess.run(
-                ["diskutil", "info", "-plist", f"/dev/{device_id}"],
-                capture_output=True,
-                timeout=12,
-                check=False,
+            info_result = run_command(
+                ["diskutil", "info", "-plist", f"/dev/{device_id}"], timeout=12
             )
         except subprocess.TimeoutExpired:
             continue
@@ -109,13 +102,7 @@ def execute_macos_storage_health() -> List[Dict[str, Any]]:
 def list_windows_smartctl_devices() -> List[str]:
     """List Windows storage devices available to smartctl."""
     try:
-        result = subprocess.run(
-            ["smartctl", "--scan-open"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        result = run_command(["smartctl", "--scan-open"], timeout=10, text=True)
     except FileNotFoundError:
         return []
     except subprocess.TimeoutExpired:
@@ -184,12 +171,8 @@ def execute_windows_storage_health() -> List[Dict[str, Any]]:
     )
 
     try:
-        result = subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            capture_output=True,
-            text=True,
-            timeout=15,
-            check=False,
+        result = run_command(
+            ["powershell", "-NoProfile", "-Command", ps_script], timeout=15, text=True
         )
     except FileNotFoundError as exc:
         raise SmartError("PowerShell not found for Windows storage probe") from exc
@@ -253,15 +236,17 @@ def detect_storage_devices() -> List[str]:
     """
     devices = []
 
-    # Check /sys/block for block devices
-    sys_block = Path("/sys/block")
-    if not sys_block.exists():
+    # Check /sys/block for block devices (recorded/replayed with commands)
+    try:
+        names = list_system_dir("/sys/block")
+    except FileNotFoundError:
         logger.warning("/sys/block not found, cannot detect devices")
         return devices
+    except OSError as e:
+        raise SmartError(f"Failed to detect storage devices: {e}") from e
 
     try:
-        for entry in sys_block.iterdir():
-            name = entry.name
+        for name in names:
             # Skip loop, ram, and virtual devices
             if name.startswith(("loop", "ram", "dm-", "sr")):
                 continue
@@ -321,13 +306,7 @@ def execute_smartctl(device: str, use_sample: bool = False) -> Dict[str, Any]:
     cmd.append(device)
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-        )
+        result = run_command(cmd, timeout=30, text=True)
 
         # smartctl exit codes:
         # 0 = success, no issues
@@ -570,7 +549,7 @@ def collect_timeline_snapshots(
             elapsed = time.time() - start
             sleep_for = target_elapsed - elapsed
             if sleep_for > 0:
-                time.sleep(sleep_for)
+                pause(sleep_for)
 
         point: Dict[str, Any] = {
             "offset_seconds": interval,
@@ -3,127 +3,276 @@
 
 Implements offline policy-pack enforcement for enterprise-style report
 evaluation (Sprint 10 roadmap track).
+
+Rule conditions are compiled once into closures (`compile_condition`,
+cached per expression) and a pack into a `CompiledPolicyPack`, so
+evaluating many report contexts does not re-parse or re-walk the AST.
 """
 
 from __future__ import annotations
 
 import ast
 import json
+import operator
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
-
-import jsonschema
-
-
-class PolicyPackError(Exception):
-    """Raised when policy-pack parsing/validation/evaluation fails."""
+from typing import Any, Callable
 
+from agent.schema_registry import best_error
 
-class _SafeExprEvaluator:
-    """Very small safe expression evaluator for policy conditions."""
+Predicate = Callable[[dict[str, Any]], Any]
 
-    def __init__(self, context: dict[str, Any]):
-        self._context = context
+_CONDITION_CACHE_SIZE = 4096
+_MAX_CONDITION_LENGTH = 300
 
-    def evaluate(self, expression: str) -> bool:
-        if not expression or len(expression) > 300:
-            raise PolicyPackError("Policy rule condition is empty or too long")
+_SEVERITY_WEIGHTS = {
+    "warn": {"info": -1, "warning": -3, "critical": -7},
+    "recommend": {"info": 0, "warning": -1, "critical": -2},
+    "fail": {"info": -5, "warning": -10, "critical": -20},
+}
 
-        try:
-            tree = ast.parse(expression, mode="eval")
-        except SyntaxError as exc:
-            raise PolicyPackError(f"Invalid policy condition syntax: {exc}") from exc
 
-        value = self._eval_node(tree.body)
-        return bool(value)
-
-    def _eval_node(self, node: ast.AST) -> Any:
-        if isinstance(node, ast.Constant):
-            return node.value
+class PolicyPackError(Exception):
+    """Raised when policy-pack parsing/validation/evaluation fails."""
 
-        if isinstance(node, ast.Name):
-            if node.id not in self._context:
-                raise PolicyPackError(f"Unknown symbol in policy condition: {node.id}")
-            return self._context[node.id]
 
-        if isinstance(node, ast.Attribute):
-            base = self._eval_node(node.value)
+_BINARY_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+_COMPARE_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+def _compile_node(node: ast.AST) -> Predicate:
+    """Translate one AST node into a closure over the evaluation context.
+
+    Structural errors (unsupported syntax) are raised here, once; lookups
+    that depend on the context (unknown symbols/attributes) are raised when
+    the closure runs, exactly as the tree-walking reference evaluator in
+    `tools/benchmark_policy_eval.py` does.
+    """
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda _ctx: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+
+        def _name(ctx: dict[str, Any]) -> Any:
+            try:
+                return ctx[name]
+            except KeyError:
+                raise PolicyPackError(
+                    f"Unknown symbol in policy condition: {name}"
+                ) from None
+
+        return _name
+
+    if isinstance(node, ast.Attribute):
+        base_fn = _compile_node(node.value)
+        attr = node.attr
+
+        def _attribute(ctx: dict[str, Any]) -> Any:
+            base = base_fn(ctx)
             if isinstance(base, dict):
-                if node.attr not in base:
+                if attr not in base:
                     raise PolicyPackError(
-                        f"Unknown attribute in policy condition: {node.attr}"
+                        f"Unknown attribute in policy condition: {attr}"
                     )
-                return base[node.attr]
-            if hasattr(base, node.attr):
-                return getattr(base, node.attr)
-            raise PolicyPackError(f"Unsupported attribute access: {node.attr}")
-
-        if isinstance(node, ast.BoolOp):
-            values = [bool(self._eval_node(v)) for v in node.values]
-            if isinstance(node.op, ast.And):
-                return all(values)
-            if isinstance(node.op, ast.Or):
-                return any(values)
+                return base[attr]
+            if hasattr(base, attr):
+                return getattr(base, attr)
+            raise PolicyPackError(f"Unsupported attribute access: {attr}")
+
+        return _attribute
+
+    if isinstance(node, ast.BoolOp):
+        value_fns = [_compile_node(v) for v in node.values]
+        # Every operand is evaluated (no short-circuit) so unknown symbols
+        # are reported regardless of operand order.
+        if isinstance(node.op, ast.And):
+            combine: Callable[[list[bool]], bool] = all
+        elif isinstance(node.op, ast.Or):
+            combine = any
+        else:
             raise PolicyPackError("Unsupported boolean operator")
 
-        if isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand)
-            if isinstance(node.op, ast.Not):
-                return not bool(operand)
-            if isinstance(node.op, ast.USub):
-                return -float(operand)
-            raise PolicyPackError("Unsupported unary operator")
-
-        if isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
-            if isinstance(node.op, ast.Mult):
-                return left * right
-            if isinstance(node.op, ast.Div):
-                return left / right
-            raise PolicyPackError("Unsupported binary operator")
+        def _boolop(ctx: dict[str, Any]) -> bool:
+            values = [bool(fn(ctx)) for fn in value_fns]
+            return combine(values)
 
-        if isinstance(node, ast.Compare):
-            left = self._eval_node(node.left)
-            for op, comparator in zip(node.ops, node.comparators):
-                right = self._eval_node(comparator)
-                if isinstance(op, ast.Lt):
-                    matched = left < right
-                elif isinstance(op, ast.LtE):
-                    matched = left <= right
-                elif isinstance(op, ast.Gt):
-                    matched = left > right
-                elif isinstance(op, ast.GtE):
-                    matched = left >= right
-                elif isinstance(op, ast.Eq):
-                    matched = left == right
-                elif isinstance(op, ast.NotEq):
-                    matched = left != right
-                elif isinstance(op, ast.In):
-                    matched = left in right
-                elif isinstance(op, ast.NotIn):
-                    matched = left not in right
-                else:
-                    raise PolicyPackError("Unsupported comparison operator")
-
-                if not matched:
+        return _boolop
+
+    if isinstance(node, ast.UnaryOp):
+        operand_fn = _compile_node(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda ctx: not bool(operand_fn(ctx))
+        if isinstance(node.op, ast.USub):
+            return lambda ctx: -float(operand_fn(ctx))
+        raise PolicyPackError("Unsupported unary operator")
+
+    if isinstance(node, ast.BinOp):
+        binary = _BINARY_OPS.get(type(node.op))
+        if binary is None:
+            raise PolicyPackError("Unsupported binary operator")
+        left_fn = _compile_node(node.left)
+        right_fn = _compile_node(node.right)
+        return lambda ctx: binary(left_fn(ctx), right_fn(ctx))
+
+    if isinstance(node, ast.Compare):
+        left_fn = _compile_node(node.left)
+        steps = []
+        for op, comparator in zip(node.ops, node.comparators):
+            compare = _COMPARE_OPS.get(type(op))
+            if compare is None:
+                raise PolicyPackError("Unsupported comparison operator")
+            steps.append((compare, _compile_node(comparator)))
+
+        def _compare(ctx: dict[str, Any]) -> bool:
+            left = left_fn(ctx)
+            for compare, right_fn in steps:
+                right = right_fn(ctx)
+                if not compare(left, right):
                     return False
                 left = right
             return True
 
-        raise PolicyPackError(f"Unsupported expression node: {type(node).__name__}")
+        return _compare
+
+    raise PolicyPackError(f"Unsupported expression node: {type(node).__name__}")
+
 
+@lru_cache(maxsize=_CONDITION_CACHE_SIZE)
+def compile_condition(expression: str) -> Callable[[dict[str, Any]], bool]:
+    """Validate a rule condition and compile it into a predicate.
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
+    Results are cached per expression string, so packs sharing conditions
+    (and repeated `evaluate_policy_pack` calls) compile each one once.
 
+    Raises:
+        PolicyPackError: Empty, too long, invalid syntax or unsupported node
+    """
+    if not expression or len(expression) > _MAX_CONDITION_LENGTH:
+        raise PolicyPackError("Policy rule condition is empty or too long")
 
-def _policy_schema_path() -> Path:
-    return _project_root() / "schemas" / "policy-pack-schema-1.0.0.json"
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as exc:
+        raise PolicyPackError(f"Invalid policy condition syntax: {exc}") from exc
+
+    body = _compile_node(tree.body)
+    return lambda ctx: bool(body(ctx))
+
+
+class CompiledPolicyPack:
+    """A policy pack with every rule condition compiled up front.
+
+    Compile once with `compile_policy_pack`, then call `evaluate` for each
+    report context; results match `evaluate_policy_pack`.
+
+    Args:
+        policy_pack: Loaded policy-pack payload
+
+    Raises:
+        PolicyPackError: A rule condition is invalid
+    """
+
+    def __init__(self, policy_pack: dict[str, Any]):
+        self.pack_id = policy_pack.get("pack_id")
+        self.display_name = policy_pack.get("display_name")
+        self.target_profile = policy_pack.get("target_profile")
+        self._rules = []
+        for rule in policy_pack.get("rules", []):
+            condition = str(rule.get("condition", "")).strip()
+            action = str(rule.get("action", "warn"))
+            severity = str(rule.get("severity", "warning"))
+            self._rules.append(
+                (
+                    compile_condition(condition),
+                    action,
+                    _SEVERITY_WEIGHTS.get(action, _SEVERITY_WEIGHTS["warn"]).get(
+                        severity, -1
+                    ),
+                    {
+                        "id": rule.get("id"),
+                        "title": rule.get("title"),
+                        "severity": severity,
+                        "action": action,
+                        "message": str(
+                            rule.get("message") or rule.get("title") or "Policy matched"
+                        ),
+                        "condition": condition,
+                    },
+                )
+            )
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def evaluate(self, context: dict[str, Any]) -> dict[str, Any]:
+        """Evaluate all rules against `context` (see `evaluate_policy_pack`)."""
+        triggered_rules: list[dict[str, Any]] = []
+        score_delta = 0
+        fail_count = 0
+        warn_count = 0
+        recommend_count = 0
+
+        for predicate, action, weight, triggered in self._rules:
+            if not predicate(context):
+                continue
+
+            score_delta += weight
+            if action == "fail":
+                fail_count += 1
+            elif action == "recommend":
+                recommend_count += 1
+            else:
+                warn_count += 1
+            triggered_rules.append(dict(triggered))
+
+        if fail_count > 0:
+            status = "fail"
+        elif warn_count > 0:
+            status = "warn"
+        elif recommend_count > 0:
+            status = "recommend"
+        else:
+            status = "pass"
+
+        return {
+            "pack_id": self.pack_id,
+            "display_name": self.display_name,
+            "target_profile": self.target_profile,
+            "rules_evaluated": len(self._rules),
+            "rules_triggered": len(triggered_rules),
+            "status": status,
+            "score_delta": score_delta,
+            "fail_count": fail_count,
+            "warn_count": warn_count,
+            "recommend_count": recommend_count,
+            "triggered_rules": triggered_rules,
+        }
+
+
+def compile_policy_pack(
+    policy_pack: dict[str, Any] | CompiledPolicyPack,
+) -> CompiledPolicyPack:
+    """Compile a loaded policy pack for repeated evaluation (idempotent)."""
+    if isinstance(policy_pack, CompiledPolicyPack):
+        return policy_pack
+    return CompiledPolicyPack(policy_pack)
 
 
 def load_policy_pack(path: Path) -> dict[str, Any]:
@@ -136,85 +285,19 @@ def load_policy_pack(path: Path) -> dict[str, Any]:
     except json.JSONDecodeError as exc:
         raise PolicyPackError(f"Invalid policy pack JSON: {exc}") from exc
 
-    schema = json.loads(_policy_schema_path().read_text(encoding="utf-8"))
-    try:
-        jsonschema.validate(payload, schema)
-    except jsonschema.ValidationError as exc:
-        raise PolicyPackError(f"Policy pack schema validation failed: {exc.message}")
+    error = best_error(payload, "policy-pack")
+    if error is not None:
+        raise PolicyPackError(f"Policy pack schema validation failed: {error}")
 
     return payload
 
 
 def evaluate_policy_pack(
-    policy_pack: dict[str, Any],
+    policy_pack: dict[str, Any] | CompiledPolicyPack,
     context: dict[str, Any],
 ) -> dict[str, Any]:
-    """Evaluate policy rules and return a deterministic policy result payload."""
-    evaluator = _SafeExprEvaluator(context)
-
-    severity_weights = {
-        "warn": {"info": -1, "warning": -3, "critical": -7},
-        "recommend": {"info": 0, "warning": -1, "critical": -2},
-        "fail": {"info": -5, "warning": -10, "critical": -20},
-    }
-
-    triggered_rules: list[dict[str, Any]] = []
-    score_delta = 0
-    fail_count = 0
-    warn_count = 0
-    recommend_count = 0
-
-    for rule in policy_pack.get("rules", []):
-        condition = str(rule.get("condition", "")).strip()
-        if not evaluator.evaluate(condition):
-            continue
-
-        action = str(rule.get("action", "warn"))
-        severity = str(rule.get("severity", "warning"))
-        message = str(rule.get("message") or rule.get("title") or "Policy matched")
-
-        score_delta += severity_weights.get(action, severity_weights["warn"]).get(
-            severity,
-            -1,
-        )
-
-        if action == "fail":
-            fail_count += 1
-        elif action == "recommend":
-            recommend_count += 1
-        else:
-            warn_count += 1
-
-        triggered_rules.append(
-            {
-                "id": rule.get("id"),
-                "title": rule.get("title"),
-                "severity": severity,
-                "action": action,
-                "message": message,
-                "condition": condition,
-            }
-        )
-
-    if fail_count > 0:
-        status = "fail"
-    elif warn_count > 0:
-        status = "warn"
-    elif recommend_count > 0:
-        status = "recommend"
-    else:
-        status = "pass"
-
-    return {
-        "pack_id": policy_pack.get("pack_id"),
-        "display_name": policy_pack.get("display_name"),
-        "target_profile": policy_pack.get("target_profile"),
-        "rules_evaluated": len(policy_pack.get("rules", [])),
-        "rules_triggered": len(triggered_rules),
-        "status": status,
-        "score_delta": score_delta,
-        "fail_count": fail_count,
-        "warn_count": warn_count,
-        "recommend_count": recommend_count,
-        "triggered_rules": triggered_rules,
-    }
+    """Evaluate policy rules and return a deterministic policy result payload.
+
+    For many contexts, pass a pack compiled once with `compile_policy_pack`.
+    """
+    return compile_policy_pack(policy_pack).evaluate(context)
@@ -0,0 +1,498 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Record-and-replay of external commands.
+
+`CommandRecorder` captures every command issued through `agent.exec`
+(argv, stdin digest, stdout, stderr, exit code, outcome, duration) into a
+capture directory, together with the host files and directory listings
+probes read through `read_system_file` / `list_system_dir` (/sys/block,
+cpufreq, /proc/cpuinfo, /etc/os-release, powercfg reports); paths under the
+temp directory are recorded as `TEMP_PLACEHOLDER`. `CommandReplayer` serves
+those captures back through the same layer without spawning processes,
+touching the local /sys or /proc, or pausing between samples, so field
+captures can be re-run through parsers and scoring at full speed on any
+machine.
+
+Capture directory layout::
+
+    <dir>/capture.json     # format version, agent version, platform
+    <dir>/commands.jsonl   # one JSON object per command, in call order
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from . import __version__
+from .exec import (
+    OUTCOME_NOT_FOUND,
+    OUTCOME_SPAWN_FAILED,
+    OUTCOME_TERMINATED,
+    OUTCOME_TIMEOUT,
+    CommandRecord,
+    CommandResult,
+    add_command_record,
+    decode_output,
+    get_command_hook,
+    set_command_hook,
+)
+
+logger = logging.getLogger("inspecta.replay")
+
+CAPTURE_FORMAT_VERSION = 1
+CAPTURE_META_FILE = "capture.json"
+CAPTURE_COMMANDS_FILE = "commands.jsonl"
+TEMP_PLACEHOLDER = "<tmp>"
+
+
+class ReplayError(Exception):
+    """Raised when a capture directory cannot be written or loaded."""
+
+
+def _stdin_digest(data: str | bytes | None) -> str | None:
+    if data is None:
+        return None
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _encode_stream(payload: bytes) -> dict[str, str]:
+    try:
+        return {"encoding": "utf-8", "data": payload.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {
+            "encoding": "base64",
+            "data": base64.b64encode(payload).decode("ascii"),
+        }
+
+
+def _decode_stream(stream: dict[str, Any] | None) -> bytes:
+    if not stream:
+        return b""
+    data = stream.get("data", "")
+    if stream.get("encoding") == "base64":
+        return base64.b64decode(data)
+    return str(data).encode("utf-8")
+
+
+def _mask_temp_paths(argv: Sequence[str]) -> list[str]:
+    """Replace per-run temp paths with `TEMP_PLACEHOLDER`.
+
+    Probes such as `powercfg /batteryreport /output <tmpfile>` pass a fresh
+    temp file each run; masking it lets the command and the file read match
+    across runs and hosts.
+    """
+    tmp = tempfile.gettempdir()
+    masked = []
+    for arg in argv:
+        arg = str(arg)
+        index = arg.find(tmp)
+        end = index + len(tmp)
+        if index >= 0 and arg[end : end + 1] in ("", "/", "\\"):
+            arg = arg[:index] + TEMP_PLACEHOLDER
+        masked.append(arg)
+    return masked
+
+
+def _command_key(argv: Sequence[str], stdin_sha256: str | None) -> str:
+    return json.dumps([_mask_temp_paths(argv), stdin_sha256])
+
+
+# OSError subclasses a probe may tell apart when reading host files.
+_OS_ERRORS: dict[str, type[OSError]] = {
+    "FileNotFoundError": FileNotFoundError,
+    "NotADirectoryError": NotADirectoryError,
+    "PermissionError": PermissionError,
+}
+
+
+def _os_error_entry(exc: OSError) -> dict[str, Any]:
+    name = type(exc).__name__
+    return {"error": name if name in _OS_ERRORS else "OSError", "message": str(exc)}
+
+
+def _raise_os_error(entry: dict[str, Any]) -> None:
+    raise _OS_ERRORS.get(entry["error"], OSError)(entry.get("message", ""))
+
+
+class CommandRecorder:
+    """Command hook that runs commands live and appends them to a capture."""
+
+    skip_pauses = False
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._seq = 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            meta = {
+                "format_version": CAPTURE_FORMAT_VERSION,
+                "agent_version": __version__,
+                "recorded_at": datetime.now(timezone.utc)
+                .replace(microsecond=0)
+                .isoformat(),
+                "platform": platform.system().lower(),
+                "platform_release": platform.release(),
+                "machine": platform.machine(),
+            }
+            (self.directory / CAPTURE_META_FILE).write_text(
+                json.dumps(meta, indent=2), encoding="utf-8"
+            )
+            self._fh = (self.directory / CAPTURE_COMMANDS_FILE).open(
+                "w", encoding="utf-8"
+            )
+        except OSError as exc:
+            raise ReplayError(f"Cannot create capture directory: {exc}") from exc
+
+    @property
+    def command_count(self) -> int:
+        return self._seq
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, **entry}
+            if "argv" in entry:
+                entry["argv"] = _mask_temp_paths(entry["argv"])
+            self._fh.write(json.dumps(entry, sort_keys=True) + "\n")
+            # Flush per entry so a crashed run still leaves a usable capture.
+            self._fh.flush()
+
+    def run_command(
+        self,
+        argv: list[str],
+        *,
+        timeout: float | None,
+        text: bool,
+        input: str | bytes | None,
+        execute: Callable[[], CommandResult],
+    ) -> CommandResult:
+        base = {
+            "kind": "run",
+            "argv": argv,
+            "stdin_sha256": _stdin_digest(input),
+            "timeout": timeout,
+        }
+        started = time.perf_counter()
+        try:
+            result = execute()
+        except FileNotFoundError:
+            self._append({**base, "outcome": OUTCOME_NOT_FOUND})
+            raise
+        except subprocess.TimeoutExpired as exc:
+            self._append(
+                {
+                    **base,
+                    "outcome": OUTCOME_TIMEOUT,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "stdout": _encode_stream(exc.output or b""),
+                    "stderr": _encode_stream(exc.stderr or b""),
+                }
+            )
+            raise subprocess.TimeoutExpired(
+                argv,
+                exc.timeout,
+                output=decode_output(exc.output or b"", text),
+                stderr=decode_output(exc.stderr or b"", text),
+            ) from None
+        except OSError:
+            self._append({**base, "outcome": OUTCOME_SPAWN_FAILED})
+            raise
+
+        self._append(
+            {
+                **base,
+                "outcome": result.outcome,
+                "returncode": result.returncode,
+                "duration_ms": result.duration_ms,
+                "truncated": result.truncated,
+                "stdout": _encode_stream(result.stdout),
+                "stderr": _encode_stream(result.stderr),
+            }
+        )
+        if text:
+            result.stdout = decode_output(result.stdout, True)
+            result.stderr = decode_output(result.stderr, True)
+        return result
+
+    def spawn_command(self, argv: list[str], *, execute: Callable[[], Any]) -> Any:
+        try:
+            proc = execute()
+        except FileNotFoundError:
+            self._append({"kind": "spawn", "argv": argv, "outcome": OUTCOME_NOT_FOUND})
+            raise
+        except OSError:
+            self._append(
+                {"kind": "spawn", "argv": argv, "outcome": OUTCOME_SPAWN_FAILED}
+            )
+            raise
+        self._append({"kind": "spawn", "argv": argv, "outcome": "started"})
+        return proc
+
+    def read_file(self, path: str, *, execute: Callable[[], str]) -> str:
+        try:
+            text = execute()
+        except OSError as exc:
+            self._append({"kind": "file", "argv": [path], **_os_error_entry(exc)})
+            raise
+        self._append({"kind": "file", "argv": [path], "data": text})
+        return text
+
+    def list_dir(self, path: str, *, execute: Callable[[], list[str]]) -> list[str]:
+        try:
+            names = execute()
+        except OSError as exc:
+            self._append({"kind": "listdir", "argv": [path], **_os_error_entry(exc)})
+            raise
+        self._append({"kind": "listdir", "argv": [path], "entries": names})
+        return names
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "mode": "record",
+            "directory": str(self.directory),
+            "commands": self._seq,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+class ReplayedProcess:
+    """Stand-in for `ManagedProcess` when a background command is replayed."""
+
+    pid = 0
+
+    def __init__(self, argv: Sequence[str]) -> None:
+        self.argv = list(argv)
+        self.returncode: int | None = None
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        self.returncode = 0 if self.returncode is None else self.returncode
+        return self.returncode
+
+    def terminate(self, grace_seconds: float = 0.0) -> None:
+        if self.returncode is None:
+            self.returncode = 0
+
+    def __enter__(self) -> "ReplayedProcess":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.terminate()
+
+
+class CommandReplayer:
+    """Command hook that serves captured outputs instead of spawning.
+
+    Entries are matched by exact argv plus stdin digest, in recorded order.
+    When a command is issued more often than it was captured the last
+    capture is served again (steady-state polling); a command that was never
+    captured raises `FileNotFoundError`, exactly as a missing tool would.
+    """
+
+    skip_pauses = True
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        commands_path = self.directory / CAPTURE_COMMANDS_FILE
+        meta_path = self.directory / CAPTURE_META_FILE
+        if not commands_path.is_file():
+            raise ReplayError(f"No {CAPTURE_COMMANDS_FILE} in {self.directory}")
+
+        self.meta: dict[str, Any] = {}
+        if meta_path.is_file():
+            try:
+                self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                raise ReplayError(f"Invalid {CAPTURE_META_FILE}: {exc}") from exc
+        version = self.meta.get("format_version", CAPTURE_FORMAT_VERSION)
+        if version != CAPTURE_FORMAT_VERSION:
+            raise ReplayError(f"Unsupported capture format version: {version}")
+
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.served = 0
+        self.misses = 0
+
+        line_no = 0
+        try:
+            with commands_path.open("r", encoding="utf-8") as fh:
+                for line_no, line in enumerate(fh, start=1):
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = _command_key(entry["argv"], entry.get("stdin_sha256"))
+                    if entry.get("kind") in ("spawn", "file", "listdir"):
+                        key = f"{entry['kind']}:{key}"
+                    self._queues.setdefault(key, deque()).append(entry)
+        except (OSError, json.JSONDecodeError, KeyError) as exc:
+            raise ReplayError(
+                f"Invalid {CAPTURE_COMMANDS_FILE} (line {line_no}): {exc}"
+            ) from exc
+
+        recorded_platform = self.meta.get("platform")
+        if recorded_platform and recorded_platform != platform.system().lower():
+            logger.warning(
+                "Capture was recorded on %s; replaying on %s may issue "
+                "commands that were never captured",
+                recorded_platform,
+                platform.system().lower(),
+            )
+
+    def _next(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            else:
+                entry = self._last.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.served += 1
+            return entry
+
+    def run_command(
+        self,
+        argv: list[str],
+        *,
+        timeout: float | None,
+        text: bool,
+        input: str | bytes | None,
+        execute: Callable[[], CommandResult],
+    ) -> CommandResult:
+        started = time.perf_counter()
+        entry = self._next(_command_key(argv, _stdin_digest(input)))
+        outcome = entry.get("outcome", OUTCOME_NOT_FOUND) if entry else None
+        stdout = _decode_stream(entry.get("stdout")) if entry else b""
+        stderr = _decode_stream(entry.get("stderr")) if entry else b""
+        record = CommandRecord(
+            tool=Path(argv[0]).name if argv else "unknown",
+            argv=tuple(argv),
+            outcome=outcome or OUTCOME_NOT_FOUND,
+            returncode=entry.get("returncode") if entry else None,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            stdout_bytes=len(stdout),
+            stderr_bytes=len(stderr),
+            truncated=bool(entry and entry.get("truncated")),
+        )
+        add_command_record(record)
+
+        if entry is None:
+            logger.debug("Replay miss: %s", argv)
+            raise FileNotFoundError(f"Command not in capture: {argv[0]}")
+        if outcome == OUTCOME_NOT_FOUND:
+            raise FileNotFoundError(f"Command not found when captured: {argv[0]}")
+        if outcome == OUTCOME_SPAWN_FAILED:
+            raise OSError(f"Command failed to spawn when captured: {argv[0]}")
+        if outcome == OUTCOME_TIMEOUT:
+            raise subprocess.TimeoutExpired(
+                argv,
+                timeout or entry.get("timeout") or 0,
+                output=decode_output(stdout, text),
+                stderr=decode_output(stderr, text),
+            )
+
+        return CommandResult(
+            argv,
+            int(entry.get("returncode") or 0),
+            decode_output(stdout, text),
+            decode_output(stderr, text),
+            outcome=record.outcome,
+            duration_ms=record.duration_ms,
+            truncated=record.truncated,
+        )
+
+    def spawn_command(self, argv: list[str], *, execute: Callable[[], Any]) -> Any:
+        entry = self._next("spawn:" + _command_key(argv, None))
+        outcome = entry.get("outcome") if entry else OUTCOME_NOT_FOUND
+        add_command_record(
+            CommandRecord(
+                tool=Path(argv[0]).name if argv else "unknown",
+                argv=tuple(argv),
+                outcome=OUTCOME_TERMINATED if entry else OUTCOME_NOT_FOUND,
+                returncode=None,
+                duration_ms=0.0,
+            )
+        )
+        if outcome == OUTCOME_NOT_FOUND:
+            raise FileNotFoundError(f"Command not in capture: {argv[0]}")
+        if outcome == OUTCOME_SPAWN_FAILED:
+            raise OSError(f"Command failed to spawn when captured: {argv[0]}")
+        return ReplayedProcess(argv)
+
+    def read_file(self, path: str, *, execute: Callable[[], str]) -> str:
+        entry = self._next("file:" + _command_key([path], None))
+        if entry is None:
+            raise FileNotFoundError(f"File not in capture: {path}")
+        if "error" in entry:
+            _raise_os_error(entry)
+        return str(entry.get("data", ""))
+
+    def list_dir(self, path: str, *, execute: Callable[[], list[str]]) -> list[str]:
+        entry = self._next("listdir:" + _command_key([path], None))
+        if entry is None:
+            raise FileNotFoundError(f"Directory not in capture: {path}")
+        if "error" in entry:
+            _raise_os_error(entry)
+        return list(entry.get("entries", []))
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "mode": "replay",
+            "directory": str(self.directory),
+            "recorded_platform": self.meta.get("platform"),
+            "recorded_agent_version": self.meta.get("agent_version"),
+            "served": self.served,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        return None
+
+
+def start_recording(directory: Path) -> CommandRecorder:
+    """Install a recorder for all subsequent commands."""
+    recorder = CommandRecorder(directory)
+    _install(recorder)
+    return recorder
+
+
+def start_replay(directory: Path) -> CommandReplayer:
+    """Install a replayer for all subsequent commands."""
+    replayer = CommandReplayer(directory)
+    _install(replayer)
+    return replayer
+
+
+def _install(hook: CommandRecorder | CommandReplayer) -> None:
+    if get_command_hook() is not None:
+        raise ReplayError("A command record/replay session is already active")
+    set_command_hook(hook)
+
+
+def stop_capture() -> None:
+    """Remove the active recorder/replayer (if any) and close its files."""
+    hook = set_command_hook(None)
+    if hook is not None and hasattr(hook, "close"):
+        hook.close()
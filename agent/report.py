@@ -9,7 +9,7 @@ testing.
 from __future__ import annotations
 
 import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from . import anomaly, policy_pack, reliability, scoring
 from .analytics_profile import get_offline_analytics_profile
@@ -135,7 +135,10 @@ def compose_report(
     profile: str = "default",
     smart_status: Optional[str] = None,
     native: Optional[Dict[str, Any]] = None,
-    policy_pack_payload: Optional[Dict[str, Any]] = None,
+    command_metrics: Optional[Dict[str, Any]] = None,
+    policy_pack_payload: Optional[
+        Union[Dict[str, Any], policy_pack.CompiledPolicyPack]
+    ] = None,
     plugin_manifest_verification: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Compose a minimal report dict.
@@ -151,6 +154,10 @@ def compose_report(
         profile: Buyer profile
         smart_status: Overall SMART status (ok/sample/missing)
         native: Optional native helper metadata/capabilities
+        command_metrics: Optional aggregate external-command metrics
+            (see `agent.exec.command_metrics_summary`)
+        policy_pack_payload: Optional policy pack (loaded payload or a pack
+            precompiled with `policy_pack.compile_policy_pack`)
     """
     report: Dict[str, Any] = {
         "report_version": REPORT_SCHEMA_VERSION,
@@ -177,6 +184,9 @@ def compose_report(
     if native is not None:
         report["native"] = native
 
+    if command_metrics is not None:
+        report["command_metrics"] = command_metrics
+
     if plugin_manifest_verification is not None:
         report.setdefault("evidence", {})[
             "plugin_manifest"
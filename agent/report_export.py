@@ -0,0 +1,333 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Flat, columnar export of many reports for analytics.
+
+Each report becomes one row: top-level metadata, `device.*`, `summary.*`,
+`scores.*`, `tests.<name>.status` and `tests.<name>.data.*` columns
+flattened from the nested report.json (lists are kept as compact JSON
+strings). Sources are
+report.json files and `.inspecta` bundle archives, read one at a time.
+
+CSV and Parquet need their columns up front, so those formats make a
+first pass over the sources to collect column names and types (only the
+schema is kept) and a second pass that writes rows in fixed-size batches.
+JSONL is written in a single pass. Memory use is bounded by the batch
+size, not by the number of reports. Parquet requires pyarrow; CSV and
+JSONL use only the standard library.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from agent import jsonio
+from agent.bundle_archive import (
+    ARCHIVE_SUFFIX,
+    BundleArchive,
+    BundleArchiveError,
+    is_bundle_archive,
+)
+from agent.rescore import REPORT_FILE
+
+logger = logging.getLogger("inspecta.report_export")
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_BATCH_SIZE = 1000
+SOURCE_COLUMN = "source"
+_MAX_FLATTEN_DEPTH = 4
+_MAX_REPORTED_ERRORS = 20
+_META_FIELDS = ("report_version", "generated_at", "mode", "profile")
+# Column groups, in output order; columns within a group are sorted.
+_GROUP_ORDER = ("device.", "summary.", "scores.", "tests.")
+
+
+class ReportExportError(Exception):
+    """Raised when an export cannot be written."""
+
+
+def discover_export_sources(root: Path) -> List[Path]:
+    """Return sorted report.json files and `.inspecta` archives under `root`."""
+    if root.is_file():
+        return [root]
+    sources: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in filenames:
+            if name == REPORT_FILE or name.endswith(ARCHIVE_SUFFIX):
+                sources.append(Path(dirpath) / name)
+    return sorted(sources)
+
+
+def _load_source(path: Path) -> Dict[str, Any]:
+    if is_bundle_archive(path):
+        with BundleArchive(path) as archive:
+            text = archive.read_text(REPORT_FILE)
+    else:
+        text = path.read_text(encoding="utf-8")
+    report = jsonio.loads(text)
+    if not isinstance(report, dict):
+        raise ValueError("report is not a JSON object")
+    return report
+
+
+def _flatten(value: Any, prefix: str, out: Dict[str, Any], depth: int = 0) -> None:
+    if isinstance(value, dict) and depth < _MAX_FLATTEN_DEPTH:
+        for key, item in value.items():
+            _flatten(item, f"{prefix}.{key}", out, depth + 1)
+    elif isinstance(value, (dict, list, tuple)):
+        out[prefix] = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    else:
+        out[prefix] = value
+
+
+def flatten_report(report: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Flatten one report into a `{column: scalar}` row.
+
+    Args:
+        report: Parsed report.json
+        source: Value of the `source` column (the file or archive path)
+
+    Returns:
+        Row with metadata, `device.*`, `summary.*`, `scores.*` and
+        `tests.<name>.status` / `tests.<name>.data.<data path>` columns (the
+        `data.` level keeps a `status` field in test data from overwriting
+        the test status); when test names repeat, the first test wins
+    """
+    row: Dict[str, Any] = {SOURCE_COLUMN: source}
+    for field in _META_FIELDS:
+        row[field] = report.get(field)
+    agent = report.get("agent")
+    row["agent_version"] = (
+        agent.get("version") if isinstance(agent, dict) else report.get("agent_version")
+    )
+    for section in ("device", "summary", "scores"):
+        value = report.get(section)
+        if isinstance(value, dict):
+            _flatten(value, section, row)
+    seen = set()
+    for test in report.get("tests") or []:
+        if not isinstance(test, dict):
+            continue
+        name = str(test.get("name", ""))
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        row[f"tests.{name}.status"] = test.get("status")
+        data = test.get("data")
+        if isinstance(data, dict):
+            _flatten(data, f"tests.{name}.data", row)
+    return row
+
+
+def _column_sort_key(column: str) -> Tuple[int, str]:
+    for rank, prefix in enumerate(_GROUP_ORDER, start=1):
+        if column.startswith(prefix):
+            return rank, column
+    return 0, ""  # fixed leading columns keep insertion order
+
+
+def _value_type(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "string"
+
+
+def _merge_type(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    if current is None or current == new:
+        return new or current
+    if new is None:
+        return current
+    if {current, new} == {"int", "float"}:
+        return "float"
+    return "string"
+
+
+def _iter_rows(
+    sources: Sequence[Path], summary: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    for path in sources:
+        try:
+            report = _load_source(path)
+        except (OSError, ValueError, BundleArchiveError) as exc:
+            if summary is not None:
+                summary["errors"] += 1
+                if len(summary["error_messages"]) < _MAX_REPORTED_ERRORS:
+                    summary["error_messages"].append(f"{path}: {exc}")
+                logger.warning("Skipping %s: %s", path, exc)
+            continue
+        yield flatten_report(report, str(path))
+
+
+def _scan_schema(sources: Sequence[Path]) -> Dict[str, Optional[str]]:
+    """First pass: column names (in output order) and their merged types."""
+    types: Dict[str, Optional[str]] = {}
+    for row in _iter_rows(sources):
+        for column, value in row.items():
+            types[column] = _merge_type(types.get(column), _value_type(value))
+    leading = [c for c in types if _column_sort_key(c)[0] == 0]
+    rest = sorted((c for c in types if _column_sort_key(c)[0]), key=_column_sort_key)
+    return {column: types[column] for column in leading + rest}
+
+
+def _batches(
+    rows: Iterator[Dict[str, Any]], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _write_csv(
+    handle: Any, rows: Iterator[Dict[str, Any]], columns: List[str], batch_size: int
+) -> None:
+    writer = csv.writer(handle)
+    writer.writerow(columns)
+    for batch in _batches(rows, batch_size):
+        writer.writerows([[_csv_cell(row.get(c)) for c in columns] for row in batch])
+
+
+def _write_jsonl(handle: Any, rows: Iterator[Dict[str, Any]], batch_size: int) -> None:
+    for batch in _batches(rows, batch_size):
+        handle.write("".join(jsonio.dumps(row) + "\n" for row in batch))
+
+
+def _load_pyarrow() -> Tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet as parquet
+    except ImportError as exc:
+        raise ReportExportError(
+            "Parquet export requires pyarrow (pip install pyarrow); "
+            "use --format csv or jsonl instead"
+        ) from exc
+    return pyarrow, parquet
+
+
+def _arrow_value(value: Any, kind: Optional[str]) -> Any:
+    if value is None:
+        return None
+    if kind == "string":
+        return value if isinstance(value, str) else json.dumps(value)
+    if kind == "float":
+        return float(value)
+    return value
+
+
+def _write_parquet(
+    path: Path,
+    rows: Iterator[Dict[str, Any]],
+    schema_types: Dict[str, Optional[str]],
+    batch_size: int,
+) -> None:
+    pa, pq = _load_pyarrow()
+    arrow_types = {
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "string": pa.string(),
+        None: pa.string(),
+    }
+    schema = pa.schema(
+        [(column, arrow_types[kind]) for column, kind in schema_types.items()]
+    )
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for batch in _batches(rows, batch_size):
+            columns = {
+                column: [_arrow_value(row.get(column), kind) for row in batch]
+                for column, kind in schema_types.items()
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+
+def export_reports(
+    sources: Sequence[Path],
+    output: Path,
+    fmt: str = "csv",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Export `sources` as one flat row per report.
+
+    Args:
+        sources: report.json files and/or `.inspecta` archives
+        output: Destination file (replaced atomically when complete)
+        fmt: One of `EXPORT_FORMATS`
+        batch_size: Rows buffered per write
+
+    Returns:
+        Summary with format, output, rows, columns, errors, the first few
+        error messages and elapsed seconds
+
+    Raises:
+        ReportExportError: Unknown format, pyarrow missing for parquet, or
+            the output cannot be written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ReportExportError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        _load_pyarrow()
+    started = time.perf_counter()
+    batch_size = max(1, batch_size)
+    summary: Dict[str, Any] = {
+        "format": fmt,
+        "output": str(output),
+        "rows": 0,
+        "columns": 0,
+        "errors": 0,
+        "error_messages": [],
+    }
+    schema_types = _scan_schema(sources) if fmt != "jsonl" else {}
+    columns = set()
+
+    def counted(rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            summary["rows"] += 1
+            if fmt == "jsonl":
+                columns.update(row)
+            yield row
+
+    rows = counted(_iter_rows(sources, summary))
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "parquet":
+            _write_parquet(tmp_path, rows, schema_types, batch_size)
+        else:
+            with tmp_path.open("w", encoding="utf-8", newline="") as handle:
+                if fmt == "csv":
+                    _write_csv(handle, rows, list(schema_types), batch_size)
+                else:
+                    _write_jsonl(handle, rows, batch_size)
+        os.replace(tmp_path, output)
+    except OSError as exc:
+        raise ReportExportError(f"Cannot write {output}: {exc}") from exc
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    summary["columns"] = len(schema_types) if fmt != "jsonl" else len(columns)
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 6)
+    return summary
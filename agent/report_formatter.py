@@ -1,18 +1,46 @@
 # Copyright (c) 2025 mufthakherul — see LICENSE.txt
 """Report formatting utilities for human-readable outputs.
 
-Generates TXT and PDF reports from inspection data.
+Generates TXT, PDF and HTML reports from inspection data, optionally all
+at once in the background (see `start_report_rendering`).
+
+The HTML report has two layouts. "single" is one self-contained file with
+every test row and the full report JSON inline, for archiving. "split"
+keeps report.html small for runs with long sample series or many tests:
+the full report goes to a compact `report.data.js` next to it, which the
+page loads only when the reader pages past the first tests or asks for
+raw data. Both layouts chart numeric sample series downsampled to at most
+`CHART_MAX_POINTS` points.
 """
 
 from __future__ import annotations
 
+import copy
+import importlib.util
+import itertools
 import json
+import math
 import os
 import platform
 import subprocess
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from html import escape
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agent import jsonio
+
+HTML_MODES = ("auto", "single", "split")
+HTML_DATA_FILE = "report.data.js"
+# Compact report.json size above which "auto" writes the split layout.
+HTML_SPLIT_THRESHOLD_BYTES = 1024 * 1024
+HTML_PAGE_SIZE = 50
+CHART_MAX_POINTS = 240
+_MAX_CHARTS = 12
+_DATA_GLOBAL = "INSPECTA_REPORT_DATA"
+# Sample fields that are an x axis, not a measurement.
+_AXIS_FIELDS = frozenset({"timestamp", "time", "ts"})
 
 
 def format_txt_report(report: Dict[str, Any]) -> str:
@@ -356,16 +384,253 @@ def generate_pdf_report(report: Dict[str, Any], output_path: Path) -> Optional[P
     return pdf_path
 
 
-def generate_html_report(report: Dict[str, Any], output_path: Path) -> Path:
+def downsample_series(
+    values: Sequence[float], max_points: int = CHART_MAX_POINTS
+) -> List[Tuple[int, float]]:
+    """Reduce a series to at most `max_points` `(index, value)` pairs.
+
+    The series is cut into `max_points // 2` equal buckets and each bucket
+    keeps its minimum and maximum in their original order, so short spikes
+    (a throttling dip, a temperature peak) survive downsampling.
+
+    Args:
+        values: Samples in time order
+        max_points: Upper bound on returned points (at least 2)
+
+    Returns:
+        Original indices and values of the kept samples, in order
+    """
+    count = len(values)
+    if count <= max_points:
+        return list(enumerate(values))
+    buckets = max(1, max_points // 2)
+    kept: List[Tuple[int, float]] = []
+    for bucket in range(buckets):
+        start = bucket * count // buckets
+        stop = (bucket + 1) * count // buckets
+        low = min(range(start, stop), key=values.__getitem__)
+        high = max(range(start, stop), key=values.__getitem__)
+        for index in sorted({low, high}):
+            kept.append((index, values[index]))
+    return kept
+
+
+def _finite_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if math.isfinite(value) else None
+
+
+def _sample_series(tests: Iterable[Any]) -> Iterator[Tuple[str, List[float]]]:
+    """Yield `(label, values)` for numeric fields of sample lists in test data.
+
+    A sample list is a list of at least two objects under a test's `data`,
+    such as the thermal stress `samples`.
+    """
+    for test in tests:
+        data = test.get("data") if isinstance(test, dict) else None
+        if not isinstance(data, dict):
+            continue
+        for key, samples in data.items():
+            if not isinstance(samples, list) or len(samples) < 2:
+                continue
+            series: Dict[str, List[float]] = {}
+            for sample in samples:
+                if not isinstance(sample, dict):
+                    break  # not a sample list
+                for field, value in sample.items():
+                    number = _finite_number(value)
+                    if number is not None and field not in _AXIS_FIELDS:
+                        series.setdefault(field, []).append(number)
+            else:
+                name = test.get("name", "unknown")
+                for field, values in series.items():
+                    if len(values) >= 2:
+                        yield f"{name} · {key}.{field}", values
+
+
+def _chart_figure(label: str, values: List[float]) -> str:
+    width, height = 600, 120
+    points = downsample_series(values)
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    last = max(1, len(values) - 1)
+    coords = " ".join(
+        f"{index * width / last:.1f},{height - (value - low) * height / span:.1f}"
+        for index, value in points
+    )
+    note = f"{len(values)} samples, min {low:g}, max {high:g}"
+    if len(points) < len(values):
+        note += f", drawn from {len(points)} points"
+    return (
+        f'    <figure><figcaption>{escape(label)} <span class="muted">'
+        f"({note})</span></figcaption>"
+        f'<svg class="chart" viewBox="0 0 {width} {height}" '
+        'preserveAspectRatio="none" role="img">'
+        '<polyline fill="none" stroke="#4f46e5" stroke-width="1.5" '
+        f'points="{coords}" /></svg></figure>'
+    )
+
+
+def _test_row(test: Dict[str, Any], index: Optional[int] = None) -> str:
+    name = escape(str(test.get("name", "unknown")))
+    if index is not None:
+        name = f'<a href="#raw-data" data-test="{index}">{name}</a>'
+    return (
+        "<tr>"
+        f"<td>{name}</td>"
+        f"<td>{escape(str(test.get('status', 'unknown')).upper())}</td>"
+        f"<td>{escape(str(test.get('status_detail', '')))}</td>"
+        f"<td>{escape(str(test.get('error', '')))}</td>"
+        "</tr>"
+    )
+
+
+# Pagination and on-demand raw data for the split layout. The data file is
+# loaded with a <script> element because browsers block fetch() of file://
+# URLs, and reports are usually opened straight from disk.
+_SPLIT_VIEWER_JS = """\
+(function () {
+  "use strict";
+  var meta = JSON.parse(document.getElementById("report-meta").textContent);
+  var body = document.getElementById("tests-body");
+  var status = document.getElementById("data-status");
+  var pages = Math.max(1, Math.ceil(meta.tests / meta.page_size));
+  var page = 0;
+  var data = null;
+  var waiting = [];
+
+  function withData(callback) {
+    if (data) {
+      callback(data);
+      return;
+    }
+    waiting.push(callback);
+    if (waiting.length > 1) {
+      return;
+    }
+    status.textContent = "Loading " + meta.data_file + "...";
+    var script = document.createElement("script");
+    script.src = meta.data_file;
+    script.onerror = function () {
+      waiting = [];
+      status.textContent =
+        "Cannot load " + meta.data_file + "; keep it next to report.html.";
+    };
+    script.onload = function () {
+      data = window[meta.data_global] || null;
+      if (!data) {
+        script.onerror();
+        return;
+      }
+      status.textContent = "";
+      waiting.splice(0).forEach(function (fn) { fn(data); });
+    };
+    document.head.appendChild(script);
+  }
+
+  function text(value, fallback) {
+    return value === undefined || value === null ? fallback : String(value);
+  }
+
+  function cell(content) {
+    var td = document.createElement("td");
+    td.textContent = content;
+    return td;
+  }
+
+  function renderPage(report) {
+    var rows = document.createDocumentFragment();
+    var start = page * meta.page_size;
+    report.tests.slice(start, start + meta.page_size).forEach(function (test, i) {
+      var tr = document.createElement("tr");
+      var name = document.createElement("td");
+      var link = document.createElement("a");
+      link.href = "#raw-data";
+      link.dataset.test = String(start + i);
+      link.textContent = text(test.name, "unknown");
+      name.appendChild(link);
+      tr.appendChild(name);
+      tr.appendChild(cell(text(test.status, "unknown").toUpperCase()));
+      tr.appendChild(cell(text(test.status_detail, "")));
+      tr.appendChild(cell(text(test.error, "")));
+      rows.appendChild(tr);
+    });
+    body.replaceChildren(rows);
+    document.getElementById("page-label").textContent =
+      "Page " + (page + 1) + " of " + pages;
+  }
+
+  function goTo(target) {
+    target = Math.min(Math.max(target, 0), pages - 1);
+    if (target !== page) {
+      withData(function (report) {
+        page = target;
+        renderPage(report);
+      });
+    }
+  }
+
+  function showRaw(title, value) {
+    document.getElementById("raw-title").textContent = title;
+    document.getElementById("raw-json").textContent = JSON.stringify(value, null, 2);
+  }
+
+  document.getElementById("page-prev").addEventListener("click", function () {
+    goTo(page - 1);
+  });
+  document.getElementById("page-next").addEventListener("click", function () {
+    goTo(page + 1);
+  });
+  body.addEventListener("click", function (event) {
+    var link = event.target.closest("a[data-test]");
+    if (link) {
+      var index = Number(link.dataset.test);
+      withData(function (report) {
+        showRaw("tests[" + index + "]", report.tests[index]);
+      });
+    }
+  });
+  document.getElementById("raw-section").addEventListener("change", function (event) {
+    var key = event.target.value;
+    if (key) {
+      withData(function (report) {
+        showRaw(key === "*" ? "report" : key, key === "*" ? report : report[key]);
+      });
+    }
+  });
+})();
+"""
+
+
+def generate_html_report(
+    report: Dict[str, Any], output_path: Path, mode: str = "single"
+) -> Path:
     """Generate a static HTML report file.
 
     Args:
             report: Report dictionary from compose_report()
             output_path: Directory where the report should be saved
+            mode: "single" for one self-contained file, "split" for a small
+                page plus `HTML_DATA_FILE`, or "auto" to split when the
+                compact report exceeds `HTML_SPLIT_THRESHOLD_BYTES`
 
     Returns:
             Path to generated HTML report
+
+    Raises:
+            ValueError: Unknown mode
     """
+    if mode not in HTML_MODES:
+        raise ValueError(f"Unknown HTML mode: {mode}")
+    data_path = output_path / HTML_DATA_FILE
+    report_bytes = b""
+    if mode != "single":
+        report_bytes = jsonio.dump_bytes(report)
+        if mode == "auto":
+            split = len(report_bytes) > HTML_SPLIT_THRESHOLD_BYTES
+            mode = "split" if split else "single"
+
     summary = report.get("summary", {})
     device = report.get("device", {})
     scores = report.get("scores", {})
@@ -389,19 +654,78 @@ def generate_html_report(report: Dict[str, Any], output_path: Path) -> Path:
         for name, value in sorted(scores.items())
     )
 
-    test_rows = "\n".join(
-        (
-            "<tr>"
-            f"<td>{escape(str(test.get('name', 'unknown')))}</td>"
-            f"<td>{escape(str(test.get('status', 'unknown')).upper())}</td>"
-            f"<td>{escape(str(test.get('status_detail', '')))}</td>"
-            f"<td>{escape(str(test.get('error', '')))}</td>"
-            "</tr>"
-        )
-        for test in tests
+    charts = [
+        _chart_figure(label, values)
+        for label, values in itertools.islice(_sample_series(tests), _MAX_CHARTS)
+    ]
+    chart_parts = (
+        [
+            '  <section class="card">',
+            "    <h2>Sample Series</h2>",
+            *charts,
+            "  </section>",
+        ]
+        if charts
+        else []
     )
 
-    raw_json = escape(json.dumps(report, indent=2, ensure_ascii=False))
+    if mode == "split":
+        test_rows = "\n".join(
+            _test_row(test, index) for index, test in enumerate(tests[:HTML_PAGE_SIZE])
+        )
+        pages = max(1, math.ceil(len(tests) / HTML_PAGE_SIZE))
+        pager_hidden = " hidden" if pages == 1 else ""
+        meta = {
+            "data_file": HTML_DATA_FILE,
+            "data_global": _DATA_GLOBAL,
+            "page_size": HTML_PAGE_SIZE,
+            "tests": len(tests),
+        }
+        section_options = "".join(
+            f'<option value="{escape(str(key))}">{escape(str(key))}</option>'
+            for key in report
+        )
+        table_footer = [
+            f'    <p class="pager"{pager_hidden}>',
+            '      <button type="button" id="page-prev">Previous</button>',
+            f'      <span id="page-label">Page 1 of {pages}</span>',
+            '      <button type="button" id="page-next">Next</button>',
+            f'      <span class="muted">{len(tests)} tests</span>',
+            "    </p>",
+        ]
+        raw_parts = [
+            '  <section class="card" id="raw-data">',
+            "    <h2>Raw JSON</h2>",
+            (
+                f'    <p class="muted">Loaded on demand from {HTML_DATA_FILE}. '
+                "Pick a section or click a test name.</p>"
+            ),
+            '    <select id="raw-section">',
+            '      <option value="">Choose a section...</option>',
+            f"      {section_options}",
+            '      <option value="*">Entire report</option>',
+            "    </select>",
+            '    <span class="muted" id="data-status"></span>',
+            '    <h3 id="raw-title"></h3>',
+            '    <pre id="raw-json"></pre>',
+            "  </section>",
+            '  <script type="application/json" id="report-meta">'
+            + json.dumps(meta).replace("</", "<\\/")
+            + "</script>",
+            "  <script>",
+            _SPLIT_VIEWER_JS,
+            "  </script>",
+        ]
+    else:
+        test_rows = "\n".join(_test_row(test) for test in tests)
+        table_footer = []
+        raw_json = escape(json.dumps(report, indent=2, ensure_ascii=False))
+        raw_parts = [
+            '  <section class="card">',
+            "    <h2>Raw JSON</h2>",
+            f"    <pre>{raw_json}</pre>",
+            "  </section>",
+        ]
 
     html_parts = [
         "<!doctype html>",
@@ -440,6 +764,11 @@ def generate_html_report(report: Dict[str, Any], output_path: Path) -> Path:
             "background: #f9fafb; padding: 0.75rem; border-radius: 8px; "
             "border: 1px solid #e5e7eb; }"
         ),
+        "    figure { margin: 0.75rem 0; }",
+        (
+            "    .chart { width: 100%; height: 120px; background: #f9fafb; "
+            "border: 1px solid #e5e7eb; border-radius: 8px; }"
+        ),
         "  </style>",
         "</head>",
         "<body>",
@@ -469,6 +798,7 @@ def generate_html_report(report: Dict[str, Any], output_path: Path) -> Path:
         "      </tbody>",
         "    </table>",
         "  </section>",
+        *chart_parts,
         '  <section class="card">',
         "    <h2>Test Results</h2>",
         "    <table>",
@@ -476,24 +806,96 @@ def generate_html_report(report: Dict[str, Any], output_path: Path) -> Path:
             "      <thead><tr><th>Test</th><th>Status</th><th>Detail</th>"
             "<th>Error</th></tr></thead>"
         ),
-        "      <tbody>",
+        '      <tbody id="tests-body">',
         test_rows,
         "      </tbody>",
         "    </table>",
+        *table_footer,
         "  </section>",
-        '  <section class="card">',
-        "    <h2>Raw JSON</h2>",
-        f"    <pre>{raw_json}</pre>",
-        "  </section>",
+        *raw_parts,
         "</body>",
         "</html>",
     ]
 
+    if mode == "split":
+        # Written first so report.html never points at a missing data file.
+        data_path.write_bytes(
+            f"window.{_DATA_GLOBAL} = ".encode("ascii") + report_bytes + b";\n"
+        )
+    elif data_path.exists():
+        data_path.unlink()  # left over from an earlier split render
     html_path = output_path / "report.html"
     html_path.write_text("\n".join(html_parts), encoding="utf-8")
     return html_path
 
 
+REPORT_RENDERERS = {
+    "txt": generate_txt_report,
+    "pdf": generate_pdf_report,
+    "html": generate_html_report,
+}
+
+
+def _start_pdf_process(report: Dict[str, Any], output_path: Path) -> Optional[Future]:
+    """Render the PDF in a separate process; None if that would not help."""
+    if importlib.util.find_spec("reportlab") is None:
+        return None  # generate_pdf_report returns None at once; no process needed
+    if (os.cpu_count() or 1) < 2:
+        return None  # nothing to run in parallel with; skip the process start
+    try:
+        pool = ProcessPoolExecutor(max_workers=1)
+        future = pool.submit(generate_pdf_report, report, output_path)
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return None
+    pool.shutdown(wait=False)
+    return future
+
+
+def start_report_rendering(
+    report: Dict[str, Any],
+    output_path: Path,
+    formats: Iterable[str],
+    html_mode: str = "single",
+) -> Dict[str, Future]:
+    """Start rendering human-readable reports concurrently.
+
+    TXT and HTML render on threads. PDF rendering is CPU-bound, so when
+    reportlab is installed and there is more than one CPU it runs in a
+    separate process. Renderers work on
+    a snapshot of `report`, so the caller may keep updating it while they
+    run.
+
+    Args:
+        report: Report dictionary from compose_report()
+        output_path: Directory where the reports should be saved
+        formats: Any of the `REPORT_RENDERERS` keys
+        html_mode: Layout for the HTML report (see `generate_html_report`)
+
+    Returns:
+        Mapping of format to a future resolving to the renderer's result
+    """
+    snapshot = copy.deepcopy(report)
+    futures: Dict[str, Future] = {}
+    threaded = []
+    for fmt in dict.fromkeys(formats):
+        future = _start_pdf_process(snapshot, output_path) if fmt == "pdf" else None
+        if future is not None:
+            futures[fmt] = future
+        else:
+            threaded.append(fmt)
+    if threaded:
+        pool = ThreadPoolExecutor(
+            max_workers=len(threaded), thread_name_prefix="inspecta-render"
+        )
+        for fmt in threaded:
+            extra = {"mode": html_mode} if fmt == "html" else {}
+            futures[fmt] = pool.submit(
+                REPORT_RENDERERS[fmt], snapshot, output_path, **extra
+            )
+        pool.shutdown(wait=False)
+    return futures
+
+
 def open_file(file_path: Path) -> bool:
     """Open a file using the system's default application.
 
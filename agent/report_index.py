@@ -0,0 +1,541 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""SQLite index over stored reports for fleet queries.
+
+`ReportIndex.update` walks an archive for report.json files and upserts
+report metadata, device identity, category scores, per-test numeric metrics
+and anomalies into a local SQLite database. Files whose (mtime_ns, size) are
+unchanged since the last run are skipped, and rows for reports that have
+disappeared from the archive are dropped. Writes go through `executemany`
+in batched transactions with the database in WAL mode, so queries can run
+while an update is in progress.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agent import jsonio
+from agent.paths import user_data_dir
+from agent.rescore import discover_reports
+from agent.schema_compat import migrate_legacy_report
+
+logger = logging.getLogger("inspecta.report_index")
+
+INDEX_FILE = "report-index.sqlite"
+INDEX_SCHEMA_VERSION = 1
+DEFAULT_BATCH_SIZE = 500
+# Nested test data deeper than this is not flattened into metrics.
+_MAX_METRIC_DEPTH = 3
+_MAX_REPORTED_ERRORS = 20
+
+GROUP_BY_FIELDS = {
+    "grade": "r.grade",
+    "profile": "r.profile",
+    "mode": "r.mode",
+    "vendor": "r.vendor",
+    "model": "r.model",
+    "month": "substr(r.generated_at, 1, 7)",
+}
+_METRIC_FILTER_RE = re.compile(
+    r"^\s*([A-Za-z0-9_.\-]+)\s*(>=|<=|!=|==|=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    report_version TEXT,
+    generated_at TEXT,
+    mode TEXT,
+    profile TEXT,
+    agent_version TEXT,
+    vendor TEXT,
+    model TEXT,
+    serial TEXT,
+    overall_score INTEGER,
+    grade TEXT,
+    confidence_score INTEGER,
+    policy_status TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    score INTEGER,
+    PRIMARY KEY (report_id, category)
+);
+CREATE TABLE IF NOT EXISTS test_metrics (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    status TEXT,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS anomalies (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    anomaly_id TEXT,
+    category TEXT,
+    severity TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_generated_at ON reports(generated_at);
+CREATE INDEX IF NOT EXISTS scores_category ON scores(category, score);
+CREATE INDEX IF NOT EXISTS test_metrics_metric ON test_metrics(metric, value);
+CREATE INDEX IF NOT EXISTS test_metrics_report ON test_metrics(report_id);
+CREATE INDEX IF NOT EXISTS anomalies_report ON anomalies(report_id);
+"""
+
+_REPORT_COLUMNS = (
+    "id",
+    "path",
+    "mtime_ns",
+    "size",
+    "report_version",
+    "generated_at",
+    "mode",
+    "profile",
+    "agent_version",
+    "vendor",
+    "model",
+    "serial",
+    "overall_score",
+    "grade",
+    "confidence_score",
+    "policy_status",
+    "indexed_at",
+)
+_RESULT_COLUMNS = (
+    "path",
+    "generated_at",
+    "vendor",
+    "model",
+    "serial",
+    "mode",
+    "profile",
+    "overall_score",
+    "grade",
+    "confidence_score",
+    "policy_status",
+)
+
+
+class ReportIndexError(Exception):
+    """Raised for an unusable index database or an invalid query."""
+
+
+def default_index_path() -> Path:
+    """Return the per-user report index database location."""
+    return user_data_dir() / INDEX_FILE
+
+
+def parse_metric_filter(spec: str) -> Tuple[str, str, float]:
+    """Parse `METRIC OP VALUE` (e.g. `nvme_percentage_used>=80`).
+
+    Raises:
+        ReportIndexError: Malformed filter
+    """
+    match = _METRIC_FILTER_RE.match(spec)
+    if not match:
+        raise ReportIndexError(
+            f"Invalid metric filter {spec!r}; expected METRIC OP VALUE, "
+            "e.g. nvme_percentage_used>=80"
+        )
+    metric, op, value = match.groups()
+    return metric, "=" if op == "==" else op, float(value)
+
+
+def _flatten_metrics(
+    data: Any, prefix: str = "", depth: int = 0
+) -> Iterator[Tuple[str, float]]:
+    if not isinstance(data, dict) or depth >= _MAX_METRIC_DEPTH:
+        return
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            yield name, float(value)
+        elif isinstance(value, (int, float)):
+            if value == value:  # skip NaN
+                yield name, float(value)
+        elif isinstance(value, dict):
+            yield from _flatten_metrics(value, f"{name}.", depth + 1)
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _dict_or_empty(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _text_or_none(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _report_rows(
+    report_id: int, path: str, stat: os.stat_result, report: Dict[str, Any]
+) -> Dict[str, List[tuple]]:
+    normalized = migrate_legacy_report(report)
+    device = _dict_or_empty(normalized.get("device"))
+    summary = _dict_or_empty(normalized.get("summary"))
+    policy = _dict_or_empty(summary.get("policy_pack"))
+    agent = _dict_or_empty(normalized.get("agent"))
+
+    rows: Dict[str, List[tuple]] = {
+        "reports": [
+            (
+                report_id,
+                path,
+                stat.st_mtime_ns,
+                stat.st_size,
+                _text_or_none(normalized.get("report_version")),
+                _text_or_none(normalized.get("generated_at")),
+                _text_or_none(normalized.get("mode")),
+                _text_or_none(normalized.get("profile")),
+                _text_or_none(agent.get("version")),
+                _text_or_none(device.get("vendor")),
+                _text_or_none(device.get("model")),
+                _text_or_none(device.get("serial")),
+                _int_or_none(summary.get("overall_score")),
+                _text_or_none(summary.get("grade")),
+                _int_or_none(summary.get("confidence_score")),
+                _text_or_none(policy.get("status")),
+                time.time(),
+            )
+        ],
+        "scores": [
+            (report_id, str(category), _int_or_none(score))
+            for category, score in _dict_or_empty(normalized.get("scores")).items()
+        ],
+        "test_metrics": [],
+        "anomalies": [],
+    }
+    for test in normalized.get("tests") or []:
+        if not isinstance(test, dict):
+            continue
+        name = str(test.get("name", ""))
+        status = _text_or_none(test.get("status"))
+        rows["test_metrics"].extend(
+            (report_id, name, status, metric, value)
+            for metric, value in _flatten_metrics(test.get("data"))
+        )
+    for anomaly in summary.get("anomalies") or []:
+        if isinstance(anomaly, dict):
+            rows["anomalies"].append(
+                (
+                    report_id,
+                    _text_or_none(anomaly.get("id")),
+                    _text_or_none(anomaly.get("category")),
+                    _text_or_none(anomaly.get("severity")),
+                    _text_or_none(anomaly.get("message")),
+                )
+            )
+    return rows
+
+
+class ReportIndex:
+    """SQLite-backed index of report.json files.
+
+    Args:
+        path: Database file (default `default_index_path()`)
+
+    Raises:
+        ReportIndexError: The database cannot be opened or was written by a
+            newer, incompatible index schema
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or default_index_path()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit; transactions are opened explicitly around writes.
+            self._conn = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None
+            )
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            version = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+        except (OSError, sqlite3.Error) as exc:
+            raise ReportIndexError(f"Cannot open report index {self.path}: {exc}")
+        if version is None:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(INDEX_SCHEMA_VERSION),),
+            )
+        elif int(version["value"]) > INDEX_SCHEMA_VERSION:
+            self._conn.close()
+            raise ReportIndexError(
+                f"Report index {self.path} uses schema {version['value']}; "
+                f"this agent supports up to {INDEX_SCHEMA_VERSION}"
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ReportIndex":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def _write_batch(
+        self, stale_ids: Sequence[int], rows: Dict[str, List[tuple]]
+    ) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "DELETE FROM reports WHERE id = ?", [(i,) for i in stale_ids]
+            )
+            self._conn.executemany(
+                f"INSERT INTO reports ({', '.join(_REPORT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_REPORT_COLUMNS))})",
+                rows["reports"],
+            )
+            self._conn.executemany(
+                "INSERT INTO scores VALUES (?, ?, ?)", rows["scores"]
+            )
+            self._conn.executemany(
+                "INSERT INTO test_metrics VALUES (?, ?, ?, ?, ?)", rows["test_metrics"]
+            )
+            self._conn.executemany(
+                "INSERT INTO anomalies VALUES (?, ?, ?, ?, ?)", rows["anomalies"]
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def update(
+        self, root: Path, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """Index report.json files under `root`, skipping unchanged ones.
+
+        Args:
+            root: Archive directory (or a single report.json)
+            batch_size: Reports written per transaction
+
+        Returns:
+            Summary with scanned/added/updated/unchanged/removed/errors counts,
+            the first few error messages and elapsed seconds
+        """
+        started = time.perf_counter()
+        root = root.resolve()
+        known = {
+            row["path"]: (row["id"], row["mtime_ns"], row["size"])
+            for row in self._conn.execute(
+                "SELECT id, path, mtime_ns, size FROM reports"
+            )
+        }
+        next_id = (
+            self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM reports").fetchone()[0]
+            + 1
+        )
+        summary: Dict[str, Any] = {
+            "scanned": 0,
+            "added": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "removed": 0,
+            "errors": 0,
+            "error_messages": [],
+        }
+        seen = set()
+        stale_ids: List[int] = []
+        pending: Dict[str, List[tuple]] = {
+            "reports": [],
+            "scores": [],
+            "test_metrics": [],
+            "anomalies": [],
+        }
+
+        def flush() -> None:
+            if stale_ids or pending["reports"]:
+                self._write_batch(stale_ids, pending)
+            stale_ids.clear()
+            for table_rows in pending.values():
+                table_rows.clear()
+
+        for report_path in discover_reports(root):
+            path = str(report_path.resolve())
+            seen.add(path)
+            summary["scanned"] += 1
+            previous = known.get(path)
+            try:
+                stat = report_path.stat()
+                if previous is not None and previous[1:] == (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                ):
+                    summary["unchanged"] += 1
+                    continue
+                report = jsonio.loads(report_path.read_text(encoding="utf-8"))
+                if not isinstance(report, dict):
+                    raise ValueError("report is not a JSON object")
+            except (OSError, ValueError) as exc:
+                summary["errors"] += 1
+                if len(summary["error_messages"]) < _MAX_REPORTED_ERRORS:
+                    summary["error_messages"].append(f"{path}: {exc}")
+                logger.warning("Skipping %s: %s", path, exc)
+                # Drop rows indexed from an older, readable version of the file.
+                if previous is not None:
+                    stale_ids.append(previous[0])
+                continue
+
+            if previous is not None:
+                stale_ids.append(previous[0])
+                summary["updated"] += 1
+            else:
+                summary["added"] += 1
+            for table, table_rows in _report_rows(next_id, path, stat, report).items():
+                pending[table].extend(table_rows)
+            next_id += 1
+            if len(pending["reports"]) >= batch_size:
+                flush()
+
+        prefix = str(root) if root.is_file() else str(root) + os.sep
+        for path, (report_id, _mtime, _size) in known.items():
+            if path not in seen and (path == prefix or path.startswith(prefix)):
+                stale_ids.append(report_id)
+                summary["removed"] += 1
+        flush()
+
+        summary["reports_indexed"] = len(self)
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 6)
+        return summary
+
+    def _where(
+        self,
+        grade: Optional[str] = None,
+        profile: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        device: Optional[str] = None,
+        metrics: Iterable[str] = (),
+        test: Optional[str] = None,
+        anomaly_severity: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("r.grade", grade), ("r.profile", profile)):
+            if value is not None:
+                clauses.append(f"{column} = ? COLLATE NOCASE")
+                params.append(value)
+        if min_score is not None:
+            clauses.append("r.overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("r.overall_score <= ?")
+            params.append(max_score)
+        # generated_at is ISO 8601, so string order is chronological.
+        if since is not None:
+            clauses.append("r.generated_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("r.generated_at < ?")
+            params.append(until)
+        if device is not None:
+            clauses.append("(r.vendor LIKE ? OR r.model LIKE ? OR r.serial LIKE ?)")
+            params.extend([f"%{device}%"] * 3)
+        for spec in metrics:
+            metric, op, value = parse_metric_filter(spec)
+            clause = (
+                # Uncorrelated IN lets SQLite range-scan the (metric, value)
+                # index once instead of probing it per report.
+                "r.id IN (SELECT m.report_id FROM test_metrics m "
+                f"WHERE m.metric = ? AND m.value {op} ?"
+            )
+            params.extend([metric, value])
+            if test is not None:
+                clause += " AND m.test GLOB ?"
+                params.append(test)
+            clauses.append(clause + ")")
+        if anomaly_severity is not None:
+            clauses.append(
+                "r.id IN (SELECT a.report_id FROM anomalies a "
+                "WHERE a.severity = ? COLLATE NOCASE)"
+            )
+            params.append(anomaly_severity)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self, limit: Optional[int] = None, **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """Return matching reports, newest first.
+
+        Args:
+            limit: Maximum rows to return
+            **filters: grade, profile, min_score, max_score, since, until,
+                device (substring of vendor/model/serial), metrics
+                (`METRIC OP VALUE` specs, all must match), test (GLOB limiting
+                which tests metrics are matched in), anomaly_severity
+
+        Raises:
+            ReportIndexError: Invalid metric filter
+        """
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT {', '.join('r.' + c for c in _RESULT_COLUMNS)} FROM reports r"
+            f"{where} ORDER BY r.generated_at DESC, r.path"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def aggregate(self, group_by: str, **filters: Any) -> List[Dict[str, Any]]:
+        """Count and summarize overall scores of matching reports per group.
+
+        Args:
+            group_by: One of `GROUP_BY_FIELDS`
+            **filters: As for `query`
+
+        Raises:
+            ReportIndexError: Unknown group field or invalid metric filter
+        """
+        if group_by not in GROUP_BY_FIELDS:
+            raise ReportIndexError(
+                f"Cannot group by {group_by!r}; "
+                f"choose from {', '.join(sorted(GROUP_BY_FIELDS))}"
+            )
+        expression = GROUP_BY_FIELDS[group_by]
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT {expression} AS grp, COUNT(*) AS reports, "
+            "ROUND(AVG(r.overall_score), 1) AS avg_score, "
+            "MIN(r.overall_score) AS min_score, MAX(r.overall_score) AS max_score "
+            f"FROM reports r{where} GROUP BY grp ORDER BY reports DESC, grp"
+        )
+        return [
+            {
+                group_by: row["grp"],
+                "reports": row["reports"],
+                "avg_score": row["avg_score"],
+                "min_score": row["min_score"],
+                "max_score": row["max_score"],
+            }
+            for row in self._conn.execute(sql, params)
+        ]
@@ -0,0 +1,219 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Recompute scores and policy results for stored reports.
+
+Re-runs only the derived stages of `compose_report` (scoring, policy,
+reliability, anomaly) on the `tests` already recorded in each report.json,
+so a change to scoring weights, policy packs or anomaly rules does not
+require re-inspecting the hardware. Stored report.json files are never
+modified, since they are covered by the evidence manifest; updated
+summaries go to a JSONL delta and, optionally, a `rescore.json` beside
+each report.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from agent import jsonio
+from agent.policy_pack import CompiledPolicyPack, compile_policy_pack
+from agent.report import compose_report
+from agent.schema_compat import ensure_supported_report_version, migrate_legacy_report
+
+REPORT_FILE = "report.json"
+RESCORE_FILE = "rescore.json"
+DEFAULT_PROCESSES = os.cpu_count() or 1
+_MAX_CHUNKSIZE = 256
+
+# Per-process state set up by `_init_worker`.
+_worker_policy: CompiledPolicyPack | None = None
+_worker_profile: str | None = None
+_worker_write: bool = False
+
+
+def discover_reports(root: Path) -> List[Path]:
+    """Return sorted report.json files under `root` (or `[root]` for a file)."""
+    if root.is_file():
+        return [root]
+    reports: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if REPORT_FILE in filenames:
+            reports.append(Path(dirpath) / REPORT_FILE)
+    return sorted(reports)
+
+
+def rescore_report(
+    report: Dict[str, Any],
+    policy_pack: Dict[str, Any] | CompiledPolicyPack | None = None,
+    profile: str | None = None,
+) -> Dict[str, Any]:
+    """Return freshly derived `{"scores", "summary"}` for a stored report.
+
+    Args:
+        report: Parsed report.json (legacy shapes are migrated)
+        policy_pack: Policy pack to evaluate; stored policy results are not
+            carried over, since the pack that produced them is not stored
+        profile: Scoring profile override (default: the report's profile)
+
+    Raises:
+        ValueError: Unsupported report schema major version
+    """
+    normalized = migrate_legacy_report(report)
+    ensure_supported_report_version(str(normalized.get("report_version", "0.0.0")))
+    evidence = normalized.get("evidence") or {}
+    composed = compose_report(
+        agent_version=str((normalized.get("agent") or {}).get("version", "unknown")),
+        device=normalized.get("device") or {},
+        artifacts=normalized.get("artifacts") or [],
+        tests=normalized.get("tests") or [],
+        mode=str(normalized.get("mode", "quick")),
+        profile=profile or str(normalized.get("profile", "default")),
+        native=normalized.get("native"),
+        command_metrics=normalized.get("command_metrics"),
+        policy_pack_payload=policy_pack,
+        plugin_manifest_verification=evidence.get("plugin_manifest"),
+    )
+    return {"scores": composed["scores"], "summary": composed["summary"]}
+
+
+def _snapshot(scores: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+    policy = summary.get("policy_pack") or {}
+    return {
+        "overall_score": summary.get("overall_score"),
+        "grade": summary.get("grade"),
+        "confidence_score": summary.get("confidence_score"),
+        "policy_status": policy.get("status"),
+        "scores": scores,
+    }
+
+
+def _write_rescore_file(
+    report_path: Path, rescored: Dict[str, Any], profile: str
+) -> None:
+    target = report_path.with_name(RESCORE_FILE)
+    policy = rescored["summary"].get("policy_pack") or {}
+    payload = {
+        "rescored_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "source": REPORT_FILE,
+        "profile": profile,
+        "policy_pack_id": policy.get("pack_id"),
+        **rescored,
+    }
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def _init_worker(
+    policy_pack: Dict[str, Any] | None, profile: str | None, write_summaries: bool
+) -> None:
+    global _worker_policy, _worker_profile, _worker_write
+    _worker_policy = compile_policy_pack(policy_pack) if policy_pack else None
+    _worker_profile = profile
+    _worker_write = write_summaries
+
+
+def _rescore_path(report_path: str) -> Dict[str, Any]:
+    path = Path(report_path)
+    try:
+        report = jsonio.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(report, dict):
+            raise ValueError("report is not a JSON object")
+        rescored = rescore_report(report, _worker_policy, _worker_profile)
+        if _worker_write:
+            _write_rescore_file(
+                path,
+                rescored,
+                _worker_profile or str(report.get("profile", "default")),
+            )
+    except Exception as exc:  # one malformed report must not stop the batch
+        detail = str(exc)
+        if not isinstance(exc, (OSError, ValueError)):
+            detail = f"{type(exc).__name__}: {detail}"
+        return {
+            "type": "rescore",
+            "report": report_path,
+            "ok": False,
+            "error": detail,
+        }
+
+    before = _snapshot(report.get("scores") or {}, report.get("summary") or {})
+    after = _snapshot(rescored["scores"], rescored["summary"])
+    return {
+        "type": "rescore",
+        "report": report_path,
+        "ok": True,
+        "changed": before != after,
+        "before": before,
+        "after": after,
+    }
+
+
+def rescore_reports(
+    reports: Iterable[Path],
+    policy_pack: Dict[str, Any] | None = None,
+    profile: str | None = None,
+    processes: int | None = None,
+    write_summaries: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Rescore `reports`, yielding one delta record per report in input order.
+
+    Args:
+        reports: report.json paths
+        policy_pack: Loaded policy-pack payload (compiled once per worker)
+        profile: Scoring profile override
+        processes: Worker processes (default: CPU count; 1 = in-process)
+        write_summaries: Also write `rescore.json` beside each report
+    """
+    global _worker_policy, _worker_profile, _worker_write
+    paths = [str(report) for report in reports]
+    processes = DEFAULT_PROCESSES if processes is None else max(1, processes)
+
+    if processes == 1 or len(paths) <= 1:
+        previous = (_worker_policy, _worker_profile, _worker_write)
+        _init_worker(policy_pack, profile, write_summaries)
+        try:
+            for path in paths:
+                yield _rescore_path(path)
+        finally:
+            _worker_policy, _worker_profile, _worker_write = previous
+        return
+
+    workers = min(processes, len(paths))
+    # Reports are small; batch them so IPC does not dominate.
+    chunksize = max(1, min(_MAX_CHUNKSIZE, len(paths) // (workers * 8)))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(policy_pack, profile, write_summaries),
+    ) as pool:
+        yield from pool.map(_rescore_path, paths, chunksize=chunksize)
+
+
+def summarize_rescore(
+    results: Iterable[Dict[str, Any]], elapsed_seconds: float
+) -> Dict[str, Any]:
+    """Aggregate rescore records into counts and throughput."""
+    total = changed = errors = 0
+    for result in results:
+        total += 1
+        if not result.get("ok"):
+            errors += 1
+        elif result.get("changed"):
+            changed += 1
+    return {
+        "type": "summary",
+        "reports": total,
+        "changed": changed,
+        "unchanged": total - changed - errors,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed_seconds, 6),
+        "reports_per_sec": (
+            round(total / elapsed_seconds, 2) if elapsed_seconds else None
+        ),
+    }
@@ -0,0 +1,199 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Cached JSON-schema validators for the schemas shipped in `schemas/`.
+
+Schemas are files named `<name>-schema-<version>.json` (e.g.
+`report-schema-1.0.0.json`). Each one is read, checked against its
+metaschema and turned into a validator once per process; building a
+validator costs far more than validating a typical document with it.
+`format` keywords are annotations only, as with plain `jsonschema.validate`:
+checking them would depend on which optional format packages are installed
+(date-time needs rfc3339-validator), so results would differ between hosts.
+`validate_files` streams many documents through the cached validator,
+optionally in a worker pool.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import jsonschema
+
+from agent import jsonio
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schemas"
+DEFAULT_PROCESSES = os.cpu_count() or 1
+MAX_ERRORS_PER_DOCUMENT = 20
+_MAX_CHUNKSIZE = 256
+_SCHEMA_FILE_RE = re.compile(r"^(?P<name>.+)-schema-(?P<version>\d+\.\d+\.\d+)\.json$")
+
+# Per-process state set up by `_init_worker`.
+_worker_validator: Any = None
+
+
+class SchemaRegistryError(Exception):
+    """Raised for an unknown schema name/version or an invalid schema file."""
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+@lru_cache(maxsize=1)
+def available_schemas() -> Dict[str, List[str]]:
+    """Return `{name: [versions, oldest first]}` for the shipped schemas."""
+    found: Dict[str, List[str]] = {}
+    for path in SCHEMA_DIR.glob("*.json"):
+        match = _SCHEMA_FILE_RE.match(path.name)
+        if match:
+            found.setdefault(match["name"], []).append(match["version"])
+    return {
+        name: sorted(versions, key=_version_key) for name, versions in found.items()
+    }
+
+
+def schema_path(name: str, version: Optional[str] = None) -> Path:
+    """Return the file for `name` at `version`.
+
+    Args:
+        name: Schema name, e.g. "report", "policy-pack", "plugin-manifest"
+        version: Exact version, a major version ("1") matching the newest
+            1.x.y, or None for the newest version
+
+    Raises:
+        SchemaRegistryError: No such schema or version
+    """
+    versions = available_schemas().get(name)
+    if not versions:
+        known = ", ".join(sorted(available_schemas()))
+        raise SchemaRegistryError(f"Unknown schema {name!r}; available: {known}")
+    if version is None:
+        chosen = versions[-1]
+    elif version in versions:
+        chosen = version
+    else:
+        major = version.split(".", 1)[0]
+        same_major = [v for v in versions if v.split(".", 1)[0] == major]
+        if not same_major:
+            raise SchemaRegistryError(
+                f"No {name} schema for version {version}; "
+                f"available: {', '.join(versions)}"
+            )
+        chosen = same_major[-1]
+    return SCHEMA_DIR / f"{name}-schema-{chosen}.json"
+
+
+@lru_cache(maxsize=None)
+def _validator_for_file(path: str) -> Any:
+    try:
+        schema = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise SchemaRegistryError(f"Cannot read schema {path}: {exc}") from exc
+    validator_cls = jsonschema.validators.validator_for(schema)
+    try:
+        validator_cls.check_schema(schema)
+    except jsonschema.SchemaError as exc:
+        raise SchemaRegistryError(f"Invalid schema {path}: {exc.message}") from exc
+    return validator_cls(schema)
+
+
+def validator_for_file(path: Path) -> Any:
+    """Return the cached validator for an arbitrary schema file."""
+    return _validator_for_file(str(Path(path).resolve()))
+
+
+def get_validator(name: str, version: Optional[str] = None) -> Any:
+    """Return the cached validator for a shipped schema (see `schema_path`)."""
+    return validator_for_file(schema_path(name, version))
+
+
+def best_error(
+    document: Any, name: str, version: Optional[str] = None
+) -> Optional[str]:
+    """Return the most relevant validation error message, or None if valid."""
+    error = jsonschema.exceptions.best_match(
+        get_validator(name, version).iter_errors(document)
+    )
+    return None if error is None else error.message
+
+
+def _error_messages(validator: Any, document: Any) -> List[str]:
+    messages = []
+    for error in sorted(validator.iter_errors(document), key=lambda e: list(e.path)):
+        location = "/".join(str(part) for part in error.path)
+        messages.append(
+            f"{error.message} at /{location}" if location else error.message
+        )
+        if len(messages) >= MAX_ERRORS_PER_DOCUMENT:
+            break
+    return messages
+
+
+def validate_document(
+    document: Any, name: str, version: Optional[str] = None
+) -> List[str]:
+    """Return all validation error messages (capped), sorted by location."""
+    return _error_messages(get_validator(name, version), document)
+
+
+def _init_worker(schema_file: str) -> None:
+    global _worker_validator
+    _worker_validator = _validator_for_file(schema_file)
+
+
+def _validate_path(path: str) -> Dict[str, Any]:
+    try:
+        document = jsonio.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        return {"path": path, "ok": False, "errors": [f"Cannot read JSON: {exc}"]}
+    errors = _error_messages(_worker_validator, document)
+    return {"path": path, "ok": not errors, "errors": errors}
+
+
+def validate_files(
+    paths: Iterable[Path],
+    name: str = "report",
+    version: Optional[str] = None,
+    processes: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Validate JSON files against one schema, yielding results in input order.
+
+    The validator is built once per worker process, not per document.
+
+    Args:
+        paths: JSON documents to validate
+        name: Schema name (see `available_schemas`)
+        version: Schema version (see `schema_path`)
+        processes: Worker processes (default: CPU count; 1 = in-process)
+
+    Raises:
+        SchemaRegistryError: Unknown schema or invalid schema file
+    """
+    global _worker_validator
+    schema_file = str(schema_path(name, version).resolve())
+    # Fail fast on a bad schema before starting any workers.
+    _validator_for_file(schema_file)
+    files = [str(path) for path in paths]
+    processes = DEFAULT_PROCESSES if processes is None else max(1, processes)
+
+    if processes == 1 or len(files) <= 1:
+        previous = _worker_validator
+        _init_worker(schema_file)
+        try:
+            for path in files:
+                yield _validate_path(path)
+        finally:
+            _worker_validator = previous
+        return
+
+    workers = min(processes, len(files))
+    chunksize = max(1, min(_MAX_CHUNKSIZE, len(files) // (workers * 8)))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(schema_file,)
+    ) as pool:
+        yield from pool.map(_validate_path, files, chunksize=chunksize)
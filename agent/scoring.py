@@ -10,6 +10,55 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+# Category weights per user profile; unknown profiles use "default".
+PROFILE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "Office": {
+        "storage": 0.20,
+        "battery": 0.25,
+        "memory": 0.15,
+        "cpu_thermal": 0.15,
+        "gpu": 0.05,
+        "network": 0.10,
+        "security": 0.10,
+    },
+    "Developer": {
+        "storage": 0.25,
+        "battery": 0.15,
+        "memory": 0.20,
+        "cpu_thermal": 0.20,
+        "gpu": 0.05,
+        "network": 0.10,
+        "security": 0.05,
+    },
+    "Gamer": {
+        "storage": 0.20,
+        "battery": 0.05,
+        "memory": 0.15,
+        "cpu_thermal": 0.25,
+        "gpu": 0.25,
+        "network": 0.05,
+        "security": 0.05,
+    },
+    "Server": {
+        "storage": 0.30,
+        "battery": 0.05,
+        "memory": 0.25,
+        "cpu_thermal": 0.20,
+        "gpu": 0.00,
+        "network": 0.15,
+        "security": 0.05,
+    },
+    "default": {
+        "storage": 0.22,
+        "battery": 0.15,
+        "memory": 0.12,
+        "cpu_thermal": 0.15,
+        "gpu": 0.10,
+        "network": 0.08,
+        "security": 0.18,
+    },
+}
+
 
 def score_storage(smart_parsed: Dict[str, Any]) -> int:
     """Score storage health based on parsed SMART attributes.
@@ -256,55 +305,7 @@ def get_profile_weights(profile: str) -> Dict[str, float]:
     Returns:
         Dictionary mapping category names to weights (0-1)
     """
-    profiles = {
-        "Office": {
-            "storage": 0.20,
-            "battery": 0.25,
-            "memory": 0.15,
-            "cpu_thermal": 0.15,
-            "gpu": 0.05,
-            "network": 0.10,
-            "security": 0.10,
-        },
-        "Developer": {
-            "storage": 0.25,
-            "battery": 0.15,
-            "memory": 0.20,
-            "cpu_thermal": 0.20,
-            "gpu": 0.05,
-            "network": 0.10,
-            "security": 0.05,
-        },
-        "Gamer": {
-            "storage": 0.20,
-            "battery": 0.05,
-            "memory": 0.15,
-            "cpu_thermal": 0.25,
-            "gpu": 0.25,
-            "network": 0.05,
-            "security": 0.05,
-        },
-        "Server": {
-            "storage": 0.30,
-            "battery": 0.05,
-            "memory": 0.25,
-            "cpu_thermal": 0.20,
-            "gpu": 0.00,
-            "network": 0.15,
-            "security": 0.05,
-        },
-        "default": {
-            "storage": 0.22,
-            "battery": 0.15,
-            "memory": 0.12,
-            "cpu_thermal": 0.15,
-            "gpu": 0.10,
-            "network": 0.08,
-            "security": 0.18,
-        },
-    }
-
-    return profiles.get(profile, profiles["default"])
+    return dict(PROFILE_WEIGHTS.get(profile, PROFILE_WEIGHTS["default"]))
 
 
 def get_profile_recommendation(
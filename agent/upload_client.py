@@ -2,78 +2,188 @@
 """Upload client for opt-in report submission.
 
 Provides a lightweight HTTP client (stdlib only) to upload report bundles
-to a remote API endpoint.
+to a remote API endpoint. The multipart body is streamed part by part from
+the files (or archive members), so memory stays flat regardless of bundle
+size. `UploadSession` keeps connections alive across uploads for the spool
+flush worker, and the optional dedup pre-flight skips parts whose content
+the server already holds.
 """
 
 from __future__ import annotations
 
+import http.client
 import json
 import mimetypes
+import threading
 import uuid
+import zlib
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib import error, request
+from urllib.parse import urlsplit
+
+from agent import jsonio
+from agent.bundle_archive import BundleArchive, BundleArchiveError, is_bundle_archive
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+_MANIFEST_REL = "artifacts/manifest.json"
+
+# Called as progress(bytes_sent, total_bytes) over the uncompressed body.
+ProgressCallback = Callable[[int, int], None]
 
 
 class UploadError(RuntimeError):
-    """Raised when upload fails."""
+    """Raised when upload fails.
 
+    `status` is the HTTP status code when the server answered, else None.
+    """
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
 
-def _iter_upload_files(output_dir: Path) -> Iterable[Tuple[str, Path]]:
-    """Yield report files to include in upload."""
-    report_json = output_dir / "report.json"
-    if report_json.exists():
-        yield ("report_json", report_json)
 
-    report_pdf = output_dir / "report.pdf"
-    if report_pdf.exists():
-        yield ("report_pdf", report_pdf)
+# (form field, filename, size in bytes, opener returning a binary stream)
+UploadSource = Tuple[str, str, int, Callable[[], IO[bytes]]]
 
-    report_txt = output_dir / "report.txt"
-    if report_txt.exists():
-        yield ("report_txt", report_txt)
+_REPORT_FIELDS = (
+    ("report_json", "report.json"),
+    ("report_pdf", "report.pdf"),
+    ("report_txt", "report.txt"),
+)
+
+
+def _iter_upload_files(output_dir: Path) -> Iterable[UploadSource]:
+    """Yield report files to include in upload."""
+    for field_name, name in _REPORT_FIELDS:
+        path = output_dir / name
+        if path.exists():
+            yield (field_name, name, path.stat().st_size, partial(path.open, "rb"))
 
     artifacts_dir = output_dir / "artifacts"
     if artifacts_dir.exists():
         for artifact in sorted(artifacts_dir.iterdir()):
             if artifact.is_file():
-                yield ("artifacts", artifact)
-
-
-def _build_multipart_body(
-    fields: Dict[str, str], files: Iterable[Tuple[str, Path]], boundary: str
-) -> bytes:
-    """Build multipart/form-data payload body."""
-    lines: list[bytes] = []
-    sep = f"--{boundary}".encode("utf-8")
-
-    for key, value in fields.items():
-        lines.extend(
-            [
-                sep,
-                (f'Content-Disposition: form-data; name="{key}"\r\n\r\n{value}').encode(
-                    "utf-8"
-                ),
-            ]
-        )
+                yield (
+                    "artifacts",
+                    artifact.name,
+                    artifact.stat().st_size,
+                    partial(artifact.open, "rb"),
+                )
 
-    for field_name, file_path in files:
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        mime_type = mime_type or "application/octet-stream"
-        lines.extend(
-            [
-                sep,
-                (
-                    f'Content-Disposition: form-data; name="{field_name}"; '
-                    f'filename="{file_path.name}"\r\n'
-                    f"Content-Type: {mime_type}\r\n\r\n"
-                ).encode("utf-8"),
-                file_path.read_bytes(),
-            ]
+
+def _iter_archive_upload_files(archive: BundleArchive) -> Iterable[UploadSource]:
+    """Yield the same upload parts as `_iter_upload_files`, read from an archive."""
+    for field_name, name in _REPORT_FIELDS:
+        if archive.exists(name):
+            yield (field_name, name, archive.size(name), partial(archive.open, name))
+
+    for member in sorted(archive.names()):
+        folder, _, name = member.partition("/")
+        if folder == "artifacts" and name and "/" not in name:
+            yield (
+                "artifacts",
+                name,
+                archive.size(member),
+                partial(archive.open, member),
+            )
+
+
+class MultipartBody:
+    """Streaming multipart/form-data body.
+
+    Iterating yields part headers and file chunks; file contents are read
+    lazily while the request is being sent. `content_length` is computed up
+    front from field values and file sizes so the request can carry a
+    Content-Length header instead of being buffered.
+
+    Args:
+        fields: Plain form fields
+        files: Upload sources (field, filename, size, opener)
+        boundary: Multipart boundary
+        chunk_size: Read size for file contents
+        progress: Optional callback receiving (bytes_sent, total_bytes)
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        files: Iterable[UploadSource],
+        boundary: str,
+        chunk_size: int = UPLOAD_CHUNK_BYTES,
+        progress: ProgressCallback | None = None,
+    ):
+        self.boundary = boundary
+        self.chunk_size = chunk_size
+        self.progress = progress
+        sep = f"--{boundary}\r\n".encode("utf-8")
+        self._parts: List[Tuple[bytes, Optional[bytes], int, Optional[Callable]]] = []
+        for key, value in fields.items():
+            data = value.encode("utf-8")
+            header = sep + (
+                f'Content-Disposition: form-data; name="{key}"\r\n\r\n'
+            ).encode("utf-8")
+            self._parts.append((header, data, len(data), None))
+        for field_name, filename, size, opener in files:
+            mime_type, _ = mimetypes.guess_type(filename)
+            mime_type = mime_type or "application/octet-stream"
+            header = sep + (
+                f'Content-Disposition: form-data; name="{field_name}"; '
+                f'filename="{filename}"\r\n'
+                f"Content-Type: {mime_type}\r\n\r\n"
+            ).encode("utf-8")
+            self._parts.append((header, None, size, opener))
+        self._closing = f"--{boundary}--\r\n".encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def content_length(self) -> int:
+        return sum(len(header) + size + 2 for header, _, size, _ in self._parts) + len(
+            self._closing
         )
 
-    lines.extend([f"--{boundary}--".encode("utf-8"), b""])
-    return b"\r\n".join(lines)
+    def __iter__(self) -> Iterator[bytes]:
+        total = self.content_length
+        sent = 0
+
+        def _emit(chunk: bytes) -> bytes:
+            nonlocal sent
+            sent += len(chunk)
+            if self.progress is not None:
+                self.progress(sent, total)
+            return chunk
+
+        for header, data, size, opener in self._parts:
+            yield _emit(header)
+            if data is not None:
+                yield _emit(data)
+            else:
+                read = 0
+                with opener() as fh:
+                    for chunk in iter(lambda: fh.read(self.chunk_size), b""):
+                        read += len(chunk)
+                        yield _emit(chunk)
+                if read != size:
+                    raise UploadError(
+                        f"Upload source changed size while sending ({read} != {size})"
+                    )
+            yield _emit(b"\r\n")
+        yield _emit(self._closing)
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip-compress a chunk stream on the fly."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
 
 def _normalize_upload_endpoint(upload_url: str) -> str:
@@ -84,67 +194,399 @@ def _normalize_upload_endpoint(upload_url: str) -> str:
     return f"{normalized}/reports"
 
 
+def _source_rel_path(source: UploadSource) -> str:
+    """Bundle-relative path of an upload part (as listed in the manifest)."""
+    field_name, filename, _, _ = source
+    return f"artifacts/{filename}" if field_name == "artifacts" else filename
+
+
+def _read_manifest_text(
+    output_dir: Path, archive: BundleArchive | None
+) -> Optional[str]:
+    try:
+        if archive is not None:
+            if archive.exists(_MANIFEST_REL):
+                return archive.read_text(_MANIFEST_REL)
+            return None
+        return (output_dir / _MANIFEST_REL).read_text(encoding="utf-8")
+    except (OSError, BundleArchiveError, UnicodeDecodeError):
+        return None
+
+
+def _manifest_digests(manifest_text: str | None) -> Dict[str, Tuple[str, int]]:
+    """Map manifest paths to `(sha256, size)`; empty if the manifest is unusable."""
+    if not manifest_text:
+        return {}
+    try:
+        manifest = jsonio.loads(manifest_text)
+    except json.JSONDecodeError:
+        return {}
+    digests: Dict[str, Tuple[str, int]] = {}
+    entries = manifest.get("entries") if isinstance(manifest, dict) else None
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        path, sha, size = entry.get("path"), entry.get("sha256"), entry.get("size")
+        if isinstance(path, str) and isinstance(sha, str) and isinstance(size, int):
+            digests[path] = (sha, size)
+    return digests
+
+
+def _dedup_records(
+    files: List[UploadSource], digests: Dict[str, Tuple[str, int]]
+) -> List[Dict[str, Any]]:
+    """Content records for upload parts whose manifest entry matches their size.
+
+    Parts not covered by the manifest (the manifest itself, logs) or whose
+    size no longer matches are left out and always uploaded.
+    """
+    records = []
+    for source in files:
+        field_name, filename, size, _ = source
+        rel = _source_rel_path(source)
+        known = digests.get(rel)
+        if known is None or known[1] != size:
+            continue
+        records.append(
+            {
+                "field": field_name,
+                "filename": filename,
+                "path": rel,
+                "sha256": known[0],
+                "size": size,
+            }
+        )
+    return records
+
+
+def _request_headers(token: str, content_type: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": content_type,
+        "Accept": "application/json, text/plain;q=0.8, */*;q=0.5",
+        "User-Agent": "inspecta-agent/0.1.0",
+    }
+
+
+def preflight_missing_blobs(
+    endpoint: str,
+    token: str,
+    records: List[Dict[str, Any]],
+    timeout: int = 30,
+    session: "UploadSession | None" = None,
+) -> Optional[set[str]]:
+    """Ask the server which content hashes it does not hold yet.
+
+    Posts `{"files": [{path, sha256, size}, ...]}` to `<endpoint>/preflight`
+    and expects `{"missing": [sha256, ...]}` back.
+
+    Returns:
+        The missing hashes, or None if the server has no pre-flight
+        endpoint (HTTP 404/405/501) and everything must be uploaded.
+    """
+    payload = json.dumps(
+        {
+            "files": [
+                {key: record[key] for key in ("path", "sha256", "size")}
+                for record in records
+            ]
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    headers = _request_headers(token, "application/json")
+    headers["Content-Length"] = str(len(payload))
+    url = f"{endpoint}/preflight"
+    try:
+        if session is not None:
+            response = session.post(url, headers, lambda: [payload])
+        else:
+            req = request.Request(url, data=payload, headers=headers, method="POST")
+            response = _send_request(req, timeout)
+    except UploadError as exc:
+        if exc.status in (404, 405, 501):
+            return None
+        raise
+    missing = response.get("missing")
+    if not isinstance(missing, list):
+        raise UploadError("Pre-flight response is missing the 'missing' list")
+    return {sha for sha in missing if isinstance(sha, str)}
+
+
 def upload_report_bundle(
     upload_url: str,
     token: str,
     output_dir: Path,
     timeout: int = 30,
     metadata: Optional[Dict[str, Any]] = None,
+    progress: ProgressCallback | None = None,
+    gzip_body: bool = False,
+    session: "UploadSession | None" = None,
+    dedup: bool = False,
 ) -> Dict[str, Any]:
     """Upload report bundle to remote server.
 
+    The body is streamed with a precomputed Content-Length; with
+    `gzip_body` it is compressed on the fly and sent with chunked transfer
+    encoding instead (the compressed length is not known up front).
+
+    With `dedup`, the manifest's `(path, sha256, size)` list is posted to
+    the pre-flight endpoint first and only parts whose content the server
+    lacks are sent; the `blobs` form field lists every hashed part so the
+    server can fill in the rest from its content store. Servers without a
+    pre-flight endpoint get the full bundle, and a 409 (a blob vanished
+    between pre-flight and upload) retries once without dedup.
+
     Args:
         upload_url: Base URL or /reports endpoint URL
         token: Bearer token for authentication
-        output_dir: Run output directory containing report + artifacts
+        output_dir: Run output directory containing report + artifacts, or a
+            `.inspecta` archive (parts are streamed from its members)
         timeout: HTTP timeout in seconds
         metadata: Optional metadata map to include
+        progress: Optional callback receiving (bytes_sent, total_bytes)
+        gzip_body: Send the body with `Content-Encoding: gzip`
+        session: Reuse this session's keep-alive connection instead of
+            opening a new one (its timeout applies)
+        dedup: Skip parts the server already holds (content-addressed)
 
     Returns:
         Parsed JSON response dict (if server returns JSON), otherwise
-        dict containing HTTP status and raw response text.
+        dict containing HTTP status and raw response text. With `dedup`,
+        `dedup` reports `{files_skipped, bytes_skipped}`.
     """
     endpoint = _normalize_upload_endpoint(upload_url)
-    files = list(_iter_upload_files(output_dir))
-    if not files:
-        raise UploadError(f"No uploadable files found in {output_dir}")
-
     payload_metadata = metadata or {}
-    fields = {"metadata": json.dumps(payload_metadata, separators=(",", ":"))}
-    boundary = f"inspecta-{uuid.uuid4().hex}"
-    body = _build_multipart_body(fields=fields, files=files, boundary=boundary)
-
-    req = request.Request(
-        endpoint,
-        data=body,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": f"multipart/form-data; boundary={boundary}",
-            "Accept": "application/json, text/plain;q=0.8, */*;q=0.5",
-            "User-Agent": "inspecta-agent/0.1.0",
-        },
-        method="POST",
-    )
+
+    archive: BundleArchive | None = None
+    with ExitStack() as stack:
+        if is_bundle_archive(output_dir):
+            try:
+                archive = stack.enter_context(BundleArchive(output_dir))
+            except BundleArchiveError as exc:
+                raise UploadError(str(exc)) from exc
+            files = list(_iter_archive_upload_files(archive))
+        else:
+            files = list(_iter_upload_files(output_dir))
+        if not files:
+            raise UploadError(f"No uploadable files found in {output_dir}")
+
+        records: List[Dict[str, Any]] = []
+        missing: Optional[set[str]] = None
+        if dedup:
+            manifest_text = _read_manifest_text(output_dir, archive)
+            records = _dedup_records(files, _manifest_digests(manifest_text))
+            if records:
+                missing = preflight_missing_blobs(
+                    endpoint, token, records, timeout, session
+                )
+
+        def _send(skip_known: bool) -> Dict[str, Any]:
+            fields = {"metadata": jsonio.dumps(payload_metadata)}
+            parts = files
+            skipped: List[Dict[str, Any]] = []
+            if skip_known and missing is not None:
+                fields["blobs"] = jsonio.dumps(records)
+                skipped = [r for r in records if r["sha256"] not in missing]
+                skip_keys = {(r["field"], r["filename"]) for r in skipped}
+                parts = [f for f in files if (f[0], f[1]) not in skip_keys]
+
+            body = MultipartBody(
+                fields, parts, f"inspecta-{uuid.uuid4().hex}", progress=progress
+            )
+            headers = _request_headers(token, body.content_type)
+            if gzip_body:
+                # No Content-Length: the body goes out with chunked transfer encoding.
+                headers["Content-Encoding"] = "gzip"
+            else:
+                headers["Content-Length"] = str(body.content_length)
+
+            def _data() -> Iterable[bytes]:
+                return _gzip_stream(body) if gzip_body else body
+
+            if session is not None:
+                result = session.post(endpoint, headers, _data)
+            else:
+                req = request.Request(
+                    endpoint, data=_data(), headers=headers, method="POST"
+                )
+                result = _send_request(req, timeout)
+            if dedup:
+                result["dedup"] = {
+                    "files_skipped": len(skipped),
+                    "bytes_skipped": sum(r["size"] for r in skipped),
+                }
+            return result
+
+        try:
+            return _send(skip_known=True)
+        except UploadError as exc:
+            if exc.status != 409 or missing is None:
+                raise
+            return _send(skip_known=False)
+
+
+def _decode_response(status: int, raw_bytes: bytes) -> Dict[str, Any]:
+    raw = raw_bytes.decode("utf-8", errors="replace")
+    if not raw:
+        return {"status": status}
 
     try:
-        with request.urlopen(req, timeout=timeout) as resp:
-            status = getattr(resp, "status", 200)
-            raw = resp.read().decode("utf-8", errors="replace")
-            if not raw:
-                return {"status": status}
+        parsed = jsonio.loads(raw)
+    except json.JSONDecodeError:
+        parsed = {"status": status, "response": raw}
+
+    if not isinstance(parsed, dict):
+        parsed = {"status": status, "response": parsed}
+    if "status" not in parsed:
+        parsed["status"] = status
+    return parsed
 
-            try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
-                data = {"status": status, "response": raw}
 
-            if "status" not in data:
-                data["status"] = status
-            return data
+def _send_request(req: request.Request, timeout: int) -> Dict[str, Any]:
+    """Send `req` and decode the server response."""
+    try:
+        with request.urlopen(req, timeout=timeout) as resp:
+            return _decode_response(getattr(resp, "status", 200), resp.read())
     except error.HTTPError as exc:
         detail = exc.read().decode("utf-8", errors="replace")
         raise UploadError(
-            f"Upload failed with HTTP {exc.code}: {detail or exc.reason}"
+            f"Upload failed with HTTP {exc.code}: {detail or exc.reason}",
+            status=exc.code,
         ) from exc
     except error.URLError as exc:
         raise UploadError(f"Upload connection failed: {exc.reason}") from exc
+    except OSError as exc:
+        raise UploadError(f"Upload failed while sending: {exc}") from exc
+
+
+# Errors that mean a reused keep-alive connection was closed by the server
+# between requests; the request is retried once on a fresh connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class UploadSession:
+    """Keep-alive HTTP(S) connections shared by repeated uploads.
+
+    http.client connections are not thread-safe, so each thread keeps its
+    own connection per host; a connection is reused until the server
+    closes it. Use as a context manager, or call `close()`.
+
+    Args:
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(self, timeout: int = 30):
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[http.client.HTTPConnection] = []
+
+    def __enter__(self) -> "UploadSession":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def _pool(self) -> Dict[Tuple[str, str], http.client.HTTPConnection]:
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        return pool
+
+    def _connection(self, scheme: str, netloc: str) -> Tuple[Any, bool]:
+        pool = self._pool()
+        conn = pool.get((scheme, netloc))
+        if conn is not None:
+            return conn, True
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        elif scheme == "http":
+            conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        else:
+            raise UploadError(f"Unsupported upload URL scheme: {scheme}")
+        pool[(scheme, netloc)] = conn
+        with self._lock:
+            self._connections.append(conn)
+            self.connections_opened += 1
+        return conn, False
+
+    def _discard(self, scheme: str, netloc: str) -> None:
+        conn = self._pool().pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def post(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        data: Callable[[], Iterable[bytes]],
+    ) -> Dict[str, Any]:
+        """POST a streamed body and decode the response.
+
+        Args:
+            url: Absolute endpoint URL
+            headers: Request headers (without Content-Length the body is
+                sent chunked)
+            data: Factory returning a fresh body iterable (called again if
+                a stale keep-alive connection forces a retry)
+
+        Raises:
+            UploadError: Connection failure or HTTP status >= 400
+        """
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        conn, reused = self._connection(parts.scheme, parts.netloc)
+        try:
+            try:
+                resp, raw = self._exchange(conn, path, headers, data)
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                self._discard(parts.scheme, parts.netloc)
+                conn, _ = self._connection(parts.scheme, parts.netloc)
+                resp, raw = self._exchange(conn, path, headers, data)
+        except _STALE_CONNECTION_ERRORS as exc:
+            self._discard(parts.scheme, parts.netloc)
+            raise UploadError(f"Upload connection failed: {exc}") from exc
+        except (OSError, http.client.HTTPException) as exc:
+            self._discard(parts.scheme, parts.netloc)
+            raise UploadError(f"Upload failed while sending: {exc}") from exc
+        except UploadError:
+            self._discard(parts.scheme, parts.netloc)
+            raise
+
+        if resp.will_close:
+            self._discard(parts.scheme, parts.netloc)
+        if resp.status >= 400:
+            detail = raw.decode("utf-8", errors="replace")
+            raise UploadError(
+                f"Upload failed with HTTP {resp.status}: {detail or resp.reason}",
+                status=resp.status,
+            )
+        return _decode_response(resp.status, raw)
+
+    @staticmethod
+    def _exchange(
+        conn: http.client.HTTPConnection,
+        path: str,
+        headers: Dict[str, str],
+        data: Callable[[], Iterable[bytes]],
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        conn.request("POST", path, body=data(), headers=headers)
+        resp = conn.getresponse()
+        return resp, resp.read()
+
+    def close(self) -> None:
+        """Close every connection opened by this session."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,544 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Durable local spool for opt-in report uploads.
+
+`inspecta run --upload` enqueues the finished bundle here instead of
+uploading inline, so a run never waits on the network. `inspecta upload
+flush` drains the spool concurrently over keep-alive connections, retrying
+failures with exponential backoff while capping the bytes in flight. The
+background flusher a run starts (`upload flush --wait`) keeps going after
+its first pass, sleeping until the earliest retry is due, until nothing is
+pending, `--max-wait` runs out or another flusher takes the lock.
+
+Jobs are keyed by the bundle's manifest SHA256, which deduplicates them:
+
+    <spool>/pending/<sha>.json   waiting to be sent (or backing off)
+    <spool>/sent/<sha>.json      uploaded; enqueueing it again is a no-op
+    <spool>/failed/<sha>.json    rejected by the server or out of attempts
+
+Upload tokens are never written to the spool; `flush` receives them from
+the caller (`--token` / `INSPECTA_UPLOAD_TOKEN`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from agent import jsonio
+from agent.bundle_archive import BundleArchive, BundleArchiveError, is_bundle_archive
+from agent.evidence import manifest_sha256
+from agent.exec import session_kwargs
+from agent.paths import user_data_dir
+from agent.upload_client import UploadError, UploadSession, upload_report_bundle
+
+logger = logging.getLogger("inspecta.upload_spool")
+
+SPOOL_DIR_NAME = "upload-spool"
+SPOOL_JOB_VERSION = 1
+TOKEN_ENV_VAR = "INSPECTA_UPLOAD_TOKEN"
+DEFAULT_FLUSH_WORKERS = 4
+DEFAULT_MAX_INFLIGHT_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30.0
+BACKOFF_CAP_SECONDS = 3600.0
+# A flush lock whose holder pid cannot be read (or was reused by another
+# process) is assumed stale after this long.
+STALE_LOCK_SECONDS = 6 * 3600
+# Wall-time cap for a waiting (background) flush; covers the backoff of a
+# job retried DEFAULT_MAX_ATTEMPTS times.
+DEFAULT_MAX_WAIT_SECONDS = 4 * 3600
+
+_PENDING = "pending"
+_SENT = "sent"
+_FAILED = "failed"
+_LOCK_FILE = "flush.lock"
+# Summary counts `drain_spool` adds up across flush passes.
+_SUMMED_KEYS = ("sent", "failed", "bytes_sent", "bytes_deduped", "connections_opened")
+# Client errors that will not succeed on retry; 408/429 are transient.
+_RETRYABLE_4XX = {408, 425, 429}
+
+
+class SpoolError(Exception):
+    """Raised when a bundle cannot be enqueued or the spool is unusable."""
+
+
+def default_spool_dir() -> Path:
+    """Return the per-user upload spool location."""
+    return user_data_dir() / SPOOL_DIR_NAME
+
+
+def bundle_manifest_sha256(
+    bundle: Path, manifest_rel: str = "artifacts/manifest.json"
+) -> str:
+    """Return the canonical manifest SHA256 of a bundle directory or archive.
+
+    Matches the digest `write_evidence_manifest` returns for the bundle.
+
+    Raises:
+        SpoolError: Manifest missing or not valid JSON
+    """
+    try:
+        if is_bundle_archive(bundle):
+            with BundleArchive(bundle) as archive:
+                text = archive.read_text(manifest_rel)
+        else:
+            text = (bundle / manifest_rel).read_text(encoding="utf-8")
+        manifest = jsonio.loads(text)
+    except (OSError, BundleArchiveError, json.JSONDecodeError) as exc:
+        raise SpoolError(f"Cannot read manifest of {bundle}: {exc}") from exc
+    if not isinstance(manifest, dict):
+        raise SpoolError(f"Manifest of {bundle} is not a JSON object")
+    return manifest_sha256(manifest)
+
+
+def _bundle_size(bundle: Path) -> int:
+    if bundle.is_file():
+        return bundle.stat().st_size
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(bundle):
+        for name in filenames:
+            try:
+                total += (Path(dirpath) / name).stat().st_size
+            except OSError:
+                continue
+    return total
+
+
+def backoff_delay(attempts: int, rng: random.Random | None = None) -> float:
+    """Seconds to wait after `attempts` failures (capped, with 50-100% jitter)."""
+    rng = rng or random.Random()
+    delay = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    return delay * (0.5 + rng.random() / 2)
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class UploadSpool:
+    """Directory-backed queue of bundles awaiting upload.
+
+    Args:
+        path: Spool directory (default `default_spool_dir()`)
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or default_spool_dir()
+
+    def _job_path(self, state: str, manifest_sha256: str) -> Path:
+        return self.path / state / f"{manifest_sha256}.json"
+
+    def state_of(self, manifest_sha256: str) -> Optional[str]:
+        """Return "pending", "sent", "failed" or None for a manifest digest."""
+        for state in (_SENT, _PENDING, _FAILED):
+            if self._job_path(state, manifest_sha256).exists():
+                return state
+        return None
+
+    def enqueue(
+        self,
+        bundle: Path,
+        upload_url: str,
+        manifest_sha256: str | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        """Queue `bundle` for upload unless its manifest is already queued or sent.
+
+        Args:
+            bundle: Bundle directory or `.inspecta` archive
+            upload_url: Base URL or /reports endpoint URL
+            manifest_sha256: Manifest digest (read from the bundle if omitted)
+            metadata: Metadata map sent with the upload
+
+        Returns:
+            `{"status": "queued" | "duplicate", "manifest_sha256", "job"}`
+
+        Raises:
+            SpoolError: Bundle unreadable or spool not writable
+        """
+        bundle = bundle.resolve()
+        if manifest_sha256 is None:
+            manifest_sha256 = bundle_manifest_sha256(bundle)
+
+        existing = self.state_of(manifest_sha256)
+        if existing in (_PENDING, _SENT):
+            return {
+                "status": "duplicate",
+                "state": existing,
+                "manifest_sha256": manifest_sha256,
+                "job": str(self._job_path(existing, manifest_sha256)),
+            }
+
+        job = {
+            "version": SPOOL_JOB_VERSION,
+            "manifest_sha256": manifest_sha256,
+            "bundle": str(bundle),
+            "upload_url": upload_url,
+            "metadata": metadata or {},
+            "size_bytes": _bundle_size(bundle),
+            "enqueued_at": datetime.now(timezone.utc).isoformat(),
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+            "last_error": None,
+        }
+        job_path = self._job_path(_PENDING, manifest_sha256)
+        try:
+            _write_json_atomic(job_path, job)
+            # Re-enqueueing a failed bundle starts it over.
+            self._job_path(_FAILED, manifest_sha256).unlink(missing_ok=True)
+        except OSError as exc:
+            raise SpoolError(f"Cannot write spool job {job_path}: {exc}") from exc
+        return {
+            "status": "queued",
+            "manifest_sha256": manifest_sha256,
+            "job": str(job_path),
+        }
+
+    def jobs(self, state: str = _PENDING) -> List[Dict[str, Any]]:
+        """Return jobs in `state`, oldest first (unreadable job files are skipped)."""
+        state_dir = self.path / state
+        if not state_dir.is_dir():
+            return []
+        jobs = []
+        for job_path in sorted(state_dir.glob("*.json")):
+            try:
+                job = jsonio.loads(job_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Skipping unreadable spool job %s: %s", job_path, exc)
+                continue
+            if isinstance(job, dict) and job.get("manifest_sha256"):
+                jobs.append(job)
+        return sorted(jobs, key=lambda job: str(job.get("enqueued_at", "")))
+
+    def next_attempt_at(self) -> Optional[float]:
+        """Return the earliest retry time among pending jobs (None if none)."""
+        times = [float(job.get("next_attempt_at", 0)) for job in self.jobs(_PENDING)]
+        return min(times) if times else None
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            state: len(list((self.path / state).glob("*.json")))
+            for state in (_PENDING, _SENT, _FAILED)
+        }
+
+    def _move(self, job: Dict[str, Any], state: str) -> None:
+        sha = job["manifest_sha256"]
+        _write_json_atomic(self._job_path(state, sha), job)
+        self._job_path(_PENDING, sha).unlink(missing_ok=True)
+
+    def mark_sent(self, job: Dict[str, Any], response: Dict[str, Any]) -> None:
+        job["sent_at"] = datetime.now(timezone.utc).isoformat()
+        job["response"] = response
+        job["last_error"] = None
+        self._move(job, _SENT)
+
+    def mark_failed(self, job: Dict[str, Any], error: str) -> None:
+        job["last_error"] = error
+        self._move(job, _FAILED)
+
+    def mark_retry(self, job: Dict[str, Any], error: str, delay: float) -> None:
+        job["last_error"] = error
+        job["next_attempt_at"] = time.time() + delay
+        _write_json_atomic(self._job_path(_PENDING, job["manifest_sha256"]), job)
+
+    def acquire_flush_lock(self) -> bool:
+        """Take the single-flusher lock; False if another flush holds it.
+
+        The lock file holds the flusher's pid. A lock whose process has
+        exited (e.g. a crashed flush) is broken at once; one without a
+        readable pid only after `STALE_LOCK_SECONDS`.
+        """
+        lock_path = self.path / _LOCK_FILE
+        self.path.mkdir(parents=True, exist_ok=True)
+        try:
+            holder = lock_path.read_text(encoding="utf-8").strip()
+            expired = time.time() - lock_path.stat().st_mtime > STALE_LOCK_SECONDS
+            if expired or (holder.isdigit() and not _process_alive(int(holder))):
+                lock_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(str(os.getpid()))
+        return True
+
+    def release_flush_lock(self) -> None:
+        (self.path / _LOCK_FILE).unlink(missing_ok=True)
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether process `pid` exists (errs towards True when unsure)."""
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        # PROCESS_QUERY_LIMITED_INFORMATION; os.kill(pid, 0) would terminate it.
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED: it exists
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # EPERM: alive, owned by someone else
+    return True
+
+
+class _ByteBudget:
+    """Blocks uploads while the bytes in flight would exceed `limit`.
+
+    A bundle larger than the whole budget waits for an empty budget and
+    then goes alone.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        size = min(max(0, size), self.limit)
+        with self._cond:
+            while self.in_flight and self.in_flight + size > self.limit:
+                self._cond.wait()
+            self.in_flight += size
+            self.peak = max(self.peak, self.in_flight)
+        return size
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self.in_flight -= size
+            self._cond.notify_all()
+
+
+def flush_spool(
+    spool: UploadSpool,
+    token: str,
+    workers: int = DEFAULT_FLUSH_WORKERS,
+    max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    timeout: int = 30,
+    gzip_body: bool = False,
+    dedup: bool = True,
+    include_deferred: bool = False,
+    rng: random.Random | None = None,
+    uploader: Callable[..., Dict[str, Any]] = upload_report_bundle,
+) -> Dict[str, Any]:
+    """Upload every due pending job.
+
+    Args:
+        spool: Spool to drain
+        token: Bearer token for the upload endpoint
+        workers: Concurrent uploads
+        max_inflight_bytes: Cap on the summed size of bundles being sent
+        max_attempts: Failures after which a job moves to failed/
+        timeout: HTTP timeout in seconds
+        gzip_body: Gzip request bodies
+        dedup: Pre-flight manifest hashes and send only content the server
+            lacks
+        include_deferred: Also send jobs still inside their backoff window
+        rng: Jitter source (for deterministic tests)
+        uploader: Upload function (`upload_report_bundle` signature)
+
+    Returns:
+        Summary with sent / retrying / failed / deferred counts, bytes sent,
+        connections opened and the peak bytes in flight
+    """
+    summary: Dict[str, Any] = {
+        "sent": 0,
+        "retrying": 0,
+        "failed": 0,
+        "deferred": 0,
+        "bytes_sent": 0,
+        "bytes_deduped": 0,
+        "locked": False,
+    }
+    if not spool.acquire_flush_lock():
+        summary["locked"] = True
+        return summary
+
+    started = time.perf_counter()
+    rng = rng or random.Random()
+    budget = _ByteBudget(max_inflight_bytes)
+    lock = threading.Lock()
+
+    def _send(job: Dict[str, Any], session: UploadSession) -> None:
+        size = int(job.get("size_bytes") or 0)
+        held = budget.acquire(size)
+        try:
+            if not Path(job["bundle"]).exists():
+                raise UploadError(f"Bundle no longer exists: {job['bundle']}", 410)
+            response = uploader(
+                upload_url=job["upload_url"],
+                token=token,
+                output_dir=Path(job["bundle"]),
+                timeout=timeout,
+                metadata=job.get("metadata") or {},
+                gzip_body=gzip_body,
+                session=session,
+                dedup=dedup,
+            )
+        except UploadError as exc:
+            job["attempts"] = int(job.get("attempts", 0)) + 1
+            permanent = (
+                exc.status is not None
+                and 400 <= exc.status < 500
+                and exc.status not in _RETRYABLE_4XX
+            )
+            if permanent or job["attempts"] >= max_attempts:
+                spool.mark_failed(job, str(exc))
+                outcome = "failed"
+            else:
+                spool.mark_retry(job, str(exc), backoff_delay(job["attempts"], rng))
+                outcome = "retrying"
+            logger.warning("Upload of %s %s: %s", job["bundle"], outcome, exc)
+        else:
+            spool.mark_sent(job, response)
+            outcome = "sent"
+            skipped = int((response.get("dedup") or {}).get("bytes_skipped", 0))
+            with lock:
+                summary["bytes_sent"] += max(0, size - skipped)
+                summary["bytes_deduped"] += skipped
+        finally:
+            budget.release(held)
+        with lock:
+            summary[outcome] += 1
+
+    try:
+        now = time.time()
+        due = []
+        for job in spool.jobs(_PENDING):
+            if include_deferred or float(job.get("next_attempt_at", 0)) <= now:
+                due.append(job)
+            else:
+                summary["deferred"] += 1
+
+        with UploadSession(timeout=timeout) as session:
+            if due:
+                with ThreadPoolExecutor(
+                    max_workers=max(1, min(workers, len(due)))
+                ) as pool:
+                    for future in [pool.submit(_send, job, session) for job in due]:
+                        future.result()
+            summary["connections_opened"] = session.connections_opened
+    finally:
+        spool.release_flush_lock()
+
+    summary["peak_inflight_bytes"] = budget.peak
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 6)
+    return summary
+
+
+def drain_spool(
+    spool: UploadSpool,
+    token: str,
+    max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.time,
+    **flush_kwargs: Any,
+) -> Dict[str, Any]:
+    """Flush repeatedly until no pending job remains.
+
+    Between passes it sleeps until the earliest `next_attempt_at`. It stops
+    early when the next retry falls after `max_wait_seconds`, or when
+    another process holds the flush lock.
+
+    Args:
+        spool: Spool to drain
+        token: Bearer token for the upload endpoint
+        max_wait_seconds: Cap on total wall time
+        sleep: Sleep function (for tests)
+        clock: Wall-clock function (for tests)
+        **flush_kwargs: Passed to `flush_spool`
+
+    Returns:
+        `flush_spool` summary with sent / failed / byte counts summed over
+        all passes, the last pass's retrying / deferred counts and `passes`
+    """
+    started = time.perf_counter()
+    deadline = clock() + max(0.0, max_wait_seconds)
+    result: Dict[str, Any] = {}
+    passes = 0
+    while True:
+        summary = flush_spool(spool, token, **flush_kwargs)
+        if summary["locked"] and passes:
+            break  # another flusher took over between passes
+        passes += 1
+        for key in _SUMMED_KEYS:
+            summary[key] = summary.get(key, 0) + result.get(key, 0)
+        summary["peak_inflight_bytes"] = max(
+            summary.get("peak_inflight_bytes", 0), result.get("peak_inflight_bytes", 0)
+        )
+        result = summary
+        if summary["locked"]:
+            break
+        next_at = spool.next_attempt_at()
+        if next_at is None or next_at > deadline:
+            break
+        delay = next_at - clock()
+        if delay > 0:
+            logger.info("Next upload retry in %.0fs", delay)
+            sleep(delay)
+    result["passes"] = passes
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def spawn_background_flush(token: str, spool_dir: Path | None = None) -> bool:
+    """Start a detached `inspecta upload flush --wait`; False if it cannot start.
+
+    The child keeps retrying backed-off jobs until the spool is empty (see
+    `drain_spool`). The token reaches it through its environment, never
+    argv or disk.
+    """
+    if getattr(sys, "frozen", False):
+        # PyInstaller build: sys.executable is the inspecta binary itself.
+        command = [sys.executable, "upload", "flush", "--wait"]
+        cwd = None
+    else:
+        command = [sys.executable, "-m", "agent.cli", "upload", "flush", "--wait"]
+        cwd = str(Path(__file__).resolve().parents[1])
+    if spool_dir is not None:
+        command += ["--spool-dir", str(spool_dir)]
+    env = dict(os.environ, **{TOKEN_ENV_VAR: token})
+    try:
+        subprocess.Popen(
+            command,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+            **session_kwargs(),
+        )
+    except OSError as exc:
+        logger.warning("Could not start background upload flush: %s", exc)
+        return False
+    return True
@@ -0,0 +1,175 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Stat-keyed digest cache for repeated bundle verification.
+
+Like git's index, an entry maps a file's absolute path and stat tuple
+(size, mtime_ns, inode, ctime_ns) to the SHA256 computed when it was last
+read. While the stat tuple is unchanged, verification can reuse the digest
+instead of rehashing the file. Entries for files modified within
+`RACY_WINDOW_NS` of being cached are not stored, because a same-tick
+rewrite would leave the stat tuple unchanged.
+
+Saving never drops an entry used in the current session, so one pass over
+a large bundle store keeps every digest for the next pass. Older entries
+are pruned when their file no longer exists and, beyond `max_entries`,
+least recently used first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agent.paths import user_cache_dir
+
+logger = logging.getLogger("inspecta.verify_cache")
+
+VERIFY_CACHE_FILE = "verify-cache.json"
+VERIFY_CACHE_VERSION = 1
+# Fraction of cache hits that are rehashed anyway to catch silent corruption.
+DEFAULT_SAMPLE_RATE = 0.02
+RACY_WINDOW_NS = 2_000_000_000
+DEFAULT_MAX_ENTRIES = 1_000_000
+# A hit only refreshes an entry's last-use time (and dirties the cache) once
+# it is this old, so re-verifying the same bundle does not rewrite the file.
+USE_REFRESH_SECONDS = 3600
+
+
+def default_verify_cache_path() -> Path:
+    """Return the per-user verification cache file location."""
+    return user_cache_dir() / VERIFY_CACHE_FILE
+
+
+def _stat_key(stat: os.stat_result) -> List[int]:
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+
+
+class VerificationCache:
+    """Persistent (path, stat tuple) -> sha256 map.
+
+    Args:
+        path: Cache file (default `default_verify_cache_path()`)
+        max_entries: Entry limit applied when saving; entries used in this
+            session are always kept
+        read_only: Never write the file; worker processes verify with a
+            read-only copy and hand `take_updates()` to the parent's cache
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        read_only: bool = False,
+    ):
+        self.path = path or default_verify_cache_path()
+        self.max_entries = max(1, max_entries)
+        self.read_only = read_only
+        self._entries = self._load()
+        self._touched: set[str] = set()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != VERIFY_CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, path: Path, stat: os.stat_result) -> Optional[str]:
+        """Return the cached digest if `stat` still matches, else None."""
+        key = str(path.resolve())
+        entry = self._entries.get(key)
+        if not isinstance(entry, dict) or entry.get("stat") != _stat_key(stat):
+            return None
+        sha = entry.get("sha256")
+        if not isinstance(sha, str):
+            return None
+        self._touched.add(key)
+        now = int(time.time())
+        if now - int(entry.get("used") or 0) >= USE_REFRESH_SECONDS:
+            entry["used"] = now
+            self._dirty = True
+        return sha
+
+    def store(self, path: Path, stat: os.stat_result, sha256: str) -> bool:
+        """Remember `sha256` for `path` at `stat`; returns False if racy."""
+        key = str(path.resolve())
+        if time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+            return False
+        self._entries[key] = {
+            "stat": _stat_key(stat),
+            "sha256": sha256,
+            "used": int(time.time()),
+        }
+        self._touched.add(key)
+        self._dirty = True
+        return True
+
+    def take_updates(self) -> Dict[str, Any]:
+        """Return the entries used since the last call, and forget them."""
+        updates = {
+            key: self._entries[key] for key in self._touched if key in self._entries
+        }
+        self._touched.clear()
+        return updates
+
+    def merge(self, updates: Dict[str, Any]) -> None:
+        """Adopt entries from another process's `take_updates()`."""
+        if not updates:
+            return
+        self._entries.update(updates)
+        self._touched.update(updates)
+        self._dirty = True
+
+    def _prune(self) -> None:
+        stale = [
+            key
+            for key in self._entries
+            if key not in self._touched and not os.path.exists(key)
+        ]
+        for key in stale:
+            del self._entries[key]
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        by_use = sorted(
+            (key for key in self._entries if key not in self._touched),
+            key=lambda k: (
+                int(self._entries[k].get("used") or 0)
+                if isinstance(self._entries[k], dict)
+                else 0
+            ),
+        )
+        for key in by_use[:excess]:
+            del self._entries[key]
+
+    def save(self) -> None:
+        """Atomically persist the cache if anything changed (see module doc)."""
+        if self.read_only or not self._dirty:
+            return
+        self._prune()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"version": VERIFY_CACHE_VERSION, "entries": self._entries},
+                    sort_keys=True,
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as exc:
+            logger.debug("Could not write verification cache %s: %s", self.path, exc)
@@ -6,10 +6,19 @@ PyInstaller entry point wrapper for inspecta CLI.
 This wrapper ensures the agent package is properly imported when
 running as a standalone executable built with PyInstaller. It avoids
 the "ImportError: attempted relative import with no known parent package"
-error that occurs when agent/cli.py is used directly as the entry point.
+error that occurs when agent/cli.py is used directly as the entry point,
+and calls multiprocessing.freeze_support() so process-pool workers start
+correctly in the frozen executable.
 """
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # Report rendering, bulk verify, rescore and validate use process pools;
+    # in a frozen build their workers re-run this executable and must be
+    # handed to multiprocessing before the CLI parses their arguments.
+    multiprocessing.freeze_support()
+
     from agent.cli import cli
 
     cli()
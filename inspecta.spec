@@ -26,6 +26,10 @@ a = Analysis(
     hiddenimports=[
         'agent',
         'agent.cli',
+        # Subcommands LazyGroup imports by name (agent.cli.LAZY_COMMANDS);
+        # PyInstaller cannot see importlib.import_module() targets.
+        'agent.cli_fleet',
+        'agent.cli_upload',
         'agent.report',
         'agent.scoring',
         'agent.exceptions',
@@ -1,4 +1,6 @@
 use serde::Serialize;
+use serde_json::{Value, json};
+use std::io::{self, BufRead, Read, Write};
 use std::process;
 
 /// Lightweight native helper for inspecta.
@@ -41,6 +43,16 @@ fn handshake() -> Handshake {
                 status: "planned",
                 detail: "intended for short CPU/memory microbenchmarks",
             },
+            Capability {
+                name: "smart_batch_contract",
+                status: "ok",
+                detail: "SMART contract batch validation (one-shot or session)",
+            },
+            Capability {
+                name: "session",
+                status: "ok",
+                detail: "newline-delimited JSON request/response over stdio",
+            },
             Capability {
                 name: "ffi_bridge",
                 status: "planned",
@@ -50,8 +62,127 @@ fn handshake() -> Handshake {
     }
 }
 
+/// Validate a batch of SMART boundary contracts (schema 1.0.0).
+fn smart_batch_contract(params: &Value) -> Result<Value, String> {
+    let contracts = params
+        .get("contracts")
+        .and_then(Value::as_array)
+        .ok_or_else(|| "missing contracts array".to_string())?;
+
+    let mut processed = 0u64;
+    let mut rejected = 0u64;
+    let mut critical_warning_devices = 0u64;
+    let mut max_percentage_used: Option<i64> = None;
+
+    for contract in contracts {
+        let valid = contract.get("schema_version").and_then(Value::as_str) == Some("1.0.0")
+            && contract.get("device").is_some_and(Value::is_object)
+            && contract.get("metrics").is_some_and(Value::is_object);
+        if !valid {
+            rejected += 1;
+            continue;
+        }
+        processed += 1;
+        let metrics = &contract["metrics"];
+        if metrics
+            .get("nvme_critical_warning")
+            .and_then(Value::as_i64)
+            .is_some_and(|value| value > 0)
+        {
+            critical_warning_devices += 1;
+        }
+        if let Some(used) = metrics.get("nvme_percentage_used").and_then(Value::as_i64) {
+            max_percentage_used = Some(max_percentage_used.map_or(used, |m| m.max(used)));
+        }
+    }
+
+    Ok(json!({
+        "status": if rejected == 0 { "ok" } else { "partial" },
+        "engine": "rust",
+        "schema_version": "1.0.0",
+        "processed": processed,
+        "rejected": rejected,
+        "critical_warning_devices": critical_warning_devices,
+        "max_nvme_percentage_used": max_percentage_used,
+    }))
+}
+
+/// Serve newline-delimited JSON requests until stdin closes or `shutdown`.
+///
+/// Request:  {"id": 1, "method": "ping" | "handshake" | "smart_batch_contract" | "shutdown", "params": {...}}
+/// Response: {"id": 1, "ok": true, "result": {...}} or {"id": 1, "ok": false, "error": "..."}
+fn run_session() {
+    let stdin = io::stdin();
+    let stdout = io::stdout();
+    let mut out = stdout.lock();
+
+    for line in stdin.lock().lines() {
+        let Ok(line) = line else { break };
+        if line.trim().is_empty() {
+            continue;
+        }
+
+        let (id, response, stop) = match serde_json::from_str::<Value>(&line) {
+            Ok(request) => {
+                let id = request.get("id").cloned().unwrap_or(Value::Null);
+                let params = request.get("params").cloned().unwrap_or(Value::Null);
+                let method = request.get("method").and_then(Value::as_str).unwrap_or("");
+                let result = match method {
+                    "ping" => Ok(json!({"status": "ok", "pid": process::id()})),
+                    "handshake" => serde_json::to_value(handshake()).map_err(|e| e.to_string()),
+                    "smart_batch_contract" => smart_batch_contract(&params),
+                    "shutdown" => Ok(json!({"status": "bye"})),
+                    other => Err(format!("unknown method: {other}")),
+                };
+                (id, result, method == "shutdown")
+            }
+            Err(err) => (Value::Null, Err(format!("invalid request: {err}")), false),
+        };
+
+        let payload = match response {
+            Ok(result) => json!({"id": id, "ok": true, "result": result}),
+            Err(error) => json!({"id": id, "ok": false, "error": error}),
+        };
+        if writeln!(out, "{payload}")
+            .and_then(|_| out.flush())
+            .is_err()
+        {
+            break;
+        }
+        if stop {
+            break;
+        }
+    }
+}
+
 fn main() {
     let args: Vec<String> = std::env::args().collect();
+    if args.iter().any(|arg| arg == "--session") {
+        run_session();
+        return;
+    }
+
+    if args.iter().any(|arg| arg == "--smart-batch-contract") {
+        let mut input = String::new();
+        if let Err(err) = io::stdin().read_to_string(&mut input) {
+            eprintln!("inspecta-native: failed to read stdin: {err}");
+            process::exit(2);
+        }
+        let result = serde_json::from_str::<Value>(&input)
+            .map_err(|err| format!("invalid json: {err}"))
+            .and_then(|params| smart_batch_contract(&params));
+        match result {
+            Ok(output) => {
+                println!("{output}");
+                return;
+            }
+            Err(err) => {
+                eprintln!("inspecta-native: {err}");
+                process::exit(2);
+            }
+        }
+    }
+
     if args.iter().any(|arg| arg == "--handshake") {
         let payload = handshake();
         match serde_json::to_string_pretty(&payload) {
@@ -66,6 +197,6 @@ fn main() {
         }
     }
 
-    eprintln!("inspecta-native: use --handshake to print capabilities");
+    eprintln!("inspecta-native: use --handshake, --smart-batch-contract or --session");
     process::exit(1);
 }
@@ -4,8 +4,9 @@ Build script for creating standalone release packages of inspecta.
 
 This script:
 1. Builds the executable using PyInstaller
-2. Creates a distribution package with documentation and samples
-3. Creates a zip file ready for distribution
+2. Smoke-tests the built executable (including a lazily loaded subcommand)
+3. Creates a distribution package with documentation and samples
+4. Creates a zip file ready for distribution
 
 Usage:
     python scripts/build_release.py [--platform PLATFORM]
@@ -101,6 +102,34 @@ def build_executable(root_dir: Path, clean: bool = True):
         return False
 
 
+# Each must exit 0 from the built executable. `validate` and `upload` are
+# loaded by name (agent.cli.LAZY_COMMANDS), so they fail if inspecta.spec
+# is missing their module in hiddenimports.
+SMOKE_COMMANDS = (
+    ["--version"],
+    ["validate", "--help"],
+    ["upload", "--help"],
+)
+
+
+def smoke_test_executable(command: list[str]) -> bool:
+    """Run SMOKE_COMMANDS with `command` (the executable, plus any prefix)."""
+    for args in SMOKE_COMMANDS:
+        try:
+            result = subprocess.run(
+                [*command, *args], capture_output=True, text=True, timeout=120
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"[ERROR] Smoke test {' '.join(args)} failed: {e}")
+            return False
+        if result.returncode != 0:
+            print(f"[ERROR] Smoke test {' '.join(args)} exited {result.returncode}")
+            print(result.stdout + result.stderr)
+            return False
+        print(f"[OK] Smoke test: inspecta {' '.join(args)}")
+    return True
+
+
 def create_distribution_package(root_dir: Path, platform_name: str, version: str):
     """Create a distribution package with all necessary files."""
     print("\n" + "=" * 60)
@@ -754,6 +783,10 @@ def main():
     if not build_executable(root_dir, clean=not args.no_clean):
         return 1
 
+    exe_name = "inspecta.exe" if platform_name == "windows" else "inspecta"
+    if not smoke_test_executable([str(root_dir / "dist" / exe_name)]):
+        return 1
+
     # Create distribution package
     package_dir = create_distribution_package(root_dir, platform_name, version)
     if not package_dir:
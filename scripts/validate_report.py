@@ -1,7 +1,8 @@
 # Copyright (c) 2025 mufthakherul — see LICENSE.txt
-"""Validate a report.json against a provided JSON Schema.
+"""Validate a report.json against a JSON Schema.
 
-Usage: python scripts/validate_report.py <report.json> <schema.json>
+Usage: python scripts/validate_report.py <report.json> [<schema.json>]
+The schema defaults to the newest shipped report schema.
 Exits with code 0 on success, non-zero on validation error.
 """
 
@@ -9,23 +10,27 @@ from __future__ import annotations
 
 import json
 import sys
+from pathlib import Path
 
-from jsonschema import Draft7Validator
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.schema_registry import get_validator, validator_for_file  # noqa: E402
 
 
 def main(argv: list[str]) -> int:
-    if len(argv) != 3:
-        print("Usage: validate_report.py <report.json> <schema.json>")
+    if len(argv) not in (2, 3):
+        print("Usage: validate_report.py <report.json> [<schema.json>]")
         return 2
     report_path = argv[1]
-    schema_path = argv[2]
     with open(report_path, "r", encoding="utf-8") as fh:
         report = json.load(fh)
-    with open(schema_path, "r", encoding="utf-8") as fh:
-        schema = json.load(fh)
 
-    validator = Draft7Validator(schema)
-    errors = sorted(validator.iter_errors(report), key=lambda e: e.path)
+    validator = (
+        validator_for_file(Path(argv[2])) if len(argv) == 3 else get_validator("report")
+    )
+    errors = sorted(validator.iter_errors(report), key=lambda e: list(e.path))
     if errors:
         for err in errors:
             print(f"Validation error: {err.message} at {list(err.path)}")
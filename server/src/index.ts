@@ -4,14 +4,18 @@ import fs from "node:fs";
 import path from "node:path";
 import crypto from "node:crypto";
 import multer from "multer";
+import zlib from "node:zlib";
 
 const app = express();
 const port = Number(process.env.PORT ?? 8787);
 const uploadToken = process.env.UPLOAD_TOKEN ?? "inspecta-dev-token";
 const dataDir = process.env.DATA_DIR ?? path.resolve(process.cwd(), "data");
 const reportsDir = path.join(dataDir, "reports");
+// Content-addressed store: every uploaded file is kept once under its sha256.
+const blobsDir = path.join(dataDir, "blobs");
 
 fs.mkdirSync(reportsDir, { recursive: true });
+fs.mkdirSync(blobsDir, { recursive: true });
 
 app.use(cors());
 app.use(express.json({ limit: "2mb" }));
@@ -35,6 +39,40 @@ const upload = multer({
     limits: { fileSize: 25 * 1024 * 1024, files: 50 },
 });
 
+// multer reads the raw request stream, so a `Content-Encoding: gzip` body
+// (`inspecta upload --gzip`) is inflated here before it reaches the
+// multipart parser. Size limits above apply to the decoded files.
+function gunzipMiddleware(
+    req: express.Request,
+    res: express.Response,
+    next: express.NextFunction
+) {
+    const encoding = (req.header("content-encoding") ?? "identity").toLowerCase();
+    if (encoding === "identity") {
+        next();
+        return;
+    }
+    if (encoding !== "gzip") {
+        res.status(415).json({ error: "unsupported content-encoding", encoding });
+        return;
+    }
+    const gunzip = zlib.createGunzip();
+    req.pipe(gunzip);
+    delete req.headers["content-encoding"];
+    delete req.headers["content-length"];
+    req.headers["transfer-encoding"] = "chunked";
+    req.pipe = (<T extends NodeJS.WritableStream>(destination: T): T => {
+        gunzip.on("error", (err: NodeJS.ErrnoException & { status?: number }) => {
+            err.status = 400;
+            destination.emit("error", err);
+        });
+        return gunzip.pipe(destination);
+    }) as typeof req.pipe;
+    next();
+}
+
+const receiveUpload = [gunzipMiddleware, upload.any()];
+
 type StoredReport = {
     id: string;
     createdAt: string;
@@ -42,29 +80,135 @@ type StoredReport = {
     files: string[];
 };
 
+type BlobRecord = {
+    field: string;
+    filename: string;
+    path: string;
+    sha256: string;
+    size: number;
+};
+
+const SHA256_HEX = /^[0-9a-f]{64}$/;
+
 function getReportDir(id: string): string {
     return path.join(reportsDir, id);
 }
 
+function getBlobPath(sha256: string): string {
+    return path.join(blobsDir, sha256);
+}
+
+function hasBlob(sha256: string): boolean {
+    return SHA256_HEX.test(sha256) && fs.existsSync(getBlobPath(sha256));
+}
+
+function storeBlob(buffer: Buffer): string {
+    const sha256 = crypto.createHash("sha256").update(buffer).digest("hex");
+    const blobPath = getBlobPath(sha256);
+    if (!fs.existsSync(blobPath)) {
+        const tmpPath = `${blobPath}.${process.pid}.tmp`;
+        fs.writeFileSync(tmpPath, buffer);
+        fs.renameSync(tmpPath, blobPath);
+    }
+    return sha256;
+}
+
+function parseBlobRecords(field: unknown): BlobRecord[] | null {
+    if (typeof field !== "string") {
+        return [];
+    }
+    try {
+        const parsed = JSON.parse(field) as unknown;
+        if (!Array.isArray(parsed)) {
+            return null;
+        }
+        return parsed.filter(
+            (r): r is BlobRecord =>
+                typeof r?.field === "string" &&
+                typeof r?.filename === "string" &&
+                typeof r?.sha256 === "string" &&
+                SHA256_HEX.test(r.sha256)
+        );
+    } catch {
+        return null;
+    }
+}
+
 app.get("/health", (_req, res) => {
     res.json({ ok: true, service: "inspecta-upload-api" });
 });
 
-app.post("/reports", authMiddleware, upload.any(), (req, res) => {
+// Dedup pre-flight: the client posts its manifest's (path, sha256, size)
+// list and uploads only the hashes reported missing here.
+app.post("/reports/preflight", authMiddleware, (req, res) => {
+    const files: unknown = req.body?.files;
+    if (!Array.isArray(files)) {
+        res.status(400).json({ error: "files must be an array" });
+        return;
+    }
+    const missing = new Set<string>();
+    for (const file of files) {
+        const sha256 = typeof file?.sha256 === "string" ? file.sha256 : "";
+        if (SHA256_HEX.test(sha256) && !hasBlob(sha256)) {
+            missing.add(sha256);
+        }
+    }
+    res.json({ missing: [...missing] });
+});
+
+app.post("/reports", authMiddleware, receiveUpload, (req, res) => {
+    const files = (req.files as Express.Multer.File[] | undefined) ?? [];
+    const blobRecords = parseBlobRecords(req.body?.blobs);
+    if (blobRecords === null) {
+        res.status(400).json({ error: "invalid blobs JSON" });
+        return;
+    }
+
+    const uploadedKeys = new Set(
+        files.map((f) => `${f.fieldname}\0${f.originalname}`)
+    );
+    const reused = blobRecords.filter(
+        (r) => !uploadedKeys.has(`${r.field}\0${r.filename}`)
+    );
+    const absent = reused.find((r) => !hasBlob(r.sha256));
+    if (absent) {
+        // Evicted since pre-flight; the client retries with the full bundle.
+        res.status(409).json({ error: "blob missing", sha256: absent.sha256 });
+        return;
+    }
+
+    const expected = new Map(
+        blobRecords.map((r) => [`${r.field}\0${r.filename}`, r.sha256])
+    );
     const id = crypto.randomUUID();
     const reportDir = getReportDir(id);
     fs.mkdirSync(reportDir, { recursive: true });
 
-    const files = (req.files as Express.Multer.File[] | undefined) ?? [];
     const storedFiles: string[] = [];
 
     for (const file of files) {
+        const sha256 = storeBlob(file.buffer);
+        const claimed = expected.get(`${file.fieldname}\0${file.originalname}`);
+        if (claimed && claimed !== sha256) {
+            fs.rmSync(reportDir, { recursive: true, force: true });
+            res.status(400).json({
+                error: "sha256 mismatch",
+                file: file.originalname,
+            });
+            return;
+        }
         const safeName = file.originalname.replace(/[^a-zA-Z0-9._-]/g, "_");
         const outPath = path.join(reportDir, safeName);
         fs.writeFileSync(outPath, file.buffer);
         storedFiles.push(safeName);
     }
 
+    for (const record of reused) {
+        const safeName = record.filename.replace(/[^a-zA-Z0-9._-]/g, "_");
+        fs.copyFileSync(getBlobPath(record.sha256), path.join(reportDir, safeName));
+        storedFiles.push(safeName);
+    }
+
     let metadata: Record<string, unknown> | undefined;
     const metadataField = req.body?.metadata;
     if (typeof metadataField === "string") {
@@ -94,6 +238,7 @@ app.post("/reports", authMiddleware, upload.any(), (req, res) => {
         reportUrl: `/reports/${id}`,
         pdfUrl: `/reports/${id}/pdf`,
         files: storedFiles,
+        reused: reused.length,
     });
 });
 
@@ -38,7 +38,7 @@ def test_execute_upower_with_sample():
     assert "raw_text" in result
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 @patch("platform.system")
 def test_scan_battery_missing_device(mock_platform, mock_run):
     mock_platform.return_value = "Linux"
@@ -54,7 +54,7 @@ def test_scan_battery_missing_device(mock_platform, mock_run):
     assert "No battery device detected" in result["error"]
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 @patch("platform.system")
 def test_scan_battery_upower_not_found(mock_platform, mock_run):
     mock_platform.return_value = "Linux"
@@ -66,7 +66,7 @@ def test_scan_battery_upower_not_found(mock_platform, mock_run):
     assert "upower not found" in result["error"]
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 @patch("platform.system")
 def test_scan_battery_timeout(mock_platform, mock_run):
     mock_platform.return_value = "Linux"
@@ -138,7 +138,7 @@ def test_execute_powercfg_with_sample():
     assert "raw_text" in result
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 @patch("tempfile.NamedTemporaryFile")
 def test_execute_powercfg_success(mock_tmpfile, mock_run):
     """Test successful powercfg execution on Windows."""
@@ -174,7 +174,7 @@ def test_execute_powercfg_success(mock_tmpfile, mock_run):
     assert result["data"]["cycle_count"] == 50
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 @patch("tempfile.NamedTemporaryFile")
 def test_execute_powercfg_fallback_to_colon_syntax(mock_tmpfile, mock_run):
     """If /output <path> fails, fallback to /output:<path> should be attempted."""
@@ -208,7 +208,7 @@ def test_execute_powercfg_fallback_to_colon_syntax(mock_tmpfile, mock_run):
     assert second_call_args[2].startswith("/output:")
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.battery.run_command")
 def test_execute_powercfg_not_found(mock_run):
     """Test powercfg not found raises error."""
     mock_run.side_effect = FileNotFoundError()
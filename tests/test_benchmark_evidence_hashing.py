@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from tools.benchmark_evidence_hashing import run_hashing_benchmark
+
+
+def test_run_hashing_benchmark_smoke(tmp_path):
+    result = run_hashing_benchmark(
+        small_files=20,
+        small_file_bytes=512,
+        large_files=2,
+        large_file_bytes=64 * 1024,
+        workers=2,
+        work_dir=tmp_path,
+    )
+
+    assert set(result["bundles"]) == {"many_small_files", "large_files"}
+    small = result["bundles"]["many_small_files"]
+    assert small["files"] == 20
+    assert small["total_bytes"] == 20 * 512
+    for bundle in result["bundles"].values():
+        assert bundle["digests_match"] is True
+        assert bundle["parallel_seconds"] >= 0
+    assert list(tmp_path.iterdir()) == []
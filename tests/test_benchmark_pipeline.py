@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tools.benchmark_pipeline import (
+    STAGES,
+    append_history,
+    compare_to_baseline,
+    history_baseline,
+    reset_history,
+    run_pipeline_benchmark,
+)
+
+
+def test_run_pipeline_benchmark_smoke():
+    stages = [name for name in STAGES if name != "format_pdf"]
+
+    result = run_pipeline_benchmark(
+        sizes=[1, 3], stages=stages, min_time=0.0, min_iterations=1
+    )
+
+    assert result["benchmark_version"] == "1.0.0"
+    assert set(result["stages"]) == set(stages)
+    for per_size in result["stages"].values():
+        assert set(per_size) == {"1", "3"}
+        for metrics in per_size.values():
+            assert metrics["ops_per_sec"] > 0
+            assert metrics["alloc_peak_bytes"] >= 0
+
+
+def test_run_pipeline_benchmark_rejects_unknown_stage():
+    with pytest.raises(ValueError):
+        run_pipeline_benchmark(stages=["parse_everything"])
+
+
+def test_compare_to_baseline_flags_only_drops_past_threshold():
+    baseline = {
+        "stages": {
+            "parse_smart_json": {"1": {"ops_per_sec": 1000.0}},
+            "compose_report": {"1": {"ops_per_sec": 100.0}},
+        }
+    }
+    current = {
+        "stages": {
+            "parse_smart_json": {"1": {"ops_per_sec": 700.0}},
+            "compose_report": {"1": {"ops_per_sec": 90.0}},
+            "format_txt": {"1": {"ops_per_sec": 1.0}},
+        }
+    }
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+
+    assert [(r["stage"], r["size"]) for r in regressions] == [("parse_smart_json", "1")]
+    assert regressions[0]["change_pct"] == -30.0
+
+
+def test_append_history_keeps_latest_runs(tmp_path):
+    history_path = tmp_path / "history.json"
+    for index in range(4):
+        append_history(history_path, {"generated_at": str(index)}, limit=2)
+
+    history = json.loads(history_path.read_text(encoding="utf-8"))
+    assert [run["generated_at"] for run in history["runs"]] == ["2", "3"]
+
+
+def _run(generated_at, ops):
+    return {
+        "generated_at": generated_at,
+        "stages": {"parse_smart": {"10": {"ops_per_sec": ops}}},
+    }
+
+
+def test_history_baseline_uses_median_of_recent_runs():
+    runs = [_run("0", 1.0)] + [
+        _run(str(i), ops) for i, ops in enumerate([100.0, 98.0, 400.0, 102.0, 99.0], 1)
+    ]
+
+    baseline = history_baseline(runs, window=5)
+
+    # The outlier fast run neither becomes nor skews the baseline, and runs
+    # outside the window are ignored.
+    assert baseline["stages"]["parse_smart"]["10"]["ops_per_sec"] == 100.0
+    assert baseline["baseline_runs"] == 5
+    assert baseline["generated_at"] == "5"
+    assert compare_to_baseline(_run("6", 80.0), baseline, threshold=0.25) == []
+    assert history_baseline([]) is None
+
+
+def test_reset_history_makes_accepted_run_the_baseline(tmp_path):
+    history_path = tmp_path / "history.json"
+    for index in range(5):
+        append_history(history_path, _run(str(index), 100.0))
+
+    reset_history(history_path, _run("slow", 40.0))
+
+    runs = json.loads(history_path.read_text(encoding="utf-8"))["runs"]
+    baseline = history_baseline(runs)
+    assert baseline["stages"]["parse_smart"]["10"]["ops_per_sec"] == 40.0
+    assert compare_to_baseline(_run("next", 39.0), baseline) == []
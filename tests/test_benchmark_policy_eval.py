@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from tools.benchmark_policy_eval import run_policy_benchmark
+
+
+def test_run_policy_benchmark_smoke():
+    result = run_policy_benchmark(reports=50, rules=12)
+
+    assert result["evaluations"] == 600
+    assert result["results_match"] is True
+    assert result["compiled_seconds"] >= 0
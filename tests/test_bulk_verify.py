@@ -0,0 +1,210 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for recursive bundle-store verification."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.bulk_verify import discover_bundles, summarize_bulk_results, verify_bundles
+from agent.cli import cli
+from agent.evidence import write_evidence_manifest
+from agent.verify_cache import VerificationCache
+
+
+def _make_bundle(bundle: Path, sign_key_path: Path | None = None) -> Path:
+    (bundle / "artifacts").mkdir(parents=True)
+    (bundle / "report.json").write_text('{"ok": true}', encoding="utf-8")
+    (bundle / "artifacts" / "agent.log").write_text(bundle.name, encoding="utf-8")
+    write_evidence_manifest(
+        bundle,
+        ["report.json", "artifacts/agent.log"],
+        agent_version="0.1.0",
+        sign_key_path=sign_key_path,
+    )
+    return bundle
+
+
+def _store(tmp_path: Path) -> Path:
+    root = tmp_path / "store"
+    _make_bundle(root / "2026" / "01" / "run-a")
+    _make_bundle(root / "2026" / "02" / "run-b")
+    tampered = _make_bundle(root / "2026" / "02" / "run-c")
+    (tampered / "report.json").write_text('{"ok": false}', encoding="utf-8")
+    (root / "notes").mkdir()
+    return root
+
+
+def test_discover_bundles_finds_manifests_and_stops_at_bundle(tmp_path: Path):
+    root = _store(tmp_path)
+    nested = root / "2026" / "01" / "run-a" / "inner"
+    _make_bundle(nested)
+
+    bundles = discover_bundles(root)
+
+    assert [b.name for b in bundles] == ["run-a", "run-b", "run-c"]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_verify_bundles_streams_every_result(tmp_path: Path, processes: int):
+    root = _store(tmp_path)
+
+    results = list(verify_bundles(discover_bundles(root), processes=processes))
+
+    by_name = {Path(r["bundle"]).name: r for r in results}
+    assert set(by_name) == {"run-a", "run-b", "run-c"}
+    assert by_name["run-a"]["ok"] is True
+    assert by_name["run-c"]["exit_reason"] == "integrity_mismatch"
+    summary = summarize_bulk_results(results, elapsed_seconds=0.5)
+    assert summary["verified"] == 2
+    assert summary["failed"] == 1
+    assert summary["exit_code"] == 1
+    assert summary["bundles_per_sec"] == 6.0
+
+
+def test_verify_bundles_shares_public_key_for_signed_bundles(tmp_path: Path):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    private_key = Ed25519PrivateKey.generate()
+    key_path = tmp_path / "signer.pem"
+    key_path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    root = tmp_path / "store"
+    for name in ("one", "two"):
+        _make_bundle(root / name, sign_key_path=key_path)
+
+    results = list(
+        verify_bundles(discover_bundles(root), public_key_pem=public_pem, processes=2)
+    )
+    unsigned = list(verify_bundles(discover_bundles(root), processes=2))
+
+    assert [r["exit_reason"] for r in results] == ["verified", "verified"]
+    assert {r["exit_reason"] for r in unsigned} == {"public_key_required"}
+
+
+def _age_files(root: Path) -> None:
+    # Freshly written files fall inside the cache's racy window.
+    old = time.time_ns() - 3600 * 1_000_000_000
+    for path in root.rglob("*"):
+        if path.is_file():
+            os.utime(path, ns=(old, old))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_verify_bundles_merges_worker_cache_updates(tmp_path: Path, processes: int):
+    root = _store(tmp_path)
+    _age_files(root)
+    cache_path = tmp_path / "cache.json"
+    bundles = discover_bundles(root)
+
+    first = list(
+        verify_bundles(
+            bundles,
+            processes=processes,
+            cache=VerificationCache(cache_path),
+            sample_rate=0.0,
+        )
+    )
+    second = list(
+        verify_bundles(
+            bundles,
+            processes=processes,
+            cache=VerificationCache(cache_path),
+            sample_rate=0.0,
+        )
+    )
+
+    assert all("cache_updates" not in r for r in first + second)
+    assert sum(r["cache"]["hashed"] for r in first) == 6
+    assert len(VerificationCache(cache_path)) == 6
+    assert [r["cache"] for r in second] == [
+        {"hits": 2, "hashed": 0, "sampled": 0, "corrupted": []}
+    ] * 3
+    assert {Path(r["bundle"]).name: r["ok"] for r in second} == {
+        "run-a": True,
+        "run-b": True,
+        "run-c": False,
+    }
+
+
+def test_cli_verify_recursive_with_cache(tmp_path: Path):
+    root = _store(tmp_path)
+    _age_files(root)
+    cache_path = tmp_path / "cache.json"
+    args = ["verify", str(root), "--recursive", "--cache-file", str(cache_path)]
+    runner = CliRunner()
+
+    runner.invoke(cli, args + ["--json"])
+    result = runner.invoke(cli, args + ["--json", "--sample-rate", "0"])
+
+    assert result.exit_code == 1, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert sum(r["cache"]["hits"] for r in records[:-1]) == 6
+
+
+def test_cli_verify_recursive_emits_jsonl_and_summary(tmp_path: Path):
+    root = _store(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli, ["verify", str(root), "--recursive", "--processes", "2", "--json"]
+    )
+
+    assert result.exit_code == 1, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["type"] for r in records] == ["bundle"] * 3 + ["summary"]
+    assert records[-1]["bundles"] == 3
+    assert records[-1]["bytes_hashed"] > 0
+
+
+def test_cli_verify_recursive_without_bundles_exits_2(tmp_path: Path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["verify", str(tmp_path), "--recursive"])
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_verify_bundles_reports_malformed_bundle_and_continues(
+    tmp_path: Path, processes: int
+):
+    root = _store(tmp_path)
+    broken = root / "2026" / "03" / "run-d" / "artifacts"
+    broken.mkdir(parents=True)
+    (broken / "manifest.json").write_text("[1]", encoding="utf-8")
+
+    results = list(verify_bundles(discover_bundles(root), processes=processes))
+
+    by_name = {Path(r["bundle"]).name: r for r in results}
+    assert set(by_name) == {"run-a", "run-b", "run-c", "run-d"}
+    assert by_name["run-d"]["ok"] is False
+    assert by_name["run-d"]["exit_reason"] == "verification_error"
+    assert summarize_bulk_results(results, elapsed_seconds=1.0)["exit_code"] == 2
+
+
+def test_cli_verify_recursive_rejects_invalid_public_key(tmp_path: Path):
+    root = _store(tmp_path)
+    key_path = tmp_path / "bad.pem"
+    key_path.write_text("not a key", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        cli, ["verify", str(root), "--recursive", "--public-key", str(key_path)]
+    )
+
+    assert result.exit_code == 2
+    assert "Cannot load public key" in result.output
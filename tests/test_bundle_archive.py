@@ -0,0 +1,149 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for single-file `.inspecta` bundle archives."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.bundle_archive import (
+    BundleArchive,
+    BundleArchiveError,
+    is_bundle_archive,
+    pack_bundle,
+)
+from agent.cli import cli
+from agent.evidence import verify_evidence_manifest, write_evidence_manifest
+from agent.upload_client import upload_report_bundle
+
+SAMPLE_REPORT = Path(__file__).resolve().parents[1] / "samples" / "sample_report.json"
+
+
+def _bundle(tmp_path: Path) -> Path:
+    bundle = tmp_path / "run-1"
+    (bundle / "artifacts").mkdir(parents=True)
+    (bundle / "report.json").write_text(json.dumps({"ok": True}), encoding="utf-8")
+    (bundle / "report.txt").write_text("report", encoding="utf-8")
+    (bundle / "artifacts" / "sensors.csv").write_text("t,v\n1,2\n", encoding="utf-8")
+    write_evidence_manifest(
+        bundle,
+        ["report.json", "report.txt", "artifacts/sensors.csv"],
+        agent_version="0.1.0",
+    )
+    return bundle
+
+
+def test_pack_is_deterministic_and_random_access(tmp_path: Path):
+    bundle = _bundle(tmp_path)
+
+    first = pack_bundle(bundle)
+    first_bytes = first.read_bytes()
+    second = pack_bundle(bundle, tmp_path / "copy.inspecta")
+
+    assert first == tmp_path / "run-1.inspecta"
+    assert second.read_bytes() == first_bytes
+    assert is_bundle_archive(first)
+    with BundleArchive(first) as archive:
+        assert archive.read_text("artifacts/sensors.csv") == "t,v\n1,2\n"
+        index = archive.index()
+        assert index["report.txt"]["size"] == len("report")
+        assert sorted(index) == sorted(archive.names())
+        with pytest.raises(BundleArchiveError):
+            archive.open("missing.txt")
+
+
+def test_reader_rejects_plain_zip(tmp_path: Path):
+    import zipfile
+
+    plain = tmp_path / "plain.inspecta"
+    with zipfile.ZipFile(plain, "w") as zf:
+        zf.writestr("report.json", "{}")
+
+    with pytest.raises(BundleArchiveError):
+        BundleArchive(plain)
+
+
+def test_verify_streams_hashes_from_archive(tmp_path: Path):
+    bundle = _bundle(tmp_path)
+    archive = pack_bundle(bundle)
+
+    result = verify_evidence_manifest(archive, "artifacts/manifest.json")
+    assert result["exit_reason"] == "verified"
+    assert result["checked"] == 3
+
+    (bundle / "report.txt").write_text("tampered", encoding="utf-8")
+    tampered = pack_bundle(bundle, tmp_path / "tampered.inspecta")
+    result = verify_evidence_manifest(tampered, "artifacts/manifest.json")
+    assert result["exit_code"] == 1
+    assert [m["path"] for m in result["mismatches"]] == ["report.txt"]
+
+
+def test_upload_accepts_archive(tmp_path: Path, monkeypatch):
+    archive = pack_bundle(_bundle(tmp_path))
+    captured = {}
+
+    class DummyResponse:
+        status = 201
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def read(self):
+            return b'{"id":"abc"}'
+
+    def fake_urlopen(req, timeout=30):
+        captured["body"] = b"".join(req.data)
+        return DummyResponse()
+
+    monkeypatch.setattr("agent.upload_client.request.urlopen", fake_urlopen)
+
+    result = upload_report_bundle("https://example.com", "token", archive)
+
+    assert result["status"] == 201
+    body = captured["body"]
+    assert b'name="report_json"; filename="report.json"' in body
+    assert b'name="artifacts"; filename="sensors.csv"' in body
+    assert b"t,v\n1,2\n" in body
+
+
+def test_cli_pack_verify_and_report_from_archive(tmp_path: Path):
+    bundle = _bundle(tmp_path)
+    (bundle / "report.json").write_text(
+        SAMPLE_REPORT.read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    write_evidence_manifest(
+        bundle,
+        ["report.json", "report.txt", "artifacts/sensors.csv"],
+        agent_version="0.1.0",
+    )
+    runner = CliRunner()
+    archive = tmp_path / "packed.inspecta"
+
+    packed = runner.invoke(cli, ["pack", str(bundle), "-o", str(archive)])
+    assert packed.exit_code == 0, packed.output
+
+    verified = runner.invoke(cli, ["verify", str(archive), "--json"])
+    assert verified.exit_code == 0, verified.output
+    assert json.loads(verified.output)["exit_reason"] == "verified"
+
+    rejected = runner.invoke(cli, ["verify", str(archive), "--cache"])
+    assert rejected.exit_code == 2
+
+    report = runner.invoke(cli, ["report", str(archive), "--format", "txt"])
+    assert report.exit_code == 0, report.output
+    assert (tmp_path / "packed.rendered" / "report.txt").exists()
+
+    # Rendering back into the source bundle would break its manifest.
+    refused = runner.invoke(
+        cli, ["report", str(archive), "--format", "txt", "--output", str(bundle)]
+    )
+    assert refused.exit_code == 2
+    assert "evidence bundle" in refused.output
+    again = runner.invoke(cli, ["verify", str(bundle), "--json"])
+    assert again.exit_code == 0, again.output
@@ -42,6 +42,20 @@ def test_report_command_generates_html(tmp_path):
     assert (tmp_path / "report.html").exists()
 
 
+def test_report_command_generates_split_html(tmp_path):
+    report_path = tmp_path / "report.json"
+    report_path.write_text(json.dumps(_sample_report()), encoding="utf-8")
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["report", str(report_path), "--format", "html", "--html-mode", "split"]
+    )
+
+    assert result.exit_code == 0
+    assert (tmp_path / "report.html").exists()
+    assert (tmp_path / "report.data.js").exists()
+
+
 def test_report_command_generates_txt(tmp_path):
     report_path = tmp_path / "report.json"
     report_path.write_text(json.dumps(_sample_report()), encoding="utf-8")
@@ -81,7 +81,9 @@ def test_run_full_mode_resumes_from_checkpoint_without_inventory_call(
     def fail_if_inventory_called(*args, **kwargs):
         raise AssertionError("inventory.get_inventory should not be called on resume")
 
-    monkeypatch.setattr("agent.cli.inventory.get_inventory", fail_if_inventory_called)
+    monkeypatch.setattr(
+        "agent.plugins.inventory.get_inventory", fail_if_inventory_called
+    )
 
     runner = CliRunner()
     result = runner.invoke(
@@ -182,3 +184,64 @@ def test_run_rejects_non_positive_retention_days(tmp_path):
     )
 
     assert result.exit_code == 20
+
+
+def test_run_renders_reports_concurrently_before_final_manifest(tmp_path):
+    out_dir = tmp_path / "out"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "run",
+            "--mode",
+            "quick",
+            "--output",
+            str(out_dir),
+            "--use-sample",
+            "--no-auto-open",
+            "--format",
+            "both",
+        ],
+    )
+
+    assert result.exit_code == 10
+    manifest = json.loads(
+        (out_dir / "artifacts" / "manifest.json").read_text(encoding="utf-8")
+    )
+    paths = {entry["path"] for entry in manifest["entries"]}
+    assert {"report.json", "report.txt"} <= paths
+    assert ("report.pdf" in paths) == (out_dir / "report.pdf").exists()
+
+    verify = CliRunner().invoke(cli, ["verify", str(out_dir), "--json"])
+    assert verify.exit_code == 0, verify.output
+
+
+def test_run_split_html_data_file_is_in_manifest(tmp_path):
+    out_dir = tmp_path / "out"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "run",
+            "--mode",
+            "quick",
+            "--output",
+            str(out_dir),
+            "--use-sample",
+            "--no-auto-open",
+            "--format",
+            "html",
+            "--html-mode",
+            "split",
+        ],
+    )
+
+    assert result.exit_code == 10
+    manifest = json.loads(
+        (out_dir / "artifacts" / "manifest.json").read_text(encoding="utf-8")
+    )
+    paths = {entry["path"] for entry in manifest["entries"]}
+    assert {"report.html", "report.data.js"} <= paths
+
+    verify = CliRunner().invoke(cli, ["verify", str(out_dir), "--json"])
+    assert verify.exit_code == 0, verify.output
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import ast
+import importlib
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from agent.cli import LAZY_COMMANDS, cli
+from scripts.build_release import smoke_test_executable
+from tools.benchmark_cli_startup import (
+    LIGHT_COMMANDS,
+    measure_command,
+    parse_importtime,
+    total_import_us,
+)
+
+_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       500 |       2500 | click
+import time:      2000 |       2000 |   click.core
+import time:       300 |        300 | json
+"""
+
+
+def test_parse_importtime():
+    rows = parse_importtime(_SAMPLE)
+
+    assert [row["module"] for row in rows] == ["_io", "click", "click.core", "json"]
+    assert [row["depth"] for row in rows] == [1, 0, 1, 0]
+    assert total_import_us(rows) == 2800
+
+
+def test_light_commands_do_not_import_heavy_modules():
+    # The import-time budget is gated by tools/benchmark_cli_startup.py in the
+    # performance workflow; timing limits are flaky in the unit-test matrix.
+    for args in LIGHT_COMMANDS:
+        command = measure_command(args, runs=1)
+        assert command["exit_code"] == 0, command
+        assert command["heavy_modules"] == [], command
+
+
+def test_lazy_commands_match_their_registered_help():
+    for name, (target, short_help) in LAZY_COMMANDS.items():
+        module_name, attribute = target.split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        assert command.name == name
+        assert command.get_short_help_str(limit=200) == short_help
+
+
+def test_help_is_the_same_before_and_after_lazy_commands_load(monkeypatch):
+    monkeypatch.setattr(cli, "commands", dict(cli.commands))
+    for name in LAZY_COMMANDS:
+        cli.commands.pop(name, None)
+
+    lazy_help = CliRunner().invoke(cli, ["--help"], terminal_width=60).output
+    assert not set(LAZY_COMMANDS) & set(cli.commands)
+    for name in LAZY_COMMANDS:
+        assert f"  {name} " in lazy_help
+
+    result = CliRunner().invoke(cli, ["upload", "--help"])
+    assert result.exit_code == 0 and "flush" in result.output
+    for name in LAZY_COMMANDS:
+        cli.get_command(None, name)
+    assert CliRunner().invoke(cli, ["--help"], terminal_width=60).output == lazy_help
+
+
+def _spec_hiddenimports() -> set:
+    spec = Path(__file__).resolve().parents[1] / "inspecta.spec"
+    for node in ast.walk(ast.parse(spec.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", "") == "Analysis":
+            for keyword in node.keywords:
+                if keyword.arg == "hiddenimports":
+                    return set(ast.literal_eval(keyword.value))
+    raise AssertionError("inspecta.spec has no Analysis(hiddenimports=...)")
+
+
+def test_frozen_build_includes_lazy_command_modules():
+    modules = {target.split(":")[0] for target, _ in LAZY_COMMANDS.values()}
+
+    assert modules <= _spec_hiddenimports()
+
+
+def test_entry_point_runs_lazy_commands():
+    entry_point = Path(__file__).resolve().parents[1] / "cli.py"
+
+    assert smoke_test_executable([sys.executable, str(entry_point)])
+
+
+def test_entry_point_calls_freeze_support_before_cli(monkeypatch):
+    import multiprocessing
+    import runpy
+
+    import agent.cli
+
+    calls = []
+    monkeypatch.setattr(
+        multiprocessing, "freeze_support", lambda: calls.append("freeze_support")
+    )
+    monkeypatch.setattr(agent.cli, "cli", lambda: calls.append("cli"))
+    entry_point = Path(__file__).resolve().parents[1] / "cli.py"
+
+    runpy.run_path(str(entry_point), run_name="__main__")
+
+    assert calls == ["freeze_support", "cli"]
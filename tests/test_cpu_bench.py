@@ -33,7 +33,7 @@ def test_execute_sysbench_with_sample():
     assert result["data"]["events_per_second"] > 0
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.cpu_bench.run_command")
 @patch("agent.plugins.cpu_bench.platform.system", return_value="Linux")
 def test_scan_cpu_benchmark_sysbench_not_found(_mock_platform, mock_run):
     mock_run.side_effect = FileNotFoundError()
@@ -44,7 +44,7 @@ def test_scan_cpu_benchmark_sysbench_not_found(_mock_platform, mock_run):
     assert "sysbench not found" in result["error"]
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.cpu_bench.run_command")
 @patch("agent.plugins.cpu_bench.platform.system", return_value="Linux")
 def test_scan_cpu_benchmark_timeout(_mock_platform, mock_run):
     mock_run.side_effect = subprocess.TimeoutExpired("sysbench", 20)
@@ -56,7 +56,7 @@ def test_scan_cpu_benchmark_timeout(_mock_platform, mock_run):
 
 
 @patch("agent.plugins.cpu_bench.platform.system", return_value="Windows")
-@patch("agent.plugins.cpu_bench.subprocess.run")
+@patch("agent.plugins.cpu_bench.run_command")
 def test_scan_cpu_benchmark_windows_probe(mock_run, _mock_platform):
     mock_run.return_value = subprocess.CompletedProcess(
         args=["powershell"],
@@ -78,7 +78,7 @@ def test_scan_cpu_benchmark_windows_probe(mock_run, _mock_platform):
 
 
 @patch("agent.plugins.cpu_bench.platform.system", return_value="Darwin")
-@patch("agent.plugins.cpu_bench.subprocess.run")
+@patch("agent.plugins.cpu_bench.run_command")
 def test_scan_cpu_benchmark_macos_probe(mock_run, _mock_platform):
     mock_run.return_value = subprocess.CompletedProcess(
         args=["sysctl"],
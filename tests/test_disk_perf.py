@@ -36,7 +36,7 @@ def test_execute_fio_with_sample():
     assert result["data"]["write_mbps"] > 0
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.disk_perf.run_command")
 @patch("agent.plugins.disk_perf.platform.system", return_value="Linux")
 def test_scan_disk_performance_fio_not_found(_mock_platform, mock_run):
     mock_run.side_effect = FileNotFoundError()
@@ -47,7 +47,7 @@ def test_scan_disk_performance_fio_not_found(_mock_platform, mock_run):
     assert "fio not found" in result["error"]
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.disk_perf.run_command")
 @patch("agent.plugins.disk_perf.platform.system", return_value="Linux")
 def test_scan_disk_performance_fio_failure(mock_platform, mock_run):
     mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="bad args")
@@ -59,7 +59,7 @@ def test_scan_disk_performance_fio_failure(mock_platform, mock_run):
 
 
 @patch("agent.plugins.disk_perf.platform.system", return_value="Windows")
-@patch("agent.plugins.disk_perf.subprocess.run")
+@patch("agent.plugins.disk_perf.run_command")
 def test_scan_disk_performance_windows_winsat(mock_run, _mock_platform):
     mock_run.side_effect = [
         MagicMock(returncode=0, stdout="Disk  300.25 MB/s", stderr=""),
@@ -75,7 +75,7 @@ def test_scan_disk_performance_windows_winsat(mock_run, _mock_platform):
 
 
 @patch("agent.plugins.disk_perf.platform.system", return_value="Windows")
-@patch("agent.plugins.disk_perf.subprocess.run")
+@patch("agent.plugins.disk_perf.run_command")
 def test_scan_disk_performance_windows_winsat_requires_elevation(
     mock_run, _mock_platform
 ):
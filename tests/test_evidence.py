@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from pathlib import Path
 
 import pytest
 
+from agent import evidence
 from agent.evidence import (
+    ArtifactIndex,
     audit_evidence_bundle,
     build_evidence_manifest,
+    generate_manifest_entries,
+    hash_files,
     verify_evidence_manifest,
     write_evidence_manifest,
 )
@@ -192,3 +197,248 @@ def test_signed_manifest_includes_attestation_metadata(tmp_path: Path):
     assert manifest["attestation"]["signature_model"] == "detached-ed25519"
     assert len(manifest["attestation"]["canonical_hash_sha256"]) == 64
     assert len(manifest["attestation"]["signer_id"]) == 64
+
+
+def test_artifact_writer_streams_hash_and_renames_atomically(tmp_path: Path):
+    index = ArtifactIndex(tmp_path)
+
+    with index.open("artifacts/series.csv") as writer:
+        writer.write("timestamp,temp\n")
+        writer.write(b"1,40\n")
+        assert not (tmp_path / "artifacts" / "series.csv").exists()
+
+    payload = b"timestamp,temp\n1,40\n"
+    assert (tmp_path / "artifacts" / "series.csv").read_bytes() == payload
+    assert writer.sha256 == hashlib.sha256(payload).hexdigest()
+    assert index.entry("artifacts/series.csv") == {
+        "path": "artifacts/series.csv",
+        "size": len(payload),
+        "sha256": writer.sha256,
+    }
+    assert list((tmp_path / "artifacts").iterdir()) == [
+        tmp_path / "artifacts" / "series.csv"
+    ]
+
+
+def test_artifact_writer_discards_partial_file_on_error(tmp_path: Path):
+    index = ArtifactIndex(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        with index.open("artifacts/broken.json") as writer:
+            writer.write("{")
+            raise RuntimeError("probe crashed")
+
+    assert list((tmp_path / "artifacts").iterdir()) == []
+    assert "artifacts/broken.json" not in index
+
+
+def test_manifest_uses_indexed_digests_without_rereading(tmp_path: Path, monkeypatch):
+    index = ArtifactIndex(tmp_path)
+    index.write_json("artifacts/smart.json", {"ok": True})
+    index.write_text("report.txt", "report")
+    expected = build_evidence_manifest(
+        tmp_path,
+        ["artifacts/smart.json", "report.txt"],
+        agent_version="0.1.0",
+        generated_at="2026-01-01T00:00:00+00:00",
+    )
+
+    def fail_hash(_path):
+        raise AssertionError("indexed artifact was re-read")
+
+    monkeypatch.setattr(evidence, "_sha256_file", fail_hash)
+    indexed = build_evidence_manifest(
+        tmp_path,
+        ["artifacts/smart.json", "report.txt"],
+        agent_version="0.1.0",
+        generated_at="2026-01-01T00:00:00+00:00",
+        artifact_index=index,
+    )
+
+    assert indexed == expected
+
+
+def test_artifact_index_rehashes_files_changed_after_write(tmp_path: Path):
+    index = ArtifactIndex(tmp_path)
+    index.write_text("artifacts/agent.txt", "original")
+    target = tmp_path / "artifacts" / "agent.txt"
+    target.write_text("changed and longer", encoding="utf-8")
+
+    assert index.entry("artifacts/agent.txt") is None
+    entries = generate_manifest_entries(tmp_path, ["artifacts/agent.txt"], index)
+    assert entries[0]["sha256"] == hashlib.sha256(b"changed and longer").hexdigest()
+
+
+def test_sha256_file_mmap_and_buffered_paths_agree(tmp_path: Path, monkeypatch):
+    payload = bytes(range(256)) * 4096
+    target = tmp_path / "blob.bin"
+    target.write_bytes(payload)
+    monkeypatch.setattr(evidence, "MMAP_THRESHOLD_BYTES", 1024)
+    monkeypatch.setattr(evidence, "_MMAP_SLICE_BYTES", 4096 * 3)
+
+    expected = hashlib.sha256(payload).hexdigest()
+    assert evidence._sha256_file(target) == expected
+    assert evidence._sha256_file(target, use_mmap=False) == expected
+
+
+def test_hash_files_keeps_input_order_and_flags_unreadable(tmp_path: Path):
+    paths = []
+    for index in range(20):
+        path = tmp_path / f"f{index:02d}.txt"
+        path.write_text("x" * index, encoding="utf-8")
+        paths.append(path)
+    paths.insert(5, tmp_path / "gone.txt")
+
+    results = hash_files(paths, workers=4)
+
+    assert results[5] is None
+    for path, result in zip(paths, results):
+        if path.name == "gone.txt":
+            continue
+        data = path.read_bytes()
+        assert result == (len(data), hashlib.sha256(data).hexdigest())
+    assert hash_files(paths, workers=1) == results
+
+
+def test_verify_manifest_parallel_reports_mismatches_in_entry_order(tmp_path: Path):
+    rel_paths = []
+    for index in range(12):
+        rel = f"artifacts/a{index:02d}.txt"
+        (tmp_path / "artifacts").mkdir(exist_ok=True)
+        (tmp_path / rel).write_text(str(index), encoding="utf-8")
+        rel_paths.append(rel)
+    manifest_rel, _ = write_evidence_manifest(
+        tmp_path, rel_paths, agent_version="0.1.0"
+    )
+    for index in (9, 2, 7):
+        (tmp_path / rel_paths[index]).write_text("tampered", encoding="utf-8")
+
+    result = verify_evidence_manifest(tmp_path, manifest_rel, workers=4)
+
+    assert result["exit_code"] == 1
+    assert [m["path"] for m in result["mismatches"]] == [
+        rel_paths[2],
+        rel_paths[7],
+        rel_paths[9],
+    ]
+
+
+def test_audit_hashes_each_file_once(tmp_path: Path, monkeypatch):
+    (tmp_path / "artifacts").mkdir()
+    rel_paths = []
+    for index in range(3):
+        rel = f"artifacts/a{index}.txt"
+        (tmp_path / rel).write_text("x" * (index + 1), encoding="utf-8")
+        rel_paths.append(rel)
+    manifest_rel, _ = write_evidence_manifest(
+        tmp_path, rel_paths, agent_version="0.1.0"
+    )
+    hashed = []
+    real_sha256_file = evidence._sha256_file
+
+    def counting_sha256_file(path, use_mmap=True):
+        hashed.append(path.name)
+        return real_sha256_file(path, use_mmap)
+
+    monkeypatch.setattr(evidence, "_sha256_file", counting_sha256_file)
+    result = audit_evidence_bundle(tmp_path, manifest_rel)
+
+    assert result["ok"] is True
+    assert sorted(hashed) == ["a0.txt", "a1.txt", "a2.txt"]
+    assert result["bytes_hashed"] == 1 + 2 + 3
+    assert result["elapsed_seconds"] >= 0
+
+
+def test_audit_flags_tampered_and_missing_files_from_one_scan(tmp_path: Path):
+    (tmp_path / "artifacts").mkdir()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / "artifacts" / name).write_text(name, encoding="utf-8")
+    manifest_rel, _ = write_evidence_manifest(
+        tmp_path, ["artifacts/a.txt", "artifacts/b.txt"], agent_version="0.1.0"
+    )
+    (tmp_path / "artifacts" / "a.txt").write_text("changed", encoding="utf-8")
+    (tmp_path / "artifacts" / "b.txt").unlink()
+
+    result = audit_evidence_bundle(tmp_path, manifest_rel)
+
+    assert result["integrity_ok"] is False
+    assert result["reindexed_entries_match"] is False
+    assert result["missing"] == ["artifacts/b.txt"]
+    assert [m["reason"] for m in result["mismatches"]] == [
+        "hash mismatch",
+        "missing file",
+    ]
+    assert result["bytes_hashed"] == len("changed")
+
+
+def test_signed_manifest_verifies_with_public_key(tmp_path: Path):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    (tmp_path / "artifacts").mkdir()
+    (tmp_path / "artifacts" / "agent.log").write_text("ok", encoding="utf-8")
+    private_key = Ed25519PrivateKey.generate()
+    private_key_path = tmp_path / "signer.pem"
+    private_key_path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    public_key_path = tmp_path / "signer.pub.pem"
+    public_key_path.write_bytes(
+        private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    rel, _ = write_evidence_manifest(
+        tmp_path,
+        ["artifacts/agent.log"],
+        agent_version="0.1.0",
+        sign_key_path=private_key_path,
+    )
+
+    result = verify_evidence_manifest(tmp_path, rel, public_key_path=public_key_path)
+
+    assert result["exit_reason"] == "verified"
+
+
+def test_index_files_hashes_final_files_once(tmp_path: Path, monkeypatch):
+    index = ArtifactIndex(tmp_path)
+    index.write_text("artifacts/a.json", "{}")
+    (tmp_path / "report.txt").write_text("report", encoding="utf-8")
+
+    assert index.index_files(["report.txt", "artifacts/a.json", "missing.txt"]) == [
+        "report.txt"
+    ]
+    assert index.entry("report.txt")["size"] == 6
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("indexed file hashed again")
+
+    monkeypatch.setattr("agent.evidence._sha256_file", fail)
+    entries = generate_manifest_entries(
+        tmp_path, ["report.txt", "artifacts/a.json"], artifact_index=index
+    )
+    assert [entry["path"] for entry in entries] == ["artifacts/a.json", "report.txt"]
+
+
+def test_index_files_skips_files_changed_while_hashing(tmp_path: Path, monkeypatch):
+    index = ArtifactIndex(tmp_path)
+    target = tmp_path / "report.pdf"
+    target.write_bytes(b"partial")
+    real_hash = evidence._sha256_file
+
+    def hash_then_append(path, *args, **kwargs):
+        digest = real_hash(path, *args, **kwargs)
+        with path.open("ab") as fh:
+            fh.write(b" more")
+        return digest
+
+    monkeypatch.setattr("agent.evidence._sha256_file", hash_then_append)
+
+    assert index.index_files(["report.pdf"]) == []
+    assert index.entry("report.pdf") is None
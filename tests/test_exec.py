@@ -0,0 +1,136 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for the shared subprocess executor."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from agent import exec as executor
+
+PY = sys.executable
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    executor.reset_command_metrics()
+    yield
+    executor.reset_command_metrics()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Orphans may linger as zombies until init reaps them.
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as fh:
+            return fh.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+def test_run_command_captures_output_and_outcome():
+    result = executor.run_command(
+        [PY, "-c", "import sys; print('out'); print('err', file=sys.stderr)"],
+        timeout=30,
+        text=True,
+    )
+
+    assert isinstance(result, subprocess.CompletedProcess)
+    assert result.returncode == 0
+    assert result.stdout.strip() == "out"
+    assert result.stderr.strip() == "err"
+    assert result.outcome == executor.OUTCOME_OK
+    assert result.truncated is False
+
+
+def test_run_command_nonzero_exit_does_not_raise():
+    result = executor.run_command([PY, "-c", "raise SystemExit(3)"], timeout=30)
+
+    assert result.returncode == 3
+    assert result.outcome == executor.OUTCOME_NONZERO
+
+
+def test_run_command_bytes_by_default_and_input():
+    result = executor.run_command(
+        [PY, "-c", "import sys; sys.stdout.write(sys.stdin.read().upper())"],
+        timeout=30,
+        input="hello",
+    )
+
+    assert result.stdout == b"HELLO"
+
+
+def test_run_command_truncates_large_output():
+    result = executor.run_command(
+        [PY, "-c", "import sys; sys.stdout.write('x' * 200000)"],
+        timeout=30,
+        max_output_bytes=1024,
+    )
+
+    assert len(result.stdout) == 1024
+    assert result.truncated is True
+    record = executor.get_command_records()[-1]
+    assert record.stdout_bytes == 200000
+
+
+def test_run_command_missing_binary_raises_and_records():
+    with pytest.raises(FileNotFoundError):
+        executor.run_command(["inspecta-no-such-binary-xyz"], timeout=5)
+
+    summary = executor.command_metrics_summary()
+    assert summary["outcomes"] == {executor.OUTCOME_NOT_FOUND: 1}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="process groups are POSIX-only")
+def test_run_command_timeout_kills_process_group(tmp_path):
+    marker = tmp_path / "grandchild.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(marker)!r}, 'w').write(str(p.pid))\n"
+        "time.sleep(60)\n"
+    )
+    started = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        executor.run_command([PY, "-c", script], timeout=1)
+    assert time.perf_counter() - started < 15
+
+    grandchild = int(marker.read_text())
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if not _alive(grandchild):
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("grandchild survived process-group teardown")
+
+    assert executor.get_command_records()[-1].outcome == executor.OUTCOME_TIMEOUT
+
+
+def test_spawn_command_terminate_records_outcome():
+    proc = executor.spawn_command([PY, "-c", "import time; time.sleep(60)"])
+    assert proc.poll() is None
+
+    proc.terminate(grace_seconds=0.5)
+
+    assert proc.returncode is not None
+    assert executor.get_command_records()[-1].outcome == executor.OUTCOME_TERMINATED
+
+
+def test_command_metrics_summary_groups_by_tool():
+    executor.run_command([PY, "-c", "print(1)"], timeout=30)
+    executor.run_command([PY, "-c", "raise SystemExit(1)"], timeout=30)
+
+    summary = executor.command_metrics_summary()
+    tool = os.path.basename(PY)
+
+    assert summary["invocations"] == 2
+    assert summary["by_tool"][tool]["invocations"] == 2
+    assert summary["by_tool"][tool]["failures"] == 1
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import copy
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from agent import scoring
+from agent.fleet_scoring import (
+    FleetScoringError,
+    build_probe_table,
+    load_probe_table,
+    score_fleet,
+)
+from agent.report import compose_report
+
+# Values that exercise each parse path: ints, floats, numeric and junk strings.
+_NUMBERS = [None, 0, 1, 3, 49.9, 50, 69, 70, 74.5, 90, 95, 150, 260, 450, "80", "x"]
+_THROUGHPUT = [None, 0, 100, 119.9, 240, 250, 399, 500, "300", "fast"]
+_EPS = [None, 0, 650, 700, 1199, 1200, 2500, "1500", "n/a", float("nan")]
+_STATUSES = ["ok", "ok", "ok", "error", "missing", "skipped"]
+
+
+def _random_tests(rng: random.Random) -> list[dict]:
+    tests = []
+    for index in range(rng.randint(0, 3)):
+        attrs = {}
+        if rng.random() < 0.7:
+            attrs = {
+                "Current_Pending_Sector": rng.choice([0, 0, 2, None, "0", "1", "?"]),
+                "Reallocated_Sector_Ct": rng.choice([0, 0, 5, None, "3"]),
+            }
+        data = {"attributes": attrs}
+        if rng.random() < 0.4:
+            data["nvme_percentage_used"] = rng.choice(_NUMBERS)
+        tests.append(
+            {"name": f"smartctl_{index}", "status": rng.choice(_STATUSES), "data": data}
+        )
+    if rng.random() < 0.7:
+        tests.append(
+            {
+                "name": "disk_performance",
+                "status": rng.choice(_STATUSES),
+                "data": {
+                    "read_mbps": rng.choice(_THROUGHPUT),
+                    "write_mbps": rng.choice(_THROUGHPUT),
+                },
+            }
+        )
+    if rng.random() < 0.7:
+        tests.append(
+            {
+                "name": "battery_health",
+                "status": rng.choice(_STATUSES),
+                "data": rng.choice([{}, {"health_pct": rng.choice(_NUMBERS)}]),
+            }
+        )
+    if rng.random() < 0.7:
+        tests.append(
+            {
+                "name": "memory_test",
+                "status": rng.choice(_STATUSES),
+                "data": rng.choice(
+                    [
+                        {},
+                        {"status": "error"},
+                        {"errors": rng.choice([True, False])},
+                        {
+                            "error_count": rng.choice([0, 1, None, "2"]),
+                            "pass_count": rng.choice([0, 1, 2, 4, None, "1"]),
+                        },
+                    ]
+                ),
+            }
+        )
+    if rng.random() < 0.7:
+        tests.append(
+            {
+                "name": "cpu_benchmark",
+                "status": rng.choice(_STATUSES),
+                "data": {"events_per_second": rng.choice(_EPS)},
+            }
+        )
+    if rng.random() < 0.6:
+        tests.append(
+            {
+                "name": "thermal_stress",
+                "status": rng.choice(_STATUSES),
+                "data": {
+                    "peak_temp": rng.choice([None, 0, 60, 75, 84, 85, 94.5, 99]),
+                    "throttled": rng.choice([None, False, True]),
+                    "thermal_severity": rng.choice(
+                        [None, "low", "moderate", "high", "critical"]
+                    ),
+                },
+            }
+        )
+    rng.shuffle(tests)
+    return tests
+
+
+def _reference(tests: list[dict]) -> dict:
+    report = compose_report(
+        agent_version="0.1.0",
+        device={},
+        artifacts=[],
+        tests=copy.deepcopy(tests),
+        mode="quick",
+        profile="default",
+    )
+    return report["scores"]
+
+
+def _assert_matches_scalar(backend: str, seed: int, count: int = 300) -> None:
+    rng = random.Random(seed)
+    reports = [{"tests": _random_tests(rng)} for _ in range(count)]
+
+    result = score_fleet(build_probe_table(reports), backend=backend)
+
+    assert result["backend"] == backend
+    for index, report in enumerate(reports):
+        expected = _reference(report["tests"])
+        actual = {name: column[index] for name, column in result["scores"].items()}
+        assert actual == expected, report["tests"]
+        for profile in scoring.PROFILE_WEIGHTS:
+            overall, grade = scoring.compute_overall_score(expected, profile)
+            assert result["overall"][profile][index] == overall
+            assert result["grades"][profile][index] == grade
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_python_backend_matches_scalar_scoring(seed: int):
+    _assert_matches_scalar("python", seed)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_backend_matches_scalar_scoring(seed: int):
+    pytest.importorskip("numpy")
+    _assert_matches_scalar("numpy", seed)
+
+
+def test_load_probe_table_keys_reports_by_path(tmp_path: Path):
+    path = tmp_path / "report.json"
+    tests = [{"name": "battery_health", "status": "missing", "data": {}}]
+    path.write_text(json.dumps({"tests": tests}), encoding="utf-8")
+
+    result = score_fleet(load_probe_table([path]), profiles=["Office"])
+
+    assert result["report_ids"] == [str(path)]
+    assert result["scores"]["battery"] == [100]
+    assert list(result["overall"]) == ["Office"]
+
+
+def test_empty_table_and_unknown_backend():
+    result = score_fleet(build_probe_table([]), backend="python")
+    assert result["scores"]["storage"] == [] and result["overall"]["default"] == []
+
+    with pytest.raises(FleetScoringError):
+        score_fleet(build_probe_table([]), backend="fortran")
@@ -105,7 +105,7 @@ def test_parse_windows_inventory_json():
 
 
 @patch("agent.plugins.inventory.platform.system", return_value="Windows")
-@patch("agent.plugins.inventory.subprocess.run")
+@patch("agent.plugins.inventory.run_command")
 def test_get_inventory_windows_backend(mock_run, _mock_system):
     mock_run.return_value = MagicMock(
         returncode=0,
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agent import jsonio
+from agent.evidence import ArtifactIndex, _canonical_manifest_bytes
+
+_SAMPLE = {
+    "z": [1, 2.5, 1e-07, 1e22, -0.0, True, None],
+    "name": "Ünïcødé ✓ \u0007",
+    "a": {"nested": {"k": "v"}},
+}
+
+
+@pytest.fixture
+def stdlib_only(monkeypatch):
+    monkeypatch.setattr(jsonio, "_orjson", lambda: None)
+    assert jsonio.backend() == "json"
+
+
+def test_canonical_bytes_match_stdlib_encoding():
+    expected = json.dumps(_SAMPLE, sort_keys=True, separators=(",", ":")).encode()
+
+    assert jsonio.canonical_bytes(_SAMPLE) == expected
+    assert _canonical_manifest_bytes(_SAMPLE) == expected
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_round_trip_with_stdlib_backend(stdlib_only, indent):
+    text = jsonio.dumps(_SAMPLE, indent=indent)
+
+    assert jsonio.loads(text) == _SAMPLE
+    assert jsonio.loads(text.encode("utf-8")) == _SAMPLE
+    if indent is None:
+        assert text == json.dumps(_SAMPLE, separators=(",", ":"))
+    else:
+        assert text == json.dumps(_SAMPLE, indent=2)
+
+
+def test_loads_accepts_stdlib_extensions_and_raises_decode_error():
+    assert jsonio.loads('{"big": 18446744073709551616}')["big"] == 2**64
+    assert jsonio.loads("[NaN]")[0] != jsonio.loads("[NaN]")[0]
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads("{")
+
+
+def test_dumps_handles_values_orjson_rejects():
+    payload = {1: 2**70}
+
+    assert jsonio.loads(jsonio.dumps(payload)) == {"1": 2**70}
+
+
+def test_write_json_compact_and_indented(tmp_path: Path):
+    store = ArtifactIndex(tmp_path)
+    store.write_json("compact.json", {"a": [1, 2]}, indent=None)
+    store.write_json("pretty.json", {"a": [1, 2]})
+
+    assert (tmp_path / "compact.json").read_text() == '{"a":[1,2]}'
+    assert json.loads((tmp_path / "pretty.json").read_text()) == {"a": [1, 2]}
+    assert "\n" in (tmp_path / "pretty.json").read_text()
+
+
+def test_orjson_backend_matches_stdlib_semantics():
+    pytest.importorskip("orjson")
+    assert jsonio.backend() == "orjson"
+
+    assert jsonio.loads(jsonio.dumps(_SAMPLE)) == _SAMPLE
+    assert jsonio.loads(jsonio.dumps(_SAMPLE, indent=2, sort_keys=True)) == _SAMPLE
+    assert jsonio.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_non_finite_floats_encode_as_null_with_stdlib_backend(stdlib_only, indent):
+    payload = {"a": float("nan"), "b": [float("inf"), -float("inf"), 1.5]}
+
+    assert jsonio.loads(jsonio.dumps(payload, indent=indent)) == {
+        "a": None,
+        "b": [None, None, 1.5],
+    }
+
+
+def test_non_finite_floats_encode_the_same_on_both_backends(monkeypatch):
+    pytest.importorskip("orjson")
+    payload = {"a": float("nan"), "b": [float("inf"), 2.0]}
+    fast = jsonio.dumps(payload)
+
+    monkeypatch.setattr(jsonio, "_orjson", lambda: None)
+
+    assert jsonio.dumps(payload) == fast == '{"a":null,"b":[null,2.0]}'
@@ -55,7 +55,7 @@ def test_execute_memtest_with_sample():
     assert "raw_text" in result
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.memtest.run_command")
 def test_execute_memtest_success(mock_run):
     """Test successful memtester execution."""
     mock_run.return_value = MagicMock(
@@ -71,7 +71,7 @@ def test_execute_memtest_success(mock_run):
     mock_run.assert_called_once()
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.memtest.run_command")
 def test_execute_memtest_not_found(mock_run):
     """Test memtester not found raises error."""
     mock_run.side_effect = FileNotFoundError()
@@ -83,7 +83,7 @@ def test_execute_memtest_not_found(mock_run):
         assert "memtester not found" in str(exc)
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.memtest.run_command")
 def test_execute_memtest_timeout(mock_run):
     """Test memtester timeout raises error."""
     mock_run.side_effect = subprocess.TimeoutExpired("memtester", 40)
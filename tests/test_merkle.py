@@ -0,0 +1,178 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for Merkle manifest v2 and partial verification."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.cli import cli
+from agent.evidence import (
+    merkle_file_proof,
+    verify_evidence_manifest,
+    verify_manifest_file,
+    write_evidence_manifest,
+)
+from agent.merkle import (
+    inclusion_proof,
+    leaf_hash,
+    merkle_root,
+    root_from_proof,
+)
+
+CHUNK = 1024
+
+
+@pytest.mark.parametrize("count", range(1, 10))
+def test_inclusion_proofs_fold_to_root(count: int):
+    leaves = [leaf_hash(bytes([index])) for index in range(count)]
+    root = merkle_root(leaves)
+
+    for index, leaf in enumerate(leaves):
+        assert root_from_proof(leaf, inclusion_proof(leaves, index)) == root
+    assert root_from_proof(leaf_hash(b"other"), inclusion_proof(leaves, 0)) != root
+
+
+def _v2_bundle(tmp_path: Path) -> tuple[Path, str, bytes]:
+    (tmp_path / "artifacts").mkdir(parents=True)
+    blob = bytes(range(256)) * 20  # 5 chunks of 1 KiB
+    (tmp_path / "artifacts" / "disk.img").write_bytes(blob)
+    (tmp_path / "report.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "empty.txt").write_bytes(b"")
+    manifest_rel, _ = write_evidence_manifest(
+        tmp_path,
+        ["artifacts/disk.img", "report.json", "empty.txt"],
+        agent_version="0.1.0",
+        manifest_version=2,
+        chunk_size=CHUNK,
+    )
+    return tmp_path, manifest_rel, blob
+
+
+def test_v2_manifest_has_chunk_and_file_roots(tmp_path: Path):
+    out, manifest_rel, blob = _v2_bundle(tmp_path)
+    manifest = json.loads((out / manifest_rel).read_text(encoding="utf-8"))
+
+    assert manifest["manifest_version"] == "2.0.0"
+    assert manifest["merkle"]["chunk_size"] == CHUNK
+    by_path = {entry["path"]: entry for entry in manifest["entries"]}
+    disk = by_path["artifacts/disk.img"]
+    assert disk["sha256"] == hashlib.sha256(blob).hexdigest()
+    assert len(disk["chunks"]) == 5
+    assert disk["merkle_root"] == merkle_root(disk["chunks"])
+    assert "chunks" not in by_path["report.json"]
+    assert verify_evidence_manifest(out, manifest_rel)["exit_reason"] == "verified"
+
+
+def test_v2_manifest_detects_tampered_merkle_metadata(tmp_path: Path):
+    out, manifest_rel, _ = _v2_bundle(tmp_path)
+    manifest_path = out / manifest_rel
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["entries"][0]["chunks"][1] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    result = verify_evidence_manifest(out, manifest_rel)
+
+    assert result["exit_code"] == 1
+    assert {m["reason"] for m in result["mismatches"]} == {"merkle root mismatch"}
+
+
+def test_verify_manifest_file_checks_only_range_chunks(tmp_path: Path):
+    out, manifest_rel, blob = _v2_bundle(tmp_path)
+    target = out / "artifacts" / "disk.img"
+    corrupted = bytearray(blob)
+    corrupted[4 * CHUNK] ^= 0xFF
+    target.write_bytes(bytes(corrupted))
+
+    head = verify_manifest_file(
+        out, manifest_rel, "artifacts/disk.img", byte_range=(10, 2 * CHUNK + 1)
+    )
+    whole = verify_manifest_file(out, manifest_rel, "artifacts/disk.img")
+
+    assert head["ok"] is True
+    assert head["chunks_checked"] == 3
+    assert whole["exit_code"] == 1
+    assert whole["bad_chunks"] == [4]
+    assert verify_manifest_file(out, manifest_rel, "empty.txt")["ok"] is True
+
+
+@pytest.mark.parametrize("change", ["append", "truncate"])
+def test_verify_manifest_file_rejects_size_changes(tmp_path: Path, change: str):
+    out, manifest_rel, blob = _v2_bundle(tmp_path)
+    target = out / "artifacts" / "disk.img"
+    if change == "append":
+        target.write_bytes(blob + b"x" * 400)
+    else:
+        target.write_bytes(blob[: 2 * CHUNK])
+
+    whole = verify_manifest_file(out, manifest_rel, "artifacts/disk.img")
+    head = verify_manifest_file(
+        out, manifest_rel, "artifacts/disk.img", byte_range=(0, CHUNK)
+    )
+
+    assert whole["ok"] is False
+    assert whole["exit_reason"] == "integrity_mismatch"
+    assert "manifest size" in whole["error"]
+    assert verify_evidence_manifest(out, manifest_rel)["ok"] is False
+    # An untouched range is still verifiable on its own.
+    assert head["ok"] is True
+
+
+def test_verify_manifest_file_against_trusted_root(tmp_path: Path):
+    out, manifest_rel, _ = _v2_bundle(tmp_path)
+    manifest = json.loads((out / manifest_rel).read_text(encoding="utf-8"))
+    record = merkle_file_proof(manifest, "report.json")
+
+    assert (
+        root_from_proof(record["leaf"], record["proof"]) == manifest["merkle"]["root"]
+    )
+    wrong = verify_manifest_file(
+        out, manifest_rel, "report.json", expected_root="f" * 64
+    )
+    assert wrong["exit_reason"] == "integrity_mismatch"
+    assert wrong["proof_ok"] is False
+
+
+def test_verify_manifest_file_rejects_v1_and_bad_ranges(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("abc", encoding="utf-8")
+    v1_rel, _ = write_evidence_manifest(tmp_path, ["a.txt"], agent_version="0.1.0")
+
+    assert verify_evidence_manifest(tmp_path, v1_rel)["ok"] is True
+    v1 = verify_manifest_file(tmp_path, v1_rel, "a.txt")
+    assert v1["exit_code"] == 2
+    assert v1["exit_reason"] == "merkle_proof_unavailable"
+
+    out, manifest_rel, _ = _v2_bundle(tmp_path / "v2")
+    bad = verify_manifest_file(
+        out, manifest_rel, "artifacts/disk.img", byte_range=(0, 10**9)
+    )
+    assert bad["exit_reason"] == "invalid_range"
+
+
+def test_cli_verify_file_range(tmp_path: Path):
+    out, manifest_rel, _ = _v2_bundle(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli,
+        [
+            "verify",
+            str(out),
+            "--manifest",
+            manifest_rel,
+            "--file",
+            "artifacts/disk.img",
+            "--range",
+            "0:100",
+            "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["chunks_checked"] == 1
+    usage = runner.invoke(cli, ["verify", str(out), "--range", "0:1"])
+    assert usage.exit_code == 2
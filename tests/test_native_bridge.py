@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import os
+import sys
 from typing import Any
 
+import pytest
+
 from agent import native_bridge
 
 
+@pytest.fixture(autouse=True)
+def _isolated_native_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("INSPECTA_CACHE_DIR", str(tmp_path / "cache"))
+    native_bridge._prewarm_futures.clear()
+    yield
+    native_bridge._prewarm_futures.clear()
+
+
 class FakeCompletedProcess:
-    def __init__(self, stdout: str = "") -> None:
+    def __init__(self, stdout: str = "", returncode: int = 0) -> None:
         self.stdout = stdout
+        self.stderr = ""
+        self.returncode = returncode
 
 
 def test_native_helper_missing(monkeypatch):
@@ -29,7 +43,7 @@ def test_native_helper_invalid_json(monkeypatch):
     monkeypatch.setattr(
         native_bridge.shutil, "which", lambda _name: "/tmp/inspecta-native"
     )
-    monkeypatch.setattr(native_bridge.subprocess, "run", fake_run)
+    monkeypatch.setattr(native_bridge, "run_command", fake_run)
 
     result = native_bridge.detect_native_capabilities()
 
@@ -47,7 +61,7 @@ def test_native_helper_parsed_payload(monkeypatch):
     monkeypatch.setattr(
         native_bridge.shutil, "which", lambda _name: "/tmp/inspecta-native"
     )
-    monkeypatch.setattr(native_bridge.subprocess, "run", fake_run)
+    monkeypatch.setattr(native_bridge, "run_command", fake_run)
 
     result = native_bridge.detect_native_capabilities()
 
@@ -55,3 +69,194 @@ def test_native_helper_parsed_payload(monkeypatch):
     assert result["status"] == "ok"
     assert result["payload"]["tool"] == "inspecta-native"
     assert result["binary"] == "/tmp/inspecta-native"
+
+
+_FAKE_SESSION_HELPER = """\
+import json, os, sys
+
+if "--session" not in sys.argv:
+    sys.exit(1)
+crash_after = int(os.environ.get("FAKE_NATIVE_CRASH_AFTER", "0"))
+marker = os.environ.get("FAKE_NATIVE_MARKER")
+served = 0
+for line in sys.stdin:
+    request = json.loads(line)
+    method = request["method"]
+    if method == "ping":
+        result = {"status": "ok", "pid": os.getpid()}
+    elif method == "smart_batch_contract":
+        served += 1
+        first_crash = marker and not os.path.exists(marker)
+        if crash_after and served == crash_after and first_crash:
+            open(marker, "w").close()
+            os._exit(3)
+        contracts = request["params"]["contracts"]
+        count = len(contracts)
+        result = {"status": "ok", "processed": count, "max_seen": count}
+    else:
+        error = {"id": request["id"], "ok": False, "error": "unknown"}
+        print(json.dumps(error), flush=True)
+        continue
+    print(json.dumps({"id": request["id"], "ok": True, "result": result}), flush=True)
+"""
+
+
+def _fake_session_helper(tmp_path):
+    if os.name == "nt":
+        pytest.skip("fake helper relies on a POSIX shebang")
+    helper = tmp_path / "inspecta-native"
+    helper.write_text(f"#!{sys.executable}\n{_FAKE_SESSION_HELPER}", encoding="utf-8")
+    helper.chmod(0o755)
+    return str(helper)
+
+
+def test_native_session_pipelines_chunks(tmp_path):
+    session = native_bridge.NativeSession(_fake_session_helper(tmp_path)).start()
+    try:
+        contracts = [{"schema_version": "1.0.0"} for _ in range(10)]
+        result = session.smart_batch_contract(contracts, chunk_size=3)
+
+        assert result["processed"] == 10
+        assert result["chunks"] == 4
+        assert result["max_seen"] == 3
+        assert session.health_check() is True
+    finally:
+        session.close()
+
+
+def test_native_session_reports_helper_errors(tmp_path):
+    session = native_bridge.NativeSession(_fake_session_helper(tmp_path)).start()
+    try:
+        with pytest.raises(native_bridge.NativeSessionError, match="unknown"):
+            session.request("bogus")
+        assert session.restarts == 0
+    finally:
+        session.close()
+
+
+def test_native_session_restarts_after_crash(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NATIVE_CRASH_AFTER", "1")
+    monkeypatch.setenv("FAKE_NATIVE_MARKER", str(tmp_path / "crashed"))
+    session = native_bridge.NativeSession(_fake_session_helper(tmp_path)).start()
+    try:
+        result = session.smart_batch_contract([{"schema_version": "1.0.0"}])
+
+        assert result["processed"] == 1
+        assert session.restarts == 1
+    finally:
+        session.close()
+
+
+def test_batch_reuses_shared_session(tmp_path, monkeypatch):
+    helper = _fake_session_helper(tmp_path)
+    monkeypatch.setattr(native_bridge.shutil, "which", lambda _name: helper)
+
+    def fail_one_shot(*_args: Any, **_kwargs: Any):
+        raise AssertionError("one-shot path should not be used")
+
+    monkeypatch.setattr(native_bridge, "run_command", fail_one_shot)
+    try:
+        first = native_bridge.run_native_smart_contract_batch([{"a": 1}])
+        session = native_bridge.get_native_session()
+        second = native_bridge.run_native_smart_contract_batch([{"a": 1}, {"a": 2}])
+
+        assert first["processed"] == 1
+        assert second["processed"] == 2
+        assert native_bridge.get_native_session() is session
+    finally:
+        native_bridge.close_native_sessions()
+
+
+def test_batch_falls_back_when_session_unsupported(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        native_bridge.shutil, "which", lambda _name: str(tmp_path / "missing")
+    )
+
+    def fake_run(*_args: Any, **_kwargs: Any):
+        return FakeCompletedProcess(stdout='{"status": "ok", "processed": 1}')
+
+    monkeypatch.setattr(native_bridge, "run_command", fake_run)
+    try:
+        result = native_bridge.run_native_smart_contract_batch([{"a": 1}])
+        assert result["processed"] == 1
+        assert native_bridge.get_native_session() is None
+    finally:
+        native_bridge.close_native_sessions()
+
+
+def _fake_binary(tmp_path):
+    binary = tmp_path / "bin" / "inspecta-native"
+    binary.parent.mkdir()
+    binary.write_text("binary-v1", encoding="utf-8")
+    return binary
+
+
+def _counting_handshake(calls):
+    def fake_run(*_args: Any, **_kwargs: Any):
+        calls.append(1)
+        return FakeCompletedProcess(stdout='{"status": "ok", "tool": "native"}')
+
+    return fake_run
+
+
+def test_handshake_is_cached_until_binary_changes(tmp_path, monkeypatch):
+    binary = _fake_binary(tmp_path)
+    calls: list[int] = []
+    monkeypatch.setattr(native_bridge.shutil, "which", lambda _name: str(binary))
+    monkeypatch.setattr(native_bridge, "run_command", _counting_handshake(calls))
+
+    first = native_bridge.detect_native_capabilities()
+    second = native_bridge.detect_native_capabilities()
+
+    assert first["available"] is True
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert second["payload"] == first["payload"]
+    assert len(calls) == 1
+
+    binary.write_text("binary-v2-longer", encoding="utf-8")
+    third = native_bridge.detect_native_capabilities()
+
+    assert "cached" not in third
+    assert len(calls) == 2
+
+
+def test_handshake_cache_keyed_by_agent_version(tmp_path, monkeypatch):
+    binary = _fake_binary(tmp_path)
+    calls: list[int] = []
+    monkeypatch.setattr(native_bridge.shutil, "which", lambda _name: str(binary))
+    monkeypatch.setattr(native_bridge, "run_command", _counting_handshake(calls))
+
+    native_bridge.detect_native_capabilities()
+    monkeypatch.setattr(native_bridge, "__version__", "99.0.0")
+    native_bridge.detect_native_capabilities()
+
+    assert len(calls) == 2
+
+
+def test_failed_handshake_is_not_cached(tmp_path, monkeypatch):
+    binary = _fake_binary(tmp_path)
+    monkeypatch.setattr(native_bridge.shutil, "which", lambda _name: str(binary))
+    monkeypatch.setattr(
+        native_bridge,
+        "run_command",
+        lambda *_a, **_k: FakeCompletedProcess(stdout="", returncode=1),
+    )
+
+    native_bridge.detect_native_capabilities()
+
+    assert not (tmp_path / "cache" / native_bridge.HANDSHAKE_CACHE_FILE).exists()
+
+
+def test_prewarm_result_is_consumed_by_detect(tmp_path, monkeypatch):
+    binary = _fake_binary(tmp_path)
+    calls: list[int] = []
+    monkeypatch.setattr(native_bridge.shutil, "which", lambda _name: str(binary))
+    monkeypatch.setattr(native_bridge, "run_command", _counting_handshake(calls))
+
+    future = native_bridge.prewarm_native_capabilities()
+    future.result(timeout=5)
+    result = native_bridge.detect_native_capabilities(use_cache=False)
+
+    assert result["available"] is True
+    assert len(calls) == 1
@@ -2,8 +2,18 @@ from __future__ import annotations
 
 import json
 
-from agent.policy_pack import evaluate_policy_pack, load_policy_pack
+import pytest
+
+from agent.policy_pack import (
+    PolicyPackError,
+    compile_condition,
+    compile_policy_pack,
+    evaluate_policy_pack,
+    load_policy_pack,
+)
 from agent.report import compose_report
+from agent.schema_registry import _validator_for_file
+from tools.benchmark_policy_eval import SafeExprEvaluator
 
 
 def _sample_policy_pack() -> dict:
@@ -93,3 +103,59 @@ def test_compose_report_applies_policy_pack_adjustment():
     assert policy_summary["status"] == "fail"
     assert policy_summary["rules_triggered"] >= 1
     assert "policy_violation" in report["summary"]["failure_classification"]
+
+
+def test_compiled_conditions_match_interpreter():
+    context = {
+        "scores": {"storage": 40, "security": 85},
+        "summary": {"grade": "C", "overall_score": 62},
+        "mode": "full",
+        "tests": [],
+    }
+    expressions = [
+        "scores.storage < 60",
+        "not (scores.security > 80) or mode == 'full'",
+        "30 <= scores.storage < 50",
+        "scores.storage + scores.security >= 125",
+        "summary.grade in 'ABC' and summary.overall_score / 2 > 30",
+        "-scores.storage < -39 and mode != 'quick'",
+        "summary.grade not in 'AB'",
+    ]
+    for expression in expressions:
+        expected = SafeExprEvaluator(context).evaluate(expression)
+        assert compile_condition(expression)(context) is expected, expression
+
+
+def test_compiled_condition_reports_unknown_symbols_at_evaluation():
+    predicate = compile_condition("scores.storage > 90 and missing_name")
+    with pytest.raises(PolicyPackError, match="Unknown symbol"):
+        predicate({"scores": {"storage": 10}})
+    with pytest.raises(PolicyPackError, match="Unsupported expression node"):
+        compile_condition("__import__('os')")
+    assert compile_condition("scores.storage < 60") is compile_condition(
+        "scores.storage < 60"
+    )
+
+
+def test_compiled_pack_matches_evaluate_policy_pack():
+    policy = _sample_policy_pack()
+    compiled = compile_policy_pack(policy)
+    for storage, security in [(40, 70), (90, 70), (90, 95)]:
+        context = {"scores": {"storage": storage, "security": security}}
+        assert compiled.evaluate(context) == evaluate_policy_pack(policy, context)
+    assert compile_policy_pack(compiled) is compiled
+
+
+def test_load_policy_pack_reuses_schema_validator(tmp_path):
+    policy_path = tmp_path / "policy-pack.json"
+    policy_path.write_text(json.dumps(_sample_policy_pack()), encoding="utf-8")
+    load_policy_pack(policy_path)
+    hits = _validator_for_file.cache_info().hits
+
+    load_policy_pack(policy_path)
+
+    assert _validator_for_file.cache_info().hits == hits + 1
+    broken = dict(_sample_policy_pack(), pack_id="X")
+    policy_path.write_text(json.dumps(broken), encoding="utf-8")
+    with pytest.raises(PolicyPackError, match="schema validation failed"):
+        load_policy_pack(policy_path)
@@ -0,0 +1,303 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for command record/replay."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent import exec as executor
+from agent import replay
+from agent.cli import cli
+
+PY = sys.executable
+
+
+@pytest.fixture(autouse=True)
+def _clean_hook():
+    replay.stop_capture()
+    executor.reset_command_metrics()
+    yield
+    replay.stop_capture()
+
+
+def _record(tmp_path):
+    capture = tmp_path / "capture"
+    replay.start_recording(capture)
+    first = executor.run_command(
+        [PY, "-c", "import sys; print('hello'); print('warn', file=sys.stderr)"],
+        timeout=30,
+        text=True,
+    )
+    executor.run_command(
+        [PY, "-c", "import sys; sys.stdout.write(sys.stdin.read()[::-1])"],
+        timeout=30,
+        input="abc",
+    )
+    with pytest.raises(FileNotFoundError):
+        executor.run_command(["inspecta-no-such-tool"], timeout=5)
+    replay.stop_capture()
+    return capture, first
+
+
+def test_record_writes_capture(tmp_path):
+    capture, first = _record(tmp_path)
+
+    assert first.stdout.strip() == "hello"
+    meta = json.loads((capture / replay.CAPTURE_META_FILE).read_text())
+    assert meta["format_version"] == replay.CAPTURE_FORMAT_VERSION
+    lines = (capture / replay.CAPTURE_COMMANDS_FILE).read_text().splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert [e["seq"] for e in entries] == [1, 2, 3]
+    assert entries[0]["returncode"] == 0
+    assert entries[0]["stdout"]["data"].strip() == "hello"
+    assert entries[1]["stdin_sha256"] is not None
+    assert entries[2]["outcome"] == executor.OUTCOME_NOT_FOUND
+
+
+def test_replay_serves_captured_outputs_without_spawning(tmp_path, monkeypatch):
+    capture, _ = _record(tmp_path)
+    replay.start_replay(capture)
+
+    def _no_spawn(*_args, **_kwargs):
+        raise AssertionError("replay must not spawn processes")
+
+    monkeypatch.setattr(executor.subprocess, "Popen", _no_spawn)
+
+    result = executor.run_command(
+        [PY, "-c", "import sys; print('hello'); print('warn', file=sys.stderr)"],
+        timeout=30,
+        text=True,
+    )
+    assert result.stdout.strip() == "hello"
+    assert result.stderr.strip() == "warn"
+    assert result.returncode == 0
+
+    reversed_result = executor.run_command(
+        [PY, "-c", "import sys; sys.stdout.write(sys.stdin.read()[::-1])"],
+        timeout=30,
+        input="abc",
+    )
+    assert reversed_result.stdout == b"cba"
+
+    with pytest.raises(FileNotFoundError):
+        executor.run_command(["inspecta-no-such-tool"], timeout=5)
+    with pytest.raises(FileNotFoundError):
+        executor.run_command(["never-recorded"], timeout=5)
+
+    hook = executor.get_command_hook()
+    assert hook.summary()["served"] == 3
+    assert hook.summary()["misses"] == 1
+
+
+def test_replay_reuses_last_capture_and_replays_timeouts(tmp_path):
+    capture = tmp_path / "capture"
+    capture.mkdir()
+    entries = [
+        {
+            "seq": 1,
+            "kind": "run",
+            "argv": ["sensors", "-j"],
+            "stdin_sha256": None,
+            "outcome": "ok",
+            "returncode": 0,
+            "stdout": {"encoding": "utf-8", "data": "{}"},
+            "stderr": {"encoding": "base64", "data": ""},
+        },
+        {
+            "seq": 2,
+            "kind": "run",
+            "argv": ["fio", "--slow"],
+            "stdin_sha256": None,
+            "timeout": 30,
+            "outcome": "timeout",
+        },
+    ]
+    (capture / replay.CAPTURE_COMMANDS_FILE).write_text(
+        "\n".join(json.dumps(e) for e in entries) + "\n"
+    )
+    replay.start_replay(capture)
+
+    for _ in range(3):
+        assert executor.run_command(["sensors", "-j"], timeout=5).stdout == b"{}"
+    with pytest.raises(subprocess.TimeoutExpired):
+        executor.run_command(["fio", "--slow"], timeout=30)
+
+
+def test_replay_skips_pauses(tmp_path, monkeypatch):
+    capture, _ = _record(tmp_path)
+    calls = []
+    monkeypatch.setattr(executor.time, "sleep", calls.append)
+
+    executor.pause(1.5)
+    replay.start_replay(capture)
+    executor.pause(2.0)
+
+    assert calls == [1.5]
+
+
+def test_replay_serves_recorded_host_files(tmp_path):
+    host = tmp_path / "host"
+    (host / "block" / "sda").mkdir(parents=True)
+    (host / "block" / "nvme0n1").mkdir()
+    freq = host / "scaling_cur_freq"
+    freq.write_text("2400000\n")
+    missing = host / "cpuinfo"
+
+    capture = tmp_path / "capture"
+    replay.start_recording(capture)
+    assert executor.read_system_file(str(freq)) == "2400000\n"
+    assert executor.list_system_dir(str(host / "block")) == ["nvme0n1", "sda"]
+    with pytest.raises(FileNotFoundError):
+        executor.read_system_file(str(missing))
+    replay.stop_capture()
+
+    # Replay must not depend on the files still existing on this machine.
+    freq.unlink()
+    missing.write_text("cpu MHz : 1.0\n")
+    replay.start_replay(capture)
+
+    assert executor.read_system_file(str(freq)) == "2400000\n"
+    assert executor.list_system_dir(str(host / "block")) == ["nvme0n1", "sda"]
+    with pytest.raises(FileNotFoundError):
+        executor.read_system_file(str(missing))
+    with pytest.raises(FileNotFoundError, match="not in capture"):
+        executor.read_system_file("/proc/never-recorded")
+
+
+def test_replayed_probe_ignores_local_sysfs(tmp_path, monkeypatch):
+    from agent.plugins import sensors
+
+    capture = tmp_path / "capture"
+    capture.mkdir()
+    entry = {
+        "seq": 1,
+        "kind": "file",
+        "argv": ["/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"],
+        "data": "3100000\n",
+    }
+    (capture / replay.CAPTURE_COMMANDS_FILE).write_text(json.dumps(entry) + "\n")
+    replay.start_replay(capture)
+
+    def _no_open(*_args, **_kwargs):
+        raise AssertionError("replay must not read local host files")
+
+    monkeypatch.setattr("builtins.open", _no_open)
+    assert sensors.get_cpu_frequency_linux() == pytest.approx(3100.0)
+
+
+def _temp_file(text: str) -> str:
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".xml", delete=False, encoding="utf-8"
+    ) as fh:
+        fh.write(text)
+    return fh.name
+
+
+def test_temp_paths_are_masked_so_reruns_match(tmp_path):
+    script = "import sys; print(open(sys.argv[1]).read())"
+    recorded = _temp_file("<report/>")
+    capture = tmp_path / "capture"
+    try:
+        replay.start_recording(capture)
+        executor.run_command([PY, "-c", script, recorded], timeout=30, text=True)
+        executor.read_system_file(recorded)
+        replay.stop_capture()
+    finally:
+        os.remove(recorded)
+
+    entries = [
+        json.loads(line)
+        for line in (capture / replay.CAPTURE_COMMANDS_FILE).read_text().splitlines()
+    ]
+    assert [e["argv"][-1] for e in entries] == [replay.TEMP_PLACEHOLDER] * 2
+
+    replay.start_replay(capture)
+    fresh = str(Path(tempfile.gettempdir()) / "inspecta-other-name.xml")
+    result = executor.run_command([PY, "-c", script, fresh], timeout=30, text=True)
+    assert result.stdout.strip() == "<report/>"
+    assert executor.read_system_file(fresh) == "<report/>"
+
+
+def test_replayed_powercfg_report(tmp_path):
+    from agent.plugins import battery
+
+    capture = tmp_path / "capture"
+    capture.mkdir()
+    entries = [
+        {
+            "seq": 1,
+            "kind": "run",
+            "argv": ["powercfg", "/batteryreport", "/output", replay.TEMP_PLACEHOLDER],
+            "stdin_sha256": None,
+            "outcome": "ok",
+            "returncode": 0,
+            "stdout": {"encoding": "utf-8", "data": "Battery life report saved"},
+            "stderr": {"encoding": "utf-8", "data": ""},
+        },
+        {
+            "seq": 2,
+            "kind": "file",
+            "argv": [replay.TEMP_PLACEHOLDER],
+            "data": battery._SAMPLE_POWERCFG,
+        },
+    ]
+    (capture / replay.CAPTURE_COMMANDS_FILE).write_text(
+        "\n".join(json.dumps(e) for e in entries) + "\n"
+    )
+    replay.start_replay(capture)
+
+    result = battery.execute_powercfg()
+
+    assert result["status"] == "ok"
+    assert result["raw_text"] == battery._SAMPLE_POWERCFG
+
+
+def test_replay_rejects_missing_capture(tmp_path):
+    with pytest.raises(replay.ReplayError):
+        replay.start_replay(tmp_path)
+
+
+def test_cli_run_record_then_replay(tmp_path, monkeypatch):
+    capture = tmp_path / "capture"
+    runner = CliRunner()
+    base = ["run", "--mode", "quick", "--no-auto-open", "--format", "txt"]
+
+    recorded = runner.invoke(
+        cli, base + ["--output", str(tmp_path / "rec"), "--record", str(capture)]
+    )
+    assert recorded.exit_code in (0, 10), recorded.output
+    assert executor.get_command_hook() is None
+    assert (capture / replay.CAPTURE_COMMANDS_FILE).exists()
+
+    replayed = runner.invoke(
+        cli, base + ["--output", str(tmp_path / "rep"), "--replay", str(capture)]
+    )
+    assert replayed.exit_code in (0, 10), replayed.output
+    report = json.loads((tmp_path / "rep" / "report.json").read_text())
+    capture_meta = report["run_metadata"]["command_capture"]
+    assert capture_meta["mode"] == "replay"
+    assert capture_meta["misses"] == 0
+
+
+def test_cli_run_rejects_replay_with_sample(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "run",
+            "--output",
+            str(tmp_path / "out"),
+            "--use-sample",
+            "--replay",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 20
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.bundle_archive import pack_bundle
+from agent.cli import cli
+from agent.report import compose_report
+from agent.report_export import (
+    ReportExportError,
+    discover_export_sources,
+    export_reports,
+    flatten_report,
+)
+
+
+def _report(index: int, extra_test: bool = False) -> dict:
+    tests = [
+        {
+            "name": "smartctl_nvme0",
+            "status": "ok",
+            "data": {
+                "attributes": {"Reallocated_Sector_Ct": 0},
+                "nvme_percentage_used": index,
+            },
+        },
+        {"name": "battery_health", "status": "ok", "data": {"health_pct": 90.5}},
+    ]
+    if extra_test:
+        tests.append({"name": "gpu_probe", "status": "ok", "data": {"vram_mb": 8192}})
+    return compose_report(
+        agent_version="0.1.0",
+        device={"vendor": "Dell", "model": f"Latitude {index}"},
+        artifacts=[],
+        tests=tests,
+        mode="quick",
+        profile="default",
+    )
+
+
+def _write(root: Path, name: str, report: dict) -> Path:
+    path = root / name / "report.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(report), encoding="utf-8")
+    return path
+
+
+def test_flatten_report_produces_stable_columns():
+    row = flatten_report(_report(12), "r.json")
+
+    assert row["source"] == "r.json"
+    assert row["device.model"] == "Latitude 12"
+    assert row["scores.storage"] == 90
+    assert row["tests.smartctl_nvme0.status"] == "ok"
+    assert row["tests.smartctl_nvme0.data.nvme_percentage_used"] == 12
+    assert row["tests.smartctl_nvme0.data.attributes.Reallocated_Sector_Ct"] == 0
+    assert json.loads(row["summary.anomalies"]) == []
+
+
+def test_flatten_report_keeps_test_status_apart_from_data_status():
+    report = _report(1)
+    report["tests"].append(
+        {"name": "memory_test", "status": "ok", "data": {"status": "error"}}
+    )
+
+    row = flatten_report(report, "r.json")
+
+    assert row["tests.memory_test.status"] == "ok"
+    assert row["tests.memory_test.data.status"] == "error"
+
+
+def test_csv_export_unions_columns_across_reports(tmp_path: Path):
+    root = tmp_path / "reports"
+    _write(root, "a", _report(1))
+    _write(root, "b", _report(2, extra_test=True))
+    bundle = tmp_path / "bundle"
+    bundle.mkdir()
+    (bundle / "report.json").write_text(json.dumps(_report(3)), encoding="utf-8")
+    pack_bundle(bundle, root / "c.inspecta")
+    (root / "d").mkdir()
+    (root / "d" / "report.json").write_text("[]", encoding="utf-8")
+    output = tmp_path / "out" / "fleet.csv"
+
+    sources = discover_export_sources(root)
+    summary = export_reports(sources, output, fmt="csv", batch_size=1)
+
+    assert summary["rows"] == 3 and summary["errors"] == 1
+    with output.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    header = list(rows[0])
+    assert header[0] == "source"
+    assert header.index("device.model") < header.index("scores.storage")
+    assert header.index("scores.storage") < header.index("tests.gpu_probe.data.vram_mb")
+    assert [row["tests.gpu_probe.data.vram_mb"] for row in rows] == ["", "8192", ""]
+    assert rows[2]["source"].endswith("c.inspecta")
+    assert not list(output.parent.glob(".*.tmp"))
+
+
+def test_jsonl_export_streams_rows(tmp_path: Path):
+    for index in range(5):
+        _write(tmp_path / "reports", f"r{index}", _report(index))
+    output = tmp_path / "fleet.jsonl"
+
+    summary = export_reports(
+        discover_export_sources(tmp_path / "reports"), output, fmt="jsonl", batch_size=2
+    )
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert summary["rows"] == len(rows) == 5
+    assert [row["tests.smartctl_nvme0.data.nvme_percentage_used"] for row in rows] == [
+        0,
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_parquet_export_round_trips_when_pyarrow_installed(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _write(tmp_path / "reports", "a", _report(1))
+    _write(tmp_path / "reports", "b", _report(2, extra_test=True))
+    output = tmp_path / "fleet.parquet"
+
+    export_reports(discover_export_sources(tmp_path / "reports"), output, fmt="parquet")
+
+    table = pq.read_table(output)
+    assert table.num_rows == 2
+    assert table.column("tests.gpu_probe.data.vram_mb").to_pylist() == [None, 8192]
+    assert table.column("tests.battery_health.data.health_pct").to_pylist() == [
+        90.5,
+        90.5,
+    ]
+
+
+def test_parquet_without_pyarrow_fails_cleanly(tmp_path: Path, monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+    with pytest.raises(ReportExportError, match="pyarrow"):
+        export_reports([], tmp_path / "x.parquet", fmt="parquet")
+
+
+def test_export_cli(tmp_path: Path):
+    _write(tmp_path / "reports", "a", _report(1))
+    output = tmp_path / "fleet.csv"
+
+    result = CliRunner().invoke(
+        cli, ["export", str(tmp_path / "reports"), "-o", str(output), "--json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["rows"] == 1
+    assert output.read_text().startswith("source,")
@@ -1,14 +1,21 @@
 # Copyright (c) 2025 mufthakherul — see LICENSE.txt
 """Tests for report formatting utilities."""
 
+import json
+
 import pytest
 
+from agent import report_formatter
 from agent.report_formatter import (
+    HTML_DATA_FILE,
+    HTML_PAGE_SIZE,
+    downsample_series,
     format_txt_report,
     generate_html_report,
     generate_pdf_report,
     generate_txt_report,
     open_file,
+    start_report_rendering,
 )
 
 
@@ -137,6 +144,88 @@ def test_generate_html_report(sample_report, tmp_path):
     assert "Raw JSON" in content
 
 
+def _large_report(sample_report, tests=HTML_PAGE_SIZE * 3, samples=5000):
+    sample_report["tests"] = [
+        {"name": f"check_{i}", "status": "ok", "data": {"i": i}} for i in range(tests)
+    ]
+    sample_report["tests"].append(
+        {
+            "name": "thermal_stress",
+            "status": "ok",
+            "data": {
+                "samples": [
+                    {"timestamp": 1000.0 + i, "temp_c": 95 if i == 1234 else 50}
+                    for i in range(samples)
+                ]
+            },
+        }
+    )
+    return sample_report
+
+
+def _load_data_file(path):
+    text = path.read_text(encoding="utf-8")
+    prefix, _, payload = text.partition(" = ")
+    assert prefix == "window.INSPECTA_REPORT_DATA"
+    return json.loads(payload.rstrip().rstrip(";"))
+
+
+def test_downsample_series_bounds_points_and_keeps_extremes():
+    values = [0.0] * 10_000
+    values[7777] = 42.0
+    values[123] = -5.0
+
+    points = downsample_series(values, max_points=100)
+
+    assert len(points) <= 100
+    assert (7777, 42.0) in points
+    assert (123, -5.0) in points
+    assert [i for i, _ in points] == sorted(i for i, _ in points)
+    assert downsample_series([1.0, 2.0], max_points=100) == [(0, 1.0), (1, 2.0)]
+
+
+def test_generate_html_report_split_mode(sample_report, tmp_path):
+    """Split mode keeps the page small and moves the full report aside."""
+    report = _large_report(sample_report)
+
+    html_path = generate_html_report(report, tmp_path, mode="split")
+
+    content = html_path.read_text(encoding="utf-8")
+    assert _load_data_file(tmp_path / HTML_DATA_FILE) == report
+    assert f'data-test="{HTML_PAGE_SIZE - 1}"' in content
+    assert "check_{}<".format(HTML_PAGE_SIZE) not in content
+    assert "Page 1 of 4" in content
+    assert "Test Vendor" in content
+    assert '"temp_c"' not in content  # raw samples live only in the data file
+    assert "thermal_stress · samples.temp_c" in content
+    assert "max 95" in content
+    assert content.count("<polyline") == 1
+
+
+def test_generate_html_report_single_mode_is_self_contained(sample_report, tmp_path):
+    report = _large_report(sample_report, samples=10)
+    (tmp_path / HTML_DATA_FILE).write_text("stale", encoding="utf-8")
+
+    content = generate_html_report(report, tmp_path).read_text(encoding="utf-8")
+
+    assert not (tmp_path / HTML_DATA_FILE).exists()
+    assert "check_{}<".format(len(report["tests"]) - 2) in content
+    assert "&quot;temp_c&quot;" in content
+    assert "<script" not in content
+
+
+def test_generate_html_report_auto_mode_threshold(sample_report, tmp_path, monkeypatch):
+    generate_html_report(sample_report, tmp_path, mode="auto")
+    assert not (tmp_path / HTML_DATA_FILE).exists()
+
+    monkeypatch.setattr(report_formatter, "HTML_SPLIT_THRESHOLD_BYTES", 100)
+    generate_html_report(sample_report, tmp_path, mode="auto")
+    assert _load_data_file(tmp_path / HTML_DATA_FILE) == sample_report
+
+    with pytest.raises(ValueError):
+        generate_html_report(sample_report, tmp_path, mode="paged")
+
+
 def test_generate_pdf_report_without_reportlab(sample_report, tmp_path, monkeypatch):
     """Test PDF report generation when reportlab is not available."""
     # Mock the import to fail
@@ -156,6 +245,34 @@ def test_generate_pdf_report_without_reportlab(sample_report, tmp_path, monkeypa
     assert pdf_path is None
 
 
+def test_start_report_rendering_uses_a_snapshot(sample_report, tmp_path):
+    """Background renderers are unaffected by later changes to the report."""
+    futures = start_report_rendering(sample_report, tmp_path, ["txt", "html", "txt"])
+    sample_report["device"]["vendor"] = "Changed Vendor"
+
+    assert sorted(futures) == ["html", "txt"]
+    assert futures["txt"].result(timeout=30) == tmp_path / "report.txt"
+    assert futures["html"].result(timeout=30) == tmp_path / "report.html"
+    for name in ("report.txt", "report.html"):
+        content = (tmp_path / name).read_text(encoding="utf-8")
+        assert "Test Vendor" in content
+        assert "Changed Vendor" not in content
+
+
+def test_start_report_rendering_pdf_in_separate_process(
+    sample_report, tmp_path, monkeypatch
+):
+    """PDF renders in a worker process on multi-CPU machines."""
+    pytest.importorskip("reportlab")
+    monkeypatch.setattr("agent.report_formatter.os.cpu_count", lambda: 4)
+
+    futures = start_report_rendering(sample_report, tmp_path, ["pdf", "txt"])
+
+    assert futures["pdf"].result(timeout=60) == tmp_path / "report.pdf"
+    assert (tmp_path / "report.pdf").read_bytes()[:4] == b"%PDF"
+    assert futures["txt"].result(timeout=30).exists()
+
+
 def test_open_file_with_nonexistent_file(tmp_path):
     """Test open_file with a non-existent file."""
     nonexistent_file = tmp_path / "nonexistent.txt"
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.cli import cli
+from agent.report import compose_report
+from agent.report_index import ReportIndex, ReportIndexError, parse_metric_filter
+
+
+def _write_report(
+    root: Path,
+    name: str,
+    nvme_pct: int,
+    generated_at: str = "2026-10-05T10:00:00+00:00",
+    model: str = "ThinkPad",
+) -> Path:
+    report = compose_report(
+        agent_version="0.1.0",
+        device={"vendor": "Lenovo", "model": model, "serial": f"SN-{name}"},
+        artifacts=[],
+        tests=[
+            {
+                "name": "smartctl_nvme0",
+                "status": "ok",
+                "data": {
+                    "attributes": {"Reallocated_Sector_Ct": 0},
+                    "nvme_percentage_used": nvme_pct,
+                },
+            }
+        ],
+        mode="quick",
+        profile="default",
+    )
+    report["generated_at"] = generated_at
+    path = root / name / "report.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report), encoding="utf-8")
+    return path
+
+
+def test_update_indexes_incrementally(tmp_path: Path):
+    archive = tmp_path / "archive"
+    worn = _write_report(archive, "a", 85)
+    fresh = _write_report(archive, "b", 10)
+    gone = _write_report(archive, "c", 20)
+
+    with ReportIndex(tmp_path / "index.sqlite") as index:
+        first = index.update(archive)
+        assert (first["added"], first["unchanged"]) == (3, 0)
+        assert index._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        second = index.update(archive)
+        assert (second["added"], second["updated"], second["unchanged"]) == (0, 0, 3)
+
+        _write_report(archive, "b", 95)
+        stat = fresh.stat()
+        os.utime(fresh, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        gone.unlink()
+        third = index.update(archive)
+        assert (third["updated"], third["removed"], third["unchanged"]) == (1, 1, 1)
+
+        paths = [
+            row["path"] for row in index.query(metrics=["nvme_percentage_used>=80"])
+        ]
+        assert sorted(paths) == sorted([str(worn.resolve()), str(fresh.resolve())])
+        assert len(index) == 2
+        # Rows of the replaced and removed reports are gone with them.
+        orphans = index._conn.execute(
+            "SELECT COUNT(*) FROM test_metrics WHERE report_id NOT IN "
+            "(SELECT id FROM reports)"
+        ).fetchone()[0]
+        assert orphans == 0
+
+
+def test_query_filters_and_aggregates(tmp_path: Path):
+    archive = tmp_path / "archive"
+    _write_report(archive, "sept", 90, generated_at="2026-09-20T08:00:00+00:00")
+    _write_report(archive, "oct", 90, model="Latitude")
+    _write_report(archive, "ok", 5)
+    (archive / "broken").mkdir()
+    (archive / "broken" / "report.json").write_text("{", encoding="utf-8")
+
+    with ReportIndex(tmp_path / "index.sqlite") as index:
+        summary = index.update(archive)
+        assert summary["errors"] == 1 and summary["added"] == 3
+
+        rows = index.query(
+            metrics=["nvme_percentage_used >= 80"],
+            test="smartctl_*",
+            since="2026-10-01",
+        )
+        assert [row["model"] for row in rows] == ["Latitude"]
+        assert index.query(anomaly_severity="WARNING", device="latitude")
+        assert index.query(anomaly_severity="critical") == []
+        assert index.query(metrics=["nvme_percentage_used>=80"], test="battery*") == []
+
+        by_model = {row["model"]: row for row in index.aggregate("model")}
+        assert by_model["ThinkPad"]["reports"] == 2
+        with pytest.raises(ReportIndexError):
+            index.aggregate("serial")
+
+
+def test_parse_metric_filter_rejects_sql():
+    assert parse_metric_filter("temp==70.5") == ("temp", "=", 70.5)
+    with pytest.raises(ReportIndexError):
+        parse_metric_filter("x >= 1; DROP TABLE reports")
+
+
+def test_index_and_query_cli(tmp_path: Path):
+    archive = tmp_path / "archive"
+    _write_report(archive, "a", 85)
+    _write_report(archive, "b", 10)
+    db = str(tmp_path / "index.sqlite")
+    runner = CliRunner()
+
+    indexed = runner.invoke(cli, ["index", str(archive), "--db", db, "--json"])
+    assert indexed.exit_code == 0, indexed.output
+    assert json.loads(indexed.output)["added"] == 2
+
+    queried = runner.invoke(
+        cli, ["query", "--db", db, "--metric", "nvme_percentage_used>=80", "--json"]
+    )
+    assert queried.exit_code == 0, queried.output
+    rows = [json.loads(line) for line in queried.output.splitlines()]
+    assert [row["serial"] for row in rows] == ["SN-a"]
+
+    grouped = runner.invoke(cli, ["query", "--db", db, "--group-by", "grade"])
+    assert grouped.exit_code == 0 and "reports, avg" in grouped.output
+
+    bad = runner.invoke(cli, ["query", "--db", db, "--metric", "nope"])
+    assert bad.exit_code == 2
+
+
+def test_query_cli_renders_missing_score_and_grade(tmp_path: Path):
+    archive = tmp_path / "archive"
+    float_score = _write_report(archive, "float", 10)
+    report = json.loads(float_score.read_text(encoding="utf-8"))
+    report["summary"]["overall_score"] = 80.0
+    float_score.write_text(json.dumps(report), encoding="utf-8")
+    missing = _write_report(archive, "missing", 10)
+    report = json.loads(missing.read_text(encoding="utf-8"))
+    report["summary"]["overall_score"] = "n/a"
+    report["summary"]["grade"] = None
+    missing.write_text(json.dumps(report), encoding="utf-8")
+    db = str(tmp_path / "index.sqlite")
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["index", str(archive), "--db", db]).exit_code == 0
+    result = runner.invoke(cli, ["query", "--db", db])
+
+    assert result.exit_code == 0, result.output
+    lines = {
+        Path(line.split()[-1]).parent.name: line for line in result.stdout.splitlines()
+    }
+    assert " 80 " in lines["float"]
+    assert "  - -  " in lines["missing"]
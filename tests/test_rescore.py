@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.cli import cli
+from agent.report import compose_report
+from agent.rescore import (
+    RESCORE_FILE,
+    discover_reports,
+    rescore_report,
+    rescore_reports,
+    summarize_rescore,
+)
+
+_TESTS = [
+    {
+        "name": "smartctl_sda",
+        "status": "ok",
+        "data": {
+            "attributes": {"Current_Pending_Sector": 3, "Reallocated_Sector_Ct": 0}
+        },
+    }
+]
+
+_POLICY = {
+    "schema_version": "1.0.0",
+    "pack_id": "storage-gate",
+    "display_name": "Storage Gate",
+    "target_profile": "enterprise_it",
+    "rules": [
+        {
+            "id": "LOW_STORAGE",
+            "title": "Storage score must be >= 60",
+            "severity": "critical",
+            "condition": "scores.storage < 60",
+            "action": "fail",
+        }
+    ],
+}
+
+
+def _write_reports(root: Path, count: int) -> list[Path]:
+    paths = []
+    for index in range(count):
+        report = compose_report(
+            agent_version="0.1.0",
+            device={"vendor": "Test", "model": f"Device {index}"},
+            artifacts=[],
+            tests=_TESTS,
+            mode="quick",
+            profile="office",
+        )
+        path = root / f"station-{index % 2}" / f"run-{index}" / "report.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps(report), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_rescore_report_is_stable_without_changes(tmp_path: Path):
+    (path,) = _write_reports(tmp_path, 1)
+    stored = json.loads(path.read_text(encoding="utf-8"))
+
+    rescored = rescore_report(stored)
+
+    assert rescored["scores"] == stored["scores"]
+    assert rescored["summary"]["overall_score"] == stored["summary"]["overall_score"]
+
+
+def test_rescore_reports_applies_new_policy_in_parallel(tmp_path: Path):
+    paths = _write_reports(tmp_path, 5)
+    assert discover_reports(tmp_path) == sorted(paths)
+    original = [p.read_bytes() for p in paths]
+
+    results = list(
+        rescore_reports(
+            discover_reports(tmp_path),
+            policy_pack=_POLICY,
+            processes=2,
+            write_summaries=True,
+        )
+    )
+
+    assert [r["report"] for r in results] == [str(p) for p in sorted(paths)]
+    assert all(r["ok"] and r["changed"] for r in results)
+    assert {r["after"]["policy_status"] for r in results} == {"fail"}
+    assert all(
+        r["after"]["overall_score"] < r["before"]["overall_score"] for r in results
+    )
+    # report.json is evidence-covered and must never be rewritten.
+    assert [p.read_bytes() for p in paths] == original
+    side = json.loads((paths[0].parent / RESCORE_FILE).read_text(encoding="utf-8"))
+    assert side["policy_pack_id"] == "storage-gate"
+    assert side["summary"]["policy_pack"]["status"] == "fail"
+
+    summary = summarize_rescore(results, 1.0)
+    assert summary["reports"] == 5 and summary["changed"] == 5
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_rescore_reports_isolates_malformed_reports(tmp_path: Path, processes: int):
+    paths = _write_reports(tmp_path, 3)
+    broken = json.loads(paths[1].read_text(encoding="utf-8"))
+    broken["tests"] = [{"name": "battery_health", "status": "ok", "data": "garbage"}]
+    paths[1].write_text(json.dumps(broken), encoding="utf-8")
+
+    results = list(rescore_reports(paths, processes=processes))
+
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert "AttributeError" in results[1]["error"]
+
+
+def test_rescore_cli_writes_jsonl_delta(tmp_path: Path):
+    paths = _write_reports(tmp_path / "store", 3)
+    paths[1].write_text("{broken", encoding="utf-8")
+    policy_path = tmp_path / "policy.json"
+    policy_path.write_text(json.dumps(_POLICY), encoding="utf-8")
+    output = tmp_path / "delta.jsonl"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "rescore",
+            str(tmp_path / "store"),
+            "--policy-pack",
+            str(policy_path),
+            "--processes",
+            "1",
+            "--output",
+            str(output),
+        ],
+    )
+
+    assert result.exit_code == 20, result.output
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 3
+    assert [r["report"] for r in records if not r["ok"]] == [str(paths[1])]
+    assert "Reports: 3 (2 changed, 1 errors)" in result.output
+
+
+def test_rescore_cli_changed_only_skips_unchanged(tmp_path: Path):
+    _write_reports(tmp_path, 2)
+
+    result = CliRunner().invoke(
+        cli, ["rescore", str(tmp_path), "--processes", "1", "--changed-only"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert not [line for line in result.output.splitlines() if line.startswith("{")]
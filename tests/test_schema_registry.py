@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.cli import cli
+from agent.report import compose_report
+from agent.schema_registry import (
+    SchemaRegistryError,
+    _validator_for_file,
+    available_schemas,
+    best_error,
+    get_validator,
+    schema_path,
+    validate_document,
+    validate_files,
+)
+
+
+def _report() -> dict:
+    return compose_report(
+        agent_version="0.1.0",
+        device={"vendor": "Test", "model": "Device"},
+        artifacts=[],
+        tests=[],
+        mode="quick",
+        profile="default",
+    )
+
+
+def test_format_keywords_are_not_enforced():
+    # Legacy reports carry placeholder timestamps; validation must not start
+    # rejecting them depending on which format packages are installed.
+    report = _report()
+    report["generated_at"] = "unknown"
+
+    assert validate_document(report, "report") == []
+
+
+def test_registry_lists_shipped_schemas_and_resolves_versions():
+    schemas = available_schemas()
+    assert {"report", "policy-pack", "plugin-manifest"} <= set(schemas)
+    assert "capability-matrix" not in schemas
+
+    assert schema_path("report").name == "report-schema-1.0.0.json"
+    assert schema_path("report", "1") == schema_path("report", "1.4.0")
+    with pytest.raises(SchemaRegistryError):
+        schema_path("report", "2.0.0")
+    with pytest.raises(SchemaRegistryError):
+        schema_path("nope")
+
+
+def test_validator_is_built_once_per_schema():
+    first = get_validator("report")
+    misses = _validator_for_file.cache_info().misses
+
+    assert get_validator("report", "1.0.0") is first
+    assert _validator_for_file.cache_info().misses == misses
+
+
+def test_validate_document_reports_locations():
+    report = _report()
+    assert validate_document(report, "report") == []
+
+    del report["agent"]
+    report["scores"] = "high"
+    errors = validate_document(report, "report")
+    assert any("'agent' is a required property" in e for e in errors)
+    assert any(e.endswith("at /scores") for e in errors)
+    assert best_error(report, "report") is not None
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_validate_files_keeps_input_order(tmp_path: Path, processes: int):
+    paths = []
+    for index in range(6):
+        report = _report()
+        if index % 3 == 0:
+            report.pop("tests")
+        path = tmp_path / f"r{index}.json"
+        path.write_text(json.dumps(report), encoding="utf-8")
+        paths.append(path)
+    (tmp_path / "bad.json").write_text("{", encoding="utf-8")
+    paths.append(tmp_path / "bad.json")
+
+    results = list(validate_files(paths, "report", processes=processes))
+
+    assert [r["path"] for r in results] == [str(p) for p in paths]
+    assert [r["ok"] for r in results] == [False, True, True, False, True, True, False]
+    assert results[-1]["errors"][0].startswith("Cannot read JSON")
+
+
+def test_validate_cli(tmp_path: Path):
+    good = tmp_path / "a" / "report.json"
+    good.parent.mkdir()
+    good.write_text(json.dumps(_report()), encoding="utf-8")
+    bad = tmp_path / "b" / "report.json"
+    bad.parent.mkdir()
+    bad.write_text(json.dumps({"report_version": "1.0.0"}), encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["validate", str(tmp_path), "--processes", "1"])
+
+    assert result.exit_code == 20, result.output
+    assert f"INVALID {bad}" in result.output
+    assert "Validated 2 documents: 1 invalid" in result.output
+
+    unknown = CliRunner().invoke(cli, ["validate", str(good), "--schema", "nope"])
+    assert unknown.exit_code == 2
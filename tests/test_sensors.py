@@ -91,20 +91,20 @@ class TestParseSensorsOutput:
 class TestHasLmSensors:
     """Test has_lm_sensors function."""
 
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_sensors_available(self, mock_run):
         """Test when lm-sensors is available."""
         mock_run.return_value = MagicMock(returncode=0)
         assert sensors.has_lm_sensors() is True
         mock_run.assert_called_once()
 
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_sensors_not_found(self, mock_run):
         """Test when lm-sensors is not installed."""
         mock_run.side_effect = FileNotFoundError()
         assert sensors.has_lm_sensors() is False
 
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_sensors_timeout(self, mock_run):
         """Test when sensors command times out."""
         from subprocess import TimeoutExpired
@@ -125,7 +125,7 @@ class TestGetSensorsSnapshotLinux:
             sensors.get_sensors_snapshot_linux()
 
     @patch("agent.plugins.sensors.has_lm_sensors")
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_successful_snapshot(self, mock_run, mock_has):
         """Test successful sensor snapshot."""
         mock_has.return_value = True
@@ -143,7 +143,7 @@ class TestGetSensorsSnapshotLinux:
         assert len(result["sensors"]) == 2
 
     @patch("agent.plugins.sensors.has_lm_sensors")
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_sensors_command_fails(self, mock_run, mock_has):
         """Test error when sensors command fails."""
         mock_has.return_value = True
@@ -156,7 +156,7 @@ class TestGetSensorsSnapshotLinux:
             sensors.get_sensors_snapshot_linux()
 
     @patch("agent.plugins.sensors.has_lm_sensors")
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_sensors_timeout(self, mock_run, mock_has):
         """Test timeout during sensor read."""
         from subprocess import TimeoutExpired
@@ -185,7 +185,7 @@ class TestGetSensorsSnapshotWindows:
         result = sensors.get_sensors_snapshot_windows()
         assert result["tool"] == "openhardwaremonitor"
 
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_wmi_no_data(self, mock_run):
         """Test Windows when no thermal data available."""
         mock_run.return_value = MagicMock(
@@ -200,7 +200,7 @@ class TestGetSensorsSnapshotWindows:
         assert result["sensors"] == []
         assert "OpenHardwareMonitor" in result.get("note", "")
 
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_wmi_timeout(self, mock_run):
         """Test WMI timeout."""
         from subprocess import TimeoutExpired
@@ -212,7 +212,7 @@ class TestGetSensorsSnapshotWindows:
 
 
 class TestOpenHardwareMonitorSnapshot:
-    @patch("agent.plugins.sensors.subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_openhardwaremonitor_snapshot_parse(self, mock_run):
         mock_run.return_value = MagicMock(
             returncode=0,
@@ -283,7 +283,7 @@ class TestDetectCpuThrottling:
             sensors.detect_cpu_throttling_linux(duration_seconds=5)
 
     @patch("agent.plugins.sensors.has_lm_sensors")
-    @patch("subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_no_stress_tool(self, mock_run, mock_has):
         """Test error when neither stress-ng nor sysbench available."""
         mock_has.return_value = True
@@ -294,8 +294,8 @@ class TestDetectCpuThrottling:
 
     @patch("agent.plugins.sensors.has_lm_sensors")
     @patch("agent.plugins.sensors.get_sensors_snapshot_linux")
-    @patch("subprocess.run")
-    @patch("subprocess.Popen")
+    @patch("agent.plugins.sensors.run_command")
+    @patch("agent.plugins.sensors.spawn_command")
     @patch("time.sleep")
     def test_throttling_detected(
         self, mock_sleep, mock_popen, mock_run, mock_snapshot, mock_has
@@ -344,8 +344,8 @@ class TestDetectCpuThrottling:
     @patch("agent.plugins.sensors.has_lm_sensors")
     @patch("agent.plugins.sensors.get_sensors_snapshot_linux")
     @patch("agent.plugins.sensors.get_cpu_frequency_linux")
-    @patch("subprocess.run")
-    @patch("subprocess.Popen")
+    @patch("agent.plugins.sensors.run_command")
+    @patch("agent.plugins.sensors.spawn_command")
     @patch("time.sleep")
     def test_no_throttling(
         self,
@@ -465,7 +465,7 @@ class TestDetectPlatform:
 
 
 class TestMacosSensorsSnapshot:
-    @patch("agent.plugins.sensors.subprocess.run")
+    @patch("agent.plugins.sensors.run_command")
     def test_get_sensors_snapshot_macos_with_osx_cpu_temp(self, mock_run):
         mock_run.return_value = MagicMock(
             returncode=0,
@@ -129,7 +129,7 @@ def test_smart_error_on_missing_sample():
             smart.execute_smartctl("/dev/sda", use_sample=True)
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_smartctl_permission_denied(mock_run):
     """Test smartctl execution with permission denied error."""
     mock_run.return_value = MagicMock(
@@ -142,7 +142,7 @@ def test_execute_smartctl_permission_denied(mock_run):
         smart.execute_smartctl("/dev/sda", use_sample=False)
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_smartctl_not_found(mock_run):
     """Test smartctl execution when command not found."""
     mock_run.side_effect = FileNotFoundError()
@@ -151,7 +151,7 @@ def test_execute_smartctl_not_found(mock_run):
         smart.execute_smartctl("/dev/sda", use_sample=False)
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_smartctl_timeout(mock_run):
     """Test smartctl execution timeout."""
     import subprocess
@@ -162,7 +162,7 @@ def test_execute_smartctl_timeout(mock_run):
         smart.execute_smartctl("/dev/sda", use_sample=False)
 
 
-@patch("subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_smartctl_success(mock_run):
     """Test successful smartctl execution."""
     sample_path = (
@@ -211,7 +211,7 @@ def test_collect_timeline_snapshots_without_devices():
     assert "No devices provided" in result["errors"][0]
 
 
-@patch("agent.plugins.smart.subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_windows_storage_health_success(mock_run):
     mock_run.return_value = MagicMock(
         returncode=0,
@@ -231,7 +231,7 @@ def test_execute_windows_storage_health_success(mock_run):
 
 
 @patch("agent.plugins.smart.platform.system", return_value="Windows")
-@patch("agent.plugins.smart.subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_scan_all_devices_windows_backend(mock_run, _mock_platform):
     mock_run.return_value = MagicMock(
         returncode=0,
@@ -288,7 +288,7 @@ def test_scan_all_devices_macos_backend(mock_exec, _mock_platform):
     assert result[0]["status"] == "ok"
 
 
-@patch("agent.plugins.smart.subprocess.run")
+@patch("agent.plugins.smart.run_command")
 def test_execute_macos_storage_health_success(mock_run):
     list_payload = (
         b'<?xml version="1.0" encoding="UTF-8"?>'
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from agent.upload_client import _normalize_upload_endpoint, upload_report_bundle
+import pytest
+
+from agent.evidence import write_evidence_manifest
+from agent.upload_client import (
+    UploadError,
+    _normalize_upload_endpoint,
+    upload_report_bundle,
+)
 
 
 def test_normalize_upload_endpoint():
@@ -73,3 +86,215 @@ def test_upload_bundle_discovers_files(tmp_path: Path, monkeypatch):
     assert captured["url"] == "https://example.com/reports"
     assert result["id"] == "abc"
     assert result["status"] == 201
+
+
+class _CapturingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802 - http.server naming
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.captured.append(
+            {"path": self.path, "headers": dict(self.headers), "body": body}
+        )
+
+        status = 401 if self.headers["Authorization"] != "Bearer good" else 201
+        response = {"id": "r1"}
+        if status == 201 and self.path.endswith("/preflight"):
+            # Content-addressed store stand-in; None = server without dedup.
+            if self.server.blobs is None:
+                status = 404
+            else:
+                status = 200
+                wanted = {f["sha256"] for f in json.loads(body)["files"]}
+                response = {"missing": sorted(wanted - self.server.blobs)}
+        elif status == 201 and self.server.blobs is not None:
+            content_type = self.headers["Content-Type"]
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            parts = _parts(content_type, body)
+            for (_field, filename), data in parts.items():
+                if filename:
+                    self.server.blobs.add(hashlib.sha256(data).hexdigest())
+            records = json.loads(parts.get(("blobs", None)) or b"[]")
+            if any(r["sha256"] not in self.server.blobs for r in records):
+                status = 409
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def upload_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CapturingHandler)
+    server.captured = []
+    server.blobs = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _parts(content_type: str, body: bytes) -> dict:
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return {
+        (part.get_param("name", header="content-disposition"), part.get_filename()): (
+            part.get_payload(decode=True)
+        )
+        for part in message.iter_parts()
+    }
+
+
+def _large_bundle(tmp_path: Path) -> bytes:
+    (tmp_path / "report.json").write_text('{"ok": true}', encoding="utf-8")
+    (tmp_path / "artifacts").mkdir()
+    series = b"".join(b"%d,42.5\n" % index for index in range(50_000))
+    (tmp_path / "artifacts" / "sensors.csv").write_bytes(series)
+    return series
+
+
+def test_streaming_upload_sends_content_length_and_progress(
+    tmp_path: Path, upload_server, monkeypatch
+):
+    series = _large_bundle(tmp_path)
+
+    def no_read_bytes(self):
+        raise AssertionError("upload must stream instead of read_bytes()")
+
+    monkeypatch.setattr(Path, "read_bytes", no_read_bytes)
+    progress = []
+
+    result = upload_report_bundle(
+        f"http://127.0.0.1:{upload_server.server_port}",
+        token="good",
+        output_dir=tmp_path,
+        metadata={"mode": "quick"},
+        progress=lambda sent, total: progress.append((sent, total)),
+    )
+
+    assert result == {"id": "r1", "status": 201}
+    captured = upload_server.captured[0]
+    assert int(captured["headers"]["Content-Length"]) == len(captured["body"])
+    parts = _parts(captured["headers"]["Content-Type"], captured["body"])
+    assert parts[("artifacts", "sensors.csv")] == series
+    assert json.loads(parts[("metadata", None)]) == {"mode": "quick"}
+    sent = [p[0] for p in progress]
+    assert sent == sorted(sent)
+    assert progress[-1] == (len(captured["body"]), len(captured["body"]))
+
+
+def test_gzip_upload_uses_chunked_transfer(tmp_path: Path, upload_server):
+    series = _large_bundle(tmp_path)
+
+    upload_report_bundle(
+        f"http://127.0.0.1:{upload_server.server_port}",
+        token="good",
+        output_dir=tmp_path,
+        gzip_body=True,
+    )
+
+    captured = upload_server.captured[0]
+    assert captured["headers"]["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in captured["headers"]
+    body = gzip.decompress(captured["body"])
+    assert len(captured["body"]) < len(body)
+    parts = _parts(captured["headers"]["Content-Type"], body)
+    assert parts[("artifacts", "sensors.csv")] == series
+
+
+def test_upload_http_error_raises_upload_error(tmp_path: Path, upload_server):
+    _large_bundle(tmp_path)
+
+    with pytest.raises(UploadError, match="HTTP 401"):
+        upload_report_bundle(
+            f"http://127.0.0.1:{upload_server.server_port}",
+            token="bad",
+            output_dir=tmp_path,
+        )
+
+
+def test_dedup_upload_sends_only_missing_blobs(tmp_path: Path, upload_server):
+    series = _large_bundle(tmp_path)
+    write_evidence_manifest(tmp_path, ["report.json", "artifacts/sensors.csv"], "0.1")
+    upload_server.blobs = set()
+    url = f"http://127.0.0.1:{upload_server.server_port}"
+
+    first = upload_report_bundle(url, token="good", output_dir=tmp_path, dedup=True)
+    assert first["dedup"] == {"files_skipped": 0, "bytes_skipped": 0}
+
+    second = upload_report_bundle(url, token="good", output_dir=tmp_path, dedup=True)
+
+    assert second["dedup"]["files_skipped"] == 2
+    assert second["dedup"]["bytes_skipped"] >= len(series)
+    preflight, upload = upload_server.captured[-2:]
+    assert preflight["path"] == "/reports/preflight"
+    sent = json.loads(preflight["body"])["files"]
+    assert {f["path"] for f in sent} == {"report.json", "artifacts/sensors.csv"}
+    parts = _parts(upload["headers"]["Content-Type"], upload["body"])
+    assert ("artifacts", "sensors.csv") not in parts
+    assert ("artifacts", "manifest.json") in parts
+    blobs = json.loads(parts[("blobs", None)])
+    assert {b["path"] for b in blobs} == {"report.json", "artifacts/sensors.csv"}
+    assert len(upload["body"]) < len(series)
+
+
+def test_dedup_upload_falls_back_without_preflight_endpoint(
+    tmp_path: Path, upload_server
+):
+    series = _large_bundle(tmp_path)
+    write_evidence_manifest(tmp_path, ["report.json", "artifacts/sensors.csv"], "0.1")
+
+    result = upload_report_bundle(
+        f"http://127.0.0.1:{upload_server.server_port}",
+        token="good",
+        output_dir=tmp_path,
+        dedup=True,
+    )
+
+    assert result["dedup"]["files_skipped"] == 0
+    upload = upload_server.captured[-1]
+    parts = _parts(upload["headers"]["Content-Type"], upload["body"])
+    assert parts[("artifacts", "sensors.csv")] == series
+    assert ("blobs", None) not in parts
+
+
+def test_dedup_upload_retries_full_bundle_on_conflict(
+    tmp_path: Path, upload_server, monkeypatch
+):
+    series = _large_bundle(tmp_path)
+    write_evidence_manifest(tmp_path, ["report.json", "artifacts/sensors.csv"], "0.1")
+    upload_server.blobs = set()
+    # Pre-flight claims everything is present, but the store is empty.
+    monkeypatch.setattr(
+        "agent.upload_client.preflight_missing_blobs", lambda *a, **k: set()
+    )
+
+    upload_report_bundle(
+        f"http://127.0.0.1:{upload_server.server_port}",
+        token="good",
+        output_dir=tmp_path,
+        dedup=True,
+    )
+
+    conflict, retry = upload_server.captured[-2:]
+    assert ("artifacts", "sensors.csv") not in _parts(
+        conflict["headers"]["Content-Type"], conflict["body"]
+    )
+    parts = _parts(retry["headers"]["Content-Type"], retry["body"])
+    assert parts[("artifacts", "sensors.csv")] == series
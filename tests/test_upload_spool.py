@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from agent.cli import cli
+from agent.evidence import write_evidence_manifest
+from agent.upload_client import UploadError
+from agent.upload_spool import (
+    UploadSpool,
+    bundle_manifest_sha256,
+    drain_spool,
+    flush_spool,
+    spawn_background_flush,
+)
+
+
+class _SpoolHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.connections.add(self.client_address)
+        # No dedup pre-flight endpoint: the client falls back to full uploads.
+        status = 404 if self.path.endswith("/preflight") else self.server.status
+        payload = json.dumps({"id": f"r{len(self.server.connections)}"}).encode()
+        self.server.requests += status != 404
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def spool_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SpoolHandler)
+    server.status = 201
+    server.requests = 0
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _bundle(root: Path, name: str, payload: bytes = b"x") -> Path:
+    bundle = root / name
+    (bundle / "artifacts").mkdir(parents=True)
+    (bundle / "report.json").write_text(json.dumps({"name": name}), encoding="utf-8")
+    (bundle / "artifacts" / "data.bin").write_bytes(payload)
+    write_evidence_manifest(bundle, ["report.json", "artifacts/data.bin"], "0.1.0")
+    return bundle
+
+
+def test_enqueue_dedups_by_manifest_sha(tmp_path: Path):
+    spool = UploadSpool(tmp_path / "spool")
+    bundle = _bundle(tmp_path, "b1")
+    _, manifest_sha = write_evidence_manifest(
+        bundle, ["report.json", "artifacts/data.bin"], "0.1.0"
+    )
+
+    first = spool.enqueue(bundle, "http://example.invalid")
+    second = spool.enqueue(bundle, "http://example.invalid")
+
+    assert first["status"] == "queued"
+    assert first["manifest_sha256"] == manifest_sha == bundle_manifest_sha256(bundle)
+    assert second["status"] == "duplicate"
+    assert spool.counts() == {"pending": 1, "sent": 0, "failed": 0}
+    job = spool.jobs()[0]
+    assert "token" not in json.dumps(job).lower()
+
+
+def test_flush_sends_over_reused_connections(tmp_path: Path, spool_server):
+    spool = UploadSpool(tmp_path / "spool")
+    url = f"http://127.0.0.1:{spool_server.server_port}"
+    for index in range(6):
+        spool.enqueue(_bundle(tmp_path, f"b{index}", b"%d" % index), url)
+
+    summary = flush_spool(spool, token="t", workers=2)
+
+    assert summary["sent"] == 6
+    assert spool.counts() == {"pending": 0, "sent": 6, "failed": 0}
+    assert spool_server.requests == 6
+    assert summary["connections_opened"] <= 2
+    assert len(spool_server.connections) <= 2
+
+    again = spool.enqueue(tmp_path / "b0", url)
+    assert again["status"] == "duplicate"
+    assert flush_spool(spool, token="t")["sent"] == 0
+
+
+def test_flush_backs_off_on_server_error(tmp_path: Path, spool_server):
+    spool_server.status = 503
+    spool = UploadSpool(tmp_path / "spool")
+    spool.enqueue(
+        _bundle(tmp_path, "b1"), f"http://127.0.0.1:{spool_server.server_port}"
+    )
+
+    summary = flush_spool(spool, token="t", rng=random.Random(0))
+
+    assert summary["retrying"] == 1
+    job = spool.jobs()[0]
+    assert job["attempts"] == 1
+    assert "HTTP 503" in job["last_error"]
+    assert job["next_attempt_at"] > time.time() + 10
+
+    deferred = flush_spool(spool, token="t")
+    assert deferred["deferred"] == 1 and spool_server.requests == 1
+
+    spool_server.status = 201
+    assert flush_spool(spool, token="t", include_deferred=True)["sent"] == 1
+
+
+def test_flush_moves_rejected_bundle_to_failed(tmp_path: Path, spool_server):
+    spool_server.status = 401
+    spool = UploadSpool(tmp_path / "spool")
+    spool.enqueue(
+        _bundle(tmp_path, "b1"), f"http://127.0.0.1:{spool_server.server_port}"
+    )
+
+    summary = flush_spool(spool, token="bad")
+
+    assert summary["failed"] == 1
+    assert spool.counts() == {"pending": 0, "sent": 0, "failed": 1}
+
+
+def test_flush_respects_inflight_byte_budget(tmp_path: Path):
+    spool = UploadSpool(tmp_path / "spool")
+    for index in range(6):
+        spool.enqueue(_bundle(tmp_path, f"b{index}", b"z" * 4000), "http://x")
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fake_uploader(**kwargs):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return {"status": 201}
+
+    size = spool.jobs()[0]["size_bytes"]
+    summary = flush_spool(
+        spool,
+        token="t",
+        workers=6,
+        max_inflight_bytes=size * 2,
+        uploader=fake_uploader,
+    )
+
+    assert summary["sent"] == 6
+    assert active["peak"] <= 2
+    assert summary["peak_inflight_bytes"] <= size * 2
+
+
+def test_flush_skips_when_another_flush_holds_lock(tmp_path: Path):
+    spool = UploadSpool(tmp_path / "spool")
+    assert spool.acquire_flush_lock()
+
+    def fail(**kwargs):
+        raise UploadError("should not upload")
+
+    assert flush_spool(spool, token="t", uploader=fail)["locked"] is True
+
+
+def test_flush_lock_of_exited_process_is_broken(tmp_path: Path):
+    spool = UploadSpool(tmp_path / "spool")
+    spool.path.mkdir(parents=True)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+
+    (spool.path / "flush.lock").write_text(str(os.getpid()), encoding="utf-8")
+    assert not spool.acquire_flush_lock()
+
+    (spool.path / "flush.lock").write_text(str(dead.pid), encoding="utf-8")
+    assert spool.acquire_flush_lock()
+    assert (spool.path / "flush.lock").read_text() == str(os.getpid())
+
+
+def _fake_clock(monkeypatch):
+    now = [1_000_000.0]
+    slept = []
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    return (lambda: now[0]), sleep, slept
+
+
+def test_drain_retries_backed_off_jobs_until_spool_is_empty(
+    tmp_path: Path, monkeypatch
+):
+    spool = UploadSpool(tmp_path / "spool")
+    spool.enqueue(_bundle(tmp_path, "b1"), "http://x")
+    clock, sleep, slept = _fake_clock(monkeypatch)
+    outcomes = [UploadError("offline", 503), UploadError("offline", 503)]
+
+    def flaky(**kwargs):
+        if outcomes:
+            raise outcomes.pop(0)
+        return {"status": 201}
+
+    summary = drain_spool(spool, token="t", sleep=sleep, clock=clock, uploader=flaky)
+
+    assert summary["passes"] == 3
+    assert summary["sent"] == 1
+    assert summary["retrying"] == 0
+    assert len(slept) == 2 and all(delay >= 15 for delay in slept)
+    assert spool.counts() == {"pending": 0, "sent": 1, "failed": 0}
+
+
+def test_drain_stops_at_max_wait_and_when_locked(tmp_path: Path, monkeypatch):
+    spool = UploadSpool(tmp_path / "spool")
+    spool.enqueue(_bundle(tmp_path, "b1"), "http://x")
+    clock, sleep, slept = _fake_clock(monkeypatch)
+
+    def offline(**kwargs):
+        raise UploadError("offline", 503)
+
+    summary = drain_spool(
+        spool,
+        token="t",
+        max_wait_seconds=10,
+        sleep=sleep,
+        clock=clock,
+        uploader=offline,
+    )
+    assert (summary["passes"], summary["retrying"], slept) == (1, 1, [])
+
+    assert spool.acquire_flush_lock()
+    locked = drain_spool(spool, token="t", sleep=sleep, clock=clock, uploader=offline)
+    assert locked["locked"] is True
+    assert slept == []
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_spawn_background_flush_command(monkeypatch, frozen: bool):
+    started = []
+    monkeypatch.setattr(
+        "agent.upload_spool.subprocess.Popen",
+        lambda command, **kwargs: started.append((command, kwargs)),
+    )
+    monkeypatch.setattr(sys, "frozen", frozen, raising=False)
+
+    assert spawn_background_flush("secret")
+
+    command, kwargs = started[0]
+    expected = ["upload", "flush", "--wait"]
+    if not frozen:
+        expected = ["-m", "agent.cli", *expected]
+    assert command == [sys.executable, *expected]
+    assert kwargs["env"]["INSPECTA_UPLOAD_TOKEN"] == "secret"
+    assert "secret" not in command
+
+
+def test_run_with_upload_enqueues_without_network(tmp_path: Path, monkeypatch):
+    spawned = []
+    monkeypatch.setattr(
+        "agent.upload_spool.spawn_background_flush",
+        lambda token: spawned.append(token) or True,
+    )
+    monkeypatch.setenv("INSPECTA_DATA_DIR", str(tmp_path / "data"))
+    out_dir = tmp_path / "out"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "run",
+            "--mode",
+            "quick",
+            "--output",
+            str(out_dir),
+            "--use-sample",
+            "--no-auto-open",
+            "--format",
+            "txt",
+            "--upload",
+            "http://127.0.0.1:9",
+            "--token",
+            "secret",
+        ],
+    )
+
+    assert result.exit_code == 10, result.output
+    assert spawned == ["secret"]
+    spool = UploadSpool(tmp_path / "data" / "upload-spool")
+    (job,) = spool.jobs()
+    assert job["manifest_sha256"] == bundle_manifest_sha256(out_dir)
+    assert "secret" not in json.dumps(job)
+
+
+def test_upload_cli_flush_and_status(tmp_path: Path, spool_server):
+    spool_dir = tmp_path / "spool"
+    bundle = _bundle(tmp_path, "b1")
+    runner = CliRunner()
+    url = f"http://127.0.0.1:{spool_server.server_port}"
+
+    enqueued = runner.invoke(
+        cli,
+        [
+            "upload",
+            "enqueue",
+            str(bundle),
+            "--upload",
+            url,
+            "--spool-dir",
+            str(spool_dir),
+        ],
+    )
+    assert enqueued.exit_code == 0, enqueued.output
+
+    flushed = runner.invoke(
+        cli,
+        ["upload", "flush", "--spool-dir", str(spool_dir), "--json"],
+        env={"INSPECTA_UPLOAD_TOKEN": "t"},
+    )
+    assert flushed.exit_code == 0, flushed.output
+    assert json.loads(flushed.output)["sent"] == 1
+
+    status = runner.invoke(cli, ["upload", "status", "--spool-dir", str(spool_dir)])
+    assert "Pending: 0  Sent: 1  Failed: 0" in status.output
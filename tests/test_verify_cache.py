@@ -0,0 +1,182 @@
+# Copyright (c) 2025 mufthakherul — see LICENSE.txt
+"""Tests for the stat-keyed verification cache."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from agent import evidence
+from agent.cli import cli
+from agent.evidence import verify_evidence_manifest, write_evidence_manifest
+from agent.verify_cache import VerificationCache
+
+
+def _bundle(tmp_path: Path) -> tuple[Path, str]:
+    out = tmp_path / "bundle"
+    (out / "artifacts").mkdir(parents=True)
+    rel_paths = []
+    old = time.time_ns() - 3600 * 1_000_000_000
+    for name in ("a.txt", "b.txt", "c.txt"):
+        target = out / "artifacts" / name
+        target.write_text(name * 10, encoding="utf-8")
+        os.utime(target, ns=(old, old))
+        rel_paths.append(f"artifacts/{name}")
+    manifest_rel, _ = write_evidence_manifest(out, rel_paths, agent_version="0.1.0")
+    return out, manifest_rel
+
+
+def _fail_hash(path, use_mmap=True):
+    raise AssertionError(f"cached file was rehashed: {path}")
+
+
+def test_second_verification_reuses_cached_digests(tmp_path: Path, monkeypatch):
+    out, manifest_rel = _bundle(tmp_path)
+    cache_path = tmp_path / "cache.json"
+
+    first = verify_evidence_manifest(
+        out, manifest_rel, cache=VerificationCache(cache_path), sample_rate=0.0
+    )
+    assert first["ok"] is True
+    assert first["cache"]["hashed"] == 3
+
+    monkeypatch.setattr(evidence, "_sha256_file", _fail_hash)
+    second = verify_evidence_manifest(
+        out, manifest_rel, cache=VerificationCache(cache_path), sample_rate=0.0
+    )
+    assert second["ok"] is True
+    assert second["cache"] == {"hits": 3, "hashed": 0, "sampled": 0, "corrupted": []}
+
+
+def test_paranoid_and_stat_changes_force_rehash(tmp_path: Path):
+    out, manifest_rel = _bundle(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    verify_evidence_manifest(out, manifest_rel, cache=VerificationCache(cache_path))
+
+    paranoid = verify_evidence_manifest(
+        out, manifest_rel, cache=VerificationCache(cache_path), paranoid=True
+    )
+    assert paranoid["cache"]["hashed"] == 3
+
+    (out / "artifacts" / "b.txt").write_text("tampered", encoding="utf-8")
+    tampered = verify_evidence_manifest(
+        out, manifest_rel, cache=VerificationCache(cache_path), sample_rate=0.0
+    )
+    assert tampered["exit_code"] == 1
+    assert tampered["cache"]["hashed"] == 1
+    assert [m["path"] for m in tampered["mismatches"]] == ["artifacts/b.txt"]
+
+
+def test_sampled_rehash_detects_silent_corruption(tmp_path: Path):
+    out, manifest_rel = _bundle(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    verify_evidence_manifest(out, manifest_rel, cache=VerificationCache(cache_path))
+
+    # Simulate bit rot: the bytes no longer match what the cache recorded
+    # for an unchanged stat tuple.
+    data = json.loads(cache_path.read_text(encoding="utf-8"))
+    key = str((out / "artifacts" / "a.txt").resolve())
+    data["entries"][key]["sha256"] = "0" * 64
+    cache_path.write_text(json.dumps(data), encoding="utf-8")
+
+    result = verify_evidence_manifest(
+        out, manifest_rel, cache=VerificationCache(cache_path), sample_rate=1.0
+    )
+    assert result["ok"] is True
+    assert result["cache"]["sampled"] == 3
+    assert result["cache"]["corrupted"] == ["artifacts/a.txt"]
+
+
+def test_recently_modified_files_are_not_cached(tmp_path: Path):
+    target = tmp_path / "fresh.txt"
+    target.write_text("fresh", encoding="utf-8")
+    cache = VerificationCache(tmp_path / "cache.json")
+
+    assert cache.store(target, target.stat(), "f" * 64) is False
+    assert cache.lookup(target, target.stat()) is None
+    assert len(cache) == 0
+
+
+def test_save_evicts_least_recently_used_entries_from_older_sessions(
+    tmp_path: Path, monkeypatch
+):
+    files = []
+    for index in range(3):
+        target = tmp_path / f"f{index}.txt"
+        target.write_text(str(index), encoding="utf-8")
+        os.utime(target, ns=(0, 0))
+        files.append(target)
+    cache_path = tmp_path / "cache.json"
+    clock = iter(range(10_000, 100_000, 10_000))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    first = VerificationCache(cache_path, max_entries=2)
+    for target in files:
+        first.store(target, target.stat(), "a" * 64)
+    first.save()
+    # Everything used in the session is kept, even past the limit.
+    assert len(VerificationCache(cache_path)) == 3
+
+    second = VerificationCache(cache_path, max_entries=2)
+    assert second.lookup(files[0], files[0].stat()) == "a" * 64
+    second.save()
+
+    reloaded = VerificationCache(cache_path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(files[1], files[1].stat()) is None
+    assert reloaded.lookup(files[2], files[2].stat()) == "a" * 64
+
+
+def test_save_prunes_entries_for_deleted_files(tmp_path: Path):
+    out, manifest_rel = _bundle(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    verify_evidence_manifest(out, manifest_rel, cache=VerificationCache(cache_path))
+    other, other_rel = _bundle(tmp_path / "other")
+    (out / "artifacts" / "a.txt").unlink()
+
+    verify_evidence_manifest(
+        other, other_rel, cache=VerificationCache(cache_path), sample_rate=0.0
+    )
+
+    assert len(VerificationCache(cache_path)) == 5
+
+
+def test_reverifying_more_bundles_than_the_limit_still_hits(
+    tmp_path: Path, monkeypatch
+):
+    bundles = [_bundle(tmp_path / f"store{index}") for index in range(3)]
+    cache_path = tmp_path / "cache.json"
+
+    cache = VerificationCache(cache_path, max_entries=4)
+    for out, manifest_rel in bundles:
+        verify_evidence_manifest(out, manifest_rel, cache=cache, sample_rate=0.0)
+
+    monkeypatch.setattr(evidence, "_sha256_file", _fail_hash)
+    cache = VerificationCache(cache_path, max_entries=4)
+    hits = [
+        verify_evidence_manifest(out, manifest_rel, cache=cache, sample_rate=0.0)[
+            "cache"
+        ]["hits"]
+        for out, manifest_rel in bundles
+    ]
+    assert hits == [3, 3, 3]
+
+
+def test_cli_verify_with_cache_file_reports_cache_stats(tmp_path: Path):
+    out, manifest_rel = _bundle(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    runner = CliRunner()
+    args = ["verify", str(out), "--manifest", manifest_rel, "--json"]
+
+    runner.invoke(cli, args + ["--cache-file", str(cache_path)])
+    result = runner.invoke(
+        cli, args + ["--cache-file", str(cache_path), "--sample-rate", "0"]
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["cache"]["hits"] == 3
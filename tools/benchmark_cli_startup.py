@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+BENCHMARK_VERSION = "1.1.0"
+DEFAULT_RUNS = 5
+# `python -X importtime` cost of a CLI invocation (best of the runs) beyond
+# that of a bare `python -c pass` measured in the same run, so the budget
+# holds on slow and fast machines alike. Cold start dominates the desktop
+# app, which shells out to the CLI many times per session.
+IMPORT_BUDGET_MS = 150.0
+# Commands that must start without the heavy modules below.
+LIGHT_COMMANDS: tuple[tuple[str, ...], ...] = (
+    ("--help",),
+    ("--version",),
+    ("capabilities", "--json"),
+    ("verify", "--help"),
+)
+# Modules only specific subcommands need; none may load for LIGHT_COMMANDS.
+HEAVY_MODULES = (
+    "agent.evidence",
+    "agent.plugins",
+    "agent.policy_pack",
+    "agent.report",
+    "agent.report_formatter",
+    "agent.upload_client",
+    "http.client",
+    "jsonschema",
+    "reportlab",
+    "sqlite3",
+)
+
+
+def parse_importtime(stderr: str) -> list[dict[str, Any]]:
+    """Parse `python -X importtime` lines into module/self/cumulative rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        rows.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+    return rows
+
+
+def total_import_us(rows: list[dict[str, Any]]) -> int:
+    """Total import time of a process (sum of its top-level imports)."""
+    return sum(row["cumulative_us"] for row in rows if row["depth"] == 0)
+
+
+def _best_of(argv: Sequence[str], runs: int) -> dict[str, Any]:
+    """Run `python -X importtime ARGV` `runs` times; keep the best timings."""
+    best_wall = best_import = None
+    result = None
+    rows: list[dict[str, Any]] = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        wall = time.perf_counter() - started
+        rows = parse_importtime(result.stderr)
+        import_us = total_import_us(rows)
+        best_wall = wall if best_wall is None else min(best_wall, wall)
+        best_import = import_us if best_import is None else min(best_import, import_us)
+    return {
+        "exit_code": result.returncode if result is not None else -1,
+        "wall_ms": round((best_wall or 0.0) * 1000, 2),
+        "import_ms": round((best_import or 0) / 1000, 2),
+        "rows": rows,
+    }
+
+
+def measure_baseline(runs: int = DEFAULT_RUNS) -> dict[str, Any]:
+    """Best wall and import time of a bare `python -c pass`, in milliseconds."""
+    best = _best_of(["-c", "pass"], runs)
+    return {"wall_ms": best["wall_ms"], "import_ms": best["import_ms"]}
+
+
+def measure_command(args: Sequence[str], runs: int = DEFAULT_RUNS) -> dict[str, Any]:
+    """Run `python -X importtime -m agent.cli ARGS` and summarize startup.
+
+    Returns:
+        Best-of-`runs` wall time and total import time in milliseconds, the
+        heavy modules that were imported, and the slowest top-level imports
+    """
+    best = _best_of(["-m", "agent.cli", *args], runs)
+    rows = best["rows"]
+    modules = {row["module"] for row in rows}
+    heavy = sorted(
+        name
+        for name in modules
+        if any(name == h or name.startswith(h + ".") for h in HEAVY_MODULES)
+    )
+    slowest = sorted(
+        (row for row in rows if row["depth"] == 0),
+        key=lambda row: row["cumulative_us"],
+        reverse=True,
+    )[:5]
+    return {
+        "command": " ".join(args),
+        "exit_code": best["exit_code"],
+        "wall_ms": best["wall_ms"],
+        "import_ms": best["import_ms"],
+        "modules_imported": len(modules),
+        "heavy_modules": heavy,
+        "slowest_imports": [
+            {"module": row["module"], "ms": round(row["cumulative_us"] / 1000, 2)}
+            for row in slowest
+        ],
+    }
+
+
+def run_startup_benchmark(
+    commands: Sequence[Sequence[str]] = LIGHT_COMMANDS,
+    runs: int = DEFAULT_RUNS,
+    budget_ms: float = IMPORT_BUDGET_MS,
+) -> dict[str, Any]:
+    """Measure startup of each command against the import budget.
+
+    Each command's `import_over_baseline_ms` (its import time minus that of
+    a bare interpreter) is what `budget_ms` applies to.
+    """
+    baseline = measure_baseline(runs=runs)
+    results = [measure_command(args, runs=runs) for args in commands]
+    for result in results:
+        result["import_over_baseline_ms"] = round(
+            result["import_ms"] - baseline["import_ms"], 2
+        )
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "import_budget_ms": budget_ms,
+        "baseline": baseline,
+        "commands": results,
+        "within_budget": all(
+            r["exit_code"] == 0
+            and r["import_over_baseline_ms"] <= budget_ms
+            and not r["heavy_modules"]
+            for r in results
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark `inspecta` CLI cold start with python -X importtime."
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=DEFAULT_RUNS,
+        help="Runs per command; the best run is reported (default: 5).",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=IMPORT_BUDGET_MS,
+        help=(
+            "Import-time budget per command in ms, over a bare interpreter "
+            "(default: 150)."
+        ),
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=1.0,
+        help=(
+            "Multiply the budget by this factor before gating, for noisy shared "
+            "runners (default: 1.0; CI uses 2.0)."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("test-output/cli-startup-benchmark.json"),
+        help="Where to write benchmark JSON output.",
+    )
+    args = parser.parse_args()
+
+    result = run_startup_benchmark(
+        runs=max(1, args.runs), budget_ms=args.budget_ms * max(1.0, args.margin)
+    )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(json.dumps(result, indent=2))
+    for command in result["commands"]:
+        if command["import_over_baseline_ms"] > result["import_budget_ms"]:
+            print(
+                f"OVER BUDGET inspecta {command['command']}: "
+                f"{command['import_over_baseline_ms']} ms > "
+                f"{result['import_budget_ms']} ms",
+                file=sys.stderr,
+            )
+        if command["heavy_modules"]:
+            print(
+                f"HEAVY IMPORTS inspecta {command['command']}: "
+                f"{', '.join(command['heavy_modules'])}",
+                file=sys.stderr,
+            )
+    return 0 if result["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
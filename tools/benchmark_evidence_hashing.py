@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.evidence import (  # noqa: E402
+    DEFAULT_HASH_WORKERS,
+    _sha256_file,
+    hash_files,
+)
+
+BENCHMARK_VERSION = "1.0.0"
+DEFAULT_SMALL_FILES = 1000
+DEFAULT_SMALL_FILE_BYTES = 16 * 1024
+DEFAULT_LARGE_FILES = 2
+DEFAULT_LARGE_FILE_MB = 1024
+
+_BLOCK_BYTES = 1024 * 1024
+
+
+def _write_file(path: Path, size: int, block: bytes) -> None:
+    with path.open("wb") as fh:
+        remaining = size
+        while remaining > 0:
+            chunk = block[: min(remaining, len(block))]
+            fh.write(chunk)
+            remaining -= len(chunk)
+
+
+def build_synthetic_bundle(
+    base_dir: Path, file_count: int, file_bytes: int
+) -> list[Path]:
+    """Create `file_count` files of `file_bytes` each under `base_dir`."""
+    base_dir.mkdir(parents=True, exist_ok=True)
+    block = os.urandom(min(_BLOCK_BYTES, max(1, file_bytes)))
+    paths = []
+    for index in range(file_count):
+        path = base_dir / f"artifact-{index:05d}.bin"
+        _write_file(path, file_bytes, block)
+        paths.append(path)
+    return paths
+
+
+def _time_serial(paths: list[Path]) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    digests = [_sha256_file(path, use_mmap=False) for path in paths]
+    return time.perf_counter() - started, digests
+
+
+def _time_parallel(paths: list[Path], workers: int) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    results = hash_files(paths, workers=workers)
+    elapsed = time.perf_counter() - started
+    return elapsed, [result[1] if result else "" for result in results]
+
+
+def benchmark_bundle(paths: list[Path], workers: int) -> dict[str, Any]:
+    """Hash `paths` serially (buffered reads) and with the parallel engine."""
+    total_bytes = sum(path.stat().st_size for path in paths)
+    serial_s, serial_digests = _time_serial(paths)
+    parallel_s, parallel_digests = _time_parallel(paths, workers)
+    mib = total_bytes / (1024 * 1024)
+    return {
+        "files": len(paths),
+        "total_bytes": total_bytes,
+        "workers": workers,
+        "serial_seconds": round(serial_s, 4),
+        "parallel_seconds": round(parallel_s, 4),
+        "serial_mib_per_sec": round(mib / serial_s, 2) if serial_s else None,
+        "parallel_mib_per_sec": round(mib / parallel_s, 2) if parallel_s else None,
+        "speedup": round(serial_s / parallel_s, 2) if parallel_s else None,
+        "digests_match": serial_digests == parallel_digests,
+    }
+
+
+def run_hashing_benchmark(
+    small_files: int = DEFAULT_SMALL_FILES,
+    small_file_bytes: int = DEFAULT_SMALL_FILE_BYTES,
+    large_files: int = DEFAULT_LARGE_FILES,
+    large_file_bytes: int = DEFAULT_LARGE_FILE_MB * 1024 * 1024,
+    workers: int = DEFAULT_HASH_WORKERS,
+    work_dir: Path | None = None,
+) -> dict[str, Any]:
+    """Benchmark evidence hashing over many-small and few-large bundles."""
+    with tempfile.TemporaryDirectory(
+        prefix="inspecta-hash-bench-", dir=work_dir
+    ) as tmp:
+        root = Path(tmp)
+        bundles: dict[str, Any] = {}
+        if small_files > 0:
+            paths = build_synthetic_bundle(
+                root / "small", small_files, small_file_bytes
+            )
+            bundles["many_small_files"] = benchmark_bundle(paths, workers)
+        if large_files > 0:
+            paths = build_synthetic_bundle(
+                root / "large", large_files, large_file_bytes
+            )
+            bundles["large_files"] = benchmark_bundle(paths, workers)
+
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "bundles": bundles,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark serial vs parallel/mmap evidence hashing over "
+        "synthetic bundles."
+    )
+    parser.add_argument(
+        "--small-files",
+        type=int,
+        default=DEFAULT_SMALL_FILES,
+        help="Number of small files in the many-files bundle (default: 1000).",
+    )
+    parser.add_argument(
+        "--small-file-bytes",
+        type=int,
+        default=DEFAULT_SMALL_FILE_BYTES,
+        help="Size of each small file in bytes (default: 16384).",
+    )
+    parser.add_argument(
+        "--large-files",
+        type=int,
+        default=DEFAULT_LARGE_FILES,
+        help="Number of large files (default: 2).",
+    )
+    parser.add_argument(
+        "--large-file-mb",
+        type=int,
+        default=DEFAULT_LARGE_FILE_MB,
+        help="Size of each large file in MiB (default: 1024).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_HASH_WORKERS,
+        help="Hashing threads for the parallel run.",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Directory for the temporary bundles (default: system temp).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("test-output/evidence-hashing-benchmark.json"),
+        help="Where to write benchmark JSON output.",
+    )
+    args = parser.parse_args()
+
+    result = run_hashing_benchmark(
+        small_files=args.small_files,
+        small_file_bytes=args.small_file_bytes,
+        large_files=args.large_files,
+        large_file_bytes=args.large_file_mb * 1024 * 1024,
+        workers=max(1, args.workers),
+        work_dir=args.work_dir,
+    )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(json.dumps(result, indent=2))
+
+    mismatched = [
+        name
+        for name, bundle in result["bundles"].items()
+        if not bundle["digests_match"]
+    ]
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,605 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent import __version__  # noqa: E402
+from agent.evidence import (  # noqa: E402
+    verify_evidence_manifest,
+    write_evidence_manifest,
+)
+from agent.plugins.battery import parse_upower_output  # noqa: E402
+from agent.plugins.cpu_bench import parse_sysbench_output  # noqa: E402
+from agent.plugins.disk_perf import parse_fio_json  # noqa: E402
+from agent.plugins.inventory import parse_dmidecode  # noqa: E402
+from agent.plugins.sensors import parse_sensors_output  # noqa: E402
+from agent.plugins.smart import parse_smart_json  # noqa: E402
+from agent.report import compose_report  # noqa: E402
+from agent.report_formatter import (  # noqa: E402
+    generate_html_report,
+    generate_pdf_report,
+    generate_txt_report,
+)
+
+BENCHMARK_VERSION = "1.0.0"
+HISTORY_VERSION = 1
+DEFAULT_SIZES = (1, 10, 100)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BASELINE_WINDOW = 5
+
+SAMPLES_DIR = PROJECT_ROOT / "samples" / "tool_outputs"
+
+_SENSORS_BLOCK = """\
+coretemp-isa-{index:04x}
+Adapter: ISA adapter
+Package id 0:  +52.0°C  (high = +100.0°C, crit = +100.0°C)
+Core 0:        +48.0°C  (high = +100.0°C, crit = +100.0°C)
+Core 1:        +50.0°C  (high = +100.0°C, crit = +100.0°C)
+fan{index}:          2400 RPM  (min =    0 RPM)
+
+"""
+
+_UPOWER_HEADER = """\
+  native-path:          BAT0
+  vendor:               SMP
+  model:                L22M4PC2
+  battery
+    present:             yes
+    state:               discharging
+    energy-full:         47.1 Wh
+    energy-full-design:  57.0 Wh
+    charge-cycles:       251
+    percentage:          97%
+    capacity:            82.63%
+"""
+
+_SYSBENCH_TAIL = """\
+CPU speed:
+    events per second:  1789.35
+
+General statistics:
+    total time:                          10.0028s
+    total number of events:              17900
+"""
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpora: `size` scales the input (rows, sections, files, tests).
+# ---------------------------------------------------------------------------
+
+
+def _smart_corpus(size: int) -> dict[str, Any]:
+    data = json.loads(
+        (SAMPLES_DIR / "smartctl_sata_healthy.json").read_text(encoding="utf-8")
+    )
+    base_table = data["ata_smart_attributes"]["table"]
+    table = []
+    for index in range(size):
+        for entry in base_table:
+            row = copy.deepcopy(entry)
+            if index:
+                row["name"] = f"{entry['name']}_{index}"
+            table.append(row)
+    data["ata_smart_attributes"]["table"] = table
+    return data
+
+
+def _sensors_corpus(size: int) -> str:
+    return "".join(_SENSORS_BLOCK.format(index=i) for i in range(size))
+
+
+def _dmidecode_corpus(size: int) -> str:
+    sample = (SAMPLES_DIR / "dmidecode_sample.txt").read_text(encoding="utf-8")
+    extra = "".join(
+        f"\nHandle 0x{0x100 + i:04X}, DMI type 17, 40 bytes\n"
+        "Memory Device\n"
+        "\tSize: 8 GB\n"
+        f"\tLocator: DIMM {i}\n"
+        "\tType: DDR4\n"
+        for i in range(size - 1)
+    )
+    return sample + extra
+
+
+def _upower_corpus(size: int) -> str:
+    extra = "".join(f"    history-{i}:           {i % 100}%\n" for i in range(size))
+    return _UPOWER_HEADER + extra
+
+
+def _fio_corpus(size: int) -> dict[str, Any]:
+    return {
+        "jobs": [
+            {
+                "jobname": f"inspecta_quick_{i}",
+                "read": {"bw_bytes": 524_288_000, "iops": 500.0},
+                "write": {"bw_bytes": 314_572_800, "iops": 300.0},
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def _sysbench_corpus(size: int) -> str:
+    header = "sysbench 1.0.20 (using system LuaJIT 2.1.0-beta3)\n\n"
+    progress = "".join(
+        f"[ {i + 1}s ] thds: 2 eps: 1789.{i % 100:02d} lat (ms,95%): 1.12\n"
+        for i in range(size)
+    )
+    return header + progress + "\n" + _SYSBENCH_TAIL
+
+
+def _tests_corpus(size: int) -> list[dict[str, Any]]:
+    now = "2026-01-01T00:00:00+00:00"
+    tests: list[dict[str, Any]] = []
+    for i in range(size):
+        tests.append(
+            {
+                "name": f"smartctl_nvme{i}",
+                "status": "ok",
+                "start_ts": now,
+                "end_ts": now,
+                "data": {
+                    "model": "Synthetic NVMe",
+                    "nvme_percentage_used": i % 50,
+                    "attributes": {"Power_On_Hours": 1000 + i},
+                },
+            }
+        )
+    tests.extend(
+        [
+            {
+                "name": "battery_health",
+                "status": "ok",
+                "data": {"health_pct": 82.6, "cycle_count": 251},
+            },
+            {
+                "name": "disk_performance",
+                "status": "ok",
+                "data": {"read_mb_s": 500.0, "write_mb_s": 300.0},
+            },
+            {
+                "name": "cpu_benchmark",
+                "status": "ok",
+                "data": {"events_per_second": 1789.35},
+            },
+        ]
+    )
+    return tests
+
+
+def _report_corpus(size: int) -> dict[str, Any]:
+    return compose_report(
+        agent_version=__version__,
+        device={"vendor": "Synthetic", "model": "Bench", "serial": "BENCH-0"},
+        artifacts=[f"artifacts/smart_nvme{i}.json" for i in range(size)],
+        tests=_tests_corpus(size),
+        mode="quick",
+        profile="default",
+        smart_status="ok",
+    )
+
+
+def _bundle_corpus(base_dir: Path, size: int) -> list[str]:
+    artifacts_dir = base_dir / "artifacts"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    payload = b"inspecta-benchmark-artifact\n" * 600  # ~16 KiB per file
+    rel_paths = []
+    for i in range(size):
+        rel = f"artifacts/artifact_{i:05d}.log"
+        (base_dir / rel).write_bytes(payload)
+        rel_paths.append(rel)
+    return rel_paths
+
+
+# ---------------------------------------------------------------------------
+# Stages: each factory returns (callable, cleanup) for a given corpus size.
+# ---------------------------------------------------------------------------
+
+StageFactory = Callable[[int], tuple[Callable[[], Any], Callable[[], None]]]
+
+
+def _noop() -> None:
+    return None
+
+
+def _pure(fn: Callable[[Any], Any], corpus: Callable[[int], Any]) -> StageFactory:
+    def factory(size: int) -> tuple[Callable[[], Any], Callable[[], None]]:
+        data = corpus(size)
+        return (lambda: fn(data)), _noop
+
+    return factory
+
+
+def _compose_stage(size: int) -> tuple[Callable[[], Any], Callable[[], None]]:
+    tests = _tests_corpus(size)
+
+    def run() -> Any:
+        return compose_report(
+            agent_version=__version__,
+            device={"vendor": "Synthetic", "model": "Bench"},
+            artifacts=[],
+            tests=copy.deepcopy(tests),
+            mode="quick",
+            profile="default",
+            smart_status="ok",
+        )
+
+    return run, _noop
+
+
+def _formatter_stage(
+    generator: Callable[[dict[str, Any], Path], Any],
+) -> StageFactory:
+    def factory(size: int) -> tuple[Callable[[], Any], Callable[[], None]]:
+        report = _report_corpus(size)
+        tmp = tempfile.TemporaryDirectory(prefix="inspecta-bench-")
+        out_dir = Path(tmp.name)
+        return (lambda: generator(report, out_dir)), tmp.cleanup
+
+    return factory
+
+
+def _write_manifest_stage(size: int) -> tuple[Callable[[], Any], Callable[[], None]]:
+    tmp = tempfile.TemporaryDirectory(prefix="inspecta-bench-")
+    base_dir = Path(tmp.name)
+    rel_paths = _bundle_corpus(base_dir, size)
+
+    def run() -> Any:
+        return write_evidence_manifest(
+            output_dir=base_dir,
+            relative_paths=rel_paths,
+            agent_version=__version__,
+            generated_at="2026-01-01T00:00:00+00:00",
+        )
+
+    return run, tmp.cleanup
+
+
+def _verify_manifest_stage(size: int) -> tuple[Callable[[], Any], Callable[[], None]]:
+    tmp = tempfile.TemporaryDirectory(prefix="inspecta-bench-")
+    base_dir = Path(tmp.name)
+    rel_paths = _bundle_corpus(base_dir, size)
+    manifest_rel, _ = write_evidence_manifest(
+        output_dir=base_dir,
+        relative_paths=rel_paths,
+        agent_version=__version__,
+        generated_at="2026-01-01T00:00:00+00:00",
+    )
+
+    def run() -> Any:
+        result = verify_evidence_manifest(base_dir, manifest_rel)
+        if not result.get("ok"):
+            raise RuntimeError(f"benchmark bundle failed verification: {result}")
+        return result
+
+    return run, tmp.cleanup
+
+
+def _pdf_available() -> bool:
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+STAGES: dict[str, StageFactory] = {
+    "parse_smart_json": _pure(parse_smart_json, _smart_corpus),
+    "parse_sensors_output": _pure(parse_sensors_output, _sensors_corpus),
+    "parse_dmidecode": _pure(parse_dmidecode, _dmidecode_corpus),
+    "parse_upower_output": _pure(parse_upower_output, _upower_corpus),
+    "parse_fio_json": _pure(parse_fio_json, _fio_corpus),
+    "parse_sysbench_output": _pure(parse_sysbench_output, _sysbench_corpus),
+    "compose_report": _compose_stage,
+    "format_txt": _formatter_stage(generate_txt_report),
+    "format_html": _formatter_stage(generate_html_report),
+    "format_pdf": _formatter_stage(generate_pdf_report),
+    "write_evidence_manifest": _write_manifest_stage,
+    "verify_evidence_manifest": _verify_manifest_stage,
+}
+
+
+def _measure(
+    fn: Callable[[], Any], min_time: float, min_iterations: int
+) -> dict[str, Any]:
+    fn()  # warm caches / lazy imports outside the timed window
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while iterations < min_iterations or elapsed < min_time:
+        fn()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "mean_ms": round(elapsed * 1000 / iterations, 4),
+        "ops_per_sec": round(iterations / elapsed, 2) if elapsed > 0 else 0.0,
+        "alloc_peak_bytes": max(0, peak - before),
+        "alloc_retained_bytes": max(0, after - before),
+    }
+
+
+def run_pipeline_benchmark(
+    sizes: tuple[int, ...] | list[int] = DEFAULT_SIZES,
+    stages: list[str] | None = None,
+    min_time: float = 0.2,
+    min_iterations: int = 3,
+) -> dict[str, Any]:
+    """Benchmark every pipeline stage over synthetic corpora of each size."""
+    selected = stages or list(STAGES)
+    unknown = [name for name in selected if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark stage(s): {', '.join(unknown)}")
+
+    results: dict[str, Any] = {}
+    skipped: dict[str, str] = {}
+    for name in selected:
+        if name == "format_pdf" and not _pdf_available():
+            skipped[name] = "reportlab not installed"
+            continue
+        per_size: dict[str, Any] = {}
+        for size in sizes:
+            fn, cleanup = STAGES[name](max(1, int(size)))
+            try:
+                per_size[str(size)] = _measure(fn, min_time, min_iterations)
+            finally:
+                cleanup()
+        results[name] = per_size
+
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "generated_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "agent_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": [int(s) for s in sizes],
+        "stages": results,
+        "skipped": skipped,
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Return stage/size pairs whose throughput dropped past `threshold`.
+
+    Only stage/size pairs present in both runs are compared, so adding
+    stages or sizes never fails the gate.
+    """
+    regressions: list[dict[str, Any]] = []
+    base_stages = baseline.get("stages", {})
+    for stage, per_size in current.get("stages", {}).items():
+        for size, metrics in per_size.items():
+            reference = base_stages.get(stage, {}).get(size)
+            if not reference:
+                continue
+            base_ops = float(reference.get("ops_per_sec") or 0.0)
+            cur_ops = float(metrics.get("ops_per_sec") or 0.0)
+            if base_ops <= 0:
+                continue
+            change = (cur_ops - base_ops) / base_ops
+            if change < -threshold:
+                regressions.append(
+                    {
+                        "stage": stage,
+                        "size": size,
+                        "baseline_ops_per_sec": base_ops,
+                        "current_ops_per_sec": cur_ops,
+                        "change_pct": round(change * 100, 2),
+                    }
+                )
+    return regressions
+
+
+def history_baseline(
+    runs: list[dict[str, Any]], window: int = DEFAULT_BASELINE_WINDOW
+) -> dict[str, Any] | None:
+    """Build a baseline from the median ops/sec of the last `window` runs.
+
+    A single fast or slow run cannot move the median, so the gate neither
+    ratchets up after a lucky run nor drifts down one run at a time.
+    """
+    recent = runs[-max(1, window) :]
+    if not recent:
+        return None
+    samples: dict[str, dict[str, list[float]]] = {}
+    for run in recent:
+        for stage, per_size in run.get("stages", {}).items():
+            for size, metrics in per_size.items():
+                ops = float(metrics.get("ops_per_sec") or 0.0)
+                if ops > 0:
+                    samples.setdefault(stage, {}).setdefault(size, []).append(ops)
+    return {
+        "generated_at": recent[-1].get("generated_at"),
+        "baseline_runs": len(recent),
+        "stages": {
+            stage: {
+                size: {"ops_per_sec": round(statistics.median(values), 2)}
+                for size, values in per_size.items()
+            }
+            for stage, per_size in samples.items()
+        },
+    }
+
+
+def load_history(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"history_version": HISTORY_VERSION, "runs": []}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload.get("runs"), list):
+        raise ValueError(f"Invalid benchmark history file: {path}")
+    return payload
+
+
+def append_history(path: Path, result: dict[str, Any], limit: int = 50) -> None:
+    history = load_history(path)
+    history["runs"].append(result)
+    history["runs"] = history["runs"][-max(1, limit) :]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+
+
+def reset_history(path: Path, result: dict[str, Any]) -> None:
+    """Start `path` over with `result` as its only run (an accepted baseline)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    history = {"history_version": HISTORY_VERSION, "runs": [result]}
+    path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark inspecta parsers, report composition, formatters "
+        "and evidence stages with regression gating."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Synthetic corpus scale factors (default: 1 10 100).",
+    )
+    parser.add_argument(
+        "--stage",
+        action="append",
+        choices=sorted(STAGES),
+        help="Restrict to a stage (repeatable). Default: all stages.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum timed seconds per stage/size (default: 0.2).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("test-output/pipeline-benchmark.json"),
+        help="Where to write benchmark JSON output.",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=None,
+        help="History JSON file; the median of its last --baseline-window "
+        "runs is the default baseline and passing runs are appended to it.",
+    )
+    parser.add_argument(
+        "--baseline-window",
+        type=int,
+        default=DEFAULT_BASELINE_WINDOW,
+        help="Number of recent history runs whose median forms the baseline "
+        f"(default: {DEFAULT_BASELINE_WINDOW}).",
+    )
+    parser.add_argument(
+        "--history-limit",
+        type=int,
+        default=50,
+        help="Maximum number of runs kept in the history file.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Pinned baseline benchmark JSON (overrides the history median).",
+    )
+    parser.add_argument(
+        "--accept-baseline",
+        action="store_true",
+        help="Accept this run as the new baseline after an intentional "
+        "slowdown: the history restarts from it and regressions are reported "
+        "but do not fail. In CI, run the Performance Regression workflow "
+        "manually with accept_baseline enabled.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed fractional ops/sec drop before failing (default: 0.25).",
+    )
+    args = parser.parse_args()
+
+    result = run_pipeline_benchmark(
+        sizes=args.sizes,
+        stages=args.stage,
+        min_time=max(0.0, args.min_time),
+    )
+
+    baseline: dict[str, Any] | None = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    elif args.history is not None:
+        runs = load_history(args.history)["runs"]
+        baseline = history_baseline(runs, window=args.baseline_window)
+
+    regressions = (
+        compare_to_baseline(result, baseline, args.threshold) if baseline else []
+    )
+    result["regression_gate"] = {
+        "threshold": args.threshold,
+        "baseline_generated_at": baseline.get("generated_at") if baseline else None,
+        "baseline_runs": baseline.get("baseline_runs", 1) if baseline else 0,
+        "regressions": regressions,
+        "accepted": args.accept_baseline,
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"Benchmark written: {args.output}")
+    for stage, per_size in result["stages"].items():
+        summary = ", ".join(
+            f"n={size}: {metrics['ops_per_sec']} ops/s"
+            for size, metrics in per_size.items()
+        )
+        print(f"{stage}: {summary}")
+
+    for item in regressions:
+        print(
+            f"REGRESSION {item['stage']} n={item['size']}: "
+            f"{item['baseline_ops_per_sec']} -> {item['current_ops_per_sec']} "
+            f"ops/s ({item['change_pct']}%)"
+        )
+    if args.accept_baseline:
+        if args.history is not None:
+            reset_history(args.history, result)
+            print(f"Accepted as new baseline: {args.history}")
+        return 0
+    if regressions:
+        return 1
+
+    # Only clean runs extend the history; the baseline is the median of the
+    # last few of them, so no single run replaces it.
+    if args.history is not None:
+        append_history(args.history, result, limit=args.history_limit)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.policy_pack import (  # noqa: E402
+    _MAX_CONDITION_LENGTH,
+    PolicyPackError,
+    compile_condition,
+    compile_policy_pack,
+)
+
+BENCHMARK_VERSION = "1.0.0"
+DEFAULT_REPORTS = 10_000
+DEFAULT_RULES = 100
+
+_SCORE_KEYS = ("storage", "battery", "memory", "cpu", "thermal", "security")
+_GRADES = ("A", "B", "C", "D", "F")
+_TEMPLATES = (
+    "scores.{key} < {threshold}",
+    "scores.{key} >= {threshold} and summary.grade in {grades}",
+    "not (scores.{key} > {threshold}) or mode == 'full'",
+    "scores.{key} + scores.{other} < {double}",
+    "{low} <= scores.{key} < {threshold}",
+    "summary.overall_score - scores.{key} > {delta}",
+)
+
+
+class SafeExprEvaluator:
+    """Tree-walking policy condition evaluator (the pre-compilation path).
+
+    Parses and walks the AST on every call. Kept here as the reference that
+    `compile_condition` is benchmarked and tested against; both must stay
+    semantically identical.
+    """
+
+    def __init__(self, context: dict[str, Any]):
+        self._context = context
+
+    def evaluate(self, expression: str) -> bool:
+        if not expression or len(expression) > _MAX_CONDITION_LENGTH:
+            raise PolicyPackError("Policy rule condition is empty or too long")
+
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as exc:
+            raise PolicyPackError(f"Invalid policy condition syntax: {exc}") from exc
+
+        value = self._eval_node(tree.body)
+        return bool(value)
+
+    def _eval_node(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        if isinstance(node, ast.Name):
+            if node.id not in self._context:
+                raise PolicyPackError(f"Unknown symbol in policy condition: {node.id}")
+            return self._context[node.id]
+
+        if isinstance(node, ast.Attribute):
+            base = self._eval_node(node.value)
+            if isinstance(base, dict):
+                if node.attr not in base:
+                    raise PolicyPackError(
+                        f"Unknown attribute in policy condition: {node.attr}"
+                    )
+                return base[node.attr]
+            if hasattr(base, node.attr):
+                return getattr(base, node.attr)
+            raise PolicyPackError(f"Unsupported attribute access: {node.attr}")
+
+        if isinstance(node, ast.BoolOp):
+            values = [bool(self._eval_node(v)) for v in node.values]
+            if isinstance(node.op, ast.And):
+                return all(values)
+            if isinstance(node.op, ast.Or):
+                return any(values)
+            raise PolicyPackError("Unsupported boolean operator")
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval_node(node.operand)
+            if isinstance(node.op, ast.Not):
+                return not bool(operand)
+            if isinstance(node.op, ast.USub):
+                return -float(operand)
+            raise PolicyPackError("Unsupported unary operator")
+
+        if isinstance(node, ast.BinOp):
+            left = self._eval_node(node.left)
+            right = self._eval_node(node.right)
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mult):
+                return left * right
+            if isinstance(node.op, ast.Div):
+                return left / right
+            raise PolicyPackError("Unsupported binary operator")
+
+        if isinstance(node, ast.Compare):
+            left = self._eval_node(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval_node(comparator)
+                if isinstance(op, ast.Lt):
+                    matched = left < right
+                elif isinstance(op, ast.LtE):
+                    matched = left <= right
+                elif isinstance(op, ast.Gt):
+                    matched = left > right
+                elif isinstance(op, ast.GtE):
+                    matched = left >= right
+                elif isinstance(op, ast.Eq):
+                    matched = left == right
+                elif isinstance(op, ast.NotEq):
+                    matched = left != right
+                elif isinstance(op, ast.In):
+                    matched = left in right
+                elif isinstance(op, ast.NotIn):
+                    matched = left not in right
+                else:
+                    raise PolicyPackError("Unsupported comparison operator")
+
+                if not matched:
+                    return False
+                left = right
+            return True
+
+        raise PolicyPackError(f"Unsupported expression node: {type(node).__name__}")
+
+
+def build_policy_pack(rule_count: int, seed: int = 0) -> dict[str, Any]:
+    """Build a synthetic pack mixing comparisons, chains, arithmetic and bools."""
+    rng = random.Random(seed)
+    rules = []
+    for index in range(rule_count):
+        threshold = rng.randint(30, 90)
+        condition = _TEMPLATES[index % len(_TEMPLATES)].format(
+            key=rng.choice(_SCORE_KEYS),
+            other=rng.choice(_SCORE_KEYS),
+            threshold=threshold,
+            double=threshold * 2,
+            low=threshold - 20,
+            delta=rng.randint(5, 30),
+            grades=repr("".join(rng.sample(_GRADES, 2))),
+        )
+        rules.append(
+            {
+                "id": f"RULE_{index:03d}",
+                "title": f"Synthetic rule {index}",
+                "severity": rng.choice(["info", "warning", "critical"]),
+                "condition": condition,
+                "action": rng.choice(["warn", "recommend", "fail"]),
+            }
+        )
+    return {
+        "schema_version": "1.0.0",
+        "pack_id": "benchmark-pack",
+        "display_name": "Benchmark Pack",
+        "target_profile": "enterprise_it",
+        "rules": rules,
+    }
+
+
+def build_contexts(report_count: int, seed: int = 1) -> list[dict[str, Any]]:
+    """Build synthetic policy contexts shaped like `compose_report`'s."""
+    rng = random.Random(seed)
+    contexts = []
+    for _ in range(report_count):
+        scores = {key: rng.randint(0, 100) for key in _SCORE_KEYS}
+        contexts.append(
+            {
+                "scores": scores,
+                "summary": {
+                    "overall_score": sum(scores.values()) // len(scores),
+                    "grade": rng.choice(_GRADES),
+                },
+                "mode": rng.choice(["quick", "full"]),
+                "profile": "default",
+                "tests": [],
+            }
+        )
+    return contexts
+
+
+def _interpreted_triggers(
+    pack: dict[str, Any], contexts: list[dict[str, Any]]
+) -> list[list[str]]:
+    """Parse and walk every condition per context (the pre-compilation path)."""
+    triggered = []
+    for context in contexts:
+        evaluator = SafeExprEvaluator(context)
+        triggered.append(
+            [
+                rule["id"]
+                for rule in pack["rules"]
+                if evaluator.evaluate(str(rule["condition"]).strip())
+            ]
+        )
+    return triggered
+
+
+def _compiled_triggers(
+    pack: dict[str, Any], contexts: list[dict[str, Any]]
+) -> list[list[str]]:
+    compiled = compile_policy_pack(pack)
+    return [
+        [rule["id"] for rule in compiled.evaluate(context)["triggered_rules"]]
+        for context in contexts
+    ]
+
+
+def run_policy_benchmark(
+    reports: int = DEFAULT_REPORTS, rules: int = DEFAULT_RULES, seed: int = 0
+) -> dict[str, Any]:
+    """Time interpreted vs compiled evaluation of `rules` over `reports` contexts."""
+    pack = build_policy_pack(rules, seed=seed)
+    contexts = build_contexts(reports, seed=seed + 1)
+
+    started = time.perf_counter()
+    interpreted = _interpreted_triggers(pack, contexts)
+    interpreted_s = time.perf_counter() - started
+
+    compile_condition.cache_clear()
+    started = time.perf_counter()
+    compiled = _compiled_triggers(pack, contexts)
+    compiled_s = time.perf_counter() - started
+
+    evaluations = reports * rules
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "reports": reports,
+        "rules": rules,
+        "evaluations": evaluations,
+        "interpreted_seconds": round(interpreted_s, 4),
+        "compiled_seconds": round(compiled_s, 4),
+        "interpreted_evals_per_sec": (
+            round(evaluations / interpreted_s) if interpreted_s else None
+        ),
+        "compiled_evals_per_sec": (
+            round(evaluations / compiled_s) if compiled_s else None
+        ),
+        "speedup": round(interpreted_s / compiled_s, 2) if compiled_s else None,
+        "results_match": interpreted == compiled,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark interpreted vs compiled policy-pack evaluation."
+    )
+    parser.add_argument(
+        "--reports",
+        type=int,
+        default=DEFAULT_REPORTS,
+        help="Number of synthetic report contexts (default: 10000).",
+    )
+    parser.add_argument(
+        "--rules",
+        type=int,
+        default=DEFAULT_RULES,
+        help="Number of rules in the synthetic pack (default: 100).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("test-output/policy-eval-benchmark.json"),
+        help="Where to write benchmark JSON output.",
+    )
+    args = parser.parse_args()
+
+    result = run_policy_benchmark(
+        reports=max(1, args.reports), rules=max(1, args.rules), seed=args.seed
+    )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(json.dumps(result, indent=2))
+    return 0 if result["results_match"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
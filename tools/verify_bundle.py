@@ -1,7 +1,8 @@
 # Copyright (c) 2025 mufthakherul — see LICENSE.txt
 """Verify inspecta output bundle integrity via evidence manifest.
 
-Validates `artifacts/manifest.json` hashes against files in the bundle.
+Validates `artifacts/manifest.json` hashes against files in the bundle, or
+with `--recursive` every bundle under a store root (one JSON line each).
 """
 
 from __future__ import annotations
@@ -9,8 +10,10 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
 
+from agent.bulk_verify import BulkSummary, discover_bundles, verify_bundles
 from agent.evidence import verify_evidence_manifest
 
 
@@ -30,6 +33,17 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="Print JSON output instead of human-readable text",
     )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Verify every bundle under the given store root (JSONL output)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes for --recursive (default: CPU count)",
+    )
     args = parser.parse_args(argv[1:])
 
     bundle_dir = Path(args.bundle)
@@ -37,6 +51,20 @@ def main(argv: list[str]) -> int:
         print(f"ERROR: bundle directory not found: {bundle_dir}")
         return 2
 
+    if args.recursive:
+        started = time.perf_counter()
+        totals = BulkSummary()
+        for result in verify_bundles(
+            discover_bundles(bundle_dir, args.manifest),
+            manifest_rel=args.manifest,
+            processes=args.processes,
+        ):
+            totals.add(result)
+            print(json.dumps(result, sort_keys=True), flush=True)
+        summary = totals.to_dict(time.perf_counter() - started)
+        print(json.dumps(summary, sort_keys=True))
+        return 0 if summary["exit_code"] == 0 else 1
+
     result = verify_evidence_manifest(bundle_dir, args.manifest)
 
     if args.as_json: